@@ -0,0 +1,3 @@
+"""
+Análise de resultados armazenados (histórico JSONL)
+"""
@@ -0,0 +1,90 @@
+"""
+Leitura do histórico de PerformanceMetrics salvo em outputs/performance
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.json_manager import JSONLReader
+from src.models.performance_metrics import PerformanceMetrics
+from src.models.records import decode_record
+
+
+# Chave de uma célula da matriz de testes: (scenario, workload_type, clients)
+CellKey = Tuple[str, str, int]
+
+
+def _row_to_metrics(row: Dict) -> Optional[PerformanceMetrics]:
+    """Converte uma linha JSONL em PerformanceMetrics (None se não for métrica)"""
+    record = decode_record(row)
+    if isinstance(record, PerformanceMetrics):
+        return record
+    if row.get('type') is not None:
+        return None
+    # Arquivos anteriores ao envelope versionado: métrica gravada sem envelope
+    if 'scenario' not in row or 'tps_total' not in row:
+        return None
+    return PerformanceMetrics.from_json(row)
+
+
+def load_performance_history(
+    base_dir: Path,
+    run_ids: Optional[List[str]] = None
+) -> List[PerformanceMetrics]:
+    """
+    Carrega todas as PerformanceMetrics salvas abaixo de um diretório
+    
+    Args:
+        base_dir: Diretório base (ex: outputs/performance)
+        run_ids: Filtra apenas estes run_ids (None = todos)
+        
+    Returns:
+        Lista de PerformanceMetrics
+    """
+    history = []
+    base_dir = Path(base_dir)
+    if not base_dir.exists():
+        return history
+    
+    for filepath in JSONLReader.iter_files(base_dir, prefix="performance_"):
+        for row in JSONLReader.iter_records(filepath):
+            metrics = _row_to_metrics(row)
+            if metrics is None:
+                continue
+            if run_ids and metrics.run_id not in run_ids:
+                continue
+            history.append(metrics)
+    
+    return history
+
+
+def cell_key(metrics: PerformanceMetrics) -> CellKey:
+    """Chave da célula (scenario, workload_type, clients) de uma métrica"""
+    return (metrics.scenario, metrics.workload_type, metrics.clients)
+
+
+def group_by_cell(history: List[PerformanceMetrics]) -> Dict[CellKey, List[PerformanceMetrics]]:
+    """
+    Agrupa métricas por célula
+    
+    Sondas de capacidade e execuções de validação (run_mode != 'benchmark')
+    ficam de fora: não são comparáveis às células da matriz.
+    
+    Returns:
+        Dicionário {(scenario, workload_type, clients): [métricas]}
+    """
+    cells: Dict[CellKey, List[PerformanceMetrics]] = {}
+    for metrics in history:
+        if not metrics.is_benchmark:
+            continue
+        cells.setdefault(cell_key(metrics), []).append(metrics)
+    return cells
+
+
+def list_run_ids(history: List[PerformanceMetrics]) -> List[str]:
+    """
+    Lista run_ids presentes no histórico em ordem cronológica
+    
+    O run_id começa com o timestamp UTC (YYYYmmdd_HHMMSS), então a
+    ordenação lexicográfica é cronológica.
+    """
+    return sorted({m.run_id for m in history})
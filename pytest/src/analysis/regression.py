@@ -0,0 +1,262 @@
+"""
+Detector de regressão de performance entre runs
+
+Compara, célula a célula (scenario, workload, clients), um run candidato
+contra um run de referência. Uma célula só é marcada como regressão quando
+a variação ultrapassa o limiar E é estatisticamente significativa
+(Mann-Whitney U sobre as amostras por intervalo do pgbench -P).
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.analysis.performance_history import CellKey, group_by_cell
+from src.analysis.stats import mann_whitney_u
+from src.models.performance_metrics import PerformanceMetrics
+from src.models.regression_metrics import CellRegression, RegressionReport
+
+
+class RegressionDetector:
+    """
+    Detecta quedas de TPS e aumentos de latência contra uma referência
+    
+    A latência comparada é o p95 do log por transação (células da matriz com
+    latency_log). Execuções sem esse p95 (ex: gravadas antes do log amostrado)
+    caem para a latência média, rotulada como tal no resumo; a significância
+    sempre usa as médias por intervalo do pgbench -P.
+    """
+    
+    def __init__(
+        self,
+        tps_drop_threshold: float = 5.0,
+        latency_rise_threshold: float = 10.0,
+        alpha: float = 0.05,
+        min_samples: int = 5,
+        warmup_intervals: int = 1,
+        require_significance: bool = True
+    ):
+        """
+        Args:
+            tps_drop_threshold: Queda mínima de TPS (%) para considerar regressão
+            latency_rise_threshold: Aumento mínimo de latência (p95, ou média sem log) (%) para considerar regressão
+            alpha: Nível de significância do teste estatístico
+            min_samples: Mínimo de amostras por lado para rodar o teste
+            warmup_intervals: Intervalos de progresso descartados no início de cada execução
+            require_significance: Se True, variação sem amostras suficientes vira 'insufficient_data'
+        """
+        self.tps_drop_threshold = tps_drop_threshold
+        self.latency_rise_threshold = latency_rise_threshold
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.warmup_intervals = warmup_intervals
+        self.require_significance = require_significance
+    
+    def compare_runs(
+        self,
+        history: List[PerformanceMetrics],
+        reference_run_id: str,
+        candidate_run_id: str
+    ) -> RegressionReport:
+        """
+        Compara todas as células de dois runs
+        
+        Args:
+            history: Histórico carregado (load_performance_history)
+            reference_run_id: Run de referência
+            candidate_run_id: Run candidato
+            
+        Returns:
+            RegressionReport com o veredito
+        """
+        reference = group_by_cell([m for m in history if m.run_id == reference_run_id])
+        candidate = group_by_cell([m for m in history if m.run_id == candidate_run_id])
+        
+        report = RegressionReport(
+            reference_run_id=reference_run_id,
+            candidate_run_id=candidate_run_id,
+            generated_at=datetime.utcnow().isoformat(),
+            tps_drop_threshold_percent=self.tps_drop_threshold,
+            latency_rise_threshold_percent=self.latency_rise_threshold,
+            alpha=self.alpha
+        )
+        
+        for key in sorted(set(reference) | set(candidate), key=lambda k: (k[0], k[1], k[2])):
+            report.cells.append(
+                self.compare_cell(key, reference.get(key, []), candidate.get(key, []))
+            )
+        
+        report.calculate_verdict()
+        return report
+    
+    def compare_cell(
+        self,
+        key: CellKey,
+        reference: List[PerformanceMetrics],
+        candidate: List[PerformanceMetrics]
+    ) -> CellRegression:
+        """
+        Compara uma célula
+        
+        Args:
+            key: (scenario, workload_type, clients)
+            reference: Execuções da célula no run de referência
+            candidate: Execuções da célula no run candidato
+            
+        Returns:
+            CellRegression
+        """
+        scenario, workload_type, clients = key
+        cell = CellRegression(scenario=scenario, workload_type=workload_type, clients=clients)
+        
+        if not reference or not candidate:
+            cell.status = "missing"
+            return cell
+        
+        ref_tps_samples = self._samples(reference, 'tps')
+        cand_tps_samples = self._samples(candidate, 'tps')
+        ref_lat_samples = self._samples(reference, 'latency_avg')
+        cand_lat_samples = self._samples(candidate, 'latency_avg')
+        cell.reference_samples = len(ref_tps_samples)
+        cell.candidate_samples = len(cand_tps_samples)
+        
+        # --- Throughput ---
+        cell.reference_tps = self._mean([m.tps_total for m in reference])
+        cell.candidate_tps = self._mean([m.tps_total for m in candidate])
+        cell.tps_change_percent = self._change_percent(cell.reference_tps, cell.candidate_tps)
+        
+        tps_p_less = self._test(cand_tps_samples, ref_tps_samples, "less")
+        tps_p_greater = self._test(cand_tps_samples, ref_tps_samples, "greater")
+        
+        # --- Latência: p95 do log por transação; sem ele, média (não é p95) ---
+        ref_p95 = [m.latency_p95 for m in reference]
+        cand_p95 = [m.latency_p95 for m in candidate]
+        if all(v is not None for v in ref_p95 + cand_p95):
+            cell.reference_latency_p95 = self._mean(ref_p95)
+            cell.candidate_latency_p95 = self._mean(cand_p95)
+            cell.latency_p95_source = "pgbench"
+        else:
+            cell.reference_latency_p95 = self._mean(ref_lat_samples)
+            cell.candidate_latency_p95 = self._mean(cand_lat_samples)
+            cell.latency_p95_source = "latency_avg"
+        cell.latency_p95_change_percent = self._change_percent(
+            cell.reference_latency_p95, cell.candidate_latency_p95
+        )
+        lat_p_greater = self._test(cand_lat_samples, ref_lat_samples, "greater")
+        
+        # --- Veredito ---
+        insufficient = False
+        
+        tps_drop = (
+            cell.tps_change_percent is not None
+            and cell.tps_change_percent <= -self.tps_drop_threshold
+        )
+        if tps_drop:
+            cell.tps_p_value = tps_p_less
+            cell.tps_regressed, missing = self._significant(tps_p_less)
+            insufficient = insufficient or missing
+        else:
+            cell.tps_p_value = tps_p_greater if (cell.tps_change_percent or 0) > 0 else tps_p_less
+        
+        latency_rise = (
+            cell.latency_p95_change_percent is not None
+            and cell.latency_p95_change_percent >= self.latency_rise_threshold
+        )
+        cell.latency_p_value = lat_p_greater
+        if latency_rise:
+            cell.latency_regressed, missing = self._significant(lat_p_greater)
+            insufficient = insufficient or missing
+        
+        tps_gain = (
+            cell.tps_change_percent is not None
+            and cell.tps_change_percent >= self.tps_drop_threshold
+            and tps_p_greater is not None
+            and tps_p_greater < self.alpha
+        )
+        
+        if cell.tps_regressed or cell.latency_regressed:
+            cell.status = "regression"
+        elif insufficient:
+            cell.status = "insufficient_data"
+        elif tps_gain:
+            cell.status = "improvement"
+        else:
+            cell.status = "ok"
+        
+        return cell
+    
+    def _samples(self, runs: List[PerformanceMetrics], key: str) -> List[float]:
+        """Amostras por intervalo (pgbench -P) de todas as execuções, sem aquecimento"""
+        samples = []
+        for metrics in runs:
+            progress = metrics.progress_samples or []
+            for sample in progress[self.warmup_intervals:]:
+                value = sample.get(key)
+                if value is not None:
+                    samples.append(value)
+        
+        # Sem progresso salvo: usa o total de cada execução (precisa de repetições)
+        if not samples:
+            field_name = 'tps_total' if key == 'tps' else key
+            samples = [getattr(m, field_name) for m in runs if getattr(m, field_name) is not None]
+        
+        return samples
+    
+    def _test(self, candidate: List[float], reference: List[float], alternative: str) -> Optional[float]:
+        """Roda o teste apenas com amostras suficientes"""
+        if len(candidate) < self.min_samples or len(reference) < self.min_samples:
+            return None
+        return mann_whitney_u(candidate, reference, alternative=alternative)
+    
+    def _significant(self, p_value: Optional[float]) -> Tuple[bool, bool]:
+        """
+        Returns:
+            (significativo, faltaram_amostras)
+        """
+        if p_value is None:
+            return (not self.require_significance, self.require_significance)
+        return (p_value < self.alpha, False)
+    
+    @staticmethod
+    def _mean(values: List[Optional[float]]) -> Optional[float]:
+        values = [v for v in values if v is not None]
+        return sum(values) / len(values) if values else None
+    
+    @staticmethod
+    def _change_percent(reference: Optional[float], candidate: Optional[float]) -> Optional[float]:
+        if reference is None or candidate is None or reference == 0:
+            return None
+        return (candidate - reference) / reference * 100
+
+
+def summarize_report(report: RegressionReport) -> str:
+    """Resumo legível do veredito"""
+    lines = [
+        "=" * 70,
+        "VEREDITO DE REGRESSÃO DE PERFORMANCE",
+        "=" * 70,
+        f"Referência: {report.reference_run_id}",
+        f"Candidato:  {report.candidate_run_id}",
+        f"Limiares:   TPS -{report.tps_drop_threshold_percent:.1f}% | "
+        f"latência (p95 ou média) +{report.latency_rise_threshold_percent:.1f}% | alpha={report.alpha}",
+        "-" * 70,
+    ]
+    
+    for cell in report.cells:
+        tps = f"{cell.tps_change_percent:+7.2f}%" if cell.tps_change_percent is not None else "    n/a "
+        lat = (
+            f"{cell.latency_p95_change_percent:+7.2f}%"
+            if cell.latency_p95_change_percent is not None else "    n/a "
+        )
+        lat_label = "p95" if cell.latency_p95_source == "pgbench" else "lat. média"
+        lines.append(
+            f"{cell.scenario:22s} {cell.workload_type:14s} {cell.clients:4d} cli | "
+            f"TPS {tps} | {lat_label} {lat} | {cell.status}"
+        )
+    
+    lines.append("-" * 70)
+    lines.append(
+        f"Regressões: {report.regressions} | Melhorias: {report.improvements} | "
+        f"Dados insuficientes: {report.insufficient_data}"
+    )
+    lines.append(f"Status: {'✅ PASSOU' if report.passed else '❌ REGRESSÃO DETECTADA'}")
+    lines.append("=" * 70)
+    return "\n".join(lines)
@@ -0,0 +1,590 @@
+"""
+Relatório comparativo entre runs (HTML estático com gráficos SVG)
+
+Lê os JSONL de outputs/ (incrementalmente, via ResultCache), pareia as
+células baseline x cluster por (workload_type, clients) e gera um único HTML
+sem dependências externas:
+
+- TPS e latência x clientes por workload (baseline vs cluster)
+- Fator de escalabilidade (cluster_tps / baseline_tps) x clientes
+- Uso de CPU e memória por container (Docker Stats)
+- Distribuições de RTO e RPO (testes isolados e campanhas)
+
+Uso:
+    python -m src.analysis.report [--run <run_id> ...] [--output relatorio.html]
+"""
+import argparse
+import html
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.analysis.result_cache import ResultCache, ResultFile
+from src.models.campaign_metrics import DistributionStats
+from src.models.docker_stats_metrics import DockerStatsMetrics
+from src.models.performance_metrics import PerformanceMetrics, LoadTestSummary
+from src.models.rpo_metrics import RPOMetrics
+from src.models.rto_metrics import RTOMetrics
+
+
+DEFAULT_OUTPUTS = Path(__file__).parent.parent.parent / "outputs"
+
+# Cores das séries (baseline, cluster, demais)
+PALETTE = ("#1f77b4", "#d62728", "#2ca02c", "#ff7f0e", "#9467bd", "#8c564b", "#e377c2", "#17becf")
+
+Point = Tuple[float, float]
+
+
+@dataclass
+class ReportData:
+    """Dados agregados do relatório"""
+    run_ids: List[str] = field(default_factory=list)
+    performance: List[PerformanceMetrics] = field(default_factory=list)
+    comparisons: List[LoadTestSummary] = field(default_factory=list)
+    
+    # cenário (baseline, cluster, rto...) -> container -> [(cpu %, memória MB)] por amostra
+    resources: Dict[str, Dict[str, List[Tuple[float, float]]]] = field(default_factory=dict)
+    
+    # grupo (test_case ou campaign:<tipo>) -> amostras
+    rto_seconds: Dict[str, List[float]] = field(default_factory=dict)
+    transactions_lost: Dict[str, List[float]] = field(default_factory=dict)
+    
+    files_parsed: int = 0
+    files_reused: int = 0
+
+
+class ReportGenerator:
+    """
+    Gera o relatório comparativo a partir de outputs/
+    
+    Uso:
+        generator = ReportGenerator(outputs_dir)
+        path = generator.generate(run_ids=["20250101_120000_ab12cd34"])
+    """
+    
+    def __init__(self, output_base_dir: Path = DEFAULT_OUTPUTS, cache_path: Optional[Path] = None,
+                 use_cache: bool = True):
+        """
+        Args:
+            output_base_dir: Diretório outputs/
+            cache_path: Cache incremental (padrão: outputs/reports/.cache.pkl)
+            use_cache: False relê todos os arquivos
+        """
+        self.output_base_dir = Path(output_base_dir)
+        self.reports_dir = self.output_base_dir / "reports"
+        if use_cache:
+            cache_path = cache_path or self.reports_dir / ".cache.pkl"
+        self.cache = ResultCache(cache_path if use_cache else None)
+    
+    def load(self, run_ids: Optional[Sequence[str]] = None) -> ReportData:
+        """
+        Carrega e agrega os resultados
+        
+        Args:
+            run_ids: Restringe a estes runs (None = todos)
+        """
+        files = [
+            f for f in self.cache.load(self.output_base_dir)
+            if not Path(f.path).is_relative_to(self.reports_dir)
+        ]
+        self.cache.save()
+        if run_ids:
+            selected = set(run_ids)
+            files = [f for f in files if f.run_id in selected]
+        
+        data = ReportData(files_parsed=self.cache.parsed, files_reused=self.cache.reused)
+        for result_file in files:
+            self._collect(result_file, data)
+        
+        data.run_ids = sorted({f.run_id for f in files if f.run_id})
+        data.comparisons = self.pair_cells(data.performance)
+        return data
+    
+    def _collect(self, result_file: ResultFile, data: ReportData) -> None:
+        """Distribui os registros de um arquivo pelas seções do relatório"""
+        scenario = result_file.metadata.get('sub_type') or result_file.metadata.get('scenario')
+        
+        for record in result_file.records:
+            if isinstance(record, dict):
+                record = self._from_legacy(record)
+            
+            if isinstance(record, PerformanceMetrics):
+                data.performance.append(record)
+            elif isinstance(record, DockerStatsMetrics):
+                self._add_resources(data, scenario, {
+                    name: (stats.cpu_percent_avg, stats.memory_usage_bytes_avg / (1024**2))
+                    for name, stats in record.containers.items()
+                })
+            elif isinstance(record, RTOMetrics):
+                if record.total_rto is not None:
+                    data.rto_seconds.setdefault(record.test_case, []).append(record.total_rto)
+            elif isinstance(record, RPOMetrics):
+                if record.transactions_lost is not None:
+                    data.transactions_lost.setdefault(record.test_case, []).append(record.transactions_lost)
+            elif isinstance(record, dict) and 'iteration' in record and 'failure_type' in record:
+                # CampaignIteration
+                if record.get('error'):
+                    continue
+                group = f"campaign:{record['failure_type']}"
+                if record.get('total_rto') is not None:
+                    data.rto_seconds.setdefault(group, []).append(record['total_rto'])
+                if record.get('transactions_lost') is not None:
+                    data.transactions_lost.setdefault(group, []).append(record['transactions_lost'])
+            elif isinstance(record, dict) and isinstance(record.get('containers'), dict):
+                # Docker Stats gravado antes do envelope (to_dict, em MB)
+                self._add_resources(data, scenario, {
+                    name: (stats.get('cpu_percent_avg', 0.0), stats.get('memory_usage_mb_avg', 0.0))
+                    for name, stats in record['containers'].items()
+                })
+    
+    @staticmethod
+    def _from_legacy(row: Dict[str, Any]) -> Any:
+        """Métricas de performance gravadas sem envelope viram PerformanceMetrics"""
+        if 'type' not in row and 'scenario' in row and 'tps_total' in row:
+            return PerformanceMetrics.from_json(row)
+        return row
+    
+    @staticmethod
+    def _add_resources(data: ReportData, scenario: Optional[str], usage: Dict[str, Tuple[float, float]]) -> None:
+        containers = data.resources.setdefault(scenario or "desconhecido", {})
+        for name, sample in usage.items():
+            containers.setdefault(name, []).append(sample)
+    
+    @staticmethod
+    def pair_cells(performance: List[PerformanceMetrics]) -> List[LoadTestSummary]:
+        """
+        Pareia baseline e cluster por (workload_type, clients)
+        
+        Todo cenário diferente de 'baseline' (ex: 'cluster_with_pgpool') é o
+        lado cluster. Vários runs na mesma célula entram pela média. Células
+        presentes em só um lado aparecem com o outro vazio. Sondas de SLO e
+        execuções de validação (run_mode != 'benchmark') não entram.
+        """
+        cells: Dict[Tuple[str, int], Dict[str, List[PerformanceMetrics]]] = {}
+        for metrics in performance:
+            if metrics.tps_total is None or not metrics.is_benchmark:
+                continue
+            cell = cells.setdefault((metrics.workload_type, metrics.clients), {})
+            side = 'baseline' if metrics.scenario == 'baseline' else 'cluster'
+            cell.setdefault(side, []).append(metrics)
+        
+        def mean(values):
+            values = [v for v in values if v is not None]
+            return statistics.fmean(values) if values else None
+        
+        summaries = []
+        for (workload, clients), scenarios in sorted(cells.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+            baseline = scenarios.get('baseline', [])
+            cluster = scenarios.get('cluster', [])
+            runs = sorted({m.run_id for m in baseline + cluster})
+            summary = LoadTestSummary(
+                run_id=",".join(runs),
+                workload_type=workload,
+                clients=clients,
+                baseline_tps=mean(m.tps_total for m in baseline),
+                baseline_latency_avg=mean(m.latency_avg for m in baseline),
+                cluster_tps=mean(m.tps_total for m in cluster),
+                cluster_latency_avg=mean(m.latency_avg for m in cluster)
+            )
+            summary.calculate_comparison()
+            summaries.append(summary)
+        return summaries
+    
+    def generate(self, run_ids: Optional[Sequence[str]] = None, path: Optional[Path] = None) -> Path:
+        """
+        Carrega os resultados e grava o HTML
+        
+        Args:
+            run_ids: Restringe a estes runs (None = todos)
+            path: Arquivo de saída (padrão: outputs/reports/report_<timestamp>.html)
+        
+        Returns:
+            Caminho do relatório
+        """
+        data = self.load(run_ids)
+        if path is None:
+            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            path = self.reports_dir / f"report_{timestamp}.html"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.render(data), encoding='utf-8')
+        return path
+    
+    def render(self, data: ReportData) -> str:
+        """HTML completo do relatório"""
+        sections = [
+            self._render_performance(data),
+            self._render_resources(data),
+            self._render_resilience(data),
+        ]
+        body = "\n".join(s for s in sections if s) or "<p>Nenhum resultado encontrado.</p>"
+        runs = ", ".join(html.escape(r) for r in data.run_ids) or "-"
+        
+        return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Relatório PostgreSQL HA</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; color: #222; }}
+h2 {{ border-bottom: 1px solid #ccc; padding-bottom: .2em; margin-top: 2em; }}
+table {{ border-collapse: collapse; margin: 1em 0; font-size: 13px; }}
+th, td {{ border: 1px solid #ddd; padding: 4px 8px; text-align: right; }}
+th {{ background: #f4f4f4; }}
+td:first-child, th:first-child {{ text-align: left; }}
+.charts {{ display: flex; flex-wrap: wrap; gap: 1em; }}
+.meta {{ color: #666; font-size: 13px; }}
+</style>
+</head>
+<body>
+<h1>Relatório PostgreSQL HA</h1>
+<p class="meta">Gerado em {datetime.utcnow().isoformat(timespec='seconds')}Z · runs: {runs} ·
+arquivos lidos: {data.files_parsed}, reaproveitados do cache: {data.files_reused}</p>
+{body}
+</body>
+</html>
+"""
+
+    def _render_performance(self, data: ReportData) -> str:
+        if not data.comparisons:
+            return ""
+        
+        rows = []
+        for s in data.comparisons:
+            rows.append("<tr>" + "".join(f"<td>{v}</td>" for v in (
+                html.escape(str(s.workload_type)), s.clients,
+                _fmt(s.baseline_tps), _fmt(s.cluster_tps), _fmt(s.scalability_factor, 3),
+                _fmt(s.tps_difference_percent, 1, "%"),
+                _fmt(s.baseline_latency_avg, 3), _fmt(s.cluster_latency_avg, 3),
+                _fmt(s.latency_difference_percent, 1, "%")
+            )) + "</tr>")
+        table = (
+            "<table><tr><th>Workload</th><th>Clientes</th><th>TPS baseline</th><th>TPS cluster</th>"
+            "<th>Fator</th><th>Δ TPS</th><th>Latência baseline (ms)</th><th>Latência cluster (ms)</th>"
+            "<th>Δ latência</th></tr>" + "".join(rows) + "</table>"
+        )
+        
+        charts = []
+        workloads = sorted({str(s.workload_type) for s in data.comparisons})
+        for workload in workloads:
+            cells = [s for s in data.comparisons if str(s.workload_type) == workload]
+            charts.append(svg_line_chart(
+                f"TPS x clientes · {workload}",
+                {
+                    'baseline': [(s.clients, s.baseline_tps) for s in cells if s.baseline_tps is not None],
+                    'cluster': [(s.clients, s.cluster_tps) for s in cells if s.cluster_tps is not None],
+                },
+                x_label="clientes", y_label="TPS"
+            ))
+            charts.append(svg_line_chart(
+                f"Latência média x clientes · {workload}",
+                {
+                    'baseline': [(s.clients, s.baseline_latency_avg) for s in cells if s.baseline_latency_avg is not None],
+                    'cluster': [(s.clients, s.cluster_latency_avg) for s in cells if s.cluster_latency_avg is not None],
+                },
+                x_label="clientes", y_label="ms"
+            ))
+        
+        factors = {
+            workload: [
+                (s.clients, s.scalability_factor) for s in data.comparisons
+                if str(s.workload_type) == workload and s.scalability_factor is not None
+            ]
+            for workload in workloads
+        }
+        if any(factors.values()):
+            charts.append(svg_line_chart(
+                "Fator de escalabilidade (cluster / baseline)", factors,
+                x_label="clientes", y_label="fator", reference_y=1.0
+            ))
+        
+        return (
+            "<h2>Performance: baseline x cluster</h2>" + table +
+            '<div class="charts">' + "".join(charts) + "</div>"
+        )
+    
+    def _render_resources(self, data: ReportData) -> str:
+        if not data.resources:
+            return ""
+        
+        containers = sorted({name for usage in data.resources.values() for name in usage})
+        scenarios = sorted(data.resources)
+        
+        def mean_of(scenario: str, container: str, index: int) -> Optional[float]:
+            samples = data.resources[scenario].get(container)
+            return statistics.fmean(s[index] for s in samples) if samples else None
+        
+        cpu = {scenario: [mean_of(scenario, c, 0) for c in containers] for scenario in scenarios}
+        memory = {scenario: [mean_of(scenario, c, 1) for c in containers] for scenario in scenarios}
+        
+        return (
+            "<h2>Recursos por container (Docker Stats, média dos testes)</h2>"
+            '<div class="charts">' +
+            svg_bar_chart("CPU média (%)", containers, cpu, y_label="%") +
+            svg_bar_chart("Memória média (MB)", containers, memory, y_label="MB") +
+            "</div>"
+        )
+    
+    def _render_resilience(self, data: ReportData) -> str:
+        if not data.rto_seconds and not data.transactions_lost:
+            return ""
+        
+        rows = []
+        for label, groups, unit in (
+            ("RTO", data.rto_seconds, "s"),
+            ("Transações perdidas", data.transactions_lost, ""),
+        ):
+            for group, values in sorted(groups.items()):
+                stats = DistributionStats.from_values(values)
+                rows.append("<tr>" + "".join(f"<td>{v}</td>" for v in (
+                    label, html.escape(group), stats.count,
+                    _fmt(stats.min, 3, unit), _fmt(stats.p50, 3, unit), _fmt(stats.p95, 3, unit),
+                    _fmt(stats.max, 3, unit), _fmt(stats.stdev, 3, unit)
+                )) + "</tr>")
+        table = (
+            "<table><tr><th>Métrica</th><th>Grupo</th><th>n</th><th>min</th><th>p50</th>"
+            "<th>p95</th><th>max</th><th>desvio</th></tr>" + "".join(rows) + "</table>"
+        )
+        
+        charts = []
+        if data.rto_seconds:
+            charts.append(svg_strip_chart("Distribuição do RTO", data.rto_seconds, x_label="segundos"))
+        if any(data.transactions_lost.values()):
+            charts.append(svg_strip_chart("Transações perdidas (RPO)", data.transactions_lost, x_label="transações"))
+        
+        return (
+            "<h2>Resiliência: RTO e RPO</h2>" + table +
+            '<div class="charts">' + "".join(charts) + "</div>"
+        )
+
+
+WIDTH, HEIGHT = 560, 300
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 60, 110, 30, 40
+
+
+def _fmt(value: Optional[float], digits: int = 2, unit: str = "") -> str:
+    if value is None:
+        return "-"
+    return f"{value:,.{digits}f}{unit}"
+
+
+def _ticks(low: float, high: float, count: int = 5) -> List[float]:
+    if high <= low:
+        return [low]
+    step = (high - low) / count
+    return [low + step * i for i in range(count + 1)]
+
+
+def _svg_frame(title: str, content: str, x_label: str, y_label: str) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+        f'font-family="sans-serif" font-size="11">'
+        f'<text x="{WIDTH / 2}" y="16" text-anchor="middle" font-size="13" font-weight="bold">{html.escape(title)}</text>'
+        f'<text x="{MARGIN_LEFT + (WIDTH - MARGIN_LEFT - MARGIN_RIGHT) / 2}" y="{HEIGHT - 6}" '
+        f'text-anchor="middle">{html.escape(x_label)}</text>'
+        f'<text x="14" y="{MARGIN_TOP + (HEIGHT - MARGIN_TOP - MARGIN_BOTTOM) / 2}" text-anchor="middle" '
+        f'transform="rotate(-90 14 {MARGIN_TOP + (HEIGHT - MARGIN_TOP - MARGIN_BOTTOM) / 2})">{html.escape(y_label)}</text>'
+        f'{content}</svg>'
+    )
+
+
+def _legend(names: Sequence[str]) -> str:
+    items = []
+    for i, name in enumerate(names):
+        y = MARGIN_TOP + 14 * i
+        x = WIDTH - MARGIN_RIGHT + 10
+        items.append(
+            f'<rect x="{x}" y="{y}" width="10" height="10" fill="{PALETTE[i % len(PALETTE)]}"/>'
+            f'<text x="{x + 14}" y="{y + 9}">{html.escape(str(name))}</text>'
+        )
+    return "".join(items)
+
+
+def _axes(x_ticks: List[Tuple[float, str]], y_min: float, y_max: float, scale_y) -> str:
+    plot_bottom = HEIGHT - MARGIN_BOTTOM
+    parts = [
+        f'<line x1="{MARGIN_LEFT}" y1="{plot_bottom}" x2="{WIDTH - MARGIN_RIGHT}" y2="{plot_bottom}" stroke="#444"/>',
+        f'<line x1="{MARGIN_LEFT}" y1="{MARGIN_TOP}" x2="{MARGIN_LEFT}" y2="{plot_bottom}" stroke="#444"/>',
+    ]
+    for value in _ticks(y_min, y_max):
+        y = scale_y(value)
+        parts.append(
+            f'<line x1="{MARGIN_LEFT}" y1="{y:.1f}" x2="{WIDTH - MARGIN_RIGHT}" y2="{y:.1f}" stroke="#eee"/>'
+            f'<text x="{MARGIN_LEFT - 4}" y="{y + 4:.1f}" text-anchor="end">{value:,.4g}</text>'
+        )
+    for x, label in x_ticks:
+        parts.append(
+            f'<text x="{x:.1f}" y="{plot_bottom + 14}" text-anchor="middle">{html.escape(label)}</text>'
+        )
+    return "".join(parts)
+
+
+def svg_line_chart(title: str, series: Dict[str, List[Point]], x_label: str = "", y_label: str = "",
+                   reference_y: Optional[float] = None) -> str:
+    """
+    Gráfico de linhas (uma série por chave, pontos ordenados por x)
+    
+    Args:
+        title: Título
+        series: nome -> [(x, y)]
+        reference_y: Linha horizontal tracejada de referência (ex: fator 1.0)
+    """
+    series = {name: sorted(points) for name, points in series.items() if points}
+    if not series:
+        return ""
+    
+    xs = [x for points in series.values() for x, _ in points]
+    ys = [y for points in series.values() for _, y in points]
+    if reference_y is not None:
+        ys.append(reference_y)
+    x_min, x_max = min(xs), max(xs)
+    y_min, y_max = min(0.0, min(ys)), max(ys) * 1.05 or 1.0
+    
+    plot_w = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_h = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    
+    def scale_x(x):
+        return MARGIN_LEFT + (plot_w / 2 if x_max == x_min else (x - x_min) / (x_max - x_min) * plot_w)
+    
+    def scale_y(y):
+        return MARGIN_TOP + plot_h - (y - y_min) / ((y_max - y_min) or 1.0) * plot_h
+    
+    x_ticks = [(scale_x(x), f"{x:g}") for x in sorted(set(xs))]
+    parts = [_axes(x_ticks, y_min, y_max, scale_y)]
+    
+    if reference_y is not None:
+        y = scale_y(reference_y)
+        parts.append(
+            f'<line x1="{MARGIN_LEFT}" y1="{y:.1f}" x2="{WIDTH - MARGIN_RIGHT}" y2="{y:.1f}" '
+            f'stroke="#888" stroke-dasharray="4 3"/>'
+        )
+    
+    for i, (name, points) in enumerate(series.items()):
+        color = PALETTE[i % len(PALETTE)]
+        path = " ".join(f"{scale_x(x):.1f},{scale_y(y):.1f}" for x, y in points)
+        parts.append(f'<polyline points="{path}" fill="none" stroke="{color}" stroke-width="2"/>')
+        for x, y in points:
+            parts.append(
+                f'<circle cx="{scale_x(x):.1f}" cy="{scale_y(y):.1f}" r="3" fill="{color}">'
+                f'<title>{html.escape(name)}: {x:g} → {y:,.3f}</title></circle>'
+            )
+    
+    parts.append(_legend(list(series)))
+    return _svg_frame(title, "".join(parts), x_label, y_label)
+
+
+def svg_bar_chart(title: str, categories: List[str], series: Dict[str, List[Optional[float]]],
+                  y_label: str = "") -> str:
+    """
+    Barras agrupadas: uma barra por série em cada categoria
+    
+    Args:
+        categories: Rótulos do eixo x (ex: containers)
+        series: nome -> valor por categoria (None = sem barra)
+    """
+    values = [v for vs in series.values() for v in vs if v is not None]
+    if not categories or not values:
+        return ""
+    
+    y_max = max(values) * 1.05 or 1.0
+    plot_w = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_h = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    group_w = plot_w / len(categories)
+    bar_w = group_w * 0.8 / max(len(series), 1)
+    
+    def scale_y(y):
+        return MARGIN_TOP + plot_h - y / y_max * plot_h
+    
+    x_ticks = [(MARGIN_LEFT + group_w * (i + 0.5), name) for i, name in enumerate(categories)]
+    parts = [_axes(x_ticks, 0.0, y_max, scale_y)]
+    
+    for s, (name, bars) in enumerate(series.items()):
+        color = PALETTE[s % len(PALETTE)]
+        for i, value in enumerate(bars):
+            if value is None:
+                continue
+            x = MARGIN_LEFT + group_w * i + group_w * 0.1 + bar_w * s
+            y = scale_y(value)
+            parts.append(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_w:.1f}" height="{MARGIN_TOP + plot_h - y:.1f}" '
+                f'fill="{color}"><title>{html.escape(name)} · {html.escape(categories[i])}: {value:,.2f}</title></rect>'
+            )
+    
+    parts.append(_legend(list(series)))
+    return _svg_frame(title, "".join(parts), "", y_label)
+
+
+def svg_strip_chart(title: str, groups: Dict[str, List[float]], x_label: str = "") -> str:
+    """
+    Distribuição por grupo: uma faixa horizontal de pontos com marcas de p50 e p95
+    
+    Args:
+        groups: nome do grupo -> amostras
+    """
+    groups = {name: values for name, values in sorted(groups.items()) if values}
+    if not groups:
+        return ""
+    
+    values = [v for vs in groups.values() for v in vs]
+    x_min, x_max = min(0.0, min(values)), max(values) * 1.05 or 1.0
+    plot_w = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_h = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    row_h = plot_h / len(groups)
+    
+    def scale_x(x):
+        return MARGIN_LEFT + (x - x_min) / ((x_max - x_min) or 1.0) * plot_w
+    
+    plot_bottom = HEIGHT - MARGIN_BOTTOM
+    parts = [f'<line x1="{MARGIN_LEFT}" y1="{plot_bottom}" x2="{WIDTH - MARGIN_RIGHT}" y2="{plot_bottom}" stroke="#444"/>']
+    for value in _ticks(x_min, x_max):
+        x = scale_x(value)
+        parts.append(
+            f'<line x1="{x:.1f}" y1="{MARGIN_TOP}" x2="{x:.1f}" y2="{plot_bottom}" stroke="#eee"/>'
+            f'<text x="{x:.1f}" y="{plot_bottom + 14}" text-anchor="middle">{value:,.4g}</text>'
+        )
+    
+    for i, (name, samples) in enumerate(groups.items()):
+        color = PALETTE[i % len(PALETTE)]
+        center = MARGIN_TOP + row_h * (i + 0.5)
+        stats = DistributionStats.from_values(samples)
+        for j, value in enumerate(samples):
+            jitter = ((j * 7) % 11 - 5) / 5 * min(row_h * 0.25, 10)
+            parts.append(
+                f'<circle cx="{scale_x(value):.1f}" cy="{center + jitter:.1f}" r="3" fill="{color}" '
+                f'fill-opacity="0.6"><title>{value:,.3f}</title></circle>'
+            )
+        for label, value in (("p50", stats.p50), ("p95", stats.p95)):
+            x = scale_x(value)
+            parts.append(
+                f'<line x1="{x:.1f}" y1="{center - row_h * 0.35:.1f}" x2="{x:.1f}" y2="{center + row_h * 0.35:.1f}" '
+                f'stroke="#222" stroke-width="{2 if label == "p50" else 1}"><title>{label}: {value:,.3f}</title></line>'
+            )
+    
+    parts.append(_legend([f"{name} (n={len(v)})" for name, v in groups.items()]))
+    return _svg_frame(title, "".join(parts), x_label, "")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Linha de comando: gera o relatório a partir de outputs/"""
+    parser = argparse.ArgumentParser(description="Relatório comparativo dos resultados em outputs/")
+    parser.add_argument("--run", action="append", default=[],
+                        help="run_id a incluir (pode repetir; padrão: todos)")
+    parser.add_argument("--outputs", type=Path, default=DEFAULT_OUTPUTS,
+                        help=f"Diretório de resultados (padrão: {DEFAULT_OUTPUTS})")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Arquivo HTML (padrão: outputs/reports/report_<timestamp>.html)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Relê todos os arquivos em vez de usar o cache incremental")
+    args = parser.parse_args(argv)
+    
+    generator = ReportGenerator(args.outputs, use_cache=not args.no_cache)
+    path = generator.generate(run_ids=args.run or None, path=args.output)
+    print(f"📊 Relatório salvo em {path} "
+          f"({generator.cache.parsed} arquivos lidos, {generator.cache.reused} do cache)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""
+Cache incremental dos arquivos de resultado (outputs/)
+
+Cada arquivo JSONL é lido uma única vez: metadados e linhas JSON (dicionários,
+como gravadas) ficam em um pickle indexado por caminho, tamanho e mtime. Ao
+re-renderizar um relatório depois de um novo run, só os arquivos novos ou
+alterados são relidos.
+
+O pickle guarda só tipos nativos, nunca os modelos: a decodificação
+(decode_record) roda depois da carga, então campos novos nos modelos não
+deixam instâncias antigas sem atributos no cache.
+"""
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.json_manager import JSONLReader
+from src.models.records import decode_record
+
+
+@dataclass
+class ResultFile:
+    """Conteúdo decodificado de um arquivo de resultado"""
+    path: str
+    metadata: Dict[str, Any] = field(default_factory=dict)  # 'data' da linha de metadados
+    records: List[Any] = field(default_factory=list)  # Modelos (envelope) ou dicionários
+    
+    @property
+    def run_id(self) -> Optional[str]:
+        """run_id dos metadados (ou do primeiro registro que o tenha)"""
+        if self.metadata.get('run_id'):
+            return self.metadata['run_id']
+        for record in self.records:
+            run_id = record.get('run_id') if isinstance(record, dict) else getattr(record, 'run_id', None)
+            if run_id:
+                return run_id
+        return None
+
+
+class ResultCache:
+    """
+    Leitura incremental de outputs/
+    
+    Uso:
+        cache = ResultCache(outputs / "reports" / ".cache.pkl")
+        files = cache.load(outputs)
+        cache.save()
+    """
+    
+    VERSION = 2  # Formato das entradas do pickle (não dos modelos): (tamanho, mtime_ns, metadados, linhas)
+    
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Args:
+            cache_path: Arquivo do cache (None = sem persistência, tudo é relido)
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._entries: Dict[str, Tuple[int, int, Dict[str, Any], List[Dict[str, Any]]]] = {}
+        self._decoded: Dict[str, ResultFile] = {}  # Só em memória: arquivos já decodificados neste processo
+        self.parsed = 0
+        self.reused = 0
+        
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'rb') as f:
+                    version, entries = pickle.load(f)
+                if version == self.VERSION:
+                    self._entries = entries
+            except Exception as e:
+                print(f"⚠️  Cache de resultados ignorado ({e})")
+    
+    @staticmethod
+    def parse(filepath: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Lê um arquivo JSONL separando metadados e linhas de registro (sem decodificar)"""
+        metadata: Dict[str, Any] = {}
+        rows = []
+        for row in JSONLReader.iter_records(filepath):
+            if row.get('type') == 'metadata':
+                metadata = row.get('data') or {}
+                continue
+            rows.append(row)
+        return metadata, rows
+    
+    @staticmethod
+    def decode(path: str, metadata: Dict[str, Any], rows: List[Dict[str, Any]]) -> ResultFile:
+        """Decodifica as linhas de um arquivo nos modelos registrados"""
+        return ResultFile(path=path, metadata=metadata, records=[decode_record(row) for row in rows])
+    
+    def load(self, base_dir: Path, prefix: str = "") -> List[ResultFile]:
+        """
+        Arquivos de resultado abaixo de um diretório, relendo só os alterados
+        
+        Args:
+            base_dir: Diretório base (ex: outputs)
+            prefix: Prefixo do nome do arquivo (ex: 'performance_')
+        
+        Returns:
+            Arquivos em ordem de caminho
+        """
+        base_dir = Path(base_dir)
+        if not base_dir.exists():
+            return []
+        
+        files = []
+        for filepath in JSONLReader.iter_files(base_dir, prefix=prefix):
+            stat = filepath.stat()
+            key = str(filepath)
+            cached = self._entries.get(key)
+            if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+                self.reused += 1
+            else:
+                try:
+                    metadata, rows = self.parse(filepath)
+                except Exception as e:
+                    print(f"⚠️  {filepath.name} ignorado: {e}")
+                    continue
+                self.parsed += 1
+                cached = self._entries[key] = (stat.st_size, stat.st_mtime_ns, metadata, rows)
+                self._decoded.pop(key, None)
+            
+            result = self._decoded.get(key)
+            if result is None:
+                result = self._decoded[key] = self.decode(key, *cached[2:])
+            files.append(result)
+        
+        return files
+    
+    def save(self) -> None:
+        """Grava o cache (entradas de arquivos removidos são descartadas)"""
+        if not self.cache_path:
+            return
+        self._entries = {k: v for k, v in self._entries.items() if Path(k).exists()}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump((self.VERSION, self._entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.cache_path)
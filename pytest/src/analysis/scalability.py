@@ -0,0 +1,292 @@
+"""
+Ajuste de curva de escalabilidade (Universal Scalability Law / Amdahl)
+
+Modelo USL (Gunther):
+    X(N) = λN / (1 + σ(N-1) + κN(N-1))
+
+- λ: throughput de um único cliente
+- σ: contenção (serialização, locks, filas)
+- κ: coerência (crosstalk entre clientes, ex: troca de cache, lock manager)
+
+Com κ = 0 o modelo se reduz à lei de Amdahl. Para λ fixo o modelo é linear
+em σ e κ (λN/X - 1 = σ(N-1) + κN(N-1)), então o ajuste busca λ e resolve
+σ, κ por mínimos quadrados a cada passo, sem depender de scipy.
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+from src.analysis.performance_history import list_run_ids
+from src.models.performance_metrics import PerformanceMetrics
+from src.models.scalability_metrics import ScalabilityAnalysis
+
+
+# (clients, tps, latency_ms)
+Point = Tuple[float, float, float]
+
+
+class ScalabilityAnalyzer:
+    """Ajusta USL/Amdahl sobre séries TPS x clientes do histórico"""
+    
+    def __init__(
+        self,
+        min_points: int = 3,
+        max_pool: int = 2,
+        reserved_connections: int = 3,
+        grid_size: int = 400
+    ):
+        """
+        Args:
+            min_points: Mínimo de níveis de clientes distintos para ajustar
+            max_pool: max_pool do pgpool (conexões em cache por child e backend)
+            reserved_connections: superuser_reserved_connections do PostgreSQL
+            grid_size: Pontos da busca inicial de λ
+        """
+        self.min_points = min_points
+        self.max_pool = max_pool
+        self.reserved_connections = reserved_connections
+        self.grid_size = grid_size
+    
+    def analyze_history(
+        self,
+        history: List[PerformanceMetrics],
+        run_ids: Optional[List[str]] = None
+    ) -> List[ScalabilityAnalysis]:
+        """
+        Analisa todas as séries (scenario, workload_type) do histórico
+        
+        Args:
+            history: Histórico carregado (load_performance_history)
+            run_ids: Restringe a estes runs (None = todos, com média por nível de clientes)
+            
+        Returns:
+            Uma ScalabilityAnalysis por série com pontos suficientes
+        """
+        series: Dict[Tuple[str, str], List[PerformanceMetrics]] = {}
+        for metrics in history:
+            if run_ids and metrics.run_id not in run_ids:
+                continue
+            if not metrics.is_benchmark:
+                continue  # Sondas de SLO / validação: fora da curva de escalabilidade
+            series.setdefault((metrics.scenario, metrics.workload_type), []).append(metrics)
+        
+        results = []
+        for (scenario, workload_type), runs in sorted(series.items()):
+            analysis = self.analyze_series(scenario, workload_type, runs)
+            if analysis.model:
+                results.append(analysis)
+        return results
+    
+    def analyze_series(
+        self,
+        scenario: str,
+        workload_type: str,
+        runs: List[PerformanceMetrics]
+    ) -> ScalabilityAnalysis:
+        """
+        Ajusta o modelo para uma série
+        
+        Args:
+            scenario: Cenário ('baseline', 'cluster_with_pgpool', ...)
+            workload_type: Tipo de carga
+            runs: Execuções da série (vários níveis de clientes)
+            
+        Returns:
+            ScalabilityAnalysis (model=None se pontos insuficientes)
+        """
+        analysis = ScalabilityAnalysis(
+            scenario=scenario,
+            workload_type=workload_type,
+            run_ids=list_run_ids(runs)
+        )
+        
+        points = self._aggregate_points(runs)
+        analysis.points = [
+            {'clients': n, 'tps': x, 'latency_avg': l} for n, x, l in points
+        ]
+        
+        if len(points) < self.min_points:
+            return analysis
+        
+        lam, sigma, kappa, r2 = self.fit(points)
+        analysis.model = "usl" if kappa > 0 else "amdahl"
+        analysis.lambda_tps = lam
+        analysis.sigma = sigma
+        analysis.kappa = kappa
+        analysis.r_squared = r2
+        
+        if sigma > 0:
+            analysis.asymptotic_tps = lam / sigma
+        if kappa > 0 and sigma < 1:
+            analysis.peak_clients = math.sqrt((1 - sigma) / kappa)
+            analysis.peak_tps = self.predict(analysis.peak_clients, lam, sigma, kappa)
+        
+        analysis.knee_clients_observed = self._observed_knee(points)
+        analysis.knee_clients_model = self._model_knee(sigma, kappa, analysis.peak_clients)
+        
+        knee = analysis.knee_clients_model or analysis.knee_clients_observed
+        if knee:
+            analysis.recommended_num_init_children = int(math.ceil(knee))
+            analysis.recommended_max_connections = (
+                analysis.recommended_num_init_children * self.max_pool
+                + self.reserved_connections
+            )
+        
+        return analysis
+    
+    # ------------------------------------------------------------------
+    # Ajuste
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def predict(clients: float, lam: float, sigma: float, kappa: float) -> float:
+        """Throughput previsto pelo modelo para N clientes"""
+        return lam * clients / (1 + sigma * (clients - 1) + kappa * clients * (clients - 1))
+    
+    def fit(self, points: List[Point]) -> Tuple[float, float, float, float]:
+        """
+        Ajusta λ, σ e κ minimizando o erro quadrático em X(N)
+        
+        Args:
+            points: Lista de (clients, tps, latency)
+            
+        Returns:
+            (λ, σ, κ, R²)
+        """
+        per_client = max(x / n for n, x, _ in points)
+        lam_low = per_client
+        lam_high = max(per_client, max(x for _, x, _ in points)) * 4
+        
+        # Busca em grade (escala log) seguida de refinamento por seção áurea
+        log_low, log_high = math.log(lam_low), math.log(lam_high)
+        step = (log_high - log_low) / self.grid_size
+        grid = [math.exp(log_low + i * step) for i in range(self.grid_size + 1)]
+        errors = [self._sse_for_lambda(lam, points)[0] for lam in grid]
+        best = min(range(len(grid)), key=lambda i: errors[i])
+        
+        a = math.log(grid[max(best - 1, 0)])
+        b = math.log(grid[min(best + 1, len(grid) - 1)])
+        ratio = (math.sqrt(5) - 1) / 2
+        for _ in range(60):
+            c = b - ratio * (b - a)
+            d = a + ratio * (b - a)
+            if self._sse_for_lambda(math.exp(c), points)[0] < self._sse_for_lambda(math.exp(d), points)[0]:
+                b = d
+            else:
+                a = c
+        lam = math.exp((a + b) / 2)
+        
+        sse, sigma, kappa = self._sse_for_lambda(lam, points)
+        mean_x = sum(x for _, x, _ in points) / len(points)
+        sst = sum((x - mean_x) ** 2 for _, x, _ in points)
+        r2 = 1 - sse / sst if sst > 0 else 1.0
+        
+        return lam, sigma, kappa, r2
+    
+    def _sse_for_lambda(self, lam: float, points: List[Point]) -> Tuple[float, float, float]:
+        """
+        Para λ fixo resolve σ, κ >= 0 por mínimos quadrados na forma linearizada
+        
+        Returns:
+            (erro quadrático em X, σ, κ)
+        """
+        rows = [(n - 1, n * (n - 1), lam * n / x - 1) for n, x, _ in points]
+        
+        candidates = []
+        
+        # σ e κ livres (equações normais 2x2)
+        saa = sum(a * a for a, _, _ in rows)
+        sab = sum(a * b for a, b, _ in rows)
+        sbb = sum(b * b for _, b, _ in rows)
+        say = sum(a * y for a, _, y in rows)
+        sby = sum(b * y for _, b, y in rows)
+        det = saa * sbb - sab * sab
+        if det > 0:
+            sigma = (say * sbb - sby * sab) / det
+            kappa = (saa * sby - sab * say) / det
+            if sigma >= 0 and kappa >= 0:
+                candidates.append((sigma, kappa))
+        
+        # Apenas σ (Amdahl) ou apenas κ
+        if saa > 0:
+            candidates.append((max(say / saa, 0.0), 0.0))
+        if sbb > 0:
+            candidates.append((0.0, max(sby / sbb, 0.0)))
+        candidates.append((0.0, 0.0))
+        
+        best = None
+        for sigma, kappa in candidates:
+            sigma = min(sigma, 1.0)
+            sse = sum(
+                (x - self.predict(n, lam, sigma, kappa)) ** 2 for n, x, _ in points
+            )
+            if best is None or sse < best[0]:
+                best = (sse, sigma, kappa)
+        
+        return best
+    
+    # ------------------------------------------------------------------
+    # Joelho
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _observed_knee(points: List[Point]) -> Optional[int]:
+        """
+        Primeiro nível de clientes a partir do qual a latência cresce
+        (relativamente) mais rápido que o throughput
+        """
+        for (n0, x0, l0), (_, x1, l1) in zip(points, points[1:]):
+            if x0 <= 0 or l0 <= 0:
+                continue
+            if (l1 - l0) / l0 > (x1 - x0) / x0:
+                return int(n0)
+        return None
+    
+    @staticmethod
+    def _model_knee(sigma: float, kappa: float, peak: Optional[float]) -> Optional[float]:
+        """
+        N onde a elasticidade do throughput (d ln X / d ln N) cai para 0.5
+        
+        Em carga fechada L = N/X (Little), então d ln L/d ln N = 1 - e(N):
+        com e < 0.5 a latência passa a crescer mais rápido que o throughput.
+        """
+        def elasticity(n: float) -> float:
+            denom = 1 + sigma * (n - 1) + kappa * n * (n - 1)
+            return 1 - n * (sigma + kappa * (2 * n - 1)) / denom
+        
+        low = 1.0
+        high = peak if peak else 1e6
+        if elasticity(low) <= 0.5:
+            return low
+        if elasticity(high) > 0.5:
+            return None
+        
+        for _ in range(100):
+            mid = (low + high) / 2
+            if elasticity(mid) > 0.5:
+                low = mid
+            else:
+                high = mid
+        return (low + high) / 2
+    
+    # ------------------------------------------------------------------
+    # Pontos
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _aggregate_points(runs: List[PerformanceMetrics]) -> List[Point]:
+        """Média de TPS/latência por nível de clientes, ordenada por clientes"""
+        grouped: Dict[int, List[PerformanceMetrics]] = {}
+        for metrics in runs:
+            if metrics.is_benchmark and metrics.tps_total and metrics.tps_total > 0:
+                grouped.setdefault(metrics.clients, []).append(metrics)
+        
+        points = []
+        for clients in sorted(grouped):
+            items = grouped[clients]
+            tps = sum(m.tps_total for m in items) / len(items)
+            latencies = [m.latency_avg for m in items if m.latency_avg]
+            # Sem latência registrada, usa a lei de Little (N/X, em ms)
+            latency = sum(latencies) / len(latencies) if latencies else clients / tps * 1000
+            points.append((float(clients), tps, latency))
+        
+        return points
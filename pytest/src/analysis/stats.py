@@ -0,0 +1,130 @@
+"""
+Funções estatísticas usadas pelas análises de resultados
+
+Implementadas em Python puro para não adicionar dependências (numpy/scipy).
+"""
+import math
+from statistics import NormalDist
+from typing import List, Optional, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """
+    Percentil por interpolação linear (mesmo método padrão do numpy)
+    
+    Args:
+        values: Amostras
+        pct: Percentil desejado (0-100)
+        
+    Returns:
+        Valor do percentil ou None se não há amostras
+    """
+    if not values:
+        return None
+    return percentile_sorted(sorted(values), pct)
+
+
+def percentile_sorted(ordered: Sequence[float], pct: float, total: Optional[int] = None) -> Optional[float]:
+    """
+    Percentil de amostras já ordenadas (vários percentis com uma única ordenação)
+    
+    Args:
+        ordered: Amostras em ordem crescente
+        pct: Percentil desejado (0-100)
+        total: Tamanho da população quando há amostras acima de todas as
+            registradas (ex: transações puladas, tratadas como +inf); None = len(ordered)
+        
+    Returns:
+        Valor do percentil, math.inf se ele cai nas amostras não registradas,
+        ou None se não há amostras
+    """
+    total = len(ordered) if total is None else total
+    if not total:
+        return None
+    if total == 1:
+        return float(ordered[0]) if ordered else math.inf
+    
+    rank = (total - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if high >= len(ordered):
+        return math.inf
+    if low == high:
+        return float(ordered[low])
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _rank(values: List[float]) -> List[float]:
+    """Ranks (1..n) com média para empates"""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        avg_rank = (i + j) / 2.0 + 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = avg_rank
+        i = j + 1
+    
+    return ranks
+
+
+def mann_whitney_u(
+    x: Sequence[float],
+    y: Sequence[float],
+    alternative: str = "less"
+) -> Optional[float]:
+    """
+    Teste de Mann-Whitney U (aproximação normal com correção de empates)
+    
+    Não assume normalidade, adequado para amostras de TPS/latência por
+    intervalo do pgbench (-P).
+    
+    Args:
+        x: Primeira amostra (ex: candidato)
+        y: Segunda amostra (ex: referência)
+        alternative: 'less' (x tende a ser menor que y),
+                     'greater' (x tende a ser maior que y) ou 'two-sided'
+        
+    Returns:
+        p-valor ou None se amostras insuficientes
+    """
+    n1, n2 = len(x), len(y)
+    if n1 == 0 or n2 == 0:
+        return None
+    
+    combined = list(x) + list(y)
+    ranks = _rank(combined)
+    r1 = sum(ranks[:n1])
+    u1 = r1 - n1 * (n1 + 1) / 2.0
+    
+    n = n1 + n2
+    mu = n1 * n2 / 2.0
+    
+    # Correção de empates
+    counts = {}
+    for value in combined:
+        counts[value] = counts.get(value, 0) + 1
+    tie_term = sum(t ** 3 - t for t in counts.values())
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    
+    if variance <= 0:
+        return 1.0
+    
+    sigma = math.sqrt(variance)
+    normal = NormalDist()
+    
+    if alternative == "less":
+        z = (u1 - mu + 0.5) / sigma
+        return normal.cdf(z)
+    if alternative == "greater":
+        z = (u1 - mu - 0.5) / sigma
+        return 1.0 - normal.cdf(z)
+    if alternative == "two-sided":
+        z = (abs(u1 - mu) - 0.5) / sigma
+        return min(1.0, 2.0 * (1.0 - normal.cdf(z)))
+    
+    raise ValueError(f"Alternativa não suportada: {alternative}")
@@ -0,0 +1,237 @@
+"""
+Varredura adaptativa de número de clientes
+
+Em vez de uma grade fixa (10, 25, ..., 200) com a mesma duração em regiões
+planas da curva, executa uma grade grossa e depois adiciona níveis de
+clientes apenas perto do pico de throughput (seção áurea) e do joelho de
+latência (bisseção), respeitando um orçamento total de tempo.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.analysis.scalability import ScalabilityAnalyzer
+from src.models.performance_metrics import PerformanceMetrics
+from src.models.scalability_metrics import AdaptiveSweepResult
+
+
+# Fração da seção áurea (1 - 1/φ)
+GOLDEN = 0.381966
+
+
+class AdaptiveSweep:
+    """
+    Driver de varredura adaptativa
+    
+    Uso:
+        sweep = AdaptiveSweep(
+            run_cell=lambda clients: collector.run_pgbench(..., clients=clients),
+            time_budget=1800
+        )
+        result = sweep.run("baseline", "select-only")
+    """
+    
+    def __init__(
+        self,
+        run_cell: Callable[[int], PerformanceMetrics],
+        time_budget: float,
+        coarse_grid: Optional[List[int]] = None,
+        min_clients: int = 1,
+        max_clients: int = 200,
+        min_step: int = 5,
+        estimated_cell_seconds: Optional[float] = None,
+        on_cell: Optional[Callable[[PerformanceMetrics], None]] = None
+    ):
+        """
+        Args:
+            run_cell: Função que executa uma célula e retorna PerformanceMetrics
+            time_budget: Orçamento total em segundos
+            coarse_grid: Grade inicial (padrão: 10, 50, 100, 200)
+            min_clients: Menor número de clientes permitido
+            max_clients: Maior número de clientes permitido
+            min_step: Resolução mínima entre níveis (para de refinar abaixo disso)
+            estimated_cell_seconds: Estimativa de duração de uma célula antes da primeira medição
+            on_cell: Callback chamado após cada célula (ex: salvar métricas)
+        """
+        self.run_cell = run_cell
+        self.time_budget = time_budget
+        self.coarse_grid = sorted(coarse_grid or [10, 50, 100, 200])
+        self.min_clients = min_clients
+        self.max_clients = max_clients
+        self.min_step = min_step
+        self.estimated_cell_seconds = estimated_cell_seconds
+        self.on_cell = on_cell
+        
+        self.results: Dict[int, PerformanceMetrics] = {}
+        self._order: List[int] = []
+        self._cell_seconds: List[float] = []
+        self._start: Optional[float] = None
+    
+    def run(self, scenario: str, workload_type: str) -> AdaptiveSweepResult:
+        """
+        Executa a varredura
+        
+        Args:
+            scenario: Cenário (para o resultado)
+            workload_type: Tipo de carga (para o resultado)
+            
+        Returns:
+            AdaptiveSweepResult
+        """
+        self._start = time.time()
+        
+        print(f"\n🎯 Varredura adaptativa: grade inicial {self.coarse_grid}, "
+              f"orçamento {self.time_budget:.0f}s")
+        
+        for clients in self.coarse_grid:
+            if not self._budget_allows():
+                break
+            self._execute(clients)
+        
+        # Alterna entre refinar o pico e o joelho até convergir ou estourar o orçamento
+        converged = False
+        while self._budget_allows():
+            progressed = False
+            for next_point in (self._next_peak_point, self._next_knee_point):
+                if not self._budget_allows():
+                    break
+                target = next_point()
+                if target is not None:
+                    self._execute(target)
+                    progressed = True
+            
+            if not progressed:
+                converged = True
+                break
+        
+        return self._build_result(scenario, workload_type, converged)
+    
+    # ------------------------------------------------------------------
+    # Execução e orçamento
+    # ------------------------------------------------------------------
+    
+    def _execute(self, clients: int):
+        """Executa uma célula e registra sua duração"""
+        print(f"\n▶️  Célula adaptativa: {clients} clientes "
+              f"(decorrido {time.time() - self._start:.0f}s / {self.time_budget:.0f}s)")
+        
+        cell_start = time.time()
+        metrics = self.run_cell(clients)
+        self._cell_seconds.append(time.time() - cell_start)
+        
+        self.results[clients] = metrics
+        self._order.append(clients)
+        
+        if self.on_cell:
+            self.on_cell(metrics)
+    
+    def _budget_allows(self) -> bool:
+        """True se ainda cabe mais uma célula no orçamento"""
+        elapsed = time.time() - self._start
+        if self._cell_seconds:
+            estimate = max(self._cell_seconds)
+        else:
+            estimate = self.estimated_cell_seconds or 0.0
+        return elapsed + estimate <= self.time_budget
+    
+    def _points(self) -> List[Tuple[int, float, float]]:
+        """Pontos (clients, tps, latency) ordenados por clientes"""
+        points = []
+        for clients in sorted(self.results):
+            metrics = self.results[clients]
+            tps = metrics.tps_total or 0.0
+            latency = metrics.latency_avg or (clients / tps * 1000 if tps > 0 else 0.0)
+            points.append((clients, tps, latency))
+        return points
+    
+    # ------------------------------------------------------------------
+    # Escolha do próximo ponto
+    # ------------------------------------------------------------------
+    
+    def _next_peak_point(self) -> Optional[int]:
+        """
+        Próximo ponto da busca por seção áurea em torno do melhor TPS
+        
+        Usa o trio (vizinho esquerdo, melhor, vizinho direito) como intervalo
+        e amostra dentro do maior sub-intervalo.
+        """
+        points = self._points()
+        if len(points) < 2:
+            return None
+        
+        best = max(range(len(points)), key=lambda i: points[i][1])
+        
+        # Pico na borda direita: curva ainda subindo dentro da faixa permitida
+        if best == len(points) - 1:
+            return None
+        
+        left = points[best - 1][0] if best > 0 else self.min_clients
+        center = points[best][0]
+        right = points[best + 1][0]
+        
+        if right - center >= center - left:
+            target = center + GOLDEN * (right - center)
+        else:
+            target = center - GOLDEN * (center - left)
+        
+        return self._valid_target(int(round(target)))
+    
+    def _next_knee_point(self) -> Optional[int]:
+        """
+        Próximo ponto da bisseção do joelho
+        
+        O joelho fica no primeiro intervalo onde a latência cresce
+        (relativamente) mais rápido que o throughput.
+        """
+        points = self._points()
+        for (n0, x0, l0), (n1, x1, l1) in zip(points, points[1:]):
+            if x0 <= 0 or l0 <= 0:
+                continue
+            if (l1 - l0) / l0 > (x1 - x0) / x0:
+                return self._valid_target((n0 + n1) // 2)
+        return None
+    
+    def _valid_target(self, target: int) -> Optional[int]:
+        """Descarta pontos fora da faixa ou mais próximos que min_step de um já medido"""
+        if target < self.min_clients or target > self.max_clients:
+            return None
+        if any(abs(target - sampled) < self.min_step for sampled in self.results):
+            return None
+        return target
+    
+    # ------------------------------------------------------------------
+    # Resultado
+    # ------------------------------------------------------------------
+    
+    def _build_result(self, scenario: str, workload_type: str, converged: bool) -> AdaptiveSweepResult:
+        """Consolida pico, joelho e ajuste USL"""
+        points = self._points()
+        
+        result = AdaptiveSweepResult(
+            scenario=scenario,
+            workload_type=workload_type,
+            time_budget_seconds=self.time_budget,
+            elapsed_seconds=time.time() - self._start,
+            cells_run=len(self._order),
+            clients_sampled=list(self._order),
+            converged=converged
+        )
+        
+        if points:
+            best = max(range(len(points)), key=lambda i: points[i][1])
+            result.peak_clients = points[best][0]
+            result.peak_tps = points[best][1]
+            result.peak_at_boundary = best == len(points) - 1
+        
+        for (n0, x0, l0), (n1, x1, l1) in zip(points, points[1:]):
+            if x0 > 0 and l0 > 0 and (l1 - l0) / l0 > (x1 - x0) / x0:
+                result.knee_clients = n0
+                result.knee_bracket = [n0, n1]
+                break
+        
+        analysis = ScalabilityAnalyzer().analyze_series(
+            scenario, workload_type, list(self.results.values())
+        )
+        if analysis.model:
+            result.analysis = analysis
+        
+        return result
@@ -0,0 +1,331 @@
+"""
+Gerador de carga nativo (asyncio + asyncpg) - alternativa ao pgbench
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Callable
+
+from src.models.performance_metrics import PerformanceMetrics
+from src.models.latency_histogram import LatencyHistogram
+
+try:
+    import asyncpg
+except ImportError:  # Dependência opcional (ver requirements.txt)
+    asyncpg = None
+
+
+@dataclass
+class TransactionTemplate:
+    """
+    Modelo de transação executada pelos clientes
+    
+    Os statements usam placeholders do PostgreSQL ($1, $2, ...). Para cada
+    execução as variáveis são sorteadas e passadas na ordem de `arguments`.
+    
+    Ex:
+        TransactionTemplate(
+            name="read_point",
+            statements=["SELECT abalance FROM pgbench_accounts WHERE aid = $1"],
+            arguments=[["aid"]],
+            variables={"aid": uniform(1, 100000 * scale)},
+            weight=7
+        )
+    """
+    name: str
+    statements: List[str]
+    arguments: List[List[str]] = field(default_factory=list)  # Variáveis por statement
+    variables: Dict[str, Callable[[random.Random], Any]] = field(default_factory=dict)
+    weight: int = 1
+    transactional: bool = False  # Envolve os statements em BEGIN/COMMIT
+    
+    def draw(self, rng: random.Random) -> Dict[str, Any]:
+        """Sorteia os valores das variáveis para uma execução"""
+        return {name: generator(rng) for name, generator in self.variables.items()}
+    
+    def statement_args(self, index: int, values: Dict[str, Any]) -> list:
+        """Argumentos posicionais do statement `index`"""
+        if index >= len(self.arguments):
+            return []
+        return [values[name] for name in self.arguments[index]]
+
+
+def uniform(low: int, high: int) -> Callable[[random.Random], int]:
+    """Gerador uniforme de inteiros em [low, high] (equivalente a random() do pgbench)"""
+    return lambda rng: rng.randint(low, high)
+
+
+def pgbench_templates(workload: str, scale: int) -> List[TransactionTemplate]:
+    """
+    Templates equivalentes aos scripts embutidos do pgbench
+    
+    Args:
+        workload: 'select-only' (-S), 'simple-update' (-N) ou 'mixed' (TPC-B)
+        scale: Fator de escala usado no pgbench -i
+    
+    Returns:
+        Lista com um template
+    """
+    variables = {
+        "aid": uniform(1, 100000 * scale),
+        "bid": uniform(1, scale),
+        "tid": uniform(1, 10 * scale),
+        "delta": uniform(-5000, 5000),
+    }
+    
+    if workload == "select-only":
+        return [TransactionTemplate(
+            name="select-only",
+            statements=["SELECT abalance FROM pgbench_accounts WHERE aid = $1"],
+            arguments=[["aid"]],
+            variables={"aid": variables["aid"]}
+        )]
+    
+    statements = [
+        "UPDATE pgbench_accounts SET abalance = abalance + $1 WHERE aid = $2",
+        "SELECT abalance FROM pgbench_accounts WHERE aid = $1",
+    ]
+    arguments = [["delta", "aid"], ["aid"]]
+    if workload == "mixed":
+        statements += [
+            "UPDATE pgbench_tellers SET tbalance = tbalance + $1 WHERE tid = $2",
+            "UPDATE pgbench_branches SET bbalance = bbalance + $1 WHERE bid = $2",
+        ]
+        arguments += [["delta", "tid"], ["delta", "bid"]]
+    elif workload != "simple-update":
+        raise ValueError(f"Workload desconhecido: {workload}")
+    
+    statements.append(
+        "INSERT INTO pgbench_history (tid, bid, aid, delta, mtime) "
+        "VALUES ($1, $2, $3, $4, CURRENT_TIMESTAMP)"
+    )
+    arguments.append(["tid", "bid", "aid", "delta"])
+    
+    return [TransactionTemplate(
+        name=workload,
+        statements=statements,
+        arguments=arguments,
+        variables=variables,
+        transactional=True
+    )]
+
+
+class AsyncLoadCollector:
+    """
+    Gera carga com N clientes asyncio (um asyncpg.Connection por cliente)
+    
+    Cada transação é cronometrada individualmente e registrada em um
+    LatencyHistogram por template; o throughput é reportado a cada
+    progress_interval no mesmo formato das amostras do pgbench -P.
+    """
+    
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+    
+    def run(self, *args, **kwargs) -> PerformanceMetrics:
+        """Versão síncrona de run_async() (para testes não assíncronos)"""
+        return asyncio.run(self.run_async(*args, **kwargs))
+    
+    async def run_async(
+        self,
+        test_case: str,
+        scenario: str,
+        templates: List[TransactionTemplate],
+        host: str = "localhost",
+        port: int = 5432,
+        user: str = "postgres",
+        password: str = "postgres",
+        database: str = "postgres",
+        clients: int = 10,
+        duration: int = 60,
+        workload: str = "select-only",
+        progress_interval: float = 5.0,
+        on_progress: Optional[Callable[[Dict[str, float]], None]] = None,
+        seed: Optional[int] = None
+    ) -> PerformanceMetrics:
+        """
+        Executa teste de carga com o gerador nativo
+        
+        Args:
+            test_case: Nome do caso de teste
+            scenario: 'baseline' ou 'cluster'
+            templates: Templates de transação (sorteados pelo peso)
+            host: Host do PostgreSQL/PgPool (visto a partir do host do pytest)
+            port: Porta
+            user: Usuário
+            password: Senha
+            database: Database
+            clients: Número de clientes concorrentes
+            duration: Duração do teste em segundos
+            workload: Rótulo da carga
+            progress_interval: Intervalo do relatório de progresso em segundos
+            on_progress: Callback chamado com cada amostra de progresso
+            seed: Semente do sorteio (reprodutibilidade)
+        
+        Returns:
+            PerformanceMetrics com resultados
+        """
+        metrics = PerformanceMetrics(
+            run_id=self.run_id,
+            test_case=test_case,
+            scenario=scenario,
+            clients=clients,
+            threads=1,
+            duration_seconds=duration,
+            workload_type=workload,
+            load_generator="asyncpg",
+            pgpool_enabled=(scenario == "cluster"),
+            transaction_type="multiple templates" if len(templates) > 1 else templates[0].name,
+            query_mode="extended"
+        )
+        
+        if asyncpg is None:
+            print("❌ asyncpg não instalado - instale com: pip install asyncpg")
+            return metrics
+        
+        print(f"\n🔧 Gerador nativo: {clients} clientes, {duration}s, {host}:{port}/{database}")
+        
+        # 1. Conecta todos os clientes antes de iniciar a medição
+        connect_times = []
+        
+        async def _connect():
+            start = time.perf_counter()
+            conn = await asyncpg.connect(
+                host=host, port=port, user=user, password=password, database=database
+            )
+            connect_times.append((time.perf_counter() - start) * 1000)
+            return conn
+        
+        results = await asyncio.gather(*[_connect() for _ in range(clients)], return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Fecha as conexões que chegaram a abrir antes de desistir
+            await asyncio.gather(*[r.close() for r in results if not isinstance(r, BaseException)],
+                                 return_exceptions=True)
+            e = errors[0]
+            print(f"❌ Erro ao conectar clientes ({len(errors)}/{clients}): {type(e).__name__}: {e}")
+            return metrics
+        connections = results
+        
+        metrics.initial_connection_time = sum(connect_times) / len(connect_times)
+        
+        # 2. Estado compartilhado (asyncio é single-thread: sem locks)
+        histograms = {template.name: LatencyHistogram() for template in templates}
+        interval_histogram = LatencyHistogram()
+        failures = {template.name: 0 for template in templates}
+        interval_failures = [0]
+        weights = [template.weight for template in templates]
+        base_seed = seed if seed is not None else random.randrange(2 ** 32)
+        
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + duration
+        
+        async def _client(client_id: int, conn):
+            rng = random.Random(base_seed + client_id)
+            while loop.time() < deadline:
+                template = rng.choices(templates, weights=weights)[0]
+                values = template.draw(rng)
+                tx_start = time.perf_counter()
+                try:
+                    if template.transactional:
+                        async with conn.transaction():
+                            for i, sql in enumerate(template.statements):
+                                await conn.execute(sql, *template.statement_args(i, values))
+                    else:
+                        for i, sql in enumerate(template.statements):
+                            await conn.execute(sql, *template.statement_args(i, values))
+                except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError):
+                    failures[template.name] += 1
+                    interval_failures[0] += 1
+                    if conn.is_closed():
+                        try:
+                            conn = await asyncpg.connect(
+                                host=host, port=port, user=user, password=password, database=database
+                            )
+                        except Exception:
+                            await asyncio.sleep(0.1)
+                    continue
+                latency_ms = (time.perf_counter() - tx_start) * 1000
+                histograms[template.name].record(latency_ms)
+                interval_histogram.record(latency_ms)
+            await conn.close()
+        
+        async def _reporter():
+            nonlocal interval_histogram
+            last = start
+            while True:
+                await asyncio.sleep(progress_interval)
+                now = loop.time()
+                snapshot, interval_histogram = interval_histogram, LatencyHistogram()
+                failed, interval_failures[0] = interval_failures[0], 0
+                sample = {
+                    'time_s': round(now - start, 1),
+                    'tps': snapshot.count / (now - last) if now > last else 0.0,
+                    'latency_avg': snapshot.mean,
+                    'latency_stddev': snapshot.stddev,
+                    'failed': failed,
+                }
+                last = now
+                metrics.progress_samples.append(sample)
+                latency = f"{sample['latency_avg']:.3f}" if sample['latency_avg'] is not None else "NaN"
+                print(f"   progress: {sample['time_s']:.1f} s, {sample['tps']:.1f} tps, "
+                      f"lat {latency} ms, {failed} failed")
+                if on_progress:
+                    on_progress(sample)
+        
+        # 3. Executa carga
+        reporter = asyncio.create_task(_reporter())
+        try:
+            await asyncio.gather(*[_client(i, conn) for i, conn in enumerate(connections)])
+        finally:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+        elapsed = loop.time() - start
+        
+        # 4. Consolida métricas
+        total = LatencyHistogram()
+        for histogram in histograms.values():
+            total.merge(histogram)
+        
+        total_failed = sum(failures.values())
+        metrics.total_transactions = total.count + total_failed
+        metrics.failed_transactions = total_failed
+        metrics.tps_total = total.count / elapsed if elapsed > 0 else 0.0
+        metrics.tps_excluding_connections = metrics.tps_total
+        metrics.latency_avg = total.mean
+        metrics.latency_stddev = total.stddev
+        metrics.latency_min = total.min
+        metrics.latency_max = total.max
+        metrics.latency_p50 = total.percentile(50)
+        metrics.latency_p95 = total.percentile(95)
+        metrics.latency_p99 = total.percentile(99)
+        metrics.latency_sample_count = total.count
+        metrics.latency_histogram = total.to_json()
+        
+        total_weight = sum(weights)
+        for number, template in enumerate(templates, start=1):
+            histogram = histograms[template.name]
+            metrics.script_stats.append({
+                'script_no': number,
+                'script': template.name,
+                'weight': template.weight,
+                'weight_percent': template.weight / total_weight * 100,
+                'transactions': histogram.count,
+                'transactions_percent': histogram.count / total.count * 100 if total.count else 0.0,
+                'tps': histogram.count / elapsed if elapsed > 0 else 0.0,
+                'failed_transactions': failures[template.name],
+                'latency_avg': histogram.mean,
+                'latency_stddev': histogram.stddev,
+                'latency_p95': histogram.percentile(95),
+                'latency_p99': histogram.percentile(99),
+            })
+        
+        metrics.calculate_metrics()
+        if metrics.success_rate is None:
+            metrics.success_rate = 0.0
+        
+        print(f"✅ Gerador nativo concluído: {metrics.tps_total:.2f} TPS, "
+              f"latência média {metrics.latency_avg or 0:.3f} ms, p99 {metrics.latency_p99 or 0:.3f} ms")
+        return metrics
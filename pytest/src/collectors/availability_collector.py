@@ -0,0 +1,405 @@
+"""
+Coletor de disponibilidade por probes contínuos
+
+Dispara probes de leitura e de escrita a cada poucos milissegundos via PgPool
+e diretamente em cada backend, durante todo o teste. Cada resultado vai para
+um ring buffer compacto; ao final, as janelas de indisponibilidade são
+calculadas separadamente para leitura e escrita.
+
+Nos backends diretos, uma escrita recusada por réplica (read_only) é o
+comportamento esperado do nó, não indisponibilidade: fica fora das falhas,
+das janelas e do gauge probe_up. Via PgPool continua sendo falha (escrita
+roteada para uma réplica).
+"""
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Iterator
+
+import psycopg2
+from psycopg2 import errorcodes
+
+from src.analysis.stats import percentile
+from src.core.config import config
+from src.core.metrics_exporter import harness_metrics
+from src.models.availability_metrics import AvailabilityMetrics, ProbeSeriesStats, UnavailabilityWindow
+
+
+# Resultado de um probe (1 byte no ring buffer)
+PROBE_OK = 0
+PROBE_ERROR = 1
+PROBE_READ_ONLY = 2  # Escrita recusada: nó em recovery (réplica)
+
+OUTCOME_NAMES = {PROBE_ERROR: "error", PROBE_READ_ONLY: "read_only"}
+
+# Métricas ao vivo (ver metrics_exporter)
+_PROBES = harness_metrics.counter("probes", "Probes de disponibilidade por alvo, tipo e resultado")
+_PROBE_UP = harness_metrics.gauge("probe_up", "1 se o último probe do alvo/tipo teve sucesso (ou read_only em réplica)")
+_PROBE_LATENCY = harness_metrics.histogram("probe_latency_ms", "Latência dos probes de disponibilidade (ms)")
+
+PROBE_TABLE = "availability_probe"
+
+READ_SQL = "SELECT 1"
+WRITE_SQL = (
+    f"INSERT INTO {PROBE_TABLE} (probe, seq, updated_at) VALUES (%s, 1, now()) "
+    f"ON CONFLICT (probe) DO UPDATE SET seq = {PROBE_TABLE}.seq + 1, updated_at = now()"
+)
+
+
+class ProbeRingBuffer:
+    """
+    Ring buffer de resultados de probes em arrays tipados
+    
+    13 bytes por probe (timestamp double, latência float, resultado byte):
+    200k probes (~33 min a cada 10ms) ocupam ~2.6MB por série.
+    """
+    
+    def __init__(self, capacity: int = 200_000):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.latencies = array('f', bytes(4 * capacity))
+        self.outcomes = array('b', bytes(capacity))
+        self.count = 0  # Total registrado (inclui sobrescritos)
+        
+        # Mensagem de erro apenas nas transições OK -> falha: {seq: mensagem}
+        self.errors: Dict[int, str] = {}
+        self._last_outcome = PROBE_OK
+    
+    def append(self, timestamp: float, outcome: int, latency_ms: float, error: Optional[str] = None):
+        """Registra um probe"""
+        index = self.count % self.capacity
+        self.timestamps[index] = timestamp
+        self.latencies[index] = latency_ms
+        self.outcomes[index] = outcome
+        
+        if outcome != PROBE_OK and outcome != self._last_outcome and error and len(self.errors) < 1000:
+            self.errors[self.count] = error
+        self._last_outcome = outcome
+        self.count += 1
+    
+    @property
+    def dropped(self) -> int:
+        """Probes sobrescritos por falta de capacidade"""
+        return max(self.count - self.capacity, 0)
+    
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    def __iter__(self) -> Iterator[Tuple[int, float, int, float]]:
+        """(seq, timestamp, resultado, latência_ms) do mais antigo ao mais recente"""
+        for seq in range(self.dropped, self.count):
+            index = seq % self.capacity
+            yield seq, self.timestamps[index], self.outcomes[index], self.latencies[index]
+
+
+class _Prober:
+    """Loop de probes de um tipo contra um alvo (uma thread, conexão persistente)"""
+    
+    def __init__(self, target: str, kind: str, host: str, port: int, interval_s: float,
+                 timeout_s: float, capacity: int, read_only_ok: bool = False):
+        self.target = target
+        self.kind = kind
+        self.read_only_ok = read_only_ok  # Backend direto: réplica recusando escrita não é falha
+        self.host = host
+        self.port = port
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.buffer = ProbeRingBuffer(capacity)
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._conn = None
+    
+    def _connect(self):
+        conn = psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            user=config.postgres_user,
+            password=config.postgres_password,
+            database=config.postgres_db,
+            connect_timeout=max(int(self.timeout_s), 2),  # libpq: mínimo efetivo de 2s
+            keepalives=1,
+            keepalives_idle=1,
+            keepalives_interval=1,
+            keepalives_count=2,
+            tcp_user_timeout=int(self.timeout_s * 1000),
+            application_name=f"availability_{self.kind}"
+        )
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"SET statement_timeout = {int(self.timeout_s * 1000)}")
+        return conn
+    
+    def _probe(self) -> Tuple[int, Optional[str]]:
+        try:
+            if self._conn is None or self._conn.closed:
+                self._conn = self._connect()
+            with self._conn.cursor() as cursor:
+                if self.kind == "read":
+                    cursor.execute(READ_SQL)
+                    cursor.fetchone()
+                else:
+                    cursor.execute(WRITE_SQL, (self.target,))
+            return PROBE_OK, None
+        except psycopg2.Error as e:
+            outcome = PROBE_READ_ONLY if e.pgcode == errorcodes.READ_ONLY_SQL_TRANSACTION else PROBE_ERROR
+            if outcome == PROBE_ERROR:
+                self._close()
+            return outcome, str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+    
+    def _close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+    
+    def run(self):
+        """Loop de probes (thread)"""
+        next_at = time.perf_counter()
+        while self.running:
+            started = time.time()
+            t0 = time.perf_counter()
+            outcome, error = self._probe()
+            latency_ms = (time.perf_counter() - t0) * 1000
+            self.buffer.append(started, outcome, latency_ms, error)
+            _PROBES.inc(target=self.target, kind=self.kind, outcome=OUTCOME_NAMES.get(outcome, "ok"))
+            _PROBE_UP.set(outcome == PROBE_OK or (outcome == PROBE_READ_ONLY and self.read_only_ok),
+                          target=self.target, kind=self.kind)
+            _PROBE_LATENCY.observe(latency_ms, target=self.target, kind=self.kind)
+            
+            next_at += self.interval_s
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_at = time.perf_counter()  # Atrasado (probe lento): não acumula rajadas
+        self._close()
+
+
+class AvailabilityCollector:
+    """
+    Disponibilidade contínua vista pelos clientes (via PgPool e direto nos backends)
+    
+    Uso:
+        collector = AvailabilityCollector(run_id, interval_ms=10)
+        collector.start()
+        # ... injeta falha, aguarda recuperação ...
+        collector.stop()
+        metrics = collector.get_metrics("primary_failure", reference_time=t_injecao)
+    """
+    
+    def __init__(
+        self,
+        run_id: str,
+        interval_ms: float = 10.0,
+        timeout_s: float = 2.0,
+        include_backends: bool = True,
+        capacity: int = 200_000
+    ):
+        """
+        Args:
+            run_id: ID da execução
+            interval_ms: Intervalo entre probes de cada série
+            timeout_s: Timeout de conexão/statement de cada probe
+            include_backends: Também sonda cada nó Patroni diretamente
+            capacity: Capacidade do ring buffer por série
+        """
+        self.run_id = run_id
+        self.interval_ms = interval_ms
+        
+        targets = [("pgpool", "localhost", config.pgpool_port)]
+        if include_backends:
+            targets += [(node, "localhost", port) for node, port in config.patroni_host_ports.items()]
+        
+        self.probers: List[_Prober] = [
+            _Prober(target, kind, host, port, interval_ms / 1000.0, timeout_s, capacity,
+                    read_only_ok=(target != "pgpool"))
+            for target, host, port in targets
+            for kind in ("read", "write")
+        ]
+        
+        self._start_time: Optional[datetime] = None
+        self._end_time: Optional[datetime] = None
+    
+    def setup_probe_table(self) -> bool:
+        """Cria a tabela dos probes de escrita (via PgPool, no primário)"""
+        try:
+            conn = psycopg2.connect(
+                host="localhost",
+                port=config.pgpool_port,
+                user=config.postgres_user,
+                password=config.postgres_password,
+                database=config.postgres_db,
+                connect_timeout=5
+            )
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {PROBE_TABLE} ("
+                    f"probe TEXT PRIMARY KEY, seq BIGINT NOT NULL DEFAULT 0, updated_at TIMESTAMPTZ)"
+                )
+            conn.close()
+            return True
+        except psycopg2.Error as e:
+            print(f"⚠️  Não foi possível criar {PROBE_TABLE}: {e}")
+            return False
+    
+    def start(self) -> None:
+        """Cria a tabela de probes e inicia uma thread por série"""
+        self.setup_probe_table()
+        self._start_time = datetime.utcnow()
+        
+        for prober in self.probers:
+            prober.running = True
+            prober.thread = threading.Thread(target=prober.run, daemon=True)
+            prober.thread.start()
+        
+        print(f"📡 Probes de disponibilidade iniciados ({len(self.probers)} séries, "
+              f"intervalo {self.interval_ms:.0f}ms)")
+    
+    def stop(self) -> None:
+        """Para todos os probes"""
+        if not any(prober.running for prober in self.probers):
+            return
+        
+        for prober in self.probers:
+            prober.running = False
+        for prober in self.probers:
+            if prober.thread:
+                prober.thread.join(timeout=prober.timeout_s + 5)
+        self._end_time = datetime.utcnow()
+        
+        total = sum(p.buffer.count for p in self.probers)
+        print(f"📡 Probes de disponibilidade finalizados ({total} probes)")
+    
+    @staticmethod
+    def compute_windows(
+        buffer: ProbeRingBuffer,
+        reference_time: Optional[float] = None,
+        read_only_ok: bool = False
+    ) -> List[UnavailabilityWindow]:
+        """
+        Janelas contínuas de probes sem sucesso
+        
+        A janela vai do início do primeiro probe com falha ao início do primeiro
+        probe bem-sucedido seguinte. last_success_before delimita o início real
+        (a falha ocorreu entre ele e o início da janela).
+        
+        Com read_only_ok, probes read_only não abrem janela e encerram a janela
+        em aberto (o nó voltou como réplica).
+        """
+        windows: List[UnavailabilityWindow] = []
+        current: Optional[UnavailabilityWindow] = None
+        last_ok_end: Optional[float] = None
+        last_timestamp: Optional[float] = None
+        
+        for seq, timestamp, outcome, latency in buffer:
+            last_timestamp = timestamp
+            if outcome == PROBE_READ_ONLY and read_only_ok:
+                if current is not None:
+                    current.end = timestamp
+                    windows.append(current)
+                    current = None
+                continue
+            if outcome != PROBE_OK:
+                if current is None:
+                    current = UnavailabilityWindow(
+                        start=timestamp,
+                        end=timestamp,
+                        duration_seconds=0.0,
+                        failed_probes=0,
+                        last_success_before=last_ok_end,
+                        outcome=OUTCOME_NAMES[outcome],
+                        first_error=buffer.errors.get(seq)
+                    )
+                current.failed_probes += 1
+                if outcome == PROBE_ERROR:
+                    current.outcome = "error"  # Erro prevalece sobre read_only
+                continue
+            
+            if current is not None:
+                current.end = timestamp
+                windows.append(current)
+                current = None
+            last_ok_end = timestamp + latency / 1000.0
+        
+        if current is not None:
+            current.end = last_timestamp
+            current.open_at_end = True
+            windows.append(current)
+        
+        for window in windows:
+            window.duration_seconds = round(window.end - window.start, 6)
+            if reference_time is not None:
+                window.start_offset = round(window.start - reference_time, 6)
+        return windows
+    
+    def _series_stats(self, prober: _Prober, reference_time: Optional[float]) -> ProbeSeriesStats:
+        buffer = prober.buffer
+        stats = ProbeSeriesStats(target=prober.target, kind=prober.kind, dropped_probes=buffer.dropped)
+        
+        latencies = []
+        for _, _, outcome, latency in buffer:
+            stats.probes += 1
+            if outcome == PROBE_OK:
+                stats.successes += 1
+                latencies.append(latency)
+            elif outcome == PROBE_READ_ONLY and prober.read_only_ok:
+                stats.read_only += 1
+        stats.failures = stats.probes - stats.successes - stats.read_only
+        
+        applicable = stats.successes + stats.failures
+        if applicable:
+            stats.availability_percent = stats.successes / applicable * 100
+        if latencies:
+            stats.latency_p50 = percentile(latencies, 50)
+            stats.latency_p99 = percentile(latencies, 99)
+            stats.latency_max = max(latencies)
+        
+        stats.windows = self.compute_windows(buffer, reference_time, read_only_ok=prober.read_only_ok)
+        stats.total_unavailable_seconds = round(sum(w.duration_seconds for w in stats.windows), 6)
+        stats.longest_window_seconds = max((w.duration_seconds for w in stats.windows), default=0.0)
+        return stats
+    
+    def get_metrics(self, test_case: str, reference_time: Optional[float] = None) -> AvailabilityMetrics:
+        """
+        Calcula as janelas de indisponibilidade por série
+        
+        Args:
+            test_case: Nome do caso de teste
+            reference_time: Epoch de referência para start_offset (ex: injeção da falha)
+        """
+        metrics = AvailabilityMetrics(
+            run_id=self.run_id,
+            test_case=test_case,
+            start_time=self._start_time.isoformat() if self._start_time else None,
+            end_time=self._end_time.isoformat() if self._end_time else None,
+            probe_interval_ms=self.interval_ms,
+            reference_time=reference_time,
+            series=[self._series_stats(prober, reference_time) for prober in self.probers]
+        )
+        
+        reads = metrics.get_series("pgpool", "read")
+        writes = metrics.get_series("pgpool", "write")
+        metrics.client_read_downtime = reads.total_unavailable_seconds if reads else None
+        metrics.client_write_downtime = writes.total_unavailable_seconds if writes else None
+        return metrics
+    
+    @staticmethod
+    def summarize(metrics: AvailabilityMetrics) -> str:
+        """Resumo legível das janelas de indisponibilidade"""
+        lines = [f"\n📡 Disponibilidade vista pelos clientes ({metrics.test_case})"]
+        lines.append(f"   {'alvo':<22} {'tipo':<6} {'probes':>8} {'disp.':>8} {'indisp.':>9} {'janelas':>8} {'p99 ms':>8}")
+        for s in metrics.series:
+            availability = f"{s.availability_percent:.2f}%" if s.availability_percent is not None else "-"
+            p99 = f"{s.latency_p99:.2f}" if s.latency_p99 is not None else "-"
+            lines.append(f"   {s.target:<22} {s.kind:<6} {s.probes:>8} {availability:>8} "
+                         f"{s.total_unavailable_seconds:>8.3f}s {len(s.windows):>8} {p99:>8}")
+            for w in s.windows:
+                offset = f"+{w.start_offset:.3f}s" if w.start_offset is not None else ""
+                still_open = " (em aberto)" if w.open_at_end else ""
+                lines.append(f"      ↳ {offset} {w.duration_seconds:.3f}s, {w.failed_probes} probes, "
+                             f"{w.outcome}{still_open}: {w.first_error or '-'}")
+        return "\n".join(lines)
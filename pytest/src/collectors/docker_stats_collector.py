@@ -8,6 +8,7 @@ from typing import List, Dict, Optional
 from collections import defaultdict
 
 from ..core.docker_manager import DockerManager
+from ..core.metrics_exporter import harness_metrics
 from ..models.docker_stats_metrics import (
     ContainerStats,
     ContainerStatsAverage,
@@ -15,6 +16,13 @@ from ..models.docker_stats_metrics import (
 )
 
 
+# Métricas ao vivo (ver metrics_exporter)
+_CPU = harness_metrics.gauge("container_cpu_percent", "CPU do container (docker stats)")
+_MEMORY = harness_metrics.gauge("container_memory_bytes", "Memória em uso pelo container (docker stats)")
+_NETWORK = harness_metrics.gauge("container_network_bytes", "Bytes de rede acumulados (direction=rx|tx)")
+_BLOCK = harness_metrics.gauge("container_block_io_bytes", "Bytes de disco acumulados (direction=read|write)")
+
+
 class DockerStatsCollector:
     """
     Coleta estatísticas de containers Docker durante a execução de testes.
@@ -125,6 +133,13 @@ class DockerStatsCollector:
             )
             
             self.samples[container_name].append(sample)
+            
+            _CPU.set(sample.cpu_percent, container=container_name)
+            _MEMORY.set(mem_used, container=container_name)
+            _NETWORK.set(net_rx, container=container_name, direction="rx")
+            _NETWORK.set(net_tx, container=container_name, direction="tx")
+            _BLOCK.set(block_read, container=container_name, direction="read")
+            _BLOCK.set(block_write, container=container_name, direction="write")
     
     def get_metrics(self, test_name: str) -> DockerStatsMetrics:
         """
@@ -0,0 +1,326 @@
+"""
+Coletor das métricas do postgres_exporter / pgpool2_exporter durante uma célula de carga
+
+Raspa os endpoints /metrics dos exporters em intervalo fixo enquanto o pgbench
+executa, mantendo apenas uma allowlist de métricas (acertos de buffer, tuplas
+retornadas, locks, uso dos pools do PgPool). Ao final, os contadores viram o
+incremento na célula e os gauges viram média/máximo, anexados ao
+PerformanceMetrics da célula: contexto interno do banco para cada número de
+vazão.
+
+O parser do formato texto do Prometheus só decodifica as linhas cujas métricas
+estão na allowlist (pré-filtro por prefixo); o restante da exposição (centenas
+de séries do postgres_exporter) é descartado sem parse.
+"""
+import re
+import threading
+import urllib.request
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.config import config
+from src.models.performance_metrics import PerformanceMetrics
+
+
+# Métricas mantidas por padrão -> tipo (None = usa o '# TYPE' da exposição)
+DEFAULT_ALLOWLIST: Dict[str, Optional[str]] = {
+    # postgres_exporter (pg_stat_database, pg_locks, pg_stat_activity)
+    "pg_stat_database_blks_hit": "counter",
+    "pg_stat_database_blks_read": "counter",
+    "pg_stat_database_tup_returned": "counter",
+    "pg_stat_database_tup_fetched": "counter",
+    "pg_stat_database_xact_commit": "counter",
+    "pg_stat_database_xact_rollback": "counter",
+    "pg_stat_database_deadlocks": "counter",
+    "pg_stat_database_conflicts": "counter",
+    "pg_locks_count": "gauge",
+    "pg_stat_activity_count": "gauge",
+    # pgpool2_exporter (SHOW POOL_PROCESSES / POOL_POOLS / POOL_NODES)
+    "pgpool2_frontend_total": "gauge",
+    "pgpool2_frontend_used": "gauge",
+    "pgpool2_frontend_used_ratio": "gauge",
+    "pgpool2_backend_total": "gauge",
+    "pgpool2_backend_used": "gauge",
+    "pgpool2_backend_used_ratio": "gauge",
+    "pgpool2_pool_nodes_select_cnt": "counter",  # Exposto como gauge, mas é cumulativo
+    "pgpool2_pool_backend_stats_select_cnt": "counter",
+    "pgpool2_pool_backend_stats_insert_cnt": "counter",
+    "pgpool2_pool_backend_stats_update_cnt": "counter",
+    "pgpool2_pool_backend_stats_delete_cnt": "counter",
+}
+
+_LABEL_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+SeriesKey = Tuple[str, str]  # (métrica, labels formatados)
+
+
+def parse_exposition(
+    text: str,
+    allowlist: Iterable[str],
+    label_filter: Optional[Dict[str, str]] = None
+) -> Tuple[Dict[SeriesKey, float], Dict[str, str]]:
+    """
+    Parseia o formato texto do Prometheus mantendo só as métricas da allowlist
+    
+    Args:
+        text: Corpo de /metrics
+        allowlist: Nomes de métricas mantidos
+        label_filter: Descarta séries cujo label difere do valor (ex: {'datname': 'postgres'});
+            séries sem o label são mantidas
+    
+    Returns:
+        (valores por (métrica, labels), tipo declarado por métrica)
+    """
+    names = frozenset(allowlist)
+    prefixes = tuple(names)
+    values: Dict[SeriesKey, float] = {}
+    types: Dict[str, str] = {}
+    
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            parts = line.split()
+            if len(parts) >= 4 and parts[2] in names:
+                types[parts[2]] = parts[3]
+            continue
+        if not line.startswith(prefixes):
+            continue
+        
+        brace = line.find("{")
+        space = line.find(" ")
+        if brace != -1 and (space == -1 or brace < space):
+            name = line[:brace]
+            close = line.rfind("}")
+            labels = dict(_LABEL_RE.findall(line[brace + 1:close]))
+            rest = line[close + 1:]
+        else:
+            name = line[:space]
+            labels = {}
+            rest = line[space:]
+        if name not in names:
+            continue  # Só o prefixo coincidia (ex: pg_locks_count_x)
+        if label_filter and any(labels.get(k, v) != v for k, v in label_filter.items()):
+            continue
+        
+        try:
+            value = float(rest.split()[0])
+        except (IndexError, ValueError):
+            continue
+        label_text = ",".join(f'{k}="{labels[k]}"' for k in sorted(labels))
+        values[(name, "{" + label_text + "}" if label_text else "")] = value
+    
+    return values, types
+
+
+class ExporterScrapeCollector:
+    """
+    Raspa os exporters em background durante uma célula de carga
+    
+    Mesmo padrão do PgPoolStatsCollector: start() / stop() / attach(). Pode
+    ser reutilizado: cada start() inicia uma nova célula.
+    
+    Uso:
+        scraper = ExporterScrapeCollector(interval_seconds=5.0)
+        scraper.start()
+        # ... executa pgbench ...
+        scraper.stop()
+        scraper.attach(metrics)  # metrics.exporter_deltas / exporter_gauges
+    """
+    
+    def __init__(
+        self,
+        targets: Optional[Dict[str, str]] = None,
+        interval_seconds: float = 5.0,
+        allowlist: Optional[Dict[str, Optional[str]]] = None,
+        label_filter: Optional[Dict[str, str]] = None,
+        timeout_seconds: float = 2.0
+    ):
+        """
+        Inicializa o coletor
+        
+        Args:
+            targets: {alvo: url de /metrics} para todos os cenários (padrão: exporters
+                do cenário de cada célula, ver config.exporter_endpoints_for)
+            interval_seconds: Intervalo entre raspagens em segundos
+            allowlist: {métrica: tipo} mantidas (tipo None = '# TYPE' da exposição)
+            label_filter: Filtro de labels (padrão: datname do banco de teste)
+            timeout_seconds: Timeout de cada requisição HTTP
+        """
+        self.targets = targets
+        self.interval_seconds = interval_seconds
+        self.allowlist = dict(allowlist if allowlist is not None else DEFAULT_ALLOWLIST)
+        self.label_filter = label_filter if label_filter is not None else {"datname": config.postgres_db}
+        self.timeout_seconds = timeout_seconds
+        
+        # Série por (alvo, métrica, labels): primeiro valor, último, incremento e agregados
+        self._series: Dict[Tuple[str, str, str], Dict[str, float]] = {}
+        self._types: Dict[str, str] = {}
+        self.scrapes: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._active_targets: Dict[str, str] = {}
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_time: Optional[datetime] = None
+        self._end_time: Optional[datetime] = None
+    
+    def _fetch(self, url: str) -> str:
+        with urllib.request.urlopen(url, timeout=self.timeout_seconds) as response:
+            return response.read().decode("utf-8", errors="replace")
+    
+    def _kind(self, name: str) -> str:
+        return self.allowlist.get(name) or self._types.get(name, "gauge")
+    
+    def _scrape(self, targets: Dict[str, str]) -> None:
+        """Uma raspagem de cada alvo, acumulando nas séries"""
+        for target, url in targets.items():
+            try:
+                text = self._fetch(url)
+            except Exception:
+                self.errors[target] = self.errors.get(target, 0) + 1
+                continue
+            
+            values, types = parse_exposition(text, self.allowlist, self.label_filter)
+            with self._lock:
+                self._types.update(types)
+                self.scrapes[target] = self.scrapes.get(target, 0) + 1
+                for (name, labels), value in values.items():
+                    self._accumulate((target, name, labels), value)
+    
+    def _accumulate(self, key: Tuple[str, str, str], value: float) -> None:
+        series = self._series.get(key)
+        if series is None:
+            self._series[key] = {'first': value, 'last': value, 'increase': 0.0,
+                                 'sum': value, 'count': 1, 'max': value}
+            return
+        
+        # Contador reiniciado (restart/failover do nó): o valor novo é todo incremento
+        series['increase'] += value - series['last'] if value >= series['last'] else value
+        series['last'] = value
+        series['sum'] += value
+        series['count'] += 1
+        series['max'] = max(series['max'], value)
+    
+    def _collect_loop(self) -> None:
+        """Loop de coleta em background"""
+        while not self._stop_event.wait(self.interval_seconds):
+            self._scrape(self._active_targets)
+    
+    def start(self, scenario: str = "cluster") -> None:
+        """
+        Inicia a raspagem (a primeira é síncrona: valores de referência da célula)
+        
+        Args:
+            scenario: Cenário da célula ('baseline' ou 'cluster'): define os alvos
+                quando targets não foi informado
+        """
+        if self._thread:
+            return
+        
+        targets = self.targets if self.targets is not None else config.exporter_endpoints_for(scenario)
+        with self._lock:
+            self._series.clear()
+            self._types.clear()
+            self.scrapes.clear()
+            self.errors.clear()
+        self._start_time = datetime.now()
+        self._end_time = None
+        
+        self._active_targets = {}
+        if not targets:
+            print(f"ℹ️  Sem exporters para o cenário {scenario}: célula sem métricas dos exporters")
+            return
+        
+        self._scrape(targets)
+        self._active_targets = {t: url for t, url in targets.items() if self.scrapes.get(t)}
+        if not self._active_targets:
+            print(f"⚠️  Nenhum exporter respondeu ({', '.join(targets)}): "
+                  f"célula sem métricas dos exporters")
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._collect_loop, daemon=True)
+        self._thread.start()
+        print(f"📈 Raspagem dos exporters iniciada ({', '.join(self._active_targets)}, "
+              f"a cada {self.interval_seconds}s)")
+    
+    def stop(self) -> None:
+        """Para a raspagem (com uma última raspagem síncrona: incremento até o fim da célula)"""
+        if self._end_time:
+            return
+        self._end_time = datetime.now()
+        if not self._thread:
+            return
+        
+        self._stop_event.set()
+        self._thread.join(timeout=self.interval_seconds + self.timeout_seconds * len(self._active_targets) + 5.0)
+        self._thread = None
+        self._scrape(self._active_targets)
+        print(f"📈 Raspagem dos exporters finalizada ({sum(self.scrapes.values())} raspagens, "
+              f"{sum(self.errors.values())} erros)")
+    
+    @staticmethod
+    def _series_name(target: str, name: str, labels: str) -> str:
+        return f"{target}:{name}{labels}"
+    
+    def get_deltas(self) -> Dict[str, float]:
+        """Incremento de cada contador na célula ('alvo:métrica{labels}')"""
+        with self._lock:
+            return {
+                self._series_name(*key): series['increase']
+                for key, series in sorted(self._series.items())
+                if self._kind(key[1]) == "counter"
+            }
+    
+    def get_gauges(self) -> Dict[str, Dict[str, float]]:
+        """Média, máximo e último valor de cada gauge na célula"""
+        with self._lock:
+            return {
+                self._series_name(*key): {
+                    'avg': series['sum'] / series['count'],
+                    'max': series['max'],
+                    'last': series['last']
+                }
+                for key, series in sorted(self._series.items())
+                if self._kind(key[1]) != "counter"
+            }
+    
+    def attach(self, metrics: PerformanceMetrics) -> PerformanceMetrics:
+        """
+        Anexa os resultados da célula ao PerformanceMetrics
+        
+        Args:
+            metrics: Resultado da célula (run_pgbench)
+        
+        Returns:
+            O próprio metrics (exporter_deltas / exporter_gauges preenchidos)
+        """
+        metrics.exporter_deltas = self.get_deltas()
+        metrics.exporter_gauges = self.get_gauges()
+        return metrics
+    
+    @staticmethod
+    def summarize(metrics: PerformanceMetrics, metric_names: Optional[List[str]] = None) -> str:
+        """
+        Resumo textual dos incrementos (somados entre alvos e labels)
+        
+        Args:
+            metrics: Resultado com exporter_deltas
+            metric_names: Métricas exibidas (padrão: todas)
+        """
+        totals: Dict[str, float] = {}
+        for series, delta in metrics.exporter_deltas.items():
+            name = series.split(":", 1)[1].split("{", 1)[0]
+            if metric_names is None or name in metric_names:
+                totals[name] = totals.get(name, 0.0) + delta
+        
+        if not totals:
+            return "📈 Exporters: sem métricas na célula"
+        
+        lines = ["📈 Exporters (incremento na célula):"]
+        hit, read = totals.get("pg_stat_database_blks_hit"), totals.get("pg_stat_database_blks_read")
+        for name, total in sorted(totals.items()):
+            lines.append(f"   {name}: {total:,.0f}")
+        if hit is not None and read is not None and hit + read > 0:
+            lines.append(f"   buffer hit ratio: {hit / (hit + read) * 100:.2f}%")
+        return "\n".join(lines)
@@ -0,0 +1,183 @@
+"""
+Coletor de distribuição de carga entre os backends do PgPool
+"""
+from typing import Optional, Dict, Any
+
+from src.core.config import config
+from src.core.docker_manager import DockerManager
+from src.core.pgpool_manager import PgPoolManager
+from src.models.load_balance_metrics import LoadBalanceMetrics, BackendLoad
+from src.models.performance_metrics import PerformanceMetrics
+
+
+# Contadores de pg_stat_database somados entre todos os databases do backend
+PG_STAT_DATABASE_COUNTERS = [
+    "xact_commit", "xact_rollback",
+    "tup_returned", "tup_fetched", "tup_inserted", "tup_updated", "tup_deleted",
+]
+
+
+class LoadBalanceCollector:
+    """
+    Mede como o PgPool distribuiu as consultas entre os backends durante um teste
+    
+    Tira um snapshot de SHOW POOL_NODES (select_cnt, replication_delay) e de
+    pg_stat_database em cada backend antes e depois da célula de carga; a
+    diferença dá a carga efetivamente recebida por nó.
+    
+    Uso:
+        collector = LoadBalanceCollector(run_id)
+        collector.start()
+        metrics = performance_collector.run_pgbench(...)
+        lb_metrics = collector.stop("cluster_select_only_50clients", metrics)
+    """
+    
+    def __init__(self, run_id: str, pgpool: Optional[PgPoolManager] = None):
+        self.run_id = run_id
+        self.pgpool = pgpool or PgPoolManager()
+        self._before: Optional[Dict[str, Any]] = None
+    
+    def start(self) -> bool:
+        """
+        Registra o snapshot inicial
+        
+        Returns:
+            True se o snapshot foi obtido
+        """
+        self._before = self.snapshot()
+        return bool(self._before['nodes'])
+    
+    def stop(self, test_case: str, metrics: Optional[PerformanceMetrics] = None) -> LoadBalanceMetrics:
+        """
+        Registra o snapshot final e calcula a distribuição
+        
+        Args:
+            test_case: Nome do caso de teste
+            metrics: PerformanceMetrics da célula; recebe load_balancing_enabled,
+                     num_replicas e o resumo da distribuição
+        
+        Returns:
+            LoadBalanceMetrics com a carga por backend
+        """
+        after = self.snapshot()
+        before = self._before or {'nodes': {}, 'stats': {}}
+        self._before = None
+        
+        result = LoadBalanceMetrics(
+            run_id=self.run_id,
+            test_case=test_case,
+            scenario=metrics.scenario if metrics else "cluster",
+            workload_type=metrics.workload_type if metrics else None,
+            clients=metrics.clients if metrics else None,
+            load_balance_mode=after['load_balance_mode'],
+            disable_load_balance_on_write=after['disable_load_balance_on_write'],
+            tps_total=metrics.tps_total if metrics else None
+        )
+        
+        for hostname, node in after['nodes'].items():
+            previous = before['nodes'].get(hostname)
+            backend = BackendLoad(
+                node_id=node.node_id or 0,
+                hostname=hostname,
+                role=node.role,
+                status=node.status,
+                lb_weight=node.lb_weight,
+                select_cnt=max((node.select_cnt or 0) - ((previous.select_cnt or 0) if previous else 0), 0),
+                load_balance_node=node.load_balance_node,
+                replication_delay_before=previous.replication_delay if previous else None,
+                replication_delay_after=node.replication_delay
+            )
+            
+            stats_after = after['stats'].get(hostname)
+            stats_before = before['stats'].get(hostname)
+            if stats_after and stats_before:
+                for counter in PG_STAT_DATABASE_COUNTERS:
+                    setattr(backend, counter, max(stats_after[counter] - stats_before[counter], 0))
+            
+            result.backends.append(backend)
+        
+        result.backends.sort(key=lambda b: b.node_id)
+        result.num_backends = len(result.backends)
+        result.num_replicas = sum(1 for b in result.backends if b.role == 'standby')
+        result.calculate_distribution()
+        
+        if metrics:
+            metrics.load_balancing_enabled = bool(result.load_balance_mode)
+            metrics.num_replicas = result.num_replicas
+            metrics.select_share_by_node = {
+                b.hostname: round(b.select_share, 2) for b in result.backends if b.select_share is not None
+            }
+            metrics.select_imbalance = result.select_imbalance
+        
+        return result
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado atual do pool e dos contadores de cada backend
+        
+        Returns:
+            {'nodes': {hostname: PoolNode},
+             'stats': {hostname: contadores de pg_stat_database},
+             'load_balance_mode': bool, 'disable_load_balance_on_write': str}
+        """
+        nodes = {node.hostname: node for node in (self.pgpool.get_pool_nodes() or []) if node.hostname}
+        
+        stats = {}
+        for hostname in nodes:
+            backend_stats = self._backend_stats(hostname)
+            if backend_stats:
+                stats[hostname] = backend_stats
+        
+        load_balance_mode = self.pgpool.get_config_value("load_balance_mode")
+        
+        return {
+            'nodes': nodes,
+            'stats': stats,
+            'load_balance_mode': load_balance_mode == 'on' if load_balance_mode is not None else None,
+            'disable_load_balance_on_write': self.pgpool.get_config_value("disable_load_balance_on_write"),
+        }
+    
+    def _backend_stats(self, container_name: str) -> Optional[Dict[str, int]]:
+        """
+        Soma os contadores de pg_stat_database de um backend (psql no container)
+        
+        O backend_hostname do PgPool é o hostname do membro Patroni, que coincide
+        com o nome do container.
+        """
+        columns = ", ".join(f"coalesce(sum({c}), 0)::bigint" for c in PG_STAT_DATABASE_COUNTERS)
+        output = DockerManager.exec_command(
+            container_name,
+            ["psql", "-h", "localhost", "-U", config.postgres_user, "-d", config.postgres_db,
+             "-At", "-F", "|", "-c", f"SELECT {columns} FROM pg_stat_database"],
+            timeout=10,
+            exec_options=["-e", f"PGPASSWORD={config.postgres_password}"]
+        )
+        if not output:
+            return None
+        
+        values = output.strip().split('|')
+        if len(values) != len(PG_STAT_DATABASE_COUNTERS):
+            return None
+        
+        try:
+            return {counter: int(value) for counter, value in zip(PG_STAT_DATABASE_COUNTERS, values)}
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def summarize(result: LoadBalanceMetrics) -> str:
+        """Resumo legível da distribuição"""
+        lines = [f"\n⚖️  Distribuição de carga ({result.test_case})"]
+        lines.append(f"   load_balance_mode: {result.load_balance_mode} | "
+                     f"disable_load_balance_on_write: {result.disable_load_balance_on_write}")
+        lines.append(f"   {'nó':<24} {'role':<8} {'peso':>5} {'SELECTs':>10} {'share':>7} {'esperado':>9} {'commits':>10}")
+        for b in result.backends:
+            share = f"{b.select_share:.1f}%" if b.select_share is not None else "-"
+            expected = f"{b.expected_share:.1f}%" if b.expected_share is not None else "-"
+            commits = str(b.xact_commit) if b.xact_commit is not None else "-"
+            lines.append(f"   {b.hostname:<24} {b.role or '-':<8} {b.lb_weight or 0:>5.2f} "
+                         f"{b.select_cnt:>10} {share:>7} {expected:>9} {commits:>10}")
+        if result.select_imbalance is not None:
+            lines.append(f"   Desequilíbrio (maior/média): {result.select_imbalance:.2f} | "
+                         f"réplicas: {result.replica_select_share:.1f}% dos SELECTs")
+        return "\n".join(lines)
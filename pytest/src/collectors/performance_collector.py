@@ -2,17 +2,41 @@
 Coletor de métricas de Performance
 """
 import subprocess
+import os
 import re
-from typing import Optional, Dict, Any
-from src.models.performance_metrics import PerformanceMetrics, LoadTestSummary
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List
+from src.models.performance_metrics import PerformanceMetrics, LoadTestSummary, RateSearchResult
+from src.models.latency_histogram import LatencyHistogram
+from src.models.docker_stats_metrics import DockerStatsMetrics
+from src.analysis.stats import percentile_sorted
 from src.core.docker_manager import DockerManager
+from src.core.metrics_exporter import harness_metrics
+from src.collectors.exporter_scrape_collector import ExporterScrapeCollector
+
+
+# Métricas ao vivo (ver metrics_exporter): uma série por célula (test_case, scenario, container)
+_PGBENCH_TPS = harness_metrics.gauge("pgbench_tps", "TPS do último intervalo de progresso do pgbench (-P)")
+_PGBENCH_LATENCY = harness_metrics.gauge("pgbench_latency_avg_ms", "Latência média do último intervalo de progresso")
+_PGBENCH_ELAPSED = harness_metrics.gauge("pgbench_elapsed_seconds", "Tempo decorrido da execução do pgbench")
+_PGBENCH_FAILED = harness_metrics.gauge("pgbench_failed_transactions", "Transações falhas no último intervalo")
+_PGBENCH_RUNNING = harness_metrics.gauge("pgbench_running", "1 enquanto o pgbench da célula executa")
 
 
 class PerformanceCollector:
     """Coletor de métricas de performance usando pgbench"""
     
-    def __init__(self, run_id: str):
+    def __init__(self, run_id: str, exporter_scraper: Optional[ExporterScrapeCollector] = None):
+        """
+        Args:
+            run_id: ID da execução
+            exporter_scraper: Raspa os exporters durante cada célula e anexa os
+                  incrementos ao resultado (None = sem raspagem)
+        """
         self.run_id = run_id
+        self.exporter_scraper = exporter_scraper
     
     def run_pgbench(
         self,
@@ -29,7 +53,13 @@ class PerformanceCollector:
         duration: int = 60,
         workload: str = "select-only",
         reconnect: bool = False,
-        prepared: bool = False
+        prepared: bool = False,
+        rate: Optional[float] = None,
+        latency_limit: Optional[float] = None,
+        latency_log: bool = False,
+        latency_log_sampling: Optional[float] = None,
+        scripts: Optional[Dict[str, int]] = None,
+        scrape_exporters: bool = True
     ) -> PerformanceMetrics:
         """
         Executa teste de carga com pgbench
@@ -48,6 +78,19 @@ class PerformanceCollector:
             duration: Duração do teste em segundos
             workload: Tipo de carga ('select-only', 'simple-update', 'mixed')
             reconnect: Se True, usa flag -C (reconectar a cada transação)
+            prepared: Se True, usa -M prepared
+            rate: Taxa alvo em TPS (-R). Carga em malha aberta: a latência passa a
+                  ser medida a partir do horário agendado (sem coordinated omission)
+            latency_limit: Limite de latência em ms (--latency-limit). Com rate,
+                  transações que já nasceriam atrasadas são puladas (skipped)
+            latency_log: Se True, grava log por transação (-l) e calcula
+                  percentis de latência (p50/p95/p99)
+            latency_log_sampling: Fração de transações registradas no log (--sampling-rate)
+            scripts: Scripts pgbench customizados {caminho_local: peso}. São copiados
+                  para o container e passados como -f script@peso; substituem o
+                  workload embutido (workload vira apenas o rótulo da carga)
+            scrape_exporters: Se False, não usa o exporter_scraper nesta execução
+                  (ex: shards, raspados uma única vez por run_pgbench_sharded)
             
         Returns:
             PerformanceMetrics com resultados
@@ -60,7 +103,9 @@ class PerformanceCollector:
             threads=threads,
             duration_seconds=duration,
             workload_type=workload,
-            pgpool_enabled=(scenario == "cluster")
+            pgpool_enabled=(scenario == "cluster"),
+            target_rate=rate,
+            latency_limit_ms=latency_limit
         )
         
         # Monta comando pgbench interno
@@ -83,8 +128,26 @@ class PerformanceCollector:
         if prepared:
             pgbench_cmd.extend(["-M", "prepared"])
         
-        # Adiciona flag de workload
-        if workload == "select-only":
+        # Carga limitada por taxa (malha aberta)
+        if rate:
+            pgbench_cmd.extend(["-R", f"{rate:.2f}"])
+        if latency_limit:
+            pgbench_cmd.extend(["--latency-limit", f"{latency_limit:.3f}"])
+        
+        # Log por transação para percentis de latência
+        log_prefix = None
+        if latency_log:
+            log_prefix = f"/tmp/pgbench_{uuid.uuid4().hex[:8]}"
+            pgbench_cmd.extend(["-l", f"--log-prefix={log_prefix}"])
+            if latency_log_sampling and latency_log_sampling < 1.0:
+                pgbench_cmd.append(f"--sampling-rate={latency_log_sampling}")
+        
+        # Scripts customizados (mix ponderado) ou workload embutido
+        script_args = None
+        if scripts:
+            script_args = self._ship_scripts(container_name, scripts)
+            pgbench_cmd.extend(script_args or [])
+        elif workload == "select-only":
             pgbench_cmd.append("-S")
         elif workload == "simple-update":
             pgbench_cmd.append("-N")
@@ -95,10 +158,33 @@ class PerformanceCollector:
         # Executa pgbench usando DockerManager
         print(f"\n🔧 Executando pgbench: {' '.join(pgbench_cmd)}")
         
+        cell = {'test_case': test_case, 'scenario': scenario, 'container': container_name}
+        
+        def _on_progress(line: str):
+            sample = self._parse_progress_line(line)
+            if sample:
+                metrics.progress_samples.append(sample)
+                _PGBENCH_TPS.set(sample['tps'], **cell)
+                _PGBENCH_ELAPSED.set(sample['time_s'], **cell)
+                _PGBENCH_FAILED.set(sample.get('failed', 0), **cell)
+                if sample['latency_avg'] is not None:
+                    _PGBENCH_LATENCY.set(sample['latency_avg'], **cell)
+        
+        scraper = self.exporter_scraper if scrape_exporters else None
+        if scraper:
+            scraper.start(scenario)
+        
+        _PGBENCH_RUNNING.set(1, **cell)
         try:
-            result = DockerManager.exec_command(
+            # Falha na cópia dos scripts: execução falha, mas segue o caminho comum
+            # (calculate_metrics + valores padrão) como qualquer outro erro
+            if scripts and script_args is None:
+                raise RuntimeError("scripts pgbench não copiados para o container")
+            
+            result = DockerManager.exec_command_streaming(
                 container_name=container_name,
                 command=pgbench_cmd,
+                on_stderr_line=_on_progress,
                 exec_options=["-e", f"PGPASSWORD={password}"],
                 timeout=duration + 3600
             )
@@ -107,6 +193,9 @@ class PerformanceCollector:
                 metrics.pgbench_output = result
                 print(f"\n📊 Output do pgbench:\n{result}")
                 self._parse_pgbench_output(metrics, result)
+                
+                if log_prefix:
+                    self._collect_latency_log(metrics, container_name, log_prefix)
             else:
                 print(f"❌ Erro ao executar pgbench - comando retornou None")
                 print(f"   Verifique se o container '{container_name}' está rodando")
@@ -124,6 +213,12 @@ class PerformanceCollector:
             import traceback
             print(f"   Traceback:\n{traceback.format_exc()}")
         
+        finally:
+            _PGBENCH_RUNNING.set(0, **cell)
+            if scraper:
+                scraper.stop()
+                scraper.attach(metrics)
+        
         metrics.calculate_metrics()
         
         # Garante valores padrão para evitar None
@@ -231,6 +326,30 @@ class PerformanceCollector:
         if match:
             metrics.initial_connection_time = float(match.group(1))
         
+        # Transações puladas (com -R e --latency-limit)
+        # Ex: number of transactions skipped: 12 (0.120%)
+        match = re.search(r'number of transactions skipped: (\d+) \(([\d.]+)%\)', output)
+        if match:
+            metrics.transactions_skipped = int(match.group(1))
+            metrics.transactions_skipped_percent = float(match.group(2))
+        
+        # Transações acima do limite de latência
+        # Ex: number of transactions above the 50.0 ms latency limit: 12/1000 (1.200%)
+        match = re.search(
+            r'number of transactions above the [\d.]+ ms latency limit: (\d+)/\d+ \(([\d.]+)%\)',
+            output
+        )
+        if match:
+            metrics.transactions_late = int(match.group(1))
+            metrics.transactions_late_percent = float(match.group(2))
+        
+        # Atraso de agendamento (com -R)
+        # Ex: rate limit schedule lag: avg 0.350 (max 12.120) ms
+        match = re.search(r'rate limit schedule lag: avg ([\d.]+) \(max ([\d.]+)\) ms', output)
+        if match:
+            metrics.schedule_lag_avg = float(match.group(1))
+            metrics.schedule_lag_max = float(match.group(2))
+        
         # Total transactions
         # Ex: number of transactions actually processed: 1402337
         match = re.search(r'number of transactions actually processed: (\d+)', output)
@@ -250,6 +369,201 @@ class PerformanceCollector:
                 metrics.failed_transactions = int(match.group(1))
             else:
                 metrics.failed_transactions = 0
+        
+        # Detalhamento por script (só aparece com mais de um script ou -r)
+        metrics.script_stats = self._parse_script_stats(output)
+    
+    @staticmethod
+    def _parse_script_stats(output: str) -> List[Dict[str, Any]]:
+        """
+        Extrai as estatísticas por script do output do pgbench
+        
+        Ex:
+            SQL script 1: /tmp/pgbench_scripts/read_point.sql
+             - weight: 7 (targets 70.0% of total)
+             - 41952 transactions (70.1% of total, tps = 699.133410)
+             - number of failed transactions: 0 (0.000%)
+             - latency average = 1.234 ms
+             - latency stddev = 0.456 ms
+        
+        Args:
+            output: Output completo do pgbench
+            
+        Returns:
+            Lista de dicts, um por script
+        """
+        stats = []
+        blocks = re.split(r'^(?:SQL script|script) (\d+): (.+)$', output, flags=re.MULTILINE)
+        
+        # re.split com grupos: [prefixo, num, nome, corpo, num, nome, corpo, ...]
+        for i in range(1, len(blocks) - 2, 3):
+            body = blocks[i + 2]
+            entry: Dict[str, Any] = {
+                'script_no': int(blocks[i]),
+                'script': blocks[i + 1].strip()
+            }
+            
+            match = re.search(r'weight: (\d+) \(targets ([\d.]+)% of total\)', body)
+            if match:
+                entry['weight'] = int(match.group(1))
+                entry['weight_percent'] = float(match.group(2))
+            
+            match = re.search(r'(\d+) transactions \(([\d.]+)% of total, tps = ([\d.]+)\)', body)
+            if match:
+                entry['transactions'] = int(match.group(1))
+                entry['transactions_percent'] = float(match.group(2))
+                entry['tps'] = float(match.group(3))
+            
+            match = re.search(r'number of failed transactions: (\d+)', body)
+            if match:
+                entry['failed_transactions'] = int(match.group(1))
+            
+            match = re.search(r'latency average = ([\d.]+) ms', body)
+            if match:
+                entry['latency_avg'] = float(match.group(1))
+            
+            match = re.search(r'latency stddev = ([\d.]+) ms', body)
+            if match:
+                entry['latency_stddev'] = float(match.group(1))
+            
+            stats.append(entry)
+        
+        return stats
+    
+    def _ship_scripts(self, container_name: str, scripts: Dict[str, int]) -> Optional[List[str]]:
+        """
+        Copia scripts pgbench locais para o container e monta os argumentos -f
+        
+        Args:
+            container_name: Container do pgbench
+            scripts: {caminho_local: peso}
+            
+        Returns:
+            Lista de argumentos (ex: ['-f', '/tmp/pgbench_scripts/read.sql@7']) ou None se falhar
+        """
+        remote_dir = "/tmp/pgbench_scripts"
+        if DockerManager.exec_command(container_name, ["mkdir", "-p", remote_dir]) is None:
+            return None
+        
+        args = []
+        for local_path, weight in scripts.items():
+            if not os.path.isfile(local_path):
+                print(f"❌ Script pgbench não encontrado: {local_path}")
+                return None
+            
+            remote_path = f"{remote_dir}/{os.path.basename(local_path)}"
+            if not DockerManager.copy_to_container(local_path, container_name, remote_path):
+                return None
+            
+            args.extend(["-f", f"{remote_path}@{weight}"])
+        
+        return args
+    
+    def _collect_latency_log(self, metrics: PerformanceMetrics, container_name: str, log_prefix: str):
+        """
+        Lê os logs por transação do pgbench (-l), calcula percentis e remove os arquivos
+        
+        Formato de cada linha:
+            client_id transaction_no time script_no time_epoch time_us [schedule_lag] [retries]
+        onde time é a latência em microssegundos (ou 'skipped'/'failed').
+        
+        Args:
+            metrics: Objeto PerformanceMetrics a preencher
+            container_name: Container onde o pgbench executou
+            log_prefix: Prefixo dos arquivos de log
+        """
+        output = DockerManager.exec_command(
+            container_name=container_name,
+            command=["sh", "-c", f"cat {log_prefix}.* 2>/dev/null; rm -f {log_prefix}.*"],
+            timeout=600
+        )
+        if not output:
+            print(f"⚠️  Log de transações do pgbench vazio ou indisponível ({log_prefix}.*)")
+            return
+        
+        latencies = []
+        skipped = 0
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) < 6:
+                continue
+            try:
+                latencies.append(int(parts[2]) / 1000.0)  # us -> ms
+            except ValueError:
+                if parts[2] == "skipped":
+                    skipped += 1  # Pulada por --latency-limit: a cauda que não chegou a executar
+        
+        self._apply_latency_samples(metrics, latencies, skipped)
+    
+    @staticmethod
+    def _apply_latency_samples(metrics: PerformanceMetrics, latencies: List[float], skipped: int = 0):
+        """
+        Preenche min/max/percentis de latência a partir de amostras (ms)
+        
+        Ordena as amostras uma única vez. latency_p99_slo trata as transações
+        puladas como acima de qualquer latência registrada; as atrasadas (acima
+        do limite) já estão entre as amostras.
+        """
+        if not latencies:
+            return
+        
+        latencies.sort()
+        metrics.latency_sample_count = len(latencies)
+        metrics.latency_min = latencies[0]
+        metrics.latency_max = latencies[-1]
+        metrics.latency_p50 = percentile_sorted(latencies, 50)
+        metrics.latency_p95 = percentile_sorted(latencies, 95)
+        metrics.latency_p99 = percentile_sorted(latencies, 99)
+        
+        p99_slo = percentile_sorted(latencies, 99, total=len(latencies) + skipped)
+        metrics.latency_p99_slo = p99_slo if p99_slo != math.inf else None
+        
+        histogram = LatencyHistogram()
+        histogram.record_many(latencies)
+        metrics.latency_histogram = histogram.to_json()
+    
+    @staticmethod
+    def _parse_progress_line(line: str) -> Optional[Dict[str, float]]:
+        """
+        Parseia uma linha de progresso do pgbench (flag -P, emitida no stderr)
+        
+        Ex: progress: 5.0 s, 12345.6 tps, lat 0.810 ms stddev 0.250, 0 failed
+        Ex: progress: 10.0 s, 998.2 tps, lat 1.2 ms stddev 0.4, 0 failed, lag 0.015 ms, 3 skipped
+        
+        Args:
+            line: Linha do stderr
+            
+        Returns:
+            Dicionário com a amostra ou None se não for linha de progresso
+        """
+        match = re.search(
+            r'progress: ([\d.]+) s, ([\d.]+) tps, lat ([\d.]+|NaN) ms stddev ([\d.]+|NaN)',
+            line
+        )
+        if not match:
+            return None
+        
+        latency, stddev = match.group(3), match.group(4)
+        sample = {
+            'time_s': float(match.group(1)),
+            'tps': float(match.group(2)),
+            'latency_avg': float(latency) if latency != 'NaN' else None,
+            'latency_stddev': float(stddev) if stddev != 'NaN' else None,
+        }
+        
+        match = re.search(r', (\d+) failed', line)
+        if match:
+            sample['failed'] = int(match.group(1))
+        
+        match = re.search(r', lag ([\d.]+) ms', line)
+        if match:
+            sample['lag'] = float(match.group(1))
+        
+        match = re.search(r', (\d+) skipped', line)
+        if match:
+            sample['skipped'] = int(match.group(1))
+        
+        return sample
     
     def initialize_pgbench_database(
         self,
@@ -375,6 +689,425 @@ class PerformanceCollector:
             print(f"   Traceback completo:\n{traceback.format_exc()}")
             return False
     
+    def find_max_sustainable_rate(
+        self,
+        test_case: str,
+        scenario: str,
+        slo_p99_ms: float,
+        rate_low: Optional[float] = None,
+        rate_high: Optional[float] = None,
+        probe_duration: int = 60,
+        precision: float = 0.05,
+        max_probes: int = 8,
+        min_rate_attainment: float = 0.95,
+        max_skipped_percent: float = 1.0,
+        on_probe: Optional[Callable[[PerformanceMetrics], None]] = None,
+        **pgbench_kwargs
+    ) -> RateSearchResult:
+        """
+        Busca a maior taxa (TPS) sustentável com p99 de latência dentro do SLO
+        
+        Cada sonda roda o pgbench em malha aberta (-R) com --latency-limit igual
+        ao SLO e log por transação para o p99. A sonda em malha fechada amostra
+        o log com base no TPS de um aquecimento curto sem log (sem taxa alvo, o
+        log completo teria uma linha por transação). Uma taxa é sustentável quando:
+        - p99 <= SLO
+        - TPS atingido >= min_rate_attainment * taxa alvo
+        - transações puladas <= max_skipped_percent
+        
+        Args:
+            test_case: Nome do caso de teste (prefixo das sondas)
+            scenario: 'baseline' ou 'cluster'
+            slo_p99_ms: SLO de latência p99 em ms
+            rate_low: Limite inferior da busca (padrão: 10% do máximo em malha fechada)
+            rate_high: Limite superior (padrão: TPS máximo medido em malha fechada)
+            probe_duration: Duração de cada sonda em segundos
+            precision: Para quando (alto - baixo) / alto < precision
+            max_probes: Máximo de sondas da bisseção
+            min_rate_attainment: Fração mínima da taxa alvo que deve ser atingida
+            max_skipped_percent: Máximo de transações puladas (%)
+            on_probe: Callback chamado com as métricas de cada sonda
+            **pgbench_kwargs: Demais argumentos de run_pgbench (host, clients, workload...)
+            
+        Returns:
+            RateSearchResult com a capacidade encontrada e as sondas
+        """
+        pgbench_kwargs.pop("duration", None)
+        
+        result = RateSearchResult(
+            run_id=self.run_id,
+            test_case=test_case,
+            scenario=scenario,
+            workload_type=pgbench_kwargs.get("workload", "select-only"),
+            clients=pgbench_kwargs.get("clients", 10),
+            slo_p99_ms=slo_p99_ms
+        )
+        
+        def _probe(rate: Optional[float], expected_tps: Optional[float] = None) -> PerformanceMetrics:
+            label = f"{rate:.0f}tps" if rate else "closed_loop"
+            metrics = self.run_pgbench(
+                test_case=f"{test_case}_{label}",
+                scenario=scenario,
+                duration=probe_duration,
+                rate=rate,
+                latency_limit=slo_p99_ms if rate else None,
+                latency_log=True,
+                latency_log_sampling=self._log_sampling_for(rate or expected_tps, probe_duration),
+                **pgbench_kwargs
+            )
+            metrics.run_mode = "slo_probe"  # Fora das células da matriz (histórico, USL, relatório)
+            if on_probe:
+                on_probe(metrics)
+            return metrics
+        
+        # 1. Máximo em malha fechada (teto da busca)
+        if rate_high is None:
+            print(f"\n🔎 Medindo throughput máximo em malha fechada...")
+            # Aquecimento sem log: estima o TPS para a amostragem do log da sonda
+            warmup = self.run_pgbench(
+                test_case=f"{test_case}_closed_loop_warmup",
+                scenario=scenario,
+                duration=min(10, probe_duration),
+                **{**pgbench_kwargs, "scrape_exporters": False}
+            )
+            closed = _probe(None, expected_tps=warmup.tps_total)
+            result.closed_loop_tps = closed.tps_total
+            result.closed_loop_latency_p99 = closed.latency_p99
+            rate_high = closed.tps_total
+        
+        if not rate_high:
+            print("❌ Não foi possível determinar o teto da busca (TPS zerado)")
+            return result
+        
+        low = rate_low if rate_low is not None else rate_high * 0.1
+        high = rate_high
+        
+        # 2. Confirma que o limite inferior é sustentável
+        print(f"\n🔎 Verificando limite inferior: {low:.0f} TPS (SLO p99 <= {slo_p99_ms}ms)")
+        if not self._record_probe(result, low, _probe(low), min_rate_attainment, max_skipped_percent):
+            print(f"⚠️  Nem o limite inferior ({low:.0f} TPS) atende o SLO")
+            return result
+        result.max_sustainable_tps = low
+        
+        # 3. Bisseção entre low (sustentável) e high (não verificado/insustentável)
+        for _ in range(max_probes):
+            if (high - low) / high < precision:
+                result.converged = True
+                break
+            
+            rate = (low + high) / 2
+            print(f"\n🔎 Sonda: {rate:.0f} TPS (intervalo {low:.0f} - {high:.0f})")
+            if self._record_probe(result, rate, _probe(rate), min_rate_attainment, max_skipped_percent):
+                low = rate
+                result.max_sustainable_tps = rate
+            else:
+                high = rate
+        else:
+            result.converged = (high - low) / high < precision
+        
+        print(f"\n✅ Capacidade sustentável: {result.max_sustainable_tps:.0f} TPS "
+              f"(p99 <= {slo_p99_ms}ms, {len(result.probes)} sondas)")
+        return result
+    
+    @staticmethod
+    def _log_sampling_for(rate: Optional[float], duration: int, target_samples: int = 200000) -> Optional[float]:
+        """
+        Fração de amostragem do log por transação para limitar o volume lido
+        
+        rate é a taxa alvo (-R) ou, em malha fechada, o TPS estimado no
+        aquecimento; sem estimativa o log não é amostrado.
+        """
+        if not rate:
+            return None
+        expected = rate * duration
+        if expected <= target_samples:
+            return None
+        return max(target_samples / expected, 0.0001)
+    
+    @staticmethod
+    def _record_probe(
+        result: RateSearchResult,
+        rate: float,
+        metrics: PerformanceMetrics,
+        min_rate_attainment: float,
+        max_skipped_percent: float
+    ) -> bool:
+        """Registra uma sonda no resultado e retorna se a taxa é sustentável"""
+        attained = (metrics.tps_total or 0.0) >= rate * min_rate_attainment
+        # Puladas e atrasadas contam como violação (p99 só das concluídas seria otimista)
+        p99_ok = metrics.latency_p99_slo is not None and metrics.latency_p99_slo <= result.slo_p99_ms
+        skipped_ok = (metrics.transactions_skipped_percent or 0.0) <= max_skipped_percent
+        sustainable = attained and p99_ok and skipped_ok
+        
+        result.probes.append({
+            'target_rate': rate,
+            'tps': metrics.tps_total,
+            'latency_p99': metrics.latency_p99,
+            'latency_p99_slo': metrics.latency_p99_slo,
+            'latency_avg': metrics.latency_avg,
+            'schedule_lag_avg': metrics.schedule_lag_avg,
+            'skipped_percent': metrics.transactions_skipped_percent,
+            'late_percent': metrics.transactions_late_percent,
+            'sustainable': sustainable
+        })
+        
+        p99 = f"{metrics.latency_p99_slo:.2f}ms" if metrics.latency_p99_slo is not None else "n/a"
+        print(f"   TPS atingido: {metrics.tps_total or 0:.0f} | p99 (puladas = violação): {p99} | "
+              f"{'✅ sustentável' if sustainable else '❌ insustentável'}")
+        return sustainable
+    
+    def run_pgbench_sharded(
+        self,
+        test_case: str,
+        scenario: str,
+        containers: List[str],
+        clients: int = 10,
+        threads: int = 4,
+        latency_log: bool = True,
+        latency_log_sampling: Optional[float] = 0.1,
+        scrape_exporters: bool = True,
+        **pgbench_kwargs
+    ) -> PerformanceMetrics:
+        """
+        Executa o pgbench em vários processos/containers simultaneamente
+        
+        Os clientes são divididos entre os shards (um processo pgbench por
+        container da lista; repetir o nome roda vários processos no mesmo
+        container). Os resultados são consolidados em um único
+        PerformanceMetrics: TPS somado e percentis do histograma combinado.
+        O workload_type consolidado recebe o sufixo '-sharded' (ex:
+        'select-only-sharded'): célula própria no histórico, na regressão, no
+        relatório e na escalabilidade, sem misturar com a execução de um processo.
+        
+        Args:
+            test_case: Nome do caso de teste
+            scenario: 'baseline' ou 'cluster'
+            containers: Containers pgbench (um shard por item)
+            clients: Total de clientes (dividido entre os shards)
+            threads: Threads por shard (limitado ao nº de clientes do shard)
+            latency_log: Log por transação em cada shard (sem ele, não há percentis consolidados)
+            latency_log_sampling: Fração do log por transação usada nos percentis
+            scrape_exporters: Se False, não usa o exporter_scraper (uma raspagem para todos os shards)
+            **pgbench_kwargs: Demais argumentos de run_pgbench (host, duration, workload...)
+            
+        Returns:
+            PerformanceMetrics consolidado (detalhe por shard em metrics.shards)
+        """
+        shard_count = min(len(containers), clients)
+        base, extra = divmod(clients, shard_count)
+        shard_clients = [base + (1 if i < extra else 0) for i in range(shard_count)]
+        
+        print(f"\n🔀 Executando pgbench em {shard_count} shards: "
+              + ", ".join(f"{containers[i]}={n}" for i, n in enumerate(shard_clients)))
+        
+        def _run_shard(index: int) -> PerformanceMetrics:
+            return self.run_pgbench(
+                test_case=f"{test_case}_shard{index}",
+                scenario=scenario,
+                container_name=containers[index],
+                clients=shard_clients[index],
+                threads=min(threads, shard_clients[index]),
+                latency_log=latency_log,
+                latency_log_sampling=latency_log_sampling,
+                scrape_exporters=False,
+                **pgbench_kwargs
+            )
+        
+        scraper = self.exporter_scraper if scrape_exporters else None
+        if scraper:
+            scraper.start(scenario)
+        try:
+            with ThreadPoolExecutor(max_workers=shard_count) as executor:
+                shard_metrics = list(executor.map(_run_shard, range(shard_count)))
+        finally:
+            if scraper:
+                scraper.stop()
+        
+        metrics = self._merge_shards(test_case, scenario, shard_metrics, containers[:shard_count])
+        if scraper:
+            scraper.attach(metrics)
+        metrics.threads = sum(m.threads for m in shard_metrics)
+        
+        print(f"\n✅ Shards consolidados: {metrics.tps_total or 0:.2f} TPS "
+              f"({metrics.total_transactions or 0} transações)")
+        return metrics
+    
+    def _merge_shards(
+        self,
+        test_case: str,
+        scenario: str,
+        shards: List[PerformanceMetrics],
+        containers: Optional[List[str]] = None
+    ) -> PerformanceMetrics:
+        """
+        Consolida os resultados de shards executados em paralelo
+        
+        Args:
+            test_case: Nome do caso de teste consolidado
+            scenario: Cenário
+            shards: Métricas de cada shard
+            containers: Container de cada shard (mesma ordem de shards)
+            
+        Returns:
+            PerformanceMetrics consolidado
+        """
+        first = shards[0]
+        metrics = PerformanceMetrics(
+            run_id=self.run_id,
+            test_case=test_case,
+            scenario=scenario,
+            clients=sum(m.clients for m in shards),
+            threads=first.threads,
+            duration_seconds=first.duration_seconds,
+            workload_type=f"{first.workload_type}-sharded",  # Célula separada da execução não-shardada
+            pgpool_enabled=first.pgpool_enabled,
+            target_rate=sum(m.target_rate for m in shards) if all(m.target_rate for m in shards) else None,
+            latency_limit_ms=first.latency_limit_ms,
+            pgbench_version=first.pgbench_version,
+            transaction_type=first.transaction_type,
+            scaling_factor=first.scaling_factor,
+            query_mode=first.query_mode,
+            max_tries=first.max_tries,
+            shard_count=len(shards)
+        )
+        
+        for index, shard in enumerate(shards):
+            metrics.shards.append({
+                'shard': index,
+                'container': containers[index] if containers else None,
+                'test_case': shard.test_case,
+                'clients': shard.clients,
+                'threads': shard.threads,
+                'tps': shard.tps_total,
+                'total_transactions': shard.total_transactions,
+                'failed_transactions': shard.failed_transactions,
+                'latency_avg': shard.latency_avg,
+                'latency_p99': shard.latency_p99,
+                'initial_connection_time': shard.initial_connection_time,
+            })
+        
+        completed = [m for m in shards if m.tps_total is not None and m.total_transactions]
+        if len(completed) < len(shards):
+            print(f"⚠️  {len(shards) - len(completed)} shard(s) sem resultado - métricas consolidadas parciais")
+        if not completed:
+            return metrics
+        
+        # Vazão: soma (shards rodam ao mesmo tempo)
+        metrics.tps_total = sum(m.tps_total for m in completed)
+        if all(m.tps_excluding_connections is not None for m in completed):
+            metrics.tps_excluding_connections = sum(m.tps_excluding_connections for m in completed)
+        if all(m.tps_including_connections is not None for m in completed):
+            metrics.tps_including_connections = sum(m.tps_including_connections for m in completed)
+        metrics.total_transactions = sum(m.total_transactions for m in completed)
+        metrics.failed_transactions = sum(m.failed_transactions or 0 for m in completed)
+        for attr in ('transactions_skipped', 'transactions_late'):
+            values = [getattr(m, attr) for m in completed if getattr(m, attr) is not None]
+            if values:
+                setattr(metrics, attr, sum(values))
+        
+        # Latência média/desvio: combinação ponderada pelo nº de transações
+        weighted = [m for m in completed if m.latency_avg is not None]
+        total_weight = sum(m.total_transactions for m in weighted)
+        if weighted and total_weight:
+            mean = sum(m.latency_avg * m.total_transactions for m in weighted) / total_weight
+            metrics.latency_avg = mean
+            if all(m.latency_stddev is not None for m in weighted):
+                second_moment = sum(
+                    (m.latency_stddev ** 2 + m.latency_avg ** 2) * m.total_transactions for m in weighted
+                ) / total_weight
+                metrics.latency_stddev = math.sqrt(max(second_moment - mean ** 2, 0.0))
+        
+        connection_times = [m.initial_connection_time for m in completed if m.initial_connection_time is not None]
+        if connection_times:
+            metrics.initial_connection_time = max(connection_times)
+        
+        # Percentis: histogramas combinados
+        histograms = [m.latency_histogram for m in completed if m.latency_histogram]
+        if histograms:
+            merged = LatencyHistogram()
+            for data in histograms:
+                merged.merge(LatencyHistogram.from_json(data))
+            metrics.latency_histogram = merged.to_json()
+            metrics.latency_sample_count = merged.count
+            metrics.latency_min = merged.min
+            metrics.latency_max = merged.max
+            metrics.latency_p50 = merged.percentile(50)
+            metrics.latency_p95 = merged.percentile(95)
+            metrics.latency_p99 = merged.percentile(99)
+        
+        # Progresso: soma de TPS por instante, latência ponderada pelo TPS
+        by_time: Dict[float, List[Dict[str, float]]] = {}
+        for shard in completed:
+            for sample in shard.progress_samples:
+                by_time.setdefault(sample['time_s'], []).append(sample)
+        for time_s in sorted(by_time):
+            samples = by_time[time_s]
+            tps = sum(sample['tps'] for sample in samples)
+            latencies = [(sample['latency_avg'], sample['tps']) for sample in samples
+                         if sample.get('latency_avg') is not None]
+            weight = sum(w for _, w in latencies)
+            metrics.progress_samples.append({
+                'time_s': time_s,
+                'tps': tps,
+                'latency_avg': sum(lat * w for lat, w in latencies) / weight if weight else None,
+                'latency_stddev': None,
+                'failed': sum(sample.get('failed', 0) for sample in samples),
+                'shards': len(samples),
+            })
+        
+        metrics.pgbench_output = "\n".join(
+            f"=== {shard.test_case} ===\n{shard.pgbench_output or ''}" for shard in shards
+        )
+        
+        metrics.calculate_metrics()
+        return metrics
+    
+    def flag_client_saturation(
+        self,
+        metrics: PerformanceMetrics,
+        docker_metrics: DockerStatsMetrics,
+        client_containers: List[str],
+        threshold_percent: float = 90.0
+    ) -> bool:
+        """
+        Marca o teste se o(s) container(s) do pgbench saturaram a CPU
+        
+        O docker stats reporta CPU em % de um núcleo (400% = 4 núcleos); o uso é
+        normalizado pelo limite do container (deploy.resources.limits.cpus) ou,
+        sem limite, pelo número de CPUs do host. Com cliente saturado o TPS
+        medido é um limite do gerador de carga, não do banco.
+        
+        Args:
+            metrics: Métricas do teste a marcar
+            docker_metrics: Docker Stats coletado durante o teste
+            client_containers: Containers geradores de carga
+            threshold_percent: Uso médio (% do limite) a partir do qual é saturação
+            
+        Returns:
+            True se algum cliente saturou
+        """
+        averages, maximums = [], []
+        for container in client_containers:
+            stats = docker_metrics.containers.get(container)
+            if not stats:
+                continue
+            cores = DockerManager.get_cpu_limit(container) or os.cpu_count() or 1
+            averages.append(stats.cpu_percent_avg / cores)
+            maximums.append(stats.cpu_percent_max / cores)
+        
+        if not averages:
+            print(f"⚠️  Sem Docker Stats dos clientes {client_containers} - saturação não verificada")
+            return False
+        
+        metrics.client_cpu_percent_avg = max(averages)
+        metrics.client_cpu_percent_max = max(maximums)
+        metrics.client_cpu_saturated = metrics.client_cpu_percent_avg >= threshold_percent
+        
+        if metrics.client_cpu_saturated:
+            print(f"⚠️  CLIENTE SATURADO: CPU média {metrics.client_cpu_percent_avg:.1f}% do limite "
+                  f"(>= {threshold_percent:.0f}%) - TPS limitado pelo gerador de carga")
+        return metrics.client_cpu_saturated
+    
     def compare_scenarios(
         self,
         baseline: PerformanceMetrics,
@@ -0,0 +1,187 @@
+"""
+Coletor periódico do estado do PgPool-II durante testes de carga
+"""
+import time
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from ..core.pgpool_manager import PgPoolManager
+from ..models.pgpool_metrics import PgPoolSnapshot, PgPoolStatsMetrics
+
+
+class PgPoolStatsCollector:
+    """
+    Amostra SHOW POOL_PROCESSES / POOL_POOLS / POOL_CACHE em background.
+    
+    Registra ocupação dos processos filhos, uso dos slots do cache de conexões
+    e acertos do cache, para dimensionar num_init_children e max_pool.
+    Mesmo padrão do DockerStatsCollector: start() / stop() / get_metrics().
+    """
+    
+    def __init__(
+        self,
+        interval_seconds: float = 2.0,
+        pgpool: Optional[PgPoolManager] = None,
+        include_pools: bool = True
+    ):
+        """
+        Inicializa o coletor
+        
+        Args:
+            interval_seconds: Intervalo entre amostras em segundos
+            pgpool: PgPoolManager (padrão: container do .env)
+            include_pools: Se False, não amostra POOL_POOLS (mais leve)
+        """
+        self.interval_seconds = interval_seconds
+        self.pgpool = pgpool or PgPoolManager()
+        self.include_pools = include_pools
+        
+        self.samples: List[PgPoolSnapshot] = []
+        
+        # Configuração em execução (lida no start)
+        self.num_init_children: Optional[int] = None
+        self.max_pool: Optional[int] = None
+        
+        # Controle de coleta
+        self._collecting = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_time: Optional[datetime] = None
+        self._end_time: Optional[datetime] = None
+    
+    def start(self) -> None:
+        """Inicia a amostragem"""
+        if self._collecting:
+            return
+        
+        self.num_init_children = self._config_int("num_init_children")
+        self.max_pool = self._config_int("max_pool")
+        
+        self._collecting = True
+        self._start_time = datetime.now()
+        self._thread = threading.Thread(target=self._collect_loop, daemon=True)
+        self._thread.start()
+        print(f"📊 Amostragem do PgPool iniciada (num_init_children={self.num_init_children}, "
+              f"max_pool={self.max_pool})")
+    
+    def stop(self) -> None:
+        """Para a amostragem"""
+        if not self._collecting:
+            return
+        
+        self._collecting = False
+        self._end_time = datetime.now()
+        
+        if self._thread:
+            self._thread.join(timeout=self.interval_seconds + 15.0)
+        
+        print(f"📊 Amostragem do PgPool finalizada ({len(self.samples)} amostras)")
+    
+    def _config_int(self, parameter: str) -> Optional[int]:
+        """Lê um parâmetro inteiro da configuração em execução (PGPOOL SHOW)"""
+        value = self.pgpool.get_config_value(parameter)
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+    
+    def _collect_loop(self) -> None:
+        """Loop de coleta em background"""
+        while self._collecting:
+            snapshot = self.pgpool.get_pool_snapshot(include_pools=self.include_pools)
+            if snapshot:
+                self.samples.append(snapshot)
+            time.sleep(self.interval_seconds)
+    
+    def get_metrics(self, test_name: str) -> PgPoolStatsMetrics:
+        """
+        Calcula e retorna as métricas agregadas
+        
+        Args:
+            test_name: Nome do teste
+        
+        Returns:
+            Métricas agregadas
+        """
+        if not self._start_time or not self._end_time:
+            raise ValueError("Coleta não foi iniciada/finalizada corretamente")
+        
+        metrics = PgPoolStatsMetrics(
+            test_name=test_name,
+            start_time=self._start_time,
+            end_time=self._end_time,
+            num_init_children=self.num_init_children,
+            max_pool=self.max_pool,
+            sample_count=len(self.samples)
+        )
+        
+        if not self.samples:
+            return metrics
+        
+        with_client = [s.children_with_client for s in self.samples]
+        executing = [s.children_executing for s in self.samples]
+        slots_used = [s.pool_slots_used for s in self.samples]
+        
+        metrics.children_with_client_avg = sum(with_client) / len(with_client)
+        metrics.children_with_client_max = max(with_client)
+        metrics.children_executing_avg = sum(executing) / len(executing)
+        metrics.children_executing_max = max(executing)
+        
+        children = self.num_init_children or max(s.children_total for s in self.samples)
+        if children:
+            metrics.children_utilization_max = metrics.children_with_client_max / children * 100
+        
+        if self.include_pools:
+            metrics.pool_slots_used_avg = sum(slots_used) / len(slots_used)
+            metrics.pool_slots_used_max = max(slots_used)
+            if children and self.max_pool:
+                metrics.pool_slot_utilization_max = metrics.pool_slots_used_max / (children * self.max_pool) * 100
+            metrics.connection_reuse_ratio = self.samples[-1].connection_reuse_ratio()
+        
+        last_cache = self.samples[-1].cache
+        if last_cache:
+            metrics.query_cache_hit_ratio = last_cache.cache_hit_ratio
+        
+        peak = max(self.samples, key=lambda s: s.children_with_client)
+        metrics.process_status_at_peak = peak.process_status_counts()
+        
+        metrics.samples = [
+            {
+                'timestamp': s.timestamp.isoformat(),
+                'children_with_client': s.children_with_client,
+                'children_executing': s.children_executing,
+                'pool_slots_used': s.pool_slots_used if self.include_pools else None,
+            }
+            for s in self.samples
+        ]
+        
+        return metrics
+    
+    def reset(self) -> None:
+        """Reseta as amostras coletadas"""
+        self.samples.clear()
+        self._start_time = None
+        self._end_time = None
+    
+    @staticmethod
+    def summarize(metrics: PgPoolStatsMetrics) -> str:
+        """Resumo legível da ocupação do PgPool"""
+        def fmt(value, suffix=""):
+            return f"{value:.1f}{suffix}" if value is not None else "-"
+        
+        lines = [f"\n🧮 Ocupação do PgPool ({metrics.test_name}, {metrics.sample_count} amostras)"]
+        lines.append(f"   num_init_children: {metrics.num_init_children} | max_pool: {metrics.max_pool}")
+        lines.append(f"   Filhos com cliente: média {fmt(metrics.children_with_client_avg)} | "
+                     f"pico {metrics.children_with_client_max} ({fmt(metrics.children_utilization_max, '%')})")
+        lines.append(f"   Filhos executando:  média {fmt(metrics.children_executing_avg)} | "
+                     f"pico {metrics.children_executing_max}")
+        lines.append(f"   Slots de conexão:   média {fmt(metrics.pool_slots_used_avg)} | "
+                     f"pico {metrics.pool_slots_used_max} ({fmt(metrics.pool_slot_utilization_max, '%')})")
+        if metrics.connection_reuse_ratio is not None:
+            lines.append(f"   Reuso de conexões em cache: {metrics.connection_reuse_ratio * 100:.1f}%")
+        if metrics.query_cache_hit_ratio is not None:
+            lines.append(f"   Acertos do cache de consultas: {metrics.query_cache_hit_ratio * 100:.1f}%")
+        if metrics.process_status_at_peak:
+            status = ", ".join(f"{k}: {v}" for k, v in sorted(metrics.process_status_at_peak.items()))
+            lines.append(f"   Estados no pico: {status}")
+        return "\n".join(lines)
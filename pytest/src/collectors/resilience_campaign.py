@@ -0,0 +1,374 @@
+"""
+Campanha de resiliência: failover e switchover repetidos N vezes
+
+Uma única medição de RTO diz pouco sobre a cauda da distribuição. A campanha
+alterna os tipos de falha a cada iteração, espera o cluster reconvergir
+(ConvergenceWaiter: nó derrubado de volta como réplica, réplicas em streaming
+na timeline atual, backends UP no PgPool) antes de cada injeção e agrega
+RTO/RPO em p50/p95/max por tipo de falha, com o detalhamento por fase.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.collectors.rto_collector import RTOCollector
+from src.core.convergence import ConvergenceWaiter
+from src.core.docker_manager import DockerManager
+from src.core.patroni_manager import PatroniManager
+from src.core.pgpool_manager import PgPoolManager
+from src.core.postgres_manager import PostgresManager
+from src.models.campaign_metrics import (
+    CampaignIteration, CampaignMetrics, DistributionStats, FailureTypeSummary
+)
+
+
+FAILURE_TYPES = ("kill", "switchover")
+
+# Fases do RTO (RTOMetrics) agregadas no resumo
+RTO_PHASES = ("detection_time", "election_time", "restoration_time")
+
+
+class _AcknowledgedWriter:
+    """
+    Escritas contínuas via PgPool durante a iteração
+    
+    Guarda o ID e o instante de cada INSERT confirmado ao cliente: após o
+    failover, os IDs confirmados que não existem mais são a perda de dados.
+    """
+    
+    def __init__(self, postgres: PostgresManager, table: str, interval_s: float = 0.005):
+        self.postgres = postgres
+        self.table = table
+        self.interval_s = interval_s
+        self.acknowledged: List[Tuple[int, float]] = []
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        self.acknowledged.clear()
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=10)
+    
+    def _write_loop(self) -> None:
+        sequence = 0
+        while self._running:
+            sequence += 1
+            transaction_id = self.postgres.insert_test_data(self.table, f"campaign_{sequence}")
+            if transaction_id:
+                self.acknowledged.append((transaction_id, time.time()))
+            time.sleep(self.interval_s)
+
+
+class ResilienceCampaign:
+    """
+    Executa N iterações de cada tipo de falha e agrega as distribuições
+    
+    Uso:
+        campaign = ResilienceCampaign(run_id, iterations=10)
+        metrics = await campaign.run("failover_switchover")
+        print(ResilienceCampaign.summarize(metrics))
+    """
+    
+    def __init__(
+        self,
+        run_id: str,
+        iterations: int = 5,
+        failure_types: Sequence[str] = FAILURE_TYPES,
+        phase_timeout: float = 60.0,
+        convergence_timeout: float = 180.0,
+        measure_rpo: bool = True,
+        on_iteration: Optional[Callable[[CampaignIteration], None]] = None
+    ):
+        """
+        Args:
+            run_id: ID da execução
+            iterations: Iterações por tipo de falha
+            failure_types: Tipos de falha ('kill' e/ou 'switchover'), alternados a cada iteração
+            phase_timeout: Timeout de cada fase (detecção, eleição, serviço)
+            convergence_timeout: Timeout da reconvergência antes de cada iteração
+            measure_rpo: Mantém escritas contínuas para medir perda de dados
+            on_iteration: Callback após cada iteração (ex: salvar o resultado)
+        """
+        unknown = set(failure_types) - set(FAILURE_TYPES)
+        if unknown:
+            raise ValueError(f"Tipos de falha desconhecidos: {sorted(unknown)}")
+        
+        self.run_id = run_id
+        self.iterations = iterations
+        self.failure_types = list(failure_types)
+        self.phase_timeout = phase_timeout
+        self.convergence_timeout = convergence_timeout
+        self.measure_rpo = measure_rpo
+        self.on_iteration = on_iteration
+        
+        self.docker = DockerManager()
+        self.patroni = PatroniManager()
+        self.pgpool = PgPoolManager()
+        self.postgres = PostgresManager()
+        self.convergence = ConvergenceWaiter(self.patroni, self.pgpool)
+        self.table = "campaign_rpo"
+        
+        # Primário derrubado na última iteração (deve ser reintegrado antes da próxima)
+        self._previous_primary: Optional[str] = None
+        self._previous_injection_time: Optional[float] = None
+    
+    async def run(self, campaign: str = "failover_switchover") -> CampaignMetrics:
+        """
+        Executa a campanha
+        
+        Args:
+            campaign: Nome da campanha (para o resultado)
+        
+        Returns:
+            CampaignMetrics com as iterações e os resumos por tipo de falha
+        """
+        metrics = CampaignMetrics(
+            run_id=self.run_id,
+            campaign=campaign,
+            started_at=datetime.utcnow().isoformat(),
+            iterations_per_type=self.iterations
+        )
+        
+        try:
+            for iteration in range(1, self.iterations + 1):
+                for failure_type in self.failure_types:
+                    print(f"\n{'='*70}")
+                    print(f"CAMPANHA {campaign}: iteração {iteration}/{self.iterations} ({failure_type})")
+                    print("="*70)
+                    
+                    result = await self.run_iteration(iteration, failure_type)
+                    metrics.iterations.append(result)
+                    self._print_iteration(result)
+                    
+                    if self.on_iteration:
+                        self.on_iteration(result)
+            
+            # Deixa o cluster como foi encontrado
+            print("\n[Cleanup] 🔄 Reconvergindo cluster após a campanha...")
+            await self.wait_for_convergence()
+        finally:
+            if self.measure_rpo:
+                await asyncio.to_thread(self.postgres.drop_test_table, self.table)
+            self.pgpool.close()
+        
+        metrics.finished_at = datetime.utcnow().isoformat()
+        metrics.summaries = [
+            self.summarize_failure_type(failure_type, metrics.iterations)
+            for failure_type in self.failure_types
+        ]
+        return metrics
+    
+    async def run_iteration(self, iteration: int, failure_type: str) -> CampaignIteration:
+        """
+        Executa uma iteração: reconvergência, injeção e medição
+        
+        Falhas de uma iteração (timeouts) ficam registradas em `error`, sem
+        interromper a campanha.
+        """
+        result = CampaignIteration(
+            iteration=iteration,
+            failure_type=failure_type,
+            test_case=f"campaign_{failure_type}_{iteration:03d}"
+        )
+        
+        result.convergence_seconds = await self.wait_for_convergence()
+        if result.convergence_seconds is None:
+            result.error = "cluster não convergiu antes da iteração"
+            return result
+        
+        collector = RTOCollector(self.run_id)
+        writer = _AcknowledgedWriter(self.postgres, self.table) if self.measure_rpo else None
+        
+        try:
+            if failure_type == "switchover":
+                await collector.start_observation_switchover()
+            else:
+                await collector.start_observation()
+            
+            primary = await asyncio.to_thread(self.patroni.get_primary_node)
+            if not primary:
+                result.error = "primário não identificado"
+                return result
+            result.failed_node = primary
+            
+            if writer:
+                await asyncio.to_thread(self._prepare_table)
+                writer.start()
+                if not await self._wait_until(lambda: bool(writer.acknowledged), timeout=10):
+                    result.error = "nenhuma escrita confirmada antes da injeção"
+                    return result
+            
+            collector.start_measurement(result.test_case, primary, failure_type)
+            self._previous_primary = primary
+            self._previous_injection_time = collector.failure_injection_time
+            injected = await asyncio.to_thread(self._inject, failure_type, primary)
+            if not injected:
+                result.error = f"falha ao injetar {failure_type} em {primary}"
+                return result
+            
+            if failure_type == "kill":
+                if not await collector.wait_for_failure_detection(timeout=self.phase_timeout):
+                    result.error = "timeout na detecção da falha"
+                    return result
+            
+            new_primary = await collector.wait_for_new_primary(timeout=self.phase_timeout, old_primary=primary)
+            if not new_primary or new_primary == primary:
+                result.error = "timeout na eleição do novo primário"
+                return result
+            
+            if not await collector.wait_for_service_available(timeout=self.phase_timeout):
+                result.error = "timeout aguardando o serviço"
+                return result
+            
+            collector.finalize_metrics()
+        finally:
+            await collector.stop_observation()
+            if writer:
+                await asyncio.to_thread(writer.stop)
+        
+        rto = collector.get_metrics()
+        result.new_primary_node = rto.new_primary_node
+        result.total_rto = rto.total_rto
+        result.detection_time = rto.detection_time
+        result.election_time = rto.election_time
+        result.restoration_time = rto.restoration_time
+        result.downtime_by_layer = dict(rto.downtime_by_layer)
+        
+        if writer:
+            await asyncio.to_thread(self._measure_data_loss, result, writer, collector.failure_injection_time)
+        
+        return result
+    
+    def _inject(self, failure_type: str, primary: str) -> bool:
+        if failure_type == "kill":
+            return self.docker.kill_container(primary, signal="SIGKILL")
+        return self.patroni.switchover(force=True)
+    
+    def _prepare_table(self) -> None:
+        """Recria a tabela de escritas (IDs recomeçam a cada iteração)"""
+        self.postgres.drop_test_table(self.table)
+        self.postgres.create_test_table(self.table)
+    
+    def _measure_data_loss(self, result: CampaignIteration, writer: _AcknowledgedWriter,
+                           injection_time: Optional[float]) -> None:
+        """Compara os IDs confirmados ao cliente com os que existem no novo primário"""
+        acknowledged = dict(writer.acknowledged)
+        result.transactions_acknowledged = len(acknowledged)
+        if not acknowledged:
+            return
+        
+        rows = self.postgres.execute_query(
+            f"SELECT id FROM {self.table} WHERE id = ANY(%s)",
+            (list(acknowledged),)
+        )
+        if rows is None:
+            return  # Não foi possível verificar: perda desconhecida
+        
+        present = {row[0] for row in rows}
+        lost = [tx_id for tx_id in acknowledged if tx_id not in present]
+        result.transactions_lost = len(lost)
+        if lost and injection_time is not None:
+            result.rpo_seconds = round(injection_time - min(acknowledged[tx_id] for tx_id in lost), 6)
+        else:
+            result.rpo_seconds = 0.0
+    
+    async def _wait_until(self, condition: Callable[[], bool], timeout: float, interval: float = 0.05) -> bool:
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if condition():
+                return True
+            await asyncio.sleep(interval)
+        return condition()
+    
+    async def wait_for_convergence(self, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Religa nós parados e espera o cluster voltar ao estado estável
+        
+        O primário derrubado na iteração anterior precisa voltar como réplica
+        em streaming na timeline atual antes da próxima injeção.
+        
+        Returns:
+            Segundos até convergir ou None se timeout
+        """
+        status = await self.convergence.wait(
+            old_primary=self._previous_primary,
+            timeout=timeout or self.convergence_timeout,
+            since=self._previous_injection_time
+        )
+        if not status.converged:
+            return None
+        
+        self._previous_primary = None
+        self._previous_injection_time = None
+        return status.elapsed_seconds
+    
+    @staticmethod
+    def summarize_failure_type(failure_type: str, iterations: List[CampaignIteration]) -> FailureTypeSummary:
+        """Distribuições de RTO, fases, camadas e RPO das iterações bem-sucedidas de um tipo"""
+        of_type = [i for i in iterations if i.failure_type == failure_type]
+        completed = [i for i in of_type if i.error is None]
+        
+        layers: Dict[str, List[float]] = {}
+        for iteration in completed:
+            for layer, seconds in iteration.downtime_by_layer.items():
+                layers.setdefault(layer, []).append(seconds)
+        
+        return FailureTypeSummary(
+            failure_type=failure_type,
+            iterations=len(of_type),
+            failed_iterations=len(of_type) - len(completed),
+            rto=DistributionStats.from_values([i.total_rto for i in completed]),
+            phases={
+                phase: DistributionStats.from_values([getattr(i, phase) for i in completed])
+                for phase in RTO_PHASES
+            },
+            layers={layer: DistributionStats.from_values(values) for layer, values in layers.items()},
+            transactions_lost=DistributionStats.from_values([i.transactions_lost for i in completed]),
+            rpo_seconds=DistributionStats.from_values([i.rpo_seconds for i in completed]),
+            iterations_with_data_loss=sum(1 for i in completed if i.transactions_lost)
+        )
+    
+    @staticmethod
+    def _print_iteration(result: CampaignIteration) -> None:
+        if result.error:
+            print(f"  ❌ Iteração abortada: {result.error}")
+            return
+        rto = f"{result.total_rto:.3f}s" if result.total_rto is not None else "-"
+        lost = result.transactions_lost if result.transactions_lost is not None else "-"
+        print(f"  ✓ {result.failed_node} → {result.new_primary_node} | RTO {rto} | "
+              f"TXs perdidas {lost}/{result.transactions_acknowledged}")
+    
+    @staticmethod
+    def summarize(metrics: CampaignMetrics) -> str:
+        """Resumo legível das distribuições por tipo de falha"""
+        def fmt(value):
+            return f"{value:8.3f}" if value is not None else f"{'-':>8}"
+        
+        def row(label: str, stats: DistributionStats) -> str:
+            return (f"   {label:<26} {stats.count:>3} {fmt(stats.p50)} {fmt(stats.p95)} "
+                    f"{fmt(stats.max)} {fmt(stats.stdev)}")
+        
+        lines = [f"\n{'='*70}", f"CAMPANHA {metrics.campaign} ({metrics.iterations_per_type} iterações por tipo)", "="*70]
+        for summary in metrics.summaries:
+            lines.append(f"\n🎯 {summary.failure_type}: {summary.iterations - summary.failed_iterations}/"
+                         f"{summary.iterations} iterações concluídas")
+            lines.append(f"   {'métrica':<26} {'n':>3} {'p50':>8} {'p95':>8} {'max':>8} {'desvio':>8}")
+            lines.append(row("RTO total (s)", summary.rto))
+            for phase, stats in summary.phases.items():
+                lines.append(row(f"  {phase} (s)", stats))
+            for layer, stats in summary.layers.items():
+                lines.append(row(f"  camada {layer} (s)", stats))
+            lines.append(row("TXs perdidas", summary.transactions_lost))
+            lines.append(row("RPO (s)", summary.rpo_seconds))
+            if summary.iterations_with_data_loss:
+                lines.append(f"   ⚠️  Perda de dados em {summary.iterations_with_data_loss} iterações")
+        lines.append("="*70)
+        return "\n".join(lines)
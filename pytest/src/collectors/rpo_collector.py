@@ -25,7 +25,7 @@ class RPOCollector:
     def __init__(self, run_id: str):
         self.run_id = run_id
         self.metrics = None
-        self.observer = ClusterObserver(poll_interval=0.1)  # 100ms
+        self.observer = ClusterObserver(poll_interval=0.5, burst_interval=0.01)  # 500ms estável, 10ms em rajada
         self.patroni = PatroniManager()
         self.postgres = PostgresManager()
         self.test_table = "rpo_test"
@@ -54,6 +54,7 @@ class RPOCollector:
         """
         timestamp = datetime.utcnow().isoformat()
         self._failure_injection_time = time.time()
+        self.observer.burst()  # Polling em rajada durante os segundos críticos
         
         self.metrics = RPOMetrics(
             run_id=self.run_id,
@@ -87,6 +88,7 @@ class RPOCollector:
     
     def mark_failure_occurred(self):
         """Marca o momento da falha"""
+        self.observer.burst()
         if self.metrics:
             self.metrics.failure_occurred_at = datetime.utcnow().isoformat()
     
@@ -102,7 +104,9 @@ class RPOCollector:
         print(f"  ⏱️  Aguardando novo primário (timeout: {timeout}s)...")
         
         start = time.time()
-        event = await self.observer.wait_for_event("new_primary", timeout=timeout)
+        event = await self.observer.wait_for_event(
+            "new_primary", timeout=timeout, since=self._failure_injection_time
+        )
         
         if event:
             new_primary = event.node
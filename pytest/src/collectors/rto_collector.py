@@ -24,7 +24,7 @@ class RTOCollector:
     def __init__(self, run_id: str):
         self.run_id = run_id
         self.metrics = None
-        self.observer = ClusterObserver(poll_interval=0.1)  # 100ms
+        self.observer = ClusterObserver(poll_interval=0.5, burst_interval=0.01)  # 500ms estável, 10ms em rajada
         self.postgres = PostgresManager()
         self._observation_started = False
         self._failure_injection_time = None
@@ -51,6 +51,11 @@ class RTOCollector:
             await self.observer.stop_observing()
             self._observation_started = False
     
+    @property
+    def failure_injection_time(self) -> Optional[float]:
+        """Epoch da injeção da falha (referência para outras linhas do tempo)"""
+        return self._failure_injection_time
+    
     def start_measurement(self, test_case: str, failed_node: str, 
                          failure_type: str = "stop") -> RTOMetrics:
         """
@@ -58,8 +63,9 @@ class RTOCollector:
         
         IMPORTANTE: Chame start_observation() ANTES de chamar este método
         """
-        timestamp = datetime.utcnow().isoformat()
         self._failure_injection_time = time.time()
+        timestamp = datetime.utcfromtimestamp(self._failure_injection_time).isoformat()
+        self.observer.burst()  # Polling em rajada durante os segundos críticos
         
         self.metrics = RTOMetrics(
             run_id=self.run_id,
@@ -81,11 +87,14 @@ class RTOCollector:
         """
         print(f"  ⏱️  Aguardando detecção (timeout: {timeout}s)...")
         
-        event = await self.observer.wait_for_event("failure_detected", timeout=timeout)
+        event = await self.observer.wait_for_event(
+            "failure_detected", timeout=timeout, since=self._failure_injection_time
+        )
         
         if event:
             if self.metrics:
-                self.metrics.failure_detected_at = datetime.fromtimestamp(event.timestamp).isoformat()
+                self.metrics.failure_detected_at = datetime.utcfromtimestamp(event.timestamp).isoformat()
+                self._record_bounds('failure_detected', event)
             
             detection_time = event.timestamp - self._failure_injection_time
             print(f"  ✓ Falha detectada em {detection_time:.3f}s")
@@ -106,7 +115,9 @@ class RTOCollector:
         print(f"  ⏱️  Aguardando novo primário (timeout: {timeout}s)...")
         
         start = time.time()
-        event = await self.observer.wait_for_event("new_primary", timeout=timeout)
+        event = await self.observer.wait_for_event(
+            "new_primary", timeout=timeout, since=self._failure_injection_time
+        )
         
         if event:
             new_primary = event.node
@@ -122,8 +133,9 @@ class RTOCollector:
                         new_primary = event.node
             
             if self.metrics:
-                self.metrics.new_primary_elected_at = datetime.fromtimestamp(event.timestamp).isoformat()
+                self.metrics.new_primary_elected_at = datetime.utcfromtimestamp(event.timestamp).isoformat()
                 self.metrics.new_primary_node = new_primary
+                self._record_bounds('new_primary', event)
             
             election_time = event.timestamp - self._failure_injection_time
             print(f"  ✓ Novo primário eleito: {new_primary} ({election_time:.3f}s)")
@@ -143,11 +155,14 @@ class RTOCollector:
         """
         print(f"  ⏱️  Aguardando serviço disponível (timeout: {timeout}s)...")
         
-        event = await self.observer.wait_for_event("service_restored", timeout=timeout)
+        event = await self.observer.wait_for_event(
+            "service_restored", timeout=timeout, since=self._failure_injection_time
+        )
         if event:
             if self.metrics:
-                self.metrics.service_restored_at = datetime.utcnow().isoformat()
-            print(f"  ✓ Serviço disponível")
+                self.metrics.service_restored_at = datetime.utcfromtimestamp(event.timestamp).isoformat()
+                self._record_bounds('service_restored', event)
+            print(f"  ✓ Serviço disponível (±{event.uncertainty / 2 * 1000:.0f}ms)")
             return True
         
         print(f"  ⚠️  Timeout aguardando serviço")
@@ -156,8 +171,49 @@ class RTOCollector:
     def finalize_metrics(self):
         """Calcula métricas finais"""
         if self.metrics:
+            self._apply_pgpool_timeline()
             self.metrics.calculate_metrics()
     
+    def _apply_pgpool_timeline(self):
+        """
+        Preenche os timestamps da camada PgPool
+        
+        Status dos backends vem da observação (PCP); início/fim dos hooks de
+        failover/follow_primary vem do log do container PgPool.
+        """
+        since = self._failure_injection_time
+        if since is None:
+            return
+        
+        self.observer.collect_pgpool_log_events(since=since - 1.0)
+        
+        fields = {
+            'pgpool_backend_down': 'pgpool_backend_down_at',
+            'pgpool_primary_switched': 'pgpool_primary_switched_at',
+            'pgpool_failover_started': 'pgpool_failover_started_at',
+            'pgpool_failover_finished': 'pgpool_failover_finished_at',
+            'pgpool_follow_primary_started': 'pgpool_follow_primary_started_at',
+            'pgpool_follow_primary_finished': 'pgpool_follow_primary_finished_at',
+        }
+        for event_type, attribute in fields.items():
+            event = self.observer.get_event(event_type, since=since - 1.0)
+            if event:
+                # UTC, como failure_injected_at
+                setattr(self.metrics, attribute, datetime.utcfromtimestamp(event.timestamp).isoformat())
+                self._record_bounds(event_type, event)
+    
+    def _record_bounds(self, name: str, event):
+        """
+        Registra o intervalo [lower, upper] do evento, em segundos desde a injeção
+        
+        O evento é consequência da injeção: o limite inferior não fica antes dela.
+        """
+        if self._failure_injection_time is None:
+            return
+        lower = max(event.lower_bound - self._failure_injection_time, 0.0)
+        upper = max(event.upper_bound - self._failure_injection_time, lower)
+        self.metrics.event_bounds[name] = [round(lower, 6), round(upper, 6)]
+    
     def get_metrics(self) -> Optional[RTOMetrics]:
         """Retorna as métricas coletadas"""
         return self.metrics
@@ -176,7 +232,8 @@ class RTOCollector:
         
         for i, event in enumerate(events, 1):
             elapsed = event.timestamp - self._failure_injection_time if self._failure_injection_time else 0
-            summary.append(f"{i}. [{elapsed:6.3f}s] {event.event_type:20s} | {event.node}")
+            source = " (log)" if isinstance(event.data, dict) and event.data.get('source') == 'log' else ""
+            summary.append(f"{i}. [{elapsed:6.3f}s] {event.event_type:20s} | {event.node}{source}")
         
         summary.append("="*60)
         return "\n".join(summary)
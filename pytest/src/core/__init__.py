@@ -6,7 +6,10 @@ from .docker_manager import DockerManager
 from .patroni_manager import PatroniManager
 from .postgres_manager import PostgresManager
 from .pgpool_manager import PgPoolManager
+from .pcp_client import PCPClient, PCPError, PCPConnectionError
+from .convergence import ConvergenceWaiter, ConvergenceStatus
 from .json_manager import JSONLWriter, JSONLReader
+from .metrics_exporter import MetricsExporter, MetricsRegistry, harness_metrics
 
 __all__ = [
     'config',
@@ -15,6 +18,14 @@ __all__ = [
     'PatroniManager',
     'PostgresManager',
     'PgPoolManager',
+    'PCPClient',
+    'PCPError',
+    'PCPConnectionError',
+    'ConvergenceWaiter',
+    'ConvergenceStatus',
     'JSONLWriter',
-    'JSONLReader'
+    'JSONLReader',
+    'MetricsExporter',
+    'MetricsRegistry',
+    'harness_metrics'
 ]
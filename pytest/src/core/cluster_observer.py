@@ -6,23 +6,62 @@ Elimina a necessidade de sleeps e polling manual.
 """
 import asyncio
 import json
+import threading
 import time
 from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime
 from .docker_manager import DockerManager
 from .patroni_manager import PatroniManager
 from .postgres_manager import PostgresManager
+from .pgpool_manager import PgPoolManager
+from .log_tailer import ContainerLogTailer
+from .event_store import EventStore
+from .cluster_state import (
+    ClusterStateMachine, ClusterSnapshot, StateTransition,
+    HEALTHY, LEADERLESS, ELECTING, NEW_LEADER, SERVICE_RESTORED, CONVERGED, STATE_ORDER
+)
 from .config import config
+from .metrics_exporter import harness_metrics
+
+
+# Métricas ao vivo (ver metrics_exporter)
+_EVENTS = harness_metrics.counter("observer_events", "Eventos emitidos pelo ClusterObserver")
+_STATE = harness_metrics.gauge("observer_state", "Estado do ciclo (índice em healthy..converged)")
+_POLL_INTERVAL = harness_metrics.gauge("observer_poll_interval_seconds", "Intervalo atual de polling do ClusterObserver")
+_EVENT_UNCERTAINTY = harness_metrics.gauge(
+    "observer_event_uncertainty_seconds", "Largura do intervalo [lower, upper] do último evento de cada tipo"
+)
 
 
 class ClusterEvent:
-    """Representa um evento detectado no cluster"""
+    """
+    Representa um evento detectado no cluster
     
-    def __init__(self, event_type: str, node: str, timestamp: float, data: Any = None):
+    Eventos vistos por polling ocorreram entre lower_bound (último snapshot com
+    o estado antigo) e upper_bound (primeiro com o novo, igual a timestamp).
+    Eventos de log têm o timestamp registrado e intervalo nulo.
+    """
+    
+    def __init__(
+        self,
+        event_type: str,
+        node: str,
+        timestamp: float,
+        data: Any = None,
+        lower_bound: Optional[float] = None,
+        upper_bound: Optional[float] = None
+    ):
         self.event_type = event_type
         self.node = node
         self.timestamp = timestamp
         self.data = data
+        self.lower_bound = lower_bound if lower_bound is not None else timestamp
+        self.upper_bound = upper_bound if upper_bound is not None else timestamp
+    
+    @property
+    def uncertainty(self) -> float:
+        """Largura do intervalo em que o evento ocorreu (s)"""
+        return self.upper_bound - self.lower_bound
     
     def __repr__(self):
         return f"ClusterEvent({self.event_type}, {self.node}, {self.timestamp:.3f}s)"
@@ -37,22 +76,56 @@ class ClusterObserver:
     - Mudanças de role (replica -> leader)
     - Eleições de novo primário
     - Restauração de serviço
+    - Visão do PgPool: status dos backends e hooks de failover/follow_primary
+    - Transições registradas nos logs dos containers (timestamp do próprio log)
+    
+    As transições do ciclo de falha (healthy → leaderless → electing →
+    new_leader → service_restored → converged) vêm de uma ClusterStateMachine
+    alimentada por um único snapshot por polling; reset_cycle() permite medir
+    vários failovers com o mesmo observador.
+    
+    Cadência adaptativa: poll_interval com o cluster estável, burst_interval
+    por no máximo burst_window após burst() (injeção de falha) ou uma
+    transição até NEW_LEADER, e backoff exponencial até max_interval depois
+    de convergido. Um ciclo parado (ex: em SERVICE_RESTORED) volta a
+    poll_interval em vez de manter a rajada.
     """
     
-    def __init__(self, nodes: Optional[List[str]] = None, poll_interval: float = 0.5):
+    def __init__(
+        self,
+        nodes: Optional[List[str]] = None,
+        poll_interval: float = 0.5,
+        tail_logs: bool = True,
+        max_events: int = 50_000,
+        burst_interval: float = 0.01,
+        burst_window: float = 5.0,
+        max_interval: float = 5.0,
+        backoff_factor: float = 2.0
+    ):
         """
         Args:
             nodes: Lista de nós Patroni para monitorar (None = todos do config)
-            poll_interval: Intervalo de polling em segundos (padrão: 100ms)
+            poll_interval: Intervalo de polling com o cluster estável, em segundos
+            tail_logs: Segue os logs de config.all_containers e mescla os eventos extraídos
+            max_events: Retenção máxima de eventos (observações longas)
+            burst_interval: Intervalo em rajada (após burst() ou mudança de estado)
+            burst_window: Duração máxima da rajada em segundos
+            max_interval: Teto do backoff depois que o cluster convergiu
+            backoff_factor: Multiplicador do intervalo a cada polling convergido
         """
         self.nodes = nodes or config.patroni_nodes
         self.poll_interval = poll_interval
+        self.burst_interval = burst_interval
+        self.burst_window = burst_window
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
         self.docker = DockerManager()
         self.patroni = PatroniManager()
         self.postgres = PostgresManager()
+        self.pgpool = PgPoolManager()
         
-        # Eventos detectados
-        self.events: List[ClusterEvent] = []
+        # Eventos detectados (indexados por tipo, em ordem de timestamp)
+        self.events = EventStore(max_events=max_events)
         
         # Controle de observação
         self._observing = False
@@ -61,12 +134,28 @@ class ClusterObserver:
         # Callbacks para eventos específicos
         self._event_callbacks: Dict[str, List[Callable]] = {}
         
-        self.old_primary: Optional[str] = None
-        self.new_primary: Optional[str] = None
-        
-        self.cluster_failed: bool = False
-        self.cluster_restored: bool = False
-        self.cluster_switchover: bool = False
+        # Eventos dos logs chegam pelas threads do tailer e são repassados ao loop
+        # (sem loop: ficam pendentes até o próximo _drain_log_events na thread do loop)
+        self.log_tailer = ContainerLogTailer(on_event=self._on_log_event) if tail_logs else None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_log_events: List[ClusterEvent] = []
+        self._pending_lock = threading.Lock()
+        
+        # Estado do ciclo de falha, alimentado por um snapshot por polling
+        self.state_machine = ClusterStateMachine(expected_members=len(self.nodes))
+        self.last_snapshot: Optional[ClusterSnapshot] = None
+        self.snapshots_taken = 0
+        
+        # Visão anterior do PgPool (para detectar mudanças de status/role)
+        self._pgpool_previous: Dict[str, Any] = {}
+        self._pgpool_previous_at: Optional[float] = None
+        self._pgpool_primary_switched = False
+        
+        # Cadência adaptativa
+        self.current_interval = poll_interval
+        self._burst_until = 0.0
+        self._converged_polls = 0
+        self._wake: Optional[asyncio.Event] = None
     
     def on_event(self, event_type: str, callback: Callable):
         """
@@ -80,60 +169,180 @@ class ClusterObserver:
             self._event_callbacks[event_type] = []
         self._event_callbacks[event_type].append(callback)
     
-    def _emit_event(self, event: ClusterEvent):
-        """Emite evento e chama callbacks registrados"""
-        self.events.append(event)
+    def _emit_event(self, event: ClusterEvent) -> bool:
+        """
+        Emite evento e chama callbacks registrados
         
+        Returns:
+            False se o evento era repetido (descartado pelo EventStore)
+        """
+        if not self.events.add(event):
+            return False
+        _EVENTS.inc(event_type=event.event_type, node=event.node)
+        _EVENT_UNCERTAINTY.set(event.uncertainty, event_type=event.event_type)
+        self._run_callbacks(event)
+        return True
+    
+    def _run_callbacks(self, event: ClusterEvent):
+        """Chama os callbacks registrados para o tipo do evento"""
         if event.event_type in self._event_callbacks:
             for callback in self._event_callbacks[event.event_type]:
                 try:
                     callback(event)
                 except Exception as e:
                     print(f"⚠️  Erro em callback: {e}")
+    
+    def _on_log_event(self, event: ClusterEvent):
+        """
+        Recebe um evento do tailer (thread de leitura) e o entrega ao loop asyncio
+        
+        O EventStore não é thread-safe: o evento nunca é inserido nesta thread.
+        Sem loop utilizável, fica pendente até o próximo _drain_log_events().
+        """
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._merge_event, event)
+                return
+            except RuntimeError:
+                pass  # Loop fechado entre a checagem e a chamada
+        with self._pending_lock:
+            self._pending_log_events.append(event)
+    
+    def _drain_log_events(self):
+        """Insere os eventos do tailer que chegaram sem loop (chamar na thread do loop)"""
+        with self._pending_lock:
+            pending, self._pending_log_events = self._pending_log_events, []
+        for event in pending:
+            self._merge_event(event)
+    
+    def _merge_event(self, event: ClusterEvent):
+        """
+        Insere um evento na linha do tempo em ordem de timestamp
+        
+        Linhas de log chegam com atraso em relação ao que registram: o evento
+        entra na posição do timestamp logado, não no fim da lista.
+        """
+        self._emit_event(event)
       
     async def start_observing(self):
-        """Inicia observação assíncrona rotacionando entre os nós"""
+        """Inicia a observação: um único loop de snapshots alimenta a máquina de estados"""
         if self._observing:
             return
         
-        print(f"🔍 Iniciando observação de {len(self.nodes)} nós (poll: {self.poll_interval*1000:.0f}ms)")
+        print(f"🔍 Iniciando observação de {len(self.nodes)} nós "
+              f"(poll: {self.poll_interval*1000:.0f}ms, rajada: {self.burst_interval*1000:.0f}ms)")
         
         self._observing = True
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
         self.events.clear()
+        with self._pending_lock:
+            self._pending_log_events.clear()
+        self._pgpool_previous.clear()
+        self._pgpool_previous_at = None
+        self.reset_cycle(old_primary=await asyncio.to_thread(self.patroni.get_primary_node))
         
-        self.old_primary = self.patroni.get_primary_node()
-        
-        task_1 = asyncio.create_task(self._detect_cluster_failure())
-        self._tasks.append(task_1)
-        
-        task_2 = asyncio.create_task(self._detect_new_primary())
-        self._tasks.append(task_2)
+        self._tasks.append(asyncio.create_task(self._poll_cluster()))
         
-        task_3 = asyncio.create_task(self._detect_service_restoration())
-        self._tasks.append(task_3)
+        self._start_log_tailer()
         
         await asyncio.sleep(0.5)  # Pequeno delay para estabilizar
 
     async def start_observing_switchover(self):
-        """Inicia observação assíncrona rotacionando entre os nós"""
-        if self._observing:
-            return
+        """
+        Inicia observação para switchover controlado
         
-        print(f"🔍 Iniciando observação de {len(self.nodes)} nós (poll: {self.poll_interval*1000:.0f}ms)")
+        Mesma máquina de estados do failover: no switchover a liderança muda
+        sem perda de quorum (healthy → new_leader).
+        """
+        await self.start_observing()
+
+    def reset_cycle(self, old_primary: Optional[str] = None):
+        """
+        Prepara a medição de um novo ciclo de falha sem parar a observação
         
-        self._observing = True
-        self.events.clear()
+        Args:
+            old_primary: Primário atual (None: líder do último snapshot)
+        """
+        if old_primary is None and self.last_snapshot:
+            old_primary = self.last_snapshot.leader
+        self.state_machine.reset(old_primary=old_primary)
+        self._pgpool_primary_switched = False
+        self._converged_polls = 0
+    
+    def burst(self, duration: Optional[float] = None):
+        """
+        Acelera o polling para burst_interval (ex: logo antes de injetar a falha)
         
-        self.old_primary = self.patroni.get_primary_node()
+        Interrompe a espera atual do loop; pode ser chamado de qualquer thread.
         
-        task_1 = asyncio.create_task(self._detect_cluster_new_primary())
-        self._tasks.append(task_1)
+        Args:
+            duration: Duração da rajada em segundos (padrão: burst_window)
+        """
+        until = time.time() + (duration if duration is not None else self.burst_window)
+        self._burst_until = max(self._burst_until, until)
+        if self._wake and self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+    
+    def _next_interval(self) -> float:
+        """
+        Intervalo até o próximo snapshot
         
-        task_3 = asyncio.create_task(self._detect_service_restoration_switchover())
-        self._tasks.append(task_3)
+        - rajada ativa (até burst_window após burst()): burst_interval;
+        - convergido: poll_interval * backoff_factor^n, até max_interval;
+        - estável ou ciclo parado sem transições: poll_interval.
+        """
+        state = self.state_machine.state
+        if time.time() < self._burst_until:
+            return self.burst_interval
+        if state == CONVERGED:
+            self._converged_polls += 1
+            return min(self.max_interval, self.poll_interval * self.backoff_factor ** self._converged_polls)
+        return self.poll_interval
+    
+    async def _sleep(self, interval: float):
+        """Aguarda o próximo polling; burst() encerra a espera antes"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+    
+    @property
+    def old_primary(self) -> Optional[str]:
+        """Primário no início do ciclo atual"""
+        return self.state_machine.old_primary
+    
+    @property
+    def new_primary(self) -> Optional[str]:
+        """Novo líder do ciclo atual (None até a eleição)"""
+        return self.state_machine.new_primary
+    
+    @property
+    def state(self) -> str:
+        """Estado atual da máquina de estados"""
+        return self.state_machine.state
+    
+    def get_cluster_state(self) -> Dict[str, Any]:
+        """
+        Estado observado do cluster
         
-        await asyncio.sleep(0.5)  # Pequeno delay para estabilizar
-
+        Returns:
+            Estado da máquina, primários e tempo até cada estado do ciclo atual
+        """
+        snapshot = self.last_snapshot
+        return {
+            'state': self.state_machine.state,
+            'old_primary': self.old_primary,
+            'new_primary': self.new_primary,
+            'durations': self.state_machine.durations(),
+            'leader': snapshot.leader if snapshot else None,
+            'timeline': snapshot.leader_timeline if snapshot else None,
+            'members': snapshot.members if snapshot else None,
+            'snapshots': self.snapshots_taken,
+            'poll_interval': self.current_interval,
+        }
         
     async def stop_observing(self):
         """Para observação"""
@@ -151,6 +360,19 @@ class ClusterObserver:
         # Aguarda cancelamento
         await asyncio.gather(*self._tasks, return_exceptions=True)
         self._tasks.clear()
+        
+        if self.log_tailer:
+            await asyncio.to_thread(self.log_tailer.stop)
+        await asyncio.sleep(0)  # Entrega os call_soon_threadsafe do flush final do tailer
+        self._drain_log_events()
+        
+        self.pgpool.close()
+    
+    def _start_log_tailer(self):
+        """Inicia o streaming de logs (a partir de agora) ligado ao loop atual"""
+        self._loop = asyncio.get_running_loop()
+        if self.log_tailer:
+            self.log_tailer.start()
     
     def get_event(self, event_type: str, since: Optional[float] = None) -> Optional[ClusterEvent]:
         """
@@ -163,190 +385,186 @@ class ClusterObserver:
         Returns:
             Evento encontrado ou None
         """
-        for event in self.events:
-            if event.event_type == event_type:
-                if since is None or event.timestamp >= since:
-                    return event
-        return None
+        return self.events.first(event_type, since=since)
     
-    async def wait_for_event(self, event_type: str, timeout: float = 60) -> Optional[ClusterEvent]:
+    def collect_pgpool_log_events(self, since: float) -> List[ClusterEvent]:
+        """
+        Importa as etapas de failover registradas no log do container PgPool
+        
+        Os hooks (failover.sh / follow_primary.sh) rodam dentro do PgPool e só
+        são visíveis pelo log; chamar após o failover (ex: na finalização).
+        
+        Args:
+            since: Epoch (s) a partir do qual procurar (ex: injeção da falha)
+        
+        Returns:
+            Eventos adicionados
+        """
+        added = []
+        for entry in self.pgpool.get_failover_log_events(since=since):
+            event = ClusterEvent(
+                event_type=entry['event_type'],
+                node='pgpool',
+                timestamp=entry['timestamp'],
+                data={**entry['data'], 'line': entry['line']}
+            )
+            # Já visto (ex: pelo tailer): o EventStore descarta pelo tipo/nó/timestamp
+            if self._emit_event(event):
+                added.append(event)
+        
+        return added
+    
+    async def wait_for_event(
+        self,
+        event_type: str,
+        timeout: float = 60,
+        since: Optional[float] = None
+    ) -> Optional[ClusterEvent]:
         """
         Aguarda um evento específico
         
         Args:
             event_type: Tipo do evento
             timeout: Timeout em segundos
+            since: Aceita eventos a partir deste epoch (padrão: agora). Passe o
+                instante da injeção para não perder transições já emitidas.
         
         Returns:
             Evento quando ocorrer ou None se timeout
         """
-        start = time.time()
-        
-        while time.time() - start < timeout:
-            event = self.get_event(event_type, since=start)
-            if event:
-                return event
-            await asyncio.sleep(0.05)  # 50ms
-        
-        return None
+        # Acordado pelo EventStore quando um evento do tipo chega (sem polling)
+        since = since if since is not None else time.time()
+        return await self.events.wait_for(event_type, since=since, timeout=timeout)
     
-    async def _detect_cluster_failure(self):
-        """
-        Detecta falhas no cluster através do Patroni API
-        Identifica quando todos os nós estão com State=running (ausência de líder por muito tempo (loop_wait exceeded))
-        """
-        print(f"🔍 Detectando falhas no cluster...")
-        
-        while self._observing and not self.cluster_failed:
-            try:
-                members = self.patroni.get_cluster_members()
-                
-                if members:
-                    # Verifica se TODOS os membros estão com State=running
-                    all_running = all(
-                        member.get('State') == 'running' 
-                        for member in members
-                    )
-                    
-                    if all_running and len(members) > 1:
-                        event = ClusterEvent(
-                            event_type='failure_detected',
-                            node='cluster',
-                            timestamp=time.time(),
-                            data={
-                                'reason': 'all_nodes_running, loop_wait exceeded',
-                                'members': members
-                            }
-                        )
-                        self._emit_event(event)
-                        print(f"⚠️  ALERTA: Todos os nós com State=running (loop_wait exceeded)")
-                        
-                        self.cluster_failed = True
-                        
-            except Exception as e:
-                print(f"⚠️  Erro ao detectar falha no cluster: {e}")
-            
-            await asyncio.sleep(self.poll_interval)
-
-
-    async def _detect_new_primary(self):
+    async def _take_snapshot(self) -> ClusterSnapshot:
         """
-        Detecta eleição de novo primário no cluster
+        Coleta Patroni, PgPool e (só enquanto aguarda a restauração) a conexão
+        via PgPool em paralelo: um patronictl por ciclo para todo o observador
         """
-        print(f"🔍 Detectando eleição de novo primário...")
+        started = time.time()
+        
+        calls = [
+            asyncio.to_thread(self.patroni.get_cluster_members),
+            asyncio.to_thread(lambda: self.pgpool.get_node_info() or self.pgpool.get_pool_nodes()),
+        ]
+        if self.state_machine.needs_service_check:
+            calls.append(asyncio.to_thread(self.postgres.is_available))
+        
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        members, pool_nodes = [None if isinstance(r, Exception) else r for r in results[:2]]
+        service = results[2] if len(results) > 2 and not isinstance(results[2], Exception) else None
+        
+        now = time.time()
+        return ClusterSnapshot(
+            timestamp=now,
+            members=members,
+            pool_nodes=pool_nodes,
+            service_available=service,
+            poll_seconds=now - started,
+            started_at=started
+        )
     
+    async def _poll_cluster(self):
+        """Loop único de observação: snapshot → transições de estado → eventos"""
+        print(f"🔍 Observando cluster (máquina de estados: {self.state_machine.state})...")
         
         while self._observing:
+            self._drain_log_events()
             try:
-                if self.cluster_failed and not self.cluster_restored:
-                    self.new_primary = self.patroni.get_primary_node()
-                    last_primary = self.old_primary
-                    
-                    if self.new_primary and self.new_primary != last_primary:
-                        event = ClusterEvent(
-                            event_type='new_primary',
-                            node=self.new_primary,
-                            timestamp=time.time(),
-                            data=None
-                        )
-                        self._emit_event(event)
-                        print(f"✅ Novo primário detectado: {self.new_primary}")
-                        last_primary = self.new_primary
-                        
-                        self.cluster_restored = True
-                        
-            except Exception as e:
-                print(f"⚠️  Erro ao detectar novo primário: {e}")
-            
-            await asyncio.sleep(self.poll_interval)
-        
-    async def _detect_service_restoration_switchover(self):
-        """
-        Detecta restauração do serviço PostgreSQL via pgpool
-        """
-        print(f"🔍 Detectando restauração do serviço PostgreSQL...")
-        
-        while self._observing:
-            try:
-                if self.cluster_restored:
-                    
-                    if not self.cluster_switchover:
-                    
-                        if self.postgres.is_available():
-                            event = ClusterEvent(
-                                event_type='service_restored',
-                                node='pgpool',
-                                timestamp=time.time(),
-                                data=None
-                            )
-                            self._emit_event(event)
-                            print(f"✅ Serviço PostgreSQL restaurado e disponível via pgpool")
-                            
-                            self.cluster_switchover = True
-                            
-            except Exception as e:
-                print(f"⚠️  Erro ao detectar restauração do serviço: {e}")
-            
-            await asyncio.sleep(self.poll_interval)
-
-
-    async def _detect_service_restoration(self):
-        """
-        Detecta restauração do serviço PostgreSQL via pgpool
-        """
-        print(f"🔍 Detectando restauração do serviço PostgreSQL...")
-        
-        while self._observing:
-            try:
-                if self.cluster_restored:
+                snapshot = await self._take_snapshot()
+                self.last_snapshot = snapshot
+                self.snapshots_taken += 1
                 
-                    if self.postgres.is_available():
-                        event = ClusterEvent(
-                            event_type='service_restored',
-                            node='pgpool',
-                            timestamp=time.time(),
-                            data=None
-                        )
-                        self._emit_event(event)
-                        print(f"✅ Serviço PostgreSQL restaurado e disponível via pgpool")
+                changed = False
+                for transition in self.state_machine.feed(snapshot):
+                    self._emit_transition(transition)
+                    changed = True
+                    if transition.to_state == SERVICE_RESTORED:
+                        self._burst_until = 0.0  # RTO medido: fim da rajada
+                
+                if snapshot.pool_nodes:
+                    changed = self._observe_pgpool_nodes(snapshot) or changed
+                
+                # Mudança de estado até o novo líder: a próxima transição tende a vir logo em seguida
+                if changed and self.state_machine.state in (LEADERLESS, ELECTING, NEW_LEADER):
+                    self.burst()
                         
             except Exception as e:
-                print(f"⚠️  Erro ao detectar restauração do serviço: {e}")
+                print(f"⚠️  Erro ao observar o cluster: {e}")
             
-            await asyncio.sleep(self.poll_interval)
+            self.current_interval = self._next_interval()
+            _STATE.set(STATE_ORDER.index(self.state_machine.state))
+            _POLL_INTERVAL.set(self.current_interval)
+            await self._sleep(self.current_interval)
     
-    async def _detect_cluster_new_primary(self):
-        """
-        Detecta mudança de primário no cluster
-        Identifica quando o primário atual é diferente do primário anterior
+    def _emit_transition(self, transition: StateTransition):
+        """Converte uma transição da máquina de estados em ClusterEvent"""
+        self._emit_event(ClusterEvent(
+            event_type=transition.event_type,
+            node=transition.node,
+            timestamp=transition.timestamp,
+            data={**transition.data, 'from_state': transition.from_state, 'to_state': transition.to_state},
+            lower_bound=transition.lower_bound,
+            upper_bound=transition.upper_bound
+        ))
+        
+        messages = {
+            LEADERLESS: "⚠️  ALERTA: réplicas perderam o primário (loop_wait exceeded)",
+            ELECTING: "🗳️  Sem líder no DCS: eleição em andamento",
+            NEW_LEADER: f"✅ Novo primário detectado: {transition.node} (anterior: {self.old_primary})",
+            SERVICE_RESTORED: "✅ Serviço PostgreSQL restaurado e disponível via pgpool",
+            CONVERGED: "✅ Cluster convergido (réplicas em streaming na timeline do novo líder)",
+        }
+        print(messages.get(transition.to_state, f"➡️  {transition.from_state} → {transition.to_state}"))
+    
+    def _observe_pgpool_nodes(self, snapshot: ClusterSnapshot) -> bool:
         """
-        print(f"🔍 Detectando mudança de primário no cluster...")
+        Acompanha a visão do PgPool sobre os backends (status e role por nó)
         
-        while self._observing:
-            try:
-                current_primary = self.patroni.get_primary_node()
-                
-                if not self.cluster_switchover:
-                
-                    if current_primary and current_primary != self.old_primary:
-                        event = ClusterEvent(
-                            event_type='new_primary',
-                            node=current_primary,
-                            timestamp=time.time(),
-                            data={
-                                'old_primary': self.old_primary,
-                                'new_primary': current_primary
-                            }
-                        )
-                        self.cluster_switchover = True
-                        self._emit_event(event)
-                        print(f"✅ Novo primário detectado: {current_primary} (anterior: {self.old_primary})")
-                        
-                        self.new_primary = current_primary
-                        self.cluster_restored = True
-                            
-            except Exception as e:
-                print(f"⚠️  Erro ao detectar mudança de primário: {e}")
-            
-            await asyncio.sleep(self.poll_interval)
-
+        Os nós vêm do snapshot (sessão PCP, com fallback para SHOW POOL_NODES).
+        Emite 'pgpool_node_status' a cada mudança, 'pgpool_backend_down' quando o
+        primário antigo é marcado DOWN e 'pgpool_primary_switched' quando o PgPool
+        passa a rotear escritas para outro nó.
+        
+        Cada evento carrega o intervalo entre o snapshot anterior do PgPool e
+        este.
+        
+        Returns:
+            True se a visão do PgPool mudou desde o último snapshot
+        """
+        nodes, now = snapshot.pool_nodes, snapshot.timestamp
+        lower = self._pgpool_previous_at if self._pgpool_previous_at is not None else self.state_machine.entered_at[HEALTHY]
+        bounds = {'lower_bound': min(lower, now), 'upper_bound': now}
+        
+        changed = False
+        for node in nodes:
+            before = self._pgpool_previous.get(node.hostname)
+            if before and (before.status, before.role) != (node.status, node.role):
+                self._emit_event(ClusterEvent(
+                    event_type='pgpool_node_status',
+                    node=node.hostname,
+                    timestamp=now,
+                    data={
+                        'status': f"{before.status} -> {node.status}",
+                        'role': f"{before.role} -> {node.role}"
+                    },
+                    **bounds
+                ))
+                changed = True
+                if node.hostname == self.old_primary and node.is_down and not before.is_down:
+                    self._emit_event(ClusterEvent('pgpool_backend_down', node.hostname, now, **bounds))
+                    print(f"⚠️  PgPool marcou {node.hostname} como DOWN")
+            self._pgpool_previous[node.hostname] = node
+        
+        if not self._pgpool_primary_switched and self.old_primary:
+            primary = next(
+                (n.hostname for n in nodes if n.role == 'primary' and not n.is_down), None
+            )
+            if primary and primary != self.old_primary:
+                self._emit_event(ClusterEvent('pgpool_primary_switched', primary, now, **bounds))
+                print(f"✅ PgPool roteando escritas para {primary}")
+                self._pgpool_primary_switched = True
+                changed = True
+        
+        self._pgpool_previous_at = snapshot.observed_from
+        return changed
@@ -0,0 +1,244 @@
+"""
+Máquina de estados do cluster durante um ciclo de falha/recuperação
+
+    healthy → leaderless → electing → new_leader → service_restored → converged
+
+Alimentada por snapshots (uma consulta ao Patroni + PgPool por ciclo de
+polling). Cada transição é emitida uma única vez, com o timestamp do snapshot
+que a revelou; estados intermediários não observados são pulados (ex: no
+switchover, healthy → new_leader). reset() prepara um novo ciclo sem recriar
+o observador.
+
+Uma transição vista por polling aconteceu em algum instante entre o último
+snapshot que ainda mostrava o estado antigo e o primeiro que mostra o novo:
+cada transição carrega esse intervalo [lower_bound, upper_bound].
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any
+
+
+HEALTHY = "healthy"
+LEADERLESS = "leaderless"  # Réplicas perderam o primário (ou não há líder)
+ELECTING = "electing"  # Chave de líder vazia no DCS
+NEW_LEADER = "new_leader"  # Outro nó assumiu a liderança
+SERVICE_RESTORED = "service_restored"  # PgPool aceita conexões
+CONVERGED = "converged"  # Todos os membros de volta, réplicas em streaming na timeline do líder
+
+STATE_ORDER = (HEALTHY, LEADERLESS, ELECTING, NEW_LEADER, SERVICE_RESTORED, CONVERGED)
+
+# Evento do ClusterObserver emitido na entrada de cada estado
+TRANSITION_EVENTS = {
+    LEADERLESS: "failure_detected",
+    ELECTING: "election_started",
+    NEW_LEADER: "new_primary",
+    SERVICE_RESTORED: "service_restored",
+    CONVERGED: "cluster_converged",
+}
+
+# Status do PgPool considerados UP
+POOL_UP_STATUS = ("up", "waiting")
+
+
+@dataclass
+class ClusterSnapshot:
+    """Visão do cluster em um ciclo de polling"""
+    timestamp: float
+    members: Optional[List[Dict[str, Any]]] = None  # patronictl list (None = sem resposta)
+    pool_nodes: Optional[List[Any]] = None  # PoolNode do PgPool (None = não consultado)
+    service_available: Optional[bool] = None  # Conexão via PgPool (None = não verificada)
+    poll_seconds: float = 0.0  # Custo da coleta
+    started_at: Optional[float] = None  # Início da coleta (o estado foi lido entre started_at e timestamp)
+    
+    @property
+    def observed_from(self) -> float:
+        """Instante mais cedo em que a coleta pode ter lido o estado"""
+        return self.started_at if self.started_at is not None else self.timestamp
+    
+    @property
+    def leader(self) -> Optional[str]:
+        for member in self.members or []:
+            if member.get("Role") == "Leader":
+                return member.get("Member")
+        return None
+    
+    @property
+    def leader_timeline(self) -> Optional[int]:
+        for member in self.members or []:
+            if member.get("Role") == "Leader":
+                return member.get("TL")
+        return None
+    
+    @property
+    def replicas_lost_primary(self) -> bool:
+        """Todos os membros em 'running': nenhuma réplica recebe WAL (loop_wait excedido)"""
+        members = self.members or []
+        return len(members) > 1 and all(m.get("State") == "running" for m in members)
+
+
+@dataclass
+class StateTransition:
+    """Mudança de estado observada"""
+    from_state: str
+    to_state: str
+    timestamp: float
+    node: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    lower_bound: Optional[float] = None  # Último instante em que o estado antigo foi visto
+    upper_bound: Optional[float] = None  # Primeiro instante em que o estado novo foi visto
+    
+    @property
+    def event_type(self) -> str:
+        return TRANSITION_EVENTS.get(self.to_state, self.to_state)
+    
+    @property
+    def uncertainty(self) -> float:
+        """Largura do intervalo em que a transição ocorreu (s)"""
+        lower = self.lower_bound if self.lower_bound is not None else self.timestamp
+        upper = self.upper_bound if self.upper_bound is not None else self.timestamp
+        return upper - lower
+
+
+class ClusterStateMachine:
+    """
+    Estados de um ciclo de failover/switchover
+    
+    Uso:
+        machine = ClusterStateMachine(expected_members=3)
+        machine.reset(old_primary="patroni1")
+        for transition in machine.feed(snapshot):
+            print(transition.to_state, transition.timestamp)
+    """
+    
+    def __init__(self, expected_members: int):
+        """
+        Args:
+            expected_members: Número de membros Patroni do cluster (para 'converged')
+        """
+        self.expected_members = expected_members
+        self._previous_snapshot: Optional[ClusterSnapshot] = None  # Mantido entre ciclos
+        self.reset()
+    
+    def reset(self, old_primary: Optional[str] = None, timestamp: Optional[float] = None) -> None:
+        """
+        Inicia um novo ciclo em 'healthy'
+        
+        Args:
+            old_primary: Primário atual (None: o líder do primeiro snapshot)
+            timestamp: Início do ciclo (padrão: agora)
+        """
+        self.state = HEALTHY
+        self.old_primary = old_primary
+        self.new_primary: Optional[str] = None
+        self.entered_at: Dict[str, float] = {HEALTHY: timestamp or time.time()}
+        self.transitions: List[StateTransition] = []
+        self._service_down_seen_at: Optional[float] = None  # Última verificação com o serviço indisponível
+    
+    @property
+    def needs_service_check(self) -> bool:
+        """O snapshot precisa testar a conexão via PgPool (apenas aguardando a restauração)"""
+        return self.state == NEW_LEADER
+    
+    def reached(self, state: str) -> bool:
+        """O ciclo atual já passou por `state`"""
+        return state in self.entered_at
+    
+    def _lower_bound(self, to_state: str) -> float:
+        """
+        Último instante em que o estado anterior a `to_state` foi observado
+        
+        Para o Patroni, o início do snapshot anterior (o snapshot seguinte se
+        não houver). A restauração do serviço só é verificada em new_leader: vale
+        a última verificação que falhou ou, sem ela, o limite da eleição.
+        """
+        if to_state == SERVICE_RESTORED:
+            if self._service_down_seen_at is not None:
+                return self._service_down_seen_at
+            election = next((t for t in self.transitions if t.to_state == NEW_LEADER), None)
+            if election and election.lower_bound is not None:
+                return election.lower_bound
+        
+        if self._previous_snapshot is not None:
+            return self._previous_snapshot.observed_from
+        return self.entered_at[HEALTHY]
+    
+    def _advance(self, to_state: str, snapshot: ClusterSnapshot, node: str,
+                 data: Optional[Dict[str, Any]] = None) -> Optional[StateTransition]:
+        if STATE_ORDER.index(to_state) <= STATE_ORDER.index(self.state):
+            return None
+        transition = StateTransition(
+            self.state, to_state, snapshot.timestamp, node, data or {},
+            lower_bound=min(self._lower_bound(to_state), snapshot.timestamp),
+            upper_bound=snapshot.timestamp
+        )
+        self.state = to_state
+        self.entered_at[to_state] = snapshot.timestamp
+        self.transitions.append(transition)
+        return transition
+    
+    def _is_converged(self, snapshot: ClusterSnapshot) -> bool:
+        members = snapshot.members or []
+        if len(members) < self.expected_members or snapshot.leader != self.new_primary:
+            return False
+        
+        timeline = snapshot.leader_timeline
+        for member in members:
+            if member.get("Role") == "Leader":
+                continue
+            if member.get("State") != "streaming" or member.get("TL") != timeline:
+                return False
+        
+        if snapshot.pool_nodes is not None:
+            return all((node.status or "").lower() in POOL_UP_STATUS for node in snapshot.pool_nodes)
+        return True
+    
+    def feed(self, snapshot: ClusterSnapshot) -> List[StateTransition]:
+        """
+        Processa um snapshot
+        
+        Returns:
+            Transições reveladas por este snapshot (em ordem)
+        """
+        if snapshot.members is None:
+            return []
+        
+        leader = snapshot.leader
+        if self.old_primary is None and self.state == HEALTHY:
+            self.old_primary = leader
+        leader_changed = bool(leader) and leader != self.old_primary
+        
+        steps = []
+        if self.state == HEALTHY and not leader_changed and (leader is None or snapshot.replicas_lost_primary):
+            steps.append(self._advance(LEADERLESS, snapshot, "cluster", {
+                'reason': 'no_leader' if leader is None else 'all_nodes_running, loop_wait exceeded',
+                'members': snapshot.members
+            }))
+        
+        if self.state == LEADERLESS and leader is None:
+            steps.append(self._advance(ELECTING, snapshot, "cluster"))
+        
+        if self.state in (HEALTHY, LEADERLESS, ELECTING) and leader_changed:
+            self.new_primary = leader
+            steps.append(self._advance(NEW_LEADER, snapshot, leader, {
+                'old_primary': self.old_primary,
+                'new_primary': leader
+            }))
+        
+        if self.state == NEW_LEADER and snapshot.service_available:
+            steps.append(self._advance(SERVICE_RESTORED, snapshot, "pgpool"))
+        
+        if self.state == SERVICE_RESTORED and self._is_converged(snapshot):
+            steps.append(self._advance(CONVERGED, snapshot, "cluster", {
+                'timeline': snapshot.leader_timeline
+            }))
+        
+        if self.state == NEW_LEADER and snapshot.service_available is False:
+            self._service_down_seen_at = snapshot.observed_from
+        self._previous_snapshot = snapshot
+        
+        return [step for step in steps if step]
+    
+    def durations(self) -> Dict[str, float]:
+        """Tempo (s) desde a entrada em 'healthy' até cada estado alcançado"""
+        start = self.entered_at[HEALTHY]
+        return {state: round(ts - start, 6) for state, ts in self.entered_at.items() if state != HEALTHY}
@@ -156,6 +156,15 @@ class Config:
             self.patroni3_name
         ]
     
+    @property
+    def patroni_host_ports(self) -> dict:
+        """Porta PostgreSQL publicada no host por nó Patroni (conexão direta, sem PgPool)"""
+        return {
+            self.patroni1_name: int(self.get('PATRONI1_HOST_PORT', '5433')),
+            self.patroni2_name: int(self.get('PATRONI2_HOST_PORT', '5434')),
+            self.patroni3_name: int(self.get('PATRONI3_HOST_PORT', '5435'))
+        }
+    
     @property
     def etcd_nodes(self) -> list:
         """Lista com todos os nós ETCD"""
@@ -214,6 +223,48 @@ class Config:
         """Porta do PgPool no host (para conexões externas)"""
         return int(self.get('PGPOOL_HOST_PORT', '5432'))
     
+    @property
+    def pgpool_pcp_host(self) -> str:
+        """Host do PCP do PgPool (pytest roda no host: porta publicada)"""
+        return self.get('PGPOOL_PCP_HOST', 'localhost')
+    
+    @property
+    def pgpool_pcp_port(self) -> int:
+        """Porta do PCP do PgPool no host"""
+        return int(self.get('PGPOOL_PCP_HOST_PORT', '9898'))
+    
+    # Propriedades de conveniência para os exporters (Prometheus)
+    
+    @property
+    def exporter_endpoints(self) -> dict:
+        """URL de /metrics (porta publicada no host) por exporter: postgres_exporter de cada nó + pgpool2_exporter"""
+        host = self.get('EXPORTERS_HOST', 'localhost')
+        return {
+            self.patroni1_name: f"http://{host}:{self.get('PG1_EXPORTER_PORT', '9187')}/metrics",
+            self.patroni2_name: f"http://{host}:{self.get('PG2_EXPORTER_PORT', '9188')}/metrics",
+            self.patroni3_name: f"http://{host}:{self.get('PG3_EXPORTER_PORT', '9189')}/metrics",
+            self.pgpool_name: f"http://{host}:{self.get('PGPOOL_EXPORTER_PORT', '9719')}/metrics"
+        }
+    
+    def exporter_endpoints_for(self, scenario: str) -> dict:
+        """
+        Exporters raspados em cada cenário de performance
+        
+        Args:
+            scenario: 'baseline' ou 'cluster'
+        
+        Returns:
+            cluster: exporter_endpoints; baseline: exporter do postgres-baseline
+            (BASELINE_EXPORTER_PORT) ou vazio se não houver
+        """
+        if scenario != "baseline":
+            return self.exporter_endpoints
+        port = self.get('BASELINE_EXPORTER_PORT')
+        if not port:
+            return {}
+        host = self.get('EXPORTERS_HOST', 'localhost')
+        return {self.get('BASELINE_CONTAINER', 'postgres-baseline'): f"http://{host}:{port}/metrics"}
+    
     def __repr__(self) -> str:
         """Representação para debug"""
         return (
@@ -0,0 +1,256 @@
+"""
+Detector de convergência do cluster
+
+Substitui esperas fixas (asyncio.sleep) após religar um nó: retorna assim que
+todas as condições valem ao mesmo tempo:
+
+- todos os membros Patroni presentes, um único líder, réplicas em streaming
+  na timeline atual com lag abaixo do limite;
+- o PgPool com todos os backends UP (nós DOWN são reanexados via PCP quando
+  o membro Patroni é o líder ou já está em streaming na timeline atual);
+- o primário antigo de volta como réplica (reintegrado com pg_rewind,
+  reinit ou simplesmente religado).
+"""
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any
+
+from .config import config
+from .docker_manager import DockerManager
+from .patroni_manager import PatroniManager
+from .pgpool_manager import PgPoolManager
+
+
+# Como o primário antigo voltou ao cluster (log do Patroni)
+REJOIN_LOG_PATTERNS = [
+    ("pg_rewind", re.compile(r"running pg_rewind from|pg_rewind exited")),
+    ("reinit", re.compile(r"(?:reinitialize|bootstrap(?:ping)?) from leader|replica has been created using basebackup")),
+]
+
+# Colunas de lag do `patronictl list -f json` (Patroni 3.x e 4.x)
+LAG_KEYS = ("Lag in MB", "Replay Lag in MB", "Receive Lag in MB")
+
+# Status do PgPool considerados UP ('waiting': UP, ainda sem conexão de cliente)
+POOL_UP_STATUS = ("up", "waiting")
+
+
+@dataclass
+class ConvergenceStatus:
+    """Resultado de uma verificação (ou da espera) de convergência"""
+    converged: bool = False
+    elapsed_seconds: Optional[float] = None
+    checks: int = 0
+    
+    leader: Optional[str] = None
+    timeline: Optional[int] = None
+    members: int = 0
+    streaming_replicas: List[str] = field(default_factory=list)
+    max_lag_mb: Optional[float] = None
+    pgpool_down_nodes: List[int] = field(default_factory=list)
+    pgpool_attachable_nodes: List[int] = field(default_factory=list)  # DOWN, mas prontos no Patroni
+    
+    old_primary: Optional[str] = None
+    old_primary_rejoined: Optional[bool] = None
+    rejoin_method: Optional[str] = None  # 'pg_rewind', 'reinit' ou 'restart'
+    
+    pending: List[str] = field(default_factory=list)  # Condições ainda não satisfeitas
+
+
+class ConvergenceWaiter:
+    """
+    Espera o cluster voltar ao estado estável
+    
+    Uso:
+        waiter = ConvergenceWaiter(patroni_manager, pgpool_manager)
+        docker.start_container(old_primary)
+        status = await waiter.wait(old_primary=old_primary, timeout=120)
+        assert status.converged, status.pending
+    """
+    
+    def __init__(
+        self,
+        patroni: Optional[PatroniManager] = None,
+        pgpool: Optional[PgPoolManager] = None,
+        max_lag_mb: float = 1.0,
+        poll_interval: float = 0.25,
+        start_stopped_nodes: bool = True
+    ):
+        """
+        Args:
+            patroni: PatroniManager (padrão: novo)
+            pgpool: PgPoolManager (padrão: novo)
+            max_lag_mb: Lag máximo aceito por réplica (MB)
+            poll_interval: Intervalo entre verificações em segundos
+            start_stopped_nodes: Religa containers Patroni parados antes de esperar
+        """
+        self.patroni = patroni or PatroniManager()
+        self.pgpool = pgpool or PgPoolManager()
+        self.docker = DockerManager()
+        self.max_lag_mb = max_lag_mb
+        self.poll_interval = poll_interval
+        self.start_stopped_nodes = start_stopped_nodes
+    
+    @staticmethod
+    def _lag_mb(member: Dict[str, Any]) -> Optional[float]:
+        """Lag da réplica em MB (None se desconhecido)"""
+        for key in LAG_KEYS:
+            value = member.get(key)
+            if value in (None, "", "unknown"):
+                continue
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        return None
+    
+    def _check_patroni(self, status: ConvergenceStatus) -> None:
+        members = self.patroni.get_cluster_members()
+        if not members:
+            status.pending.append("patroni: sem resposta do patronictl")
+            return
+        
+        status.members = len(members)
+        expected = len(config.patroni_nodes)
+        if len(members) < expected:
+            status.pending.append(f"patroni: {len(members)}/{expected} membros")
+        
+        leaders = [m for m in members if m.get("Role") == "Leader"]
+        if len(leaders) != 1:
+            status.pending.append(f"patroni: {len(leaders)} líderes")
+            return
+        
+        status.leader = leaders[0].get("Member")
+        status.timeline = leaders[0].get("TL")
+        
+        lags = []
+        for member in members:
+            name = member.get("Member")
+            if member.get("Role") == "Leader":
+                continue
+            if member.get("State") != "streaming":
+                status.pending.append(f"{name}: {member.get('State')}")
+                continue
+            if status.timeline is not None and member.get("TL") != status.timeline:
+                status.pending.append(f"{name}: timeline {member.get('TL')} (atual {status.timeline})")
+                continue
+            
+            lag = self._lag_mb(member)
+            if lag is None:
+                status.pending.append(f"{name}: lag desconhecido")
+                continue
+            lags.append(lag)
+            if lag > self.max_lag_mb:
+                status.pending.append(f"{name}: lag {lag:.1f}MB")
+                continue
+            status.streaming_replicas.append(name)
+        
+        status.max_lag_mb = max(lags) if lags else None
+        
+        if status.old_primary:
+            status.old_primary_rejoined = status.old_primary in status.streaming_replicas
+            if not status.old_primary_rejoined and status.old_primary != status.leader:
+                status.pending.append(f"{status.old_primary}: não reintegrado")
+    
+    def _check_pgpool(self, status: ConvergenceStatus) -> None:
+        nodes = self.pgpool.get_node_info() or self.pgpool.get_pool_nodes()
+        if not nodes:
+            status.pending.append("pgpool: sem resposta")
+            return
+        
+        down = [node for node in nodes if (node.status or "").lower() not in POOL_UP_STATUS]
+        status.pgpool_down_nodes = [node.node_id for node in down]
+        # Hostname do backend = nome do membro Patroni; só reanexa quem já está pronto
+        ready = set(status.streaming_replicas) | ({status.leader} if status.leader else set())
+        status.pgpool_attachable_nodes = [
+            node.node_id for node in down
+            if node.node_id is not None and node.hostname in ready
+        ]
+        if status.pgpool_down_nodes:
+            status.pending.append(f"pgpool: nós {status.pgpool_down_nodes} fora do pool")
+    
+    def check(self, old_primary: Optional[str] = None) -> ConvergenceStatus:
+        """
+        Verifica as condições uma vez
+        
+        Args:
+            old_primary: Primário antes da falha (deve voltar como réplica)
+        
+        Returns:
+            ConvergenceStatus (converged=True se todas as condições valem)
+        """
+        status = ConvergenceStatus(old_primary=old_primary, checks=1)
+        self._check_patroni(status)
+        self._check_pgpool(status)
+        status.converged = not status.pending
+        return status
+    
+    def detect_rejoin_method(self, node: str, since: float) -> str:
+        """
+        Como o nó voltou ao cluster, pelo log do Patroni
+        
+        Returns:
+            'pg_rewind', 'reinit' ou 'restart' (religado sem divergência de timeline)
+        """
+        for _, message in self.docker.get_logs(node, since=since) or []:
+            for method, regex in REJOIN_LOG_PATTERNS:
+                if regex.search(message):
+                    return method
+        return "restart"
+    
+    async def wait(
+        self,
+        old_primary: Optional[str] = None,
+        timeout: float = 120.0,
+        since: Optional[float] = None
+    ) -> ConvergenceStatus:
+        """
+        Espera todas as condições valerem ao mesmo tempo
+        
+        Backends DOWN no PgPool são reanexados assim que o membro Patroni é o
+        líder ou está em streaming na timeline atual; antes disso o attach só
+        devolveria ao pool um nó ainda fora da replicação.
+        
+        Args:
+            old_primary: Primário antes da falha (deve voltar como réplica)
+            timeout: Tempo máximo de espera em segundos
+            since: Epoch da falha, para identificar pg_rewind no log (padrão: início da espera)
+        
+        Returns:
+            Última ConvergenceStatus (converged=False se timeout)
+        """
+        start = time.time()
+        since = since if since is not None else start
+        
+        if self.start_stopped_nodes:
+            for node in config.patroni_nodes:
+                if not await asyncio.to_thread(self.docker.is_running, node):
+                    print(f"  🔄 Religando {node}...")
+                    await asyncio.to_thread(self.docker.start_container, node)
+        
+        checks = 0
+        status = ConvergenceStatus(old_primary=old_primary)
+        while True:
+            checks += 1
+            status = await asyncio.to_thread(self.check, old_primary)
+            status.checks = checks
+            status.elapsed_seconds = time.time() - start
+            
+            if status.converged:
+                break
+            for node_id in status.pgpool_attachable_nodes:
+                print(f"  🔗 Reanexando nó {node_id} ao PgPool...")
+                await asyncio.to_thread(self.pgpool.attach_node, node_id)
+            if status.elapsed_seconds >= timeout:
+                print(f"  ⚠️  Cluster não convergiu em {timeout:.0f}s: {', '.join(status.pending)}")
+                return status
+            await asyncio.sleep(self.poll_interval)
+        
+        if old_primary:
+            status.rejoin_method = await asyncio.to_thread(self.detect_rejoin_method, old_primary, since)
+        
+        rejoin = f", {old_primary} via {status.rejoin_method}" if old_primary else ""
+        print(f"  ✓ Cluster convergido em {status.elapsed_seconds:.2f}s "
+              f"(TL {status.timeline}, lag máx {status.max_lag_mb}MB{rejoin})")
+        return status
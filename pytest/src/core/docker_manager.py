@@ -2,7 +2,9 @@
 Gerenciador de operações Docker
 """
 import subprocess
-from typing import Optional, List
+import threading
+from datetime import datetime, timezone
+from typing import Optional, List, Callable, Tuple
 
 
 class DockerManager:
@@ -155,6 +157,243 @@ class DockerManager:
             print(f"   Comando: {' '.join(command)}")
             return None
 
+    @classmethod
+    def exec_command_streaming(
+        cls,
+        container_name: str,
+        command: List[str],
+        on_stderr_line: Optional[Callable[[str], None]] = None,
+        timeout: int = 10,
+        exec_options: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        Executa comando dentro do container entregando o stderr linha a linha
+
+        Útil para comandos que reportam progresso no stderr enquanto executam
+        (ex: pgbench -P), sem esperar o término para ver as linhas.
+
+        Args:
+            container_name: Nome do container
+            command: Comando a executar (lista)
+            on_stderr_line: Callback chamado para cada linha do stderr
+            timeout: Timeout em segundos
+            exec_options: Opções do docker exec (ex: ['-e', 'VAR=value'])
+
+        Returns:
+            Output (stdout) do comando ou None se falhar
+        """
+        cmd = ["docker", "exec"]
+        if exec_options:
+            cmd.extend(exec_options)
+        cmd.append(container_name)
+        cmd.extend(command)
+
+        stdout_chunks: List[str] = []
+        stderr_lines: List[str] = []
+
+        def _read_stdout(stream):
+            stdout_chunks.append(stream.read())
+
+        def _read_stderr(stream):
+            for line in stream:
+                stderr_lines.append(line)
+                if on_stderr_line:
+                    try:
+                        on_stderr_line(line.rstrip('\n'))
+                    except Exception as e:
+                        print(f"⚠️  Erro em callback de stderr: {e}")
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1
+            )
+        except Exception as e:
+            print(f"❌ Exceção ao executar comando no container '{container_name}'")
+            print(f"   Tipo: {type(e).__name__}")
+            print(f"   Mensagem: {str(e)}")
+            print(f"   Comando: {' '.join(command)}")
+            return None
+
+        readers = [
+            threading.Thread(target=_read_stdout, args=(process.stdout,), daemon=True),
+            threading.Thread(target=_read_stderr, args=(process.stderr,), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            print(f"❌ Timeout ao executar comando no container '{container_name}'")
+            print(f"   Timeout: {timeout}s")
+            print(f"   Comando: {' '.join(command)}")
+            return None
+        finally:
+            for reader in readers:
+                reader.join(timeout=5)
+
+        stdout = "".join(stdout_chunks)
+        if process.returncode == 0:
+            return stdout
+
+        print(f"❌ Comando docker exec falhou (exit code: {process.returncode})")
+        print(f"   Container: {container_name}")
+        print(f"   Comando: {' '.join(command)}")
+        if stdout:
+            print(f"   STDOUT: {stdout}")
+        if stderr_lines:
+            print(f"   STDERR: {''.join(stderr_lines)}")
+        return None
+
+    @classmethod
+    def copy_to_container(cls, source_path: str, container_name: str, dest_path: str, timeout: int = 30) -> bool:
+        """
+        Copia um arquivo local para dentro do container (docker cp)
+        
+        Args:
+            source_path: Caminho do arquivo local
+            container_name: Nome do container
+            dest_path: Caminho de destino dentro do container
+            timeout: Timeout em segundos
+            
+        Returns:
+            True se sucesso
+        """
+        try:
+            result = subprocess.run(
+                ["docker", "cp", source_path, f"{container_name}:{dest_path}"],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            if result.returncode != 0:
+                print(f"❌ Erro ao copiar {source_path} para {container_name}:{dest_path}:")
+                print(f"   stdout: {result.stdout}")
+                print(f"   stderr: {result.stderr}")
+                return False
+            return True
+        except subprocess.TimeoutExpired as e:
+            print(f"❌ Timeout ao copiar {source_path} para {container_name}: {e}")
+            return False
+        except Exception as e:
+            print(f"❌ Exceção ao copiar {source_path} para {container_name}: {e}")
+            return False
+
+
+    @classmethod
+    def get_cpu_limit(cls, container_name: str) -> Optional[float]:
+        """
+        Limite de CPU do container em núcleos (deploy.resources.limits.cpus / --cpus)
+        
+        Args:
+            container_name: Nome do container
+            
+        Returns:
+            Número de núcleos ou None se não houver limite (ou falhar)
+        """
+        try:
+            result = subprocess.run(
+                ["docker", "inspect", "-f",
+                 "{{.HostConfig.NanoCpus}} {{.HostConfig.CpuQuota}} {{.HostConfig.CpuPeriod}}",
+                 container_name],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            if result.returncode != 0:
+                return None
+            
+            nano_cpus, quota, period = (int(v) for v in result.stdout.split())
+            if nano_cpus > 0:
+                return nano_cpus / 1e9
+            if quota > 0 and period > 0:
+                return quota / period
+            return None
+        except Exception as e:
+            print(f"⚠️  Não foi possível obter limite de CPU de {container_name}: {e}")
+            return None
+    
+    @classmethod
+    def get_logs(
+        cls,
+        container_name: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        tail: Optional[int] = None,
+        timeout: int = 30
+    ) -> Optional[List[Tuple[Optional[float], str]]]:
+        """
+        Logs do container (stdout + stderr) com o timestamp do Docker por linha
+        
+        Args:
+            container_name: Nome do container
+            since: Epoch (s) a partir do qual buscar (None = desde o início)
+            until: Epoch (s) limite (None = até agora)
+            tail: Apenas as últimas N linhas
+            timeout: Timeout em segundos
+            
+        Returns:
+            Lista de (epoch da linha, mensagem) em ordem cronológica ou None se falhar
+        """
+        cmd = ["docker", "logs", "--timestamps"]
+        if since is not None:
+            cmd.extend(["--since", f"{since:.3f}"])
+        if until is not None:
+            cmd.extend(["--until", f"{until:.3f}"])
+        if tail is not None:
+            cmd.extend(["--tail", str(tail)])
+        cmd.append(container_name)
+        
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            if result.returncode != 0:
+                print(f"❌ Erro ao obter logs de {container_name}: {result.stderr.strip()}")
+                return None
+        except subprocess.TimeoutExpired as e:
+            print(f"❌ Timeout ao obter logs de {container_name}: {e}")
+            return None
+        except Exception as e:
+            print(f"❌ Exceção ao obter logs de {container_name}: {e}")
+            return None
+        
+        # O container escreve nos dois streams: intercala pela marca de tempo do Docker
+        lines = [
+            cls.split_log_timestamp(line)
+            for line in (result.stdout + result.stderr).splitlines()
+            if line.strip()
+        ]
+        lines.sort(key=lambda item: item[0] if item[0] is not None else 0.0)
+        return lines
+    
+    @staticmethod
+    def split_log_timestamp(line: str) -> Tuple[Optional[float], str]:
+        """
+        Separa o prefixo de `docker logs --timestamps` (RFC3339 UTC, nanossegundos)
+        
+        Returns:
+            (epoch em segundos ou None, mensagem)
+        """
+        stamp, _, message = line.partition(' ')
+        if not stamp.endswith('Z') or 'T' not in stamp:
+            return None, line
+        
+        base, _, fraction = stamp[:-1].partition('.')
+        try:
+            parsed = datetime.strptime(base, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None, line
+        return parsed.timestamp() + (float(f"0.{fraction}") if fraction else 0.0), message
     
     @classmethod
     def is_running(cls, container_name: str) -> bool:
@@ -0,0 +1,233 @@
+"""
+Armazenamento indexado dos eventos observados no cluster
+
+Substitui a lista simples do ClusterObserver:
+- índice por tipo, cada um ordenado por timestamp (busca por bisect);
+- retenção limitada (número máximo de eventos e/ou idade máxima);
+- deduplicação de eventos de estado repetidos a cada polling
+  (ex: 'service_restored' enquanto o serviço continua disponível): a
+  sequência de repetições vira um único evento que continua valendo
+  enquanto as repetições chegam;
+- espera por notificação (asyncio.Event por waiter) em vez de polling.
+"""
+import asyncio
+import bisect
+from typing import Optional, List, Dict, Any, Iterator, Set, Tuple
+
+
+# Eventos emitidos a cada polling enquanto o estado persiste
+STATE_EVENT_TYPES = ("service_restored",)
+
+
+def _timestamp(event: Any) -> float:
+    return event.timestamp
+
+
+class EventStore:
+    """
+    Linha do tempo de eventos (qualquer objeto com event_type, node e timestamp)
+    
+    Uso:
+        store = EventStore(max_events=10000)
+        store.add(ClusterEvent('new_primary', 'patroni2', time.time()))
+        event = store.first('new_primary', since=t_injecao)
+        event = await store.wait_for('service_restored', since=time.time(), timeout=30)
+    
+    Não é thread-safe: add() deve ser chamado na thread do loop asyncio (o
+    ClusterObserver repassa os eventos do tailer com call_soon_threadsafe).
+    """
+    
+    def __init__(
+        self,
+        max_events: int = 50_000,
+        max_age_seconds: Optional[float] = None,
+        state_event_types: Tuple[str, ...] = STATE_EVENT_TYPES,
+        state_dedup_window: float = 5.0
+    ):
+        """
+        Args:
+            max_events: Máximo de eventos retidos (os mais antigos são descartados)
+            max_age_seconds: Descarta eventos mais antigos que isso em relação ao mais recente
+            state_event_types: Tipos deduplicados enquanto se repetem
+            state_dedup_window: Repetição do mesmo (tipo, nó) dentro desta janela
+                desde a última ocorrência é descartada
+        """
+        self.max_events = max_events
+        self.max_age_seconds = max_age_seconds
+        self.state_event_types = set(state_event_types)
+        self.state_dedup_window = state_dedup_window
+        
+        self._timeline: List[Any] = []
+        self._by_type: Dict[str, List[Any]] = {}
+        self._keys: Set[Tuple[str, str, float]] = set()
+        self._last_seen: Dict[Tuple[str, str], float] = {}
+        self._runs: Dict[Tuple[str, str], Any] = {}  # Evento que abriu a sequência atual de cada estado
+        self._waiters: Dict[str, Set[asyncio.Event]] = {}
+        
+        self.duplicates = 0
+        self.evicted = 0
+    
+    def __len__(self) -> int:
+        return len(self._timeline)
+    
+    def __iter__(self) -> Iterator[Any]:
+        """Eventos em ordem cronológica"""
+        return iter(list(self._timeline))
+    
+    def clear(self) -> None:
+        """Remove todos os eventos (waiters continuam registrados)"""
+        self._timeline.clear()
+        self._by_type.clear()
+        self._keys.clear()
+        self._last_seen.clear()
+        self._runs.clear()
+        self.duplicates = 0
+        self.evicted = 0
+    
+    def add(self, event: Any) -> bool:
+        """
+        Insere um evento na posição do seu timestamp
+        
+        Returns:
+            True se armazenado; False se duplicado (mesmo tipo/nó/timestamp ou
+            repetição de um evento de estado)
+        """
+        key = (event.event_type, event.node, event.timestamp)
+        if key in self._keys:
+            self.duplicates += 1
+            return False
+        
+        if event.event_type in self.state_event_types:
+            state_key = (event.event_type, event.node)
+            last_seen = self._last_seen.get(state_key)
+            self._last_seen[state_key] = max(event.timestamp, last_seen or event.timestamp)
+            if last_seen is not None and abs(event.timestamp - last_seen) <= self.state_dedup_window:
+                self.duplicates += 1
+                self._notify(event.event_type)  # Estado confirmado: acorda quem espera desde depois do início
+                return False
+            self._runs[state_key] = event
+        
+        self._keys.add(key)
+        bisect.insort(self._timeline, event, key=_timestamp)
+        bisect.insort(self._by_type.setdefault(event.event_type, []), event, key=_timestamp)
+        
+        self._enforce_retention()
+        self._notify(event.event_type)
+        return True
+    
+    def _enforce_retention(self) -> None:
+        """
+        Descarta os eventos mais antigos
+        
+        O mais antigo da linha do tempo é também o mais antigo do seu tipo, então
+        o corte é sempre no início das listas. Por número, corta em lotes (10%
+        acima do limite) para manter a inserção amortizada.
+        """
+        drop = 0
+        if len(self._timeline) > self.max_events * 1.1:
+            drop = len(self._timeline) - self.max_events
+        if self.max_age_seconds is not None and self._timeline:
+            cutoff = self._timeline[-1].timestamp - self.max_age_seconds
+            drop = max(drop, bisect.bisect_left(self._timeline, cutoff, key=_timestamp))
+        if not drop:
+            return
+        
+        removed = self._timeline[:drop]
+        del self._timeline[:drop]
+        
+        per_type: Dict[str, int] = {}
+        for event in removed:
+            per_type[event.event_type] = per_type.get(event.event_type, 0) + 1
+            self._keys.discard((event.event_type, event.node, event.timestamp))
+        for event_type, count in per_type.items():
+            del self._by_type[event_type][:count]
+            if not self._by_type[event_type]:
+                del self._by_type[event_type]
+        self.evicted += drop
+    
+    def first(self, event_type: str, since: Optional[float] = None) -> Optional[Any]:
+        """
+        Primeiro evento de um tipo (opcionalmente a partir de um timestamp)
+        
+        Para eventos de estado, uma sequência iniciada antes de `since` mas
+        ainda repetida depois dele também conta (o estado vale em `since`).
+        
+        Args:
+            event_type: Tipo do evento
+            since: Timestamp mínimo (None = qualquer)
+        """
+        events = self._by_type.get(event_type)
+        if not events:
+            return None
+        index = 0 if since is None else bisect.bisect_left(events, since, key=_timestamp)
+        if index < len(events):
+            return events[index]
+        
+        if event_type in self.state_event_types:
+            active = [
+                event for (run_type, node), event in self._runs.items()
+                if run_type == event_type and self._last_seen[(run_type, node)] >= since
+            ]
+            if active:
+                return min(active, key=_timestamp)
+        return None
+    
+    def latest(self, event_type: str) -> Optional[Any]:
+        """Evento mais recente de um tipo"""
+        events = self._by_type.get(event_type)
+        return events[-1] if events else None
+    
+    def of_type(self, event_type: str, since: Optional[float] = None) -> List[Any]:
+        """Eventos de um tipo em ordem cronológica"""
+        events = self._by_type.get(event_type, [])
+        index = 0 if since is None else bisect.bisect_left(events, since, key=_timestamp)
+        return events[index:]
+    
+    def counts(self) -> Dict[str, int]:
+        """Número de eventos retidos por tipo"""
+        return {event_type: len(events) for event_type, events in self._by_type.items()}
+    
+    def _notify(self, event_type: str) -> None:
+        for waiter in self._waiters.get(event_type, ()):
+            waiter.set()
+    
+    async def wait_for(self, event_type: str, since: Optional[float] = None, timeout: float = 60) -> Optional[Any]:
+        """
+        Aguarda o primeiro evento de um tipo com timestamp >= since
+        
+        Acorda apenas quando chega um evento do tipo esperado.
+        
+        Args:
+            event_type: Tipo do evento
+            since: Timestamp mínimo (None = qualquer)
+            timeout: Timeout em segundos
+        
+        Returns:
+            Evento ou None se timeout
+        """
+        event = self.first(event_type, since)
+        if event:
+            return event
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waiter = asyncio.Event()
+        self._waiters.setdefault(event_type, set()).add(waiter)
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return self.first(event_type, since)
+                
+                waiter.clear()
+                event = self.first(event_type, since)
+                if event:
+                    return event
+        finally:
+            self._waiters[event_type].discard(waiter)
+            if not self._waiters[event_type]:
+                del self._waiters[event_type]
@@ -1,22 +1,97 @@
 """
 Gerenciador de arquivos JSONL
+
+Arquivos podem ser comprimidos (gzip ou zstd) em blocos independentes: cada
+flush fecha um membro gzip / frame zstd, então um arquivo interrompido no
+meio continua legível até o último bloco completo.
 """
+import atexit
+import gzip
+import io
 import json
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Iterator, BinaryIO
+
+from ..models.records import encode_record, decode_record, is_envelope, TYPE_KEY
+
+try:
+    import orjson
+except ImportError:  # Dependência opcional (ver requirements.txt)
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Dependência opcional (ver requirements.txt)
+    zstandard = None
+
+
+# Erros de um bloco comprimido final truncado (escrita interrompida)
+TRUNCATED_CHUNK_ERRORS = (EOFError,) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+# Extensão do arquivo por compressão
+COMPRESSION_SUFFIXES = {None: ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Serializa uma linha JSONL (orjson quando instalado, senão json)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # Tipo não suportado pelo orjson: json padrão decide
+    return (json.dumps(payload, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _loads(line: bytes) -> Dict[str, Any]:
+    """Desserializa uma linha JSONL"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
 
 
 class JSONLWriter:
-    """Escreve dados em formato JSONL (JSON Lines)"""
+    """
+    Escreve dados em formato JSONL (JSON Lines)
+    
+    Mantém um único handle bufferizado (aberto na primeira escrita) em vez de
+    abrir/fechar o arquivo a cada registro. O buffer é descarregado por uma
+    thread a cada flush_interval, em checkpoint() (com fsync) e em close().
     
-    def __init__(self, output_dir: Path, prefix: str, run_id: str, subdirs: list = None):
+    Uso:
+        with JSONLWriter(output_dir, "rto", run_id) as writer:
+            writer.write(metrics)
+    
+    Writers não fechados explicitamente são fechados no fim do processo.
+    """
+    
+    def __init__(
+        self,
+        output_dir: Path,
+        prefix: str,
+        run_id: str,
+        subdirs: list = None,
+        buffer_size: int = 256 * 1024,
+        flush_interval: Optional[float] = 1.0,
+        fsync: bool = False,
+        compression: Optional[str] = None,
+        chunk_size: int = 1024 * 1024,
+        compression_level: Optional[int] = None
+    ):
         """
         Args:
             output_dir: Diretório base para salvar arquivos
             prefix: Prefixo do arquivo (ex: 'rto', 'rpo', 'performance')
             run_id: ID único do run
             subdirs: Lista de subdiretórios adicionais (ex: ['select_only', '10'])
+            buffer_size: Tamanho do buffer do handle em bytes
+            flush_interval: Intervalo da thread de flush em segundos (None = só em checkpoint/close)
+            fsync: fsync a cada flush da thread (durável, mais lento)
+            compression: None, 'gzip' ou 'zstd' (sem o pacote zstandard, usa gzip)
+            chunk_size: Bytes não comprimidos por bloco (um bloco também fecha a cada flush)
+            compression_level: Nível de compressão (padrão: 6 no gzip, 3 no zstd)
         """
         self.output_dir = Path(output_dir)
         
@@ -27,26 +102,88 @@ class JSONLWriter:
         
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Compressão não suportada: {compression}")
+        if compression == "zstd" and zstandard is None:
+            print("⚠️  zstandard não instalado - usando gzip (pip install zstandard)")
+            compression = "gzip"
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self._chunk = bytearray()
+        
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = f"{prefix}_{timestamp}_{run_id}.jsonl"
+        filename = f"{prefix}_{timestamp}_{run_id}{COMPRESSION_SUFFIXES[compression]}"
         self.filepath = self.output_dir / filename
+        
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        
+        self._file = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.records_written = 0
+    
+    def __enter__(self) -> "JSONLWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _open(self) -> None:
+        """Abre o handle (append, binário) e inicia a thread de flush"""
+        self._file = open(self.filepath, 'ab', buffering=self.buffer_size)
+        atexit.register(self.close)
+        
+        if self.flush_interval:
+            self._stop.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name=f"jsonl-flush-{self.filepath.name}", daemon=True
+            )
+            self._flusher.start()
+    
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            if self._dirty:
+                self.flush(fsync=self.fsync)
     
     def write(self, data: Any) -> None:
         """
-        Escreve uma linha JSONL
+        Escreve uma linha JSONL (no buffer; vai ao disco no próximo flush)
+        
+        Modelos registrados em src.models.records vão no envelope versionado.
         
         Args:
             data: Objeto com método to_json() ou dicionário
         """
-        with open(self.filepath, 'a') as f:
-            if hasattr(data, 'to_json'):
-                payload = data.to_json()
-            elif isinstance(data, dict):
-                payload = data
+        line = _dumps(encode_record(data))
+        with self._lock:
+            if self._file is None:
+                self._open()
+            if self.compression:
+                self._chunk += line
+                if len(self._chunk) >= self.chunk_size:
+                    self._write_chunk()
             else:
-                raise ValueError(f"Tipo não suportado: {type(data)}")
-            
-            f.write(json.dumps(payload, ensure_ascii=False) + '\n')
+                self._file.write(line)
+            self._dirty = True
+            self.records_written += 1
+    
+    def _write_chunk(self) -> None:
+        """Comprime o bloco pendente como um membro gzip / frame zstd independente"""
+        if not self._chunk:
+            return
+        data = bytes(self._chunk)
+        if self.compression == "zstd":
+            level = self.compression_level if self.compression_level is not None else 3
+            self._file.write(zstandard.ZstdCompressor(level=level).compress(data))
+        else:
+            level = self.compression_level if self.compression_level is not None else 6
+            self._file.write(gzip.compress(data, compresslevel=level, mtime=0))
+        self._chunk.clear()
     
     def write_metadata(self, metadata: Dict[str, Any]) -> None:
         """Escreve metadados do teste"""
@@ -56,13 +193,144 @@ class JSONLWriter:
             "data": metadata
         })
     
+    def flush(self, fsync: bool = False) -> None:
+        """
+        Descarrega o buffer no arquivo
+        
+        Args:
+            fsync: Também força a gravação em disco (os.fsync)
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_chunk()
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+            self._dirty = False
+    
+    def checkpoint(self) -> None:
+        """Ponto durável: tudo o que foi escrito até aqui está em disco"""
+        self.flush(fsync=True)
+    
+    def close(self) -> None:
+        """Descarrega (com fsync) e fecha o handle; idempotente, write() reabre"""
+        flusher, self._flusher = self._flusher, None
+        if flusher:
+            self._stop.set()
+            flusher.join()
+        
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._write_chunk()
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+                self._dirty = False
+        atexit.unregister(self.close)
+    
     def get_filepath(self) -> Path:
         """Retorna o caminho do arquivo"""
         return self.filepath
 
 
 class JSONLReader:
-    """Lê arquivos JSONL"""
+    """
+    Lê arquivos JSONL (.jsonl, .jsonl.gz ou .jsonl.zst)
+    
+    iter_records() percorre o arquivo em streaming, sem carregar tudo na
+    memória; read_file()/read_by_type() materializam a lista.
+    """
+    
+    @staticmethod
+    def _open(filepath: Path) -> BinaryIO:
+        """Abre o arquivo em modo binário, descomprimindo pela extensão"""
+        filepath = Path(filepath)
+        if filepath.suffix == ".gz":
+            return gzip.open(filepath, 'rb')
+        if filepath.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError(f"zstandard não instalado - necessário para ler {filepath.name}")
+            raw = open(filepath, 'rb')
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+            return io.BufferedReader(reader)
+        return open(filepath, 'rb')
+    
+    @staticmethod
+    def iter_records(filepath: Path, data_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre os registros de um arquivo JSONL em streaming
+        
+        Linhas que não contêm o tipo procurado são descartadas antes do parse.
+        Uma escrita interrompida encerra a leitura no último registro completo:
+        bloco comprimido final truncado (gzip/zstd) ou última linha sem '\n'
+        que não é um JSON válido (texto puro).
+        
+        Args:
+            filepath: Caminho do arquivo
+            data_type: Filtra pelo campo 'type' (None = todos)
+        
+        Yields:
+            Dicionário de cada registro
+        """
+        needle = f'"{data_type}"'.encode('utf-8') if data_type else None
+        with JSONLReader._open(filepath) as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if needle and needle not in line:
+                        continue
+                    if line.endswith(b"\n"):
+                        obj = _loads(line)
+                    else:
+                        # Sem '\n' só pode ser a última linha: incompleta se não parseia
+                        try:
+                            obj = _loads(line)
+                        except ValueError:
+                            print(f"⚠️  {Path(filepath).name}: última linha incompleta ignorada")
+                            return
+                    if data_type and obj.get(TYPE_KEY) != data_type:
+                        continue
+                    yield obj
+            except TRUNCATED_CHUNK_ERRORS:
+                print(f"⚠️  {Path(filepath).name}: último bloco incompleto ignorado")
+    
+    @staticmethod
+    def iter_typed(filepath: Path, record_type: Optional[str] = None) -> Iterator[Any]:
+        """
+        Percorre os registros versionados já decodificados nos modelos
+        
+        Metadados e linhas sem envelope são ignorados.
+        
+        Args:
+            filepath: Caminho do arquivo
+            record_type: Tipo registrado (ex: 'performance_metrics'; None = todos)
+        
+        Yields:
+            Instâncias dos modelos (PerformanceMetrics, RTOMetrics, ...)
+        """
+        for record in JSONLReader.iter_records(filepath, record_type):
+            if is_envelope(record):
+                yield decode_record(record)
+    
+    @staticmethod
+    def iter_files(base_dir: Path, prefix: str = "") -> Iterator[Path]:
+        """
+        Arquivos JSONL (comprimidos ou não) abaixo de um diretório, em ordem
+        
+        Args:
+            base_dir: Diretório base
+            prefix: Prefixo do nome (ex: 'performance_')
+        """
+        suffixes = tuple(COMPRESSION_SUFFIXES.values())
+        for filepath in sorted(Path(base_dir).rglob(f"{prefix}*.jsonl*")):
+            if filepath.name.endswith(suffixes):
+                yield filepath
     
     @staticmethod
     def read_file(filepath: Path) -> list:
@@ -75,11 +343,7 @@ class JSONLReader:
         Returns:
             Lista de dicionários
         """
-        data = []
-        with open(filepath, 'r') as f:
-            for line in f:
-                data.append(json.loads(line.strip()))
-        return data
+        return list(JSONLReader.iter_records(filepath))
     
     @staticmethod
     def read_by_type(filepath: Path, data_type: str) -> list:
@@ -93,10 +357,4 @@ class JSONLReader:
         Returns:
             Lista de dicionários filtrados
         """
-        data = []
-        with open(filepath, 'r') as f:
-            for line in f:
-                obj = json.loads(line.strip())
-                if obj.get('type') == data_type:
-                    data.append(obj)
-        return data
+        return list(JSONLReader.iter_records(filepath, data_type))
@@ -0,0 +1,220 @@
+"""
+Streaming dos logs dos containers do cluster durante os testes de resiliência
+
+Acompanha `docker logs -f --timestamps` de cada container e converte as linhas
+que casam com o catálogo de padrões em eventos com o timestamp do próprio log
+(resolução de nanossegundos do Docker), em vez do instante em que o polling
+percebeu a mudança.
+"""
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Callable, Dict, Any, Pattern, Tuple
+
+from .config import config
+from .docker_manager import DockerManager
+from .pgpool_manager import FAILOVER_LOG_PATTERNS
+
+
+@dataclass
+class LogPattern:
+    """Entrada do catálogo: linhas de `sources` que casam com `regex` viram `event_type`"""
+    event_type: str
+    regex: Pattern
+    sources: Tuple[str, ...] = ("patroni", "etcd", "pgpool")  # Papéis dos containers
+    
+    def match(self, source: str, message: str) -> Optional[Dict[str, Any]]:
+        """Grupos nomeados do match ou None"""
+        if source not in self.sources:
+            return None
+        found = self.regex.search(message)
+        return found.groupdict() if found else None
+
+
+# Catálogo padrão (Patroni 3.x / PostgreSQL 16 / etcd 3.5 JSON / hooks do PgPool)
+DEFAULT_LOG_PATTERNS: List[LogPattern] = [
+    # Patroni
+    LogPattern("patroni_leader_promoted", re.compile(r"promoted self to leader"), ("patroni",)),
+    LogPattern("patroni_lock_acquired", re.compile(r"acquired session lock as a leader"), ("patroni",)),
+    LogPattern("patroni_demoting", re.compile(r"[Dd]emot(?:ing|ed) (?:self|myself)"), ("patroni",)),
+    LogPattern("patroni_following_new_leader", re.compile(r"following (?:a different|new) leader"), ("patroni",)),
+    LogPattern("patroni_failover_key_cleaned", re.compile(r"Cleaning up failover key"), ("patroni",)),
+    
+    # PostgreSQL (stdout do container Patroni)
+    LogPattern("postgres_promote_requested", re.compile(r"received promote request"), ("patroni",)),
+    LogPattern("postgres_new_timeline", re.compile(r"selected new timeline ID: (?P<timeline>\d+)"), ("patroni",)),
+    LogPattern("postgres_ready", re.compile(r"database system is ready to accept (?:read-only )?connections"), ("patroni",)),
+    LogPattern("postgres_replication_lost", re.compile(
+        r"could not (?:connect to the primary server|receive data from WAL stream)"), ("patroni",)),
+    LogPattern("postgres_streaming_started", re.compile(r"started streaming WAL from primary"), ("patroni",)),
+    
+    # etcd
+    LogPattern("etcd_election_started", re.compile(r"is starting a new election at term (?P<term>\d+)"), ("etcd",)),
+    LogPattern("etcd_leader_lost", re.compile(r"lost leader (?P<leader>\w+) at term (?P<term>\d+)"), ("etcd",)),
+    LogPattern("etcd_leader_elected", re.compile(r"elected leader (?P<leader>\w+) at term (?P<term>\d+)"), ("etcd",)),
+] + [
+    # PgPool: mesmos padrões usados por PgPoolManager.get_failover_log_events
+    LogPattern(event_type, regex, ("pgpool",)) for event_type, regex in FAILOVER_LOG_PATTERNS
+]
+
+
+def container_source(container_name: str) -> str:
+    """Papel do container no cluster ('patroni', 'etcd', 'pgpool' ou 'other')"""
+    if container_name in config.patroni_nodes:
+        return "patroni"
+    if container_name in config.etcd_nodes:
+        return "etcd"
+    if container_name == config.pgpool_name:
+        return "pgpool"
+    return "other"
+
+
+class ContainerLogTailer:
+    """
+    Segue os logs de vários containers e extrai eventos pelo catálogo de padrões
+    
+    Uso:
+        tailer = ContainerLogTailer(on_event=lambda e: print(e))
+        tailer.start()
+        # ... injeta falha ...
+        tailer.stop()
+        events = tailer.get_events()
+    
+    on_event é chamado na thread de leitura de cada container; quem consome
+    em asyncio deve repassar com loop.call_soon_threadsafe.
+    """
+    
+    def __init__(
+        self,
+        containers: Optional[List[str]] = None,
+        patterns: Optional[List[LogPattern]] = None,
+        on_event: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Args:
+            containers: Containers a seguir (None = config.all_containers)
+            patterns: Catálogo de padrões (None = DEFAULT_LOG_PATTERNS)
+            on_event: Callback para cada ClusterEvent extraído
+        """
+        self.containers = containers or config.all_containers
+        self.patterns = list(patterns if patterns is not None else DEFAULT_LOG_PATTERNS)
+        self.on_event = on_event
+        
+        self.events: List[Any] = []
+        self.lines_read = 0
+        
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._running = False
+    
+    def add_pattern(self, event_type: str, regex: str, sources: Tuple[str, ...] = ("patroni", "etcd", "pgpool")):
+        """Acrescenta um padrão ao catálogo (antes de start())"""
+        self.patterns.append(LogPattern(event_type, re.compile(regex), tuple(sources)))
+    
+    def start(self, since: Optional[float] = None) -> None:
+        """
+        Inicia um `docker logs -f` por container
+        
+        Args:
+            since: Epoch (s) a partir do qual ler (None = agora)
+        """
+        if self._running:
+            return
+        
+        self._running = True
+        self.events.clear()
+        self.lines_read = 0
+        since = since if since is not None else time.time()
+        
+        for container in self.containers:
+            try:
+                process = subprocess.Popen(
+                    ["docker", "logs", "-f", "--timestamps", "--since", f"{since:.3f}", container],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    bufsize=1
+                )
+            except Exception as e:
+                print(f"⚠️  Não foi possível seguir os logs de {container}: {e}")
+                continue
+            
+            self._processes[container] = process
+            thread = threading.Thread(
+                target=self._follow,
+                args=(container, container_source(container), process),
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        
+        print(f"📜 Seguindo logs de {len(self._processes)} containers ({len(self.patterns)} padrões)")
+    
+    def stop(self, drain_seconds: float = 0.5) -> None:
+        """
+        Encerra os streams
+        
+        Args:
+            drain_seconds: Espera antes de encerrar, para as últimas linhas chegarem
+        """
+        if not self._running:
+            return
+        
+        time.sleep(drain_seconds)
+        self._running = False
+        
+        for process in self._processes.values():
+            process.terminate()
+        for process in self._processes.values():
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        
+        self._processes.clear()
+        self._threads.clear()
+        print(f"📜 Logs encerrados ({self.lines_read} linhas, {len(self.events)} eventos)")
+    
+    def _follow(self, container: str, source: str, process: subprocess.Popen) -> None:
+        """Lê o stream de um container (thread)"""
+        # Import local: cluster_observer importa este módulo
+        from .cluster_observer import ClusterEvent
+        
+        for line in process.stdout:
+            self.lines_read += 1
+            timestamp, message = DockerManager.split_log_timestamp(line.rstrip('\n'))
+            if timestamp is None:
+                continue
+            
+            for pattern in self.patterns:
+                groups = pattern.match(source, message)
+                if groups is None:
+                    continue
+                
+                event = ClusterEvent(
+                    event_type=pattern.event_type,
+                    node=container,
+                    timestamp=timestamp,
+                    data={**groups, 'source': 'log', 'line': message.strip()}
+                )
+                with self._lock:
+                    self.events.append(event)
+                if self.on_event:
+                    try:
+                        self.on_event(event)
+                    except Exception as e:
+                        print(f"⚠️  Erro em callback de log: {e}")
+                break
+    
+    def get_events(self, event_type: Optional[str] = None) -> List[Any]:
+        """Eventos extraídos em ordem cronológica (opcionalmente de um tipo)"""
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e.timestamp)
+        if event_type:
+            events = [e for e in events if e.event_type == event_type]
+        return events
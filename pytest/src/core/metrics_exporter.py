@@ -0,0 +1,340 @@
+"""
+Exportador das métricas do próprio harness no formato de exposição do Prometheus
+
+As medições do harness (progresso do pgbench, eventos do observador, probes de
+disponibilidade, docker stats) são publicadas ao vivo, enquanto o teste roda,
+para sobrepor a vazão vista pelos clientes aos dados do postgres_exporter e do
+pgpool_exporter em campanhas longas.
+
+Duas saídas (independentes, ambas opcionais):
+- endpoint HTTP /metrics (servidor embutido, thread daemon);
+- arquivo texto reescrito periodicamente de forma atômica (textfile collector
+  do node_exporter).
+
+Só biblioteca padrão. Os coletores atualizam o registro global `harness_metrics`
+sempre (custo de um lock e um dict); nada é exposto até o exportador iniciar.
+
+Uso:
+    exporter = MetricsExporter(port=9464, textfile="outputs/harness.prom")
+    exporter.start()
+    harness_metrics.gauge("pgbench_tps", "TPS do último intervalo").set(1234.5, cell="baseline")
+    exporter.stop()
+"""
+import abc
+import bisect
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets de latência em ms (probes e pgbench)
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(abc.ABC):
+    """Família de séries (uma por combinação de labels)"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._series: Dict[LabelKey, object] = {}
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+    
+    @abc.abstractmethod
+    def _samples(self) -> List[str]:
+        """Linhas de amostra da família (chamado com o lock adquirido)"""
+    
+    def expose(self) -> str:
+        with self._lock:
+            samples = self._samples()
+        header = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(samples)
+
+
+class Gauge(_Metric):
+    """Valor instantâneo"""
+    
+    kind = "gauge"
+    
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._series[_label_key(labels)] = float(value)
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+    
+    def remove(self, **labels) -> None:
+        with self._lock:
+            self._series.pop(_label_key(labels), None)
+    
+    def get(self, **labels) -> Optional[float]:
+        return self._series.get(_label_key(labels))
+    
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}\n"
+                for key, value in self._series.items()]
+
+
+class Counter(_Metric):
+    """Contador monotônico (exposto com sufixo _total)"""
+    
+    kind = "counter"
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+    
+    def get(self, **labels) -> Optional[float]:
+        return self._series.get(_label_key(labels))
+    
+    def _samples(self) -> List[str]:
+        return [f"{self.name}_total{_format_labels(key)} {_format_value(value)}\n"
+                for key, value in self._series.items()]
+
+
+class Histogram(_Metric):
+    """Distribuição em buckets cumulativos (_bucket, _sum, _count)"""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1  # Contagem não cumulativa; acumulada na exposição
+            series[1] += value
+    
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}\n")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}\n")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}\n")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registro das famílias de métricas (get-or-create por nome)
+    
+    Todos os nomes recebem o prefixo do registro (padrão: 'pg_ha_harness_').
+    """
+    
+    def __init__(self, prefix: str = "pg_ha_harness_"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def _get(self, cls, name: str, help_text: str, **kwargs) -> _Metric:
+        full_name = self.prefix + name
+        metric = self._metrics.get(full_name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(full_name)
+                if metric is None:
+                    metric = self._metrics[full_name] = cls(full_name, help_text, **kwargs)
+        if type(metric) is not cls:
+            raise ValueError(f"Métrica {full_name} já registrada como {metric.kind}")
+        return metric
+    
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get(Gauge, name, help_text)
+    
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get(Counter, name, help_text)
+    
+    def histogram(self, name: str, help_text: str = "",
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+    
+    def clear(self) -> None:
+        """Zera todas as séries (as famílias continuam registradas)"""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+    
+    def expose(self) -> str:
+        """Texto no formato de exposição do Prometheus (0.0.4)"""
+        return "".join(metric.expose() for metric in list(self._metrics.values()))
+
+
+# Registro global alimentado pelos coletores
+harness_metrics = MetricsRegistry()
+
+
+class MetricsExporter:
+    """
+    Publica um MetricsRegistry via HTTP e/ou arquivo texto
+    
+    Uso:
+        with MetricsExporter(port=9464) as exporter:
+            ...  # curl http://localhost:9464/metrics
+    """
+    
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        port: Optional[int] = None,
+        host: str = "0.0.0.0",
+        textfile: Optional[Union[str, Path]] = None,
+        textfile_interval: float = 5.0
+    ):
+        """
+        Args:
+            registry: Registro exposto (padrão: harness_metrics)
+            port: Porta do endpoint /metrics (None = sem HTTP; 0 = porta livre)
+            host: Endereço de escuta
+            textfile: Arquivo .prom reescrito periodicamente (None = sem arquivo)
+            textfile_interval: Intervalo de escrita do arquivo (s)
+        """
+        self.registry = registry or harness_metrics
+        self.port = port
+        self.host = host
+        self.textfile = Path(textfile) if textfile else None
+        self.textfile_interval = textfile_interval
+        
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+    
+    @property
+    def url(self) -> Optional[str]:
+        if not self._server:
+            return None
+        host = "localhost" if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self._server.server_address[1]}/metrics"
+    
+    def _handler(self):
+        registry = self.registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.expose().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Scrapes periódicos não poluem a saída do pytest
+        
+        return Handler
+    
+    def write_textfile(self) -> None:
+        """Reescreve o arquivo texto (tmp + rename: o leitor nunca vê arquivo parcial)"""
+        if not self.textfile:
+            return
+        self.textfile.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.textfile.with_name(f".{self.textfile.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.registry.expose())
+        tmp.replace(self.textfile)
+    
+    def _textfile_loop(self) -> None:
+        while not self._stop.wait(self.textfile_interval):
+            try:
+                self.write_textfile()
+            except OSError as e:
+                print(f"⚠️  Falha ao escrever {self.textfile}: {e}")
+    
+    def start(self) -> bool:
+        """
+        Inicia o servidor HTTP e/ou a escrita periódica do arquivo
+        
+        Returns:
+            False se o servidor HTTP não pôde ser iniciado
+        """
+        self._stop.clear()
+        if self.port is not None and not self._server:
+            try:
+                self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+            except OSError as e:
+                print(f"❌ Exportador de métricas não iniciado na porta {self.port}: {e}")
+                return False
+            self._server.daemon_threads = True
+            thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            print(f"📡 Métricas do harness em {self.url}")
+        
+        if self.textfile:
+            thread = threading.Thread(target=self._textfile_loop, name="metrics-textfile", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            print(f"📡 Métricas do harness em {self.textfile} (a cada {self.textfile_interval}s)")
+        return True
+    
+    def stop(self) -> None:
+        """Para as threads (o arquivo recebe uma última escrita com o estado final)"""
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        if self.textfile:
+            try:
+                self.write_textfile()
+            except OSError as e:
+                print(f"⚠️  Falha ao escrever {self.textfile}: {e}")
+    
+    def __enter__(self) -> "MetricsExporter":
+        self.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,356 @@
+"""
+Cliente nativo do PCP (Pgpool Control Protocol)
+
+Fala o protocolo binário do PCP diretamente via TCP (porta 9898), com uma
+sessão autenticada persistente. Evita um `docker exec pcp_*` (fork + login)
+por operação: reanexar nós após failover passa de segundos para milissegundos.
+
+Formato das mensagens (ambos os sentidos):
+    tag (1 byte) | tamanho (int32 big-endian, inclui os 4 bytes) | payload
+
+O payload é uma sequência de strings terminadas em NUL. Respostas começam com
+"CommandComplete" (ou "ArraySize"/"ProcessInfo"/"ProcessConfig" nas respostas
+em várias mensagens); a tag 'E' indica erro.
+"""
+import hashlib
+import socket
+import struct
+import threading
+from typing import Optional, Dict, List, Tuple
+
+from .config import config
+from ..models.pgpool_metrics import PoolNode, PoolPool
+
+
+# backend_status / role do pgpool (src/include/pool.h)
+BACKEND_STATUS = {0: "unused", 1: "waiting", 2: "up", 3: "down", 4: "quarantine"}
+BACKEND_ROLE = {0: "main", 1: "replica", 2: "primary", 3: "standby"}
+
+# Ordem dos campos de inform_node_info (pcp_worker.c, pgpool 4.2+)
+NODE_INFO_FIELDS = (
+    "hostname", "port", "status", "pg_status", "lb_weight", "role", "pg_role",
+    "replication_delay_by_time", "replication_delay", "replication_state",
+    "replication_sync_state", "last_status_change",
+)
+
+# Ordem dos campos de inform_process_info (mesma ordem da saída do pcp_proc_info)
+PROC_INFO_FIELDS = (
+    "database", "username", "start_time", "client_connection_count",
+    "majorversion", "minorversion", "backend_connection_time", "client_connection_time",
+    "client_idle_duration", "client_disconnection_time", "pool_counter", "pool_backendpid",
+    "pool_connected", "pool_pid", "backend_id", "status", "load_balance_node",
+    "client_host", "client_port", "statement",
+)
+
+
+class PCPError(Exception):
+    """Erro reportado pelo servidor PCP ou falha de comunicação"""
+
+
+class PCPConnectionError(PCPError):
+    """Sessão PCP indisponível (conexão, autenticação ou socket): o servidor não respondeu à operação"""
+
+
+class PCPClient:
+    """
+    Sessão PCP persistente
+    
+    Uso:
+        with PCPClient() as pcp:
+            for node in pcp.nodes_info():
+                if node.is_down:
+                    pcp.attach_node(node.node_id)
+    
+    A conexão é aberta na primeira operação e reaberta automaticamente (uma
+    vez) se o pgpool a tiver fechado. Thread-safe: operações são serializadas.
+    """
+    
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 10.0
+    ):
+        """
+        Args:
+            host: Host do PCP (padrão: localhost, porta publicada no host)
+            port: Porta do PCP (padrão: PGPOOL_PCP_HOST_PORT do .env)
+            user: Usuário PCP (padrão: PGPOOL_PCP_USER)
+            password: Senha PCP (padrão: PGPOOL_PCP_PASSWORD)
+            timeout: Timeout de socket em segundos
+        """
+        self.host = host or config.pgpool_pcp_host
+        self.port = port or config.pgpool_pcp_port
+        self.user = user or config.pgpool_admin_user
+        self.password = password or config.pgpool_admin_password
+        self.timeout = timeout
+        
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> "PCPClient":
+        self.connect()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    @property
+    def connected(self) -> bool:
+        """Sessão aberta e autenticada"""
+        return self._sock is not None
+    
+    def connect(self) -> None:
+        """Abre a conexão TCP e autentica (md5 com salt)"""
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+    
+    def _connect(self) -> None:
+        try:
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._authenticate()
+        except (OSError, PCPError) as e:
+            self._drop()
+            raise PCPConnectionError(f"Falha ao conectar ao PCP em {self.host}:{self.port}: {e}") from e
+    
+    @staticmethod
+    def auth_token(user: str, password: str, salt: bytes) -> str:
+        """
+        Token md5 do PCP (pcp_authorize da libpcp)
+        
+        md5(md5(<md5 da senha> + usuário) + salt), onde <md5 da senha> é o
+        hash hexadecimal de pg_md5 guardado no pcp.conf ('usuário:md5').
+        """
+        password_md5 = hashlib.md5(password.encode()).hexdigest()
+        user_md5 = hashlib.md5((password_md5 + user).encode()).hexdigest()
+        return hashlib.md5(user_md5.encode() + salt).hexdigest()
+    
+    def _authenticate(self) -> None:
+        """Autenticação do PCP: pede o salt ('M') e envia ('R') usuário e token md5"""
+        self._send(b"M")
+        tag, fields = self._recv()
+        if tag != b"m" or not fields:
+            raise PCPError(f"Resposta inesperada ao pedido de salt: {tag!r}")
+        salt = fields[0][:4]
+        
+        self._send(b"R", self.user, self.auth_token(self.user, self.password, salt))
+        
+        tag, fields = self._recv()
+        if tag != b"r":
+            raise PCPError(f"Autenticação PCP recusada: {tag!r}")
+    
+    def close(self) -> None:
+        """Encerra a sessão ('X') e fecha o socket"""
+        with self._lock:
+            if self._sock is None:
+                return
+            try:
+                self._send(b"X")
+            except OSError:
+                pass
+            self._drop()
+    
+    def _drop(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+    
+    def _send(self, tag: bytes, *fields) -> None:
+        payload = b"".join(
+            (f if isinstance(f, bytes) else str(f).encode()) + b"\0" for f in fields
+        )
+        self._sock.sendall(tag + struct.pack("!i", len(payload) + 4) + payload)
+    
+    def _recv_exact(self, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            chunk = self._sock.recv(size)
+            if not chunk:
+                raise ConnectionResetError("Conexão PCP encerrada pelo servidor")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+    
+    def _recv(self) -> Tuple[bytes, List[bytes]]:
+        """
+        Lê uma mensagem do servidor
+        
+        Returns:
+            (tag, campos do payload separados por NUL)
+        
+        Raises:
+            PCPError: Mensagem de erro ('E') do pgpool
+        """
+        while True:
+            tag = self._recv_exact(1)
+            (length,) = struct.unpack("!i", self._recv_exact(4))
+            payload = self._recv_exact(length - 4) if length > 4 else b""
+            
+            if tag == b"m":
+                # Salt é binário: não separar por NUL
+                return tag, [payload]
+            
+            fields = payload.split(b"\0")
+            if fields and fields[-1] == b"":
+                fields.pop()
+            
+            if tag == b"N":
+                continue  # Notice: ignora
+            if tag == b"E":
+                raise PCPError(self._error_message(fields))
+            return tag, fields
+    
+    @staticmethod
+    def _error_message(fields: List[bytes]) -> str:
+        """Extrai severidade/mensagem/detalhe dos campos ('S', 'M', 'D') da mensagem de erro"""
+        parts = {}
+        for field in fields:
+            if field:
+                parts.setdefault(chr(field[0]), field[1:].decode(errors="replace"))
+        message = parts.get("M") or b" ".join(fields).decode(errors="replace")
+        if parts.get("D"):
+            message += f" ({parts['D']})"
+        return f"{parts.get('S', 'ERROR')}: {message}"
+    
+    def _request(self, tag: bytes, *fields) -> List[List[bytes]]:
+        """
+        Envia uma requisição e lê a(s) resposta(s)
+        
+        Respostas de várias mensagens (proc info, pool status) terminam com um
+        "CommandComplete"; as demais são uma única mensagem.
+        
+        Returns:
+            Lista com os campos de cada mensagem da resposta
+        """
+        with self._lock:
+            for attempt in (1, 2):
+                if self._sock is None:
+                    self._connect()
+                try:
+                    return self._exchange(tag, *fields)
+                except PCPError:
+                    raise
+                except OSError as e:
+                    # Sessão caiu (pgpool reiniciado, pcp_child encerrado): reconecta uma vez
+                    self._drop()
+                    if attempt == 2:
+                        raise PCPConnectionError(f"Falha de comunicação com o PCP: {e}") from e
+    
+    def _exchange(self, tag: bytes, *fields) -> List[List[bytes]]:
+        self._send(tag, *fields)
+        messages = []
+        expected = None
+        while True:
+            _, payload = self._recv()
+            if not payload:
+                raise PCPError(f"Resposta vazia para {tag!r}")
+            kind = payload[0]
+            
+            if kind == b"ArraySize":
+                expected = int(payload[1]) if len(payload) > 1 else 0
+                if expected == 0:
+                    return messages
+                continue
+            if kind == b"CommandComplete":
+                if expected is None:
+                    return [payload[1:]]
+                return messages
+            
+            messages.append(payload[1:])
+    
+    @staticmethod
+    def _decode(fields: List[bytes]) -> List[str]:
+        return [f.decode(errors="replace") for f in fields]
+    
+    def node_count(self) -> int:
+        """Número de backends configurados (pcp_node_count)"""
+        (fields,) = self._request(b"L")
+        return int(fields[0])
+    
+    def node_info(self, node_id: int) -> PoolNode:
+        """
+        Estado de um backend (pcp_node_info)
+        
+        Args:
+            node_id: ID do nó
+        
+        Returns:
+            PoolNode com status/role convertidos para os nomes do SHOW POOL_NODES
+        """
+        (fields,) = self._request(b"I", node_id)
+        row = dict(zip(NODE_INFO_FIELDS, self._decode(fields)))
+        row["node_id"] = str(node_id)
+        for key, names in (("status", BACKEND_STATUS), ("pg_status", BACKEND_STATUS),
+                           ("role", BACKEND_ROLE), ("pg_role", BACKEND_ROLE)):
+            value = row.get(key)
+            if value is not None and value.isdigit():
+                row[key] = names.get(int(value), value)
+        return PoolNode.from_row(row)
+    
+    def nodes_info(self) -> List[PoolNode]:
+        """Estado de todos os backends"""
+        return [self.node_info(node_id) for node_id in range(self.node_count())]
+    
+    def attach_node(self, node_id: int) -> bool:
+        """Anexa um nó ao pool (pcp_attach_node)"""
+        self._request(b"C", node_id)
+        return True
+    
+    def detach_node(self, node_id: int, gracefully: bool = False) -> bool:
+        """
+        Desanexa um nó do pool (pcp_detach_node)
+        
+        Args:
+            node_id: ID do nó
+            gracefully: Espera as sessões clientes terminarem
+        """
+        self._request(b"d" if gracefully else b"D", node_id)
+        return True
+    
+    def promote_node(self, node_id: int, gracefully: bool = False) -> bool:
+        """
+        Promove um nó a primário no pgpool (pcp_promote_node)
+        
+        Não executa failover no PostgreSQL: apenas muda o papel no pgpool.
+        """
+        self._request(b"j" if gracefully else b"J", node_id)
+        return True
+    
+    def proc_info(self, pid: Optional[int] = None) -> List[PoolPool]:
+        """
+        Slots de conexão dos processos filhos (pcp_proc_info)
+        
+        Args:
+            pid: PID de um processo filho (None: todos)
+        
+        Returns:
+            Lista de PoolPool (mesmos campos do SHOW POOL_POOLS)
+        """
+        messages = self._request(b"P", pid or 0)
+        return [PoolPool.from_row(dict(zip(PROC_INFO_FIELDS, self._decode(m)))) for m in messages]
+    
+    def pool_status(self) -> Dict[str, str]:
+        """
+        Configuração em execução (pcp_pool_status)
+        
+        Returns:
+            {parâmetro: valor}
+        """
+        status = {}
+        for message in self._request(b"B"):
+            fields = self._decode(message)
+            if len(fields) >= 2:
+                status[fields[0]] = fields[1]
+        return status
+    
+    def reload_config(self) -> bool:
+        """Recarrega pgpool.conf (pcp_reload_config)"""
+        self._request(b"Z")
+        return True
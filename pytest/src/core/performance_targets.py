@@ -0,0 +1,51 @@
+"""
+Alvos dos testes de performance do cluster
+
+Conexão, carga e parâmetros de varredura compartilhados entre os testes de
+performance do cluster (tests/performance), sem import entre módulos de teste.
+"""
+from pathlib import Path
+
+
+# Scripts pgbench customizados (pytest/workloads/)
+WORKLOADS_DIR = Path(__file__).resolve().parents[2] / "workloads"
+
+# Configurações centralizadas
+class ClusterConfig:
+    """Configurações compartilhadas entre fixture e testes"""
+    
+    # Conexão
+    CONTAINER_NAME = "pgbench-client"
+    HOST = "pgpool"
+    PORT = 5432
+    USER = "teste"
+    PASSWORD = "zxwJA9P6C0hie03dwfNNP"
+    DATABASE = "postgres"
+    SCENARIO = "cluster_with_pgpool"
+    
+    # Carga
+    THREADS = 4
+    DURATION = 180
+    SCALE = 2000  # (DEVE SER MAIOR QUE A QT DE RAM DO SISTEMA! SCALE 1 =~ 16MB)
+    LATENCY_LOG_SAMPLING = 0.01  # Fração das transações no log (-l --sampling-rate) das células da matriz
+    
+    # Varredura adaptativa
+    ADAPTIVE_TIME_BUDGET = 1800  # segundos (~10 células de 180s)
+    ADAPTIVE_COARSE_GRID = [10, 50, 100, 200]
+    ADAPTIVE_MAX_CLIENTS = 200
+    
+    # Busca de capacidade sob SLO (malha aberta, pgbench -R)
+    SLO_P99_MS = 50.0
+    SLO_CLIENTS = 100
+    SLO_PROBE_DURATION = 60
+    
+    # Geração de carga distribuída (pgbench-client-2: docker compose --profile sharded)
+    SHARD_CONTAINERS = ["pgbench-client", "pgbench-client-2"]
+    
+    # Mix sintético da produção: {script: peso} (pgbench -f script@peso)
+    CUSTOM_MIX = {
+        str(WORKLOADS_DIR / "read_point.sql"): 60,
+        str(WORKLOADS_DIR / "read_range.sql"): 15,
+        str(WORKLOADS_DIR / "write_update.sql"): 20,
+        str(WORKLOADS_DIR / "read_after_write.sql"): 5,
+    }
@@ -1,9 +1,30 @@
 """
 Gerenciador de operações PgPool-II
 """
-from typing import Optional, Dict, Any
+import re
+from datetime import datetime
+from typing import Optional, Dict, Any, List
 from .docker_manager import DockerManager
 from .config import config
+from .pcp_client import PCPClient, PCPError, PCPConnectionError
+from ..models.pgpool_metrics import PoolNode, PoolProcess, PoolPool, PoolCache, PgPoolSnapshot
+
+
+# Linhas do log do container PgPool que marcam etapas do failover.
+# Hooks: logging.sh escreve "<ts> [failover.sh] --- INÍCIO DO <processo> ---" / "--- FIM DO ..."
+FAILOVER_LOG_PATTERNS = [
+    ("pgpool_health_check_failed", re.compile(r"health check failed on node (?P<node_id>\d+)")),
+    ("pgpool_degeneration_started", re.compile(r"starting degeneration\. shutdown host (?P<host>[^(\s]+)")),
+    ("pgpool_failover_started", re.compile(r"\[failover\.sh\] --- INÍCIO DO")),
+    ("pgpool_failover_finished", re.compile(r"\[failover\.sh\] --- FIM DO(?:.*?Duração: (?P<duration>[\d.]+))?")),
+    ("pgpool_new_primary_set", re.compile(r"set new primary node: (?P<node_id>\d+)")),
+    ("pgpool_failover_done", re.compile(r"failover done\. shutdown host (?P<host>[^(\s]+)")),
+    ("pgpool_follow_primary_started", re.compile(r"\[follow_primary\.sh\] --- INÍCIO DO")),
+    ("pgpool_follow_primary_finished", re.compile(r"\[follow_primary\.sh\] --- FIM DO(?:.*?Duração: (?P<duration>[\d.]+))?")),
+]
+
+# Marcador que separa os resultados de vários comandos na mesma sessão psql
+SECTION_MARKER = "##PGPOOL_SECTION "
 
 
 class PgPoolManager:
@@ -25,6 +46,49 @@ class PgPoolManager:
         self.pgpool_admin_user = config.pgpool_admin_user
         self.pgpool_admin_password = config.pgpool_admin_password
         
+        # Sessão PCP nativa (aberta sob demanda); se indisponível, usa os binários pcp_*
+        self.pcp = PCPClient(user=self.pgpool_admin_user, password=self.pgpool_admin_password)
+    
+    def _pcp_call(self, operation: str, *args, fallback: Optional[List[str]] = None) -> Optional[Any]:
+        """
+        Executa uma operação no cliente PCP nativo
+        
+        O binário pcp_* (fallback) só é usado se a sessão PCP estiver
+        indisponível. Um erro respondido pelo pgpool é definitivo: repetir a
+        operação pelo CLI daria o mesmo erro (ou a executaria duas vezes).
+        
+        Args:
+            operation: Nome do método de PCPClient
+            *args: Argumentos da operação
+            fallback: Comando pcp_* equivalente (None = sem fallback)
+            
+        Returns:
+            Resultado da operação (ou do fallback) ou None se falhar
+        """
+        try:
+            return getattr(self.pcp, operation)(*args)
+        except PCPConnectionError as e:
+            if fallback is None:
+                print(f"⚠️  PCP nativo indisponível em {operation}: {e}")
+                return None
+            print(f"⚠️  PCP nativo indisponível em {operation}: {e} (usando {fallback[0]})")
+            return self._pcp_exec(fallback)
+        except PCPError as e:
+            print(f"❌ PCP recusou {operation}: {e}")
+            return None
+    
+    def _pcp_exec(self, command: List[str], timeout: int = 10) -> bool:
+        """Fallback: executa um binário pcp_* dentro do container do PgPool"""
+        output = self.docker.exec_command(
+            self.pgpool_container,
+            command[:1] + ["-h", "localhost", "-p", "9898", "-U", self.pgpool_admin_user] + command[1:],
+            timeout=timeout
+        )
+        return output is not None
+    
+    def close(self) -> None:
+        """Encerra a sessão PCP"""
+        self.pcp.close()
     
     def show_pool_nodes(self) -> Optional[str]:
         """
@@ -41,6 +105,140 @@ class PgPoolManager:
             exec_options=["-e", f"PGPASSWORD={self.password}"]
         )
     
+    def _psql(self, args: List[str], timeout: int = 10) -> Optional[str]:
+        """Executa psql no container do PgPool com saída não alinhada (-A, separador '|')"""
+        return self.docker.exec_command(
+            self.pgpool_container,
+            ["psql", "-h", "localhost", "-p", "5432", "-U", self.user,
+             "-d", self.database, "-A", "-F", "|", "-P", "footer=off"] + args,
+            timeout=timeout,
+            exec_options=["-e", f"PGPASSWORD={self.password}"]
+        )
+    
+    @staticmethod
+    def _parse_rows(lines: List[str]) -> List[Dict[str, str]]:
+        """Converte linhas não alinhadas (cabeçalho + dados) em dicts {coluna: valor}"""
+        lines = [line for line in lines if line.strip()]
+        if not lines:
+            return []
+        
+        header = [column.strip() for column in lines[0].split('|')]
+        return [dict(zip(header, (value.strip() for value in line.split('|')))) for line in lines[1:]]
+    
+    def query(self, sql: str, timeout: int = 10) -> Optional[List[Dict[str, str]]]:
+        """
+        Executa um comando no PgPool (SHOW POOL_*, PGPOOL SHOW ...) e retorna as linhas
+        
+        Usa saída não alinhada do psql (-A) para parsear pelo cabeçalho em vez
+        de depender da posição das colunas.
+        
+        Args:
+            sql: Comando a executar
+            timeout: Timeout em segundos
+            
+        Returns:
+            Lista de dicts {coluna: valor} ou None se falhar
+        """
+        output = self._psql(["-c", sql], timeout=timeout)
+        if output is None:
+            return None
+        return self._parse_rows(output.splitlines())
+    
+    def query_many(self, commands: Dict[str, str], timeout: int = 10) -> Optional[Dict[str, List[Dict[str, str]]]]:
+        """
+        Executa vários comandos em uma única sessão psql
+        
+        Cada resultado é precedido por um \\echo com marcador, o que permite
+        separar as seções do output. Um comando que falha (ex: SHOW POOL_CACHE
+        com o cache de consultas desligado) resulta em lista vazia.
+        
+        Args:
+            commands: {nome_da_seção: comando}
+            timeout: Timeout em segundos
+            
+        Returns:
+            {nome_da_seção: linhas} ou None se a sessão falhar
+        """
+        args = []
+        for name, sql in commands.items():
+            args.extend(["-c", f"\\echo {SECTION_MARKER}{name}", "-c", sql])
+        # Último comando sempre bem-sucedido: o exit code do psql reflete o último -c
+        args.extend(["-c", f"\\echo {SECTION_MARKER}end"])
+        
+        output = self._psql(args, timeout=timeout)
+        if output is None:
+            return None
+        
+        sections: Dict[str, List[str]] = {}
+        current = None
+        for line in output.splitlines():
+            if line.startswith(SECTION_MARKER):
+                current = line[len(SECTION_MARKER):].strip()
+                sections[current] = []
+            elif current is not None:
+                sections[current].append(line)
+        
+        return {name: self._parse_rows(sections.get(name, [])) for name in commands}
+    
+    def get_pool_nodes(self) -> Optional[List[PoolNode]]:
+        """
+        SHOW POOL_NODES estruturado
+        
+        Returns:
+            Lista de PoolNode ou None se falhar
+        """
+        rows = self.query("SHOW POOL_NODES")
+        if rows is None:
+            return None
+        return [PoolNode.from_row(row) for row in rows]
+    
+    def get_pool_snapshot(self, include_pools: bool = True) -> Optional[PgPoolSnapshot]:
+        """
+        SHOW POOL_NODES, POOL_PROCESSES, POOL_POOLS e POOL_CACHE em uma sessão
+        
+        Args:
+            include_pools: Se False, omite POOL_POOLS (uma linha por slot e backend)
+            
+        Returns:
+            PgPoolSnapshot ou None se falhar
+        """
+        commands = {
+            "nodes": "SHOW POOL_NODES",
+            "processes": "SHOW POOL_PROCESSES",
+            "cache": "SHOW POOL_CACHE",
+        }
+        if include_pools:
+            commands["pools"] = "SHOW POOL_POOLS"
+        
+        timestamp = datetime.now()
+        results = self.query_many(commands, timeout=15)
+        if results is None:
+            return None
+        
+        cache_rows = results.get("cache") or []
+        return PgPoolSnapshot(
+            timestamp=timestamp,
+            nodes=[PoolNode.from_row(row) for row in results["nodes"]],
+            processes=[PoolProcess.from_row(row) for row in results["processes"]],
+            pools=[PoolPool.from_row(row) for row in results.get("pools", [])],
+            cache=PoolCache.from_row(cache_rows[0]) if cache_rows else None
+        )
+    
+    def get_config_value(self, parameter: str) -> Optional[str]:
+        """
+        Valor de um parâmetro de configuração em execução (PGPOOL SHOW)
+        
+        Args:
+            parameter: Nome do parâmetro (ex: 'load_balance_mode')
+            
+        Returns:
+            Valor ou None se falhar
+        """
+        rows = self.query(f"PGPOOL SHOW {parameter}")
+        if not rows:
+            return None
+        return rows[0].get(parameter)
+    
     def reload_config(self) -> bool:
         """
         Recarrega configuração do PgPool
@@ -48,13 +246,7 @@ class PgPoolManager:
         Returns:
             True se sucesso
         """
-        output = self.docker.exec_command(
-            self.pgpool_container,
-            ["pcp_reload_config", "-h", "localhost", "-p", "9898", 
-             "-U", self.pgpool_admin_user],
-            timeout=10
-        )
-        return output is not None
+        return bool(self._pcp_call("reload_config", fallback=["pcp_reload_config"]))
     
     def attach_node(self, node_id: int) -> bool:
         """
@@ -66,31 +258,68 @@ class PgPoolManager:
         Returns:
             True se sucesso
         """
-        output = self.docker.exec_command(
-            self.pgpool_container,
-            ["pcp_attach_node", "-h", "localhost", "-p", "9898",
-             "-U", self.pgpool_admin_user, "-n", str(node_id)],
-            timeout=10
-        )
-        return output is not None
+        return bool(self._pcp_call("attach_node", node_id, fallback=["pcp_attach_node", "-n", str(node_id)]))
     
-    def detach_node(self, node_id: int) -> bool:
+    def detach_node(self, node_id: int, gracefully: bool = False) -> bool:
         """
         Desanexa um nó do pool
         
         Args:
             node_id: ID do nó (0, 1, 2, ...)
+            gracefully: Espera as sessões clientes terminarem
             
         Returns:
             True se sucesso
         """
-        output = self.docker.exec_command(
-            self.pgpool_container,
-            ["pcp_detach_node", "-h", "localhost", "-p", "9898",
-             "-U", self.pgpool_admin_user, "-n", str(node_id)],
-            timeout=10
-        )
-        return output is not None
+        return bool(self._pcp_call("detach_node", node_id, gracefully,
+                                   fallback=["pcp_detach_node", "-n", str(node_id)] + (["-g"] if gracefully else [])))
+    
+    def promote_node(self, node_id: int, gracefully: bool = False) -> bool:
+        """
+        Promove um nó a primário no PgPool (não executa failover no PostgreSQL)
+        
+        Args:
+            node_id: ID do nó (0, 1, 2, ...)
+            gracefully: Espera as sessões clientes terminarem
+            
+        Returns:
+            True se sucesso
+        """
+        return bool(self._pcp_call("promote_node", node_id, gracefully,
+                                   fallback=["pcp_promote_node", "-n", str(node_id)] + (["-g"] if gracefully else [])))
+    
+    def get_node_info(self, node_id: Optional[int] = None) -> Optional[List[PoolNode]]:
+        """
+        Estado dos backends via PCP (sem select_cnt; mais barato que SHOW POOL_NODES)
+        
+        Args:
+            node_id: ID de um nó (None: todos)
+            
+        Returns:
+            Lista de PoolNode ou None se o PCP falhar
+        """
+        if node_id is not None:
+            node = self._pcp_call("node_info", node_id)
+            return [node] if node else None
+        return self._pcp_call("nodes_info")
+    
+    def get_proc_info(self, pid: Optional[int] = None) -> Optional[List[PoolPool]]:
+        """
+        Slots de conexão dos processos filhos via PCP (pcp_proc_info)
+        
+        Returns:
+            Lista de PoolPool ou None se o PCP falhar
+        """
+        return self._pcp_call("proc_info", pid)
+    
+    def get_pool_config(self) -> Optional[Dict[str, str]]:
+        """
+        Configuração em execução via PCP (pcp_pool_status)
+        
+        Returns:
+            {parâmetro: valor} ou None se o PCP falhar
+        """
+        return self._pcp_call("pool_status")
     
     def get_pool_status(self) -> Dict[str, Any]:
         """
@@ -110,7 +339,41 @@ class PgPoolManager:
         }
         
         return status
-
+    
+    def get_failover_log_events(self, since: float, until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Etapas do failover encontradas no log do container PgPool
+        
+        Usa o timestamp do Docker de cada linha (precisão de nanossegundos),
+        não o que os hooks imprimem (precisão de segundos).
+        
+        Args:
+            since: Epoch (s) a partir do qual procurar
+            until: Epoch (s) limite (None = até agora)
+            
+        Returns:
+            Lista de {'event_type', 'timestamp', 'data', 'line'} em ordem cronológica
+        """
+        lines = self.docker.get_logs(self.pgpool_container, since=since, until=until)
+        if not lines:
+            return []
+        
+        events = []
+        for timestamp, message in lines:
+            if timestamp is None:
+                continue
+            for event_type, pattern in FAILOVER_LOG_PATTERNS:
+                match = pattern.search(message)
+                if match:
+                    events.append({
+                        'event_type': event_type,
+                        'timestamp': timestamp,
+                        'data': match.groupdict(),
+                        'line': message.strip()
+                    })
+                    break
+        return events
+    
     def attach_down_nodes(self) -> Dict[str, Any]:
         """
         Anexa automaticamente todos os nós marcados como DOWN no pool
@@ -121,39 +384,25 @@ class PgPoolManager:
             - nodes_failed: lista de node_ids que falhou ao anexar
             - total_down: total de nós DOWN encontrados
         """
-        output = self.show_pool_nodes()
-        
         result = {
             "nodes_attached": [],
             "nodes_failed": [],
             "total_down": 0
         }
         
-        if not output:
+        # Descoberta e attach na mesma sessão PCP; psql (SHOW POOL_NODES) só se o PCP falhar
+        nodes = self.get_node_info() or self.get_pool_nodes()
+        if not nodes:
             return result
         
-        # Parse do output para encontrar nós DOWN
-        lines = output.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('node_id') or line.startswith('-') or line.startswith('('):
+        for node in nodes:
+            if not node.is_down or node.node_id is None:
                 continue
             
-            parts = line.split('|')
-            if len(parts) >= 4:
-                node_id_str = parts[0].strip()
-                status = parts[3].strip()
-                
-                if status.lower() == 'down':
-                    try:
-                        node_id = int(node_id_str)
-                        result["total_down"] += 1
-                        
-                        if self.attach_node(node_id):
-                            result["nodes_attached"].append(node_id)
-                        else:
-                            result["nodes_failed"].append(node_id)
-                    except ValueError:
-                        continue
-        
-        return result
\ No newline at end of file
+            result["total_down"] += 1
+            if self.attach_node(node.node_id):
+                result["nodes_attached"].append(node.node_id)
+            else:
+                result["nodes_failed"].append(node.node_id)
+        
+        return result
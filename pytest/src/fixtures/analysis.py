@@ -0,0 +1,71 @@
+"""
+Fixtures de análise de resultados
+"""
+import pytest
+from src.analysis.performance_history import load_performance_history, list_run_ids
+from src.analysis.regression import RegressionDetector
+from src.analysis.scalability import ScalabilityAnalyzer
+from src.analysis.report import ReportGenerator
+
+
+@pytest.fixture(scope="session")
+def performance_history(output_base_dir):
+    """Histórico de PerformanceMetrics salvo em outputs/performance"""
+    return load_performance_history(output_base_dir / "performance")
+
+
+@pytest.fixture
+def regression_detector(request):
+    """Detector de regressão configurado pelas opções --regression-*"""
+    return RegressionDetector(
+        tps_drop_threshold=request.config.getoption("--regression-tps-threshold"),
+        latency_rise_threshold=request.config.getoption("--regression-latency-threshold"),
+        alpha=request.config.getoption("--regression-alpha")
+    )
+
+
+@pytest.fixture
+def regression_runs(request, performance_history):
+    """
+    Retorna (reference_run_id, candidate_run_id)
+    
+    A referência vem de --regression-reference (obrigatória).
+    O candidato vem de --regression-candidate ou, se omitido, é o run
+    mais recente do histórico diferente da referência.
+    """
+    reference = request.config.getoption("--regression-reference")
+    if not reference:
+        pytest.skip("Informe --regression-reference=<run_id> para rodar o gate de regressão")
+    
+    run_ids = list_run_ids(performance_history)
+    if reference not in run_ids:
+        pytest.fail(f"Run de referência '{reference}' não encontrado no histórico")
+    
+    candidate = request.config.getoption("--regression-candidate")
+    if not candidate:
+        candidates = [r for r in run_ids if r != reference]
+        if not candidates:
+            pytest.skip("Nenhum run candidato no histórico além da referência")
+        candidate = candidates[-1]
+    elif candidate not in run_ids:
+        pytest.fail(f"Run candidato '{candidate}' não encontrado no histórico")
+    
+    return reference, candidate
+
+
+@pytest.fixture
+def scalability_analyzer():
+    """Analisador de escalabilidade (USL/Amdahl)"""
+    return ScalabilityAnalyzer()
+
+
+@pytest.fixture
+def analysis_run_ids(request):
+    """run_ids a analisar (--analysis-run, pode repetir; vazio = todos)"""
+    return request.config.getoption("--analysis-run") or None
+
+
+@pytest.fixture
+def report_generator(output_base_dir):
+    """Gerador do relatório comparativo (cache incremental em outputs/reports)"""
+    return ReportGenerator(output_base_dir)
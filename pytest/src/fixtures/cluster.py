@@ -5,6 +5,7 @@ import pytest
 from src.core.patroni_manager import PatroniManager
 from src.core.postgres_manager import PostgresManager
 from src.core.pgpool_manager import PgPoolManager
+from src.core.convergence import ConvergenceWaiter
 
 
 @pytest.fixture(scope="session")
@@ -21,8 +22,23 @@ def postgres_manager():
 
 @pytest.fixture(scope="session")
 def pgpool_manager():
-    """Gerenciador PgPool compartilhado"""
-    return PgPoolManager()
+    """Gerenciador PgPool compartilhado (mantém a sessão PCP aberta durante a sessão)"""
+    manager = PgPoolManager()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def convergence_waiter(patroni_manager, pgpool_manager):
+    """
+    Espera o cluster reconvergir após uma falha (substitui sleeps fixos)
+    
+    Usage:
+        docker.start_container(old_primary)
+        status = await convergence_waiter.wait(old_primary=old_primary)
+        assert status.converged, status.pending
+    """
+    return ConvergenceWaiter(patroni_manager, pgpool_manager)
 
 
 @pytest.fixture
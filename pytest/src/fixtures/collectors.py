@@ -6,7 +6,13 @@ from typing import List
 from src.collectors.rto_collector import RTOCollector
 from src.collectors.rpo_collector import RPOCollector
 from src.collectors.performance_collector import PerformanceCollector
+from src.collectors.exporter_scrape_collector import ExporterScrapeCollector, DEFAULT_ALLOWLIST
+from src.collectors.async_load_collector import AsyncLoadCollector
+from src.collectors.load_balance_collector import LoadBalanceCollector
+from src.collectors.pgpool_stats_collector import PgPoolStatsCollector
 from src.collectors.docker_stats_collector import DockerStatsCollector
+from src.collectors.availability_collector import AvailabilityCollector
+from src.collectors.resilience_campaign import ResilienceCampaign, FAILURE_TYPES
 
 
 @pytest.fixture
@@ -22,9 +28,99 @@ def rpo_collector(run_id):
 
 
 @pytest.fixture
-def performance_collector(run_id):
-    """Coletor de métricas de performance"""
-    return PerformanceCollector(run_id)
+def availability_collector(run_id):
+    """Probes contínuos de leitura/escrita via PgPool e direto em cada backend"""
+    collector = AvailabilityCollector(run_id)
+    yield collector
+    
+    # Garante que nenhuma thread de probe fique rodando após o teste
+    collector.stop()
+
+
+@pytest.fixture
+def resilience_campaign(run_id, request):
+    """
+    Campanha de resiliência configurada pela linha de comando
+    
+    --campaign-iterations N: iterações por tipo de falha
+    --campaign-failure-type kill|switchover: restringe os tipos de falha
+    """
+    return ResilienceCampaign(
+        run_id,
+        iterations=request.config.getoption("--campaign-iterations"),
+        failure_types=request.config.getoption("--campaign-failure-type") or FAILURE_TYPES
+    )
+
+
+@pytest.fixture
+def performance_collector(run_id, exporter_scraper):
+    """Coletor de métricas de performance (raspa os exporters em cada célula)"""
+    return PerformanceCollector(run_id, exporter_scraper=exporter_scraper)
+
+
+@pytest.fixture
+def exporter_scraper(request):
+    """
+    Raspagem do postgres_exporter / pgpool2_exporter durante cada run_pgbench
+    
+    Alvos escolhidos pelo cenário da célula: exporters do cluster, ou o do
+    postgres-baseline (BASELINE_EXPORTER_PORT) se houver; sem ele, baseline não raspa.
+    
+    --exporter-scrape-interval 0 desativa (None); --exporter-metric substitui a
+    allowlist padrão.
+    """
+    interval = request.config.getoption("--exporter-scrape-interval")
+    if not interval or interval <= 0:
+        yield None
+        return
+    
+    metric_names = request.config.getoption("--exporter-metric")
+    allowlist = {name: DEFAULT_ALLOWLIST.get(name) for name in metric_names} if metric_names else None
+    scraper = ExporterScrapeCollector(interval_seconds=interval, allowlist=allowlist)
+    
+    yield scraper
+    
+    # Garante que a thread de raspagem não fique rodando após o teste
+    scraper.stop()
+
+
+@pytest.fixture
+def async_load_collector(run_id):
+    """Gerador de carga nativo (asyncio + asyncpg)"""
+    return AsyncLoadCollector(run_id)
+
+
+@pytest.fixture
+def load_balance_collector(run_id):
+    """Coletor de distribuição de carga entre os backends do PgPool"""
+    return LoadBalanceCollector(run_id)
+
+
+@pytest.fixture
+def pgpool_stats_collector():
+    """
+    Amostrador do estado do PgPool (processos filhos, slots de conexão, cache).
+    
+    Uso:
+        def test_example(pgpool_stats_collector):
+            sampler = pgpool_stats_collector(interval=2.0)
+            sampler.start()
+            # ... executa carga ...
+            sampler.stop()
+            metrics = sampler.get_metrics("test_example")
+    """
+    samplers = []
+    
+    def _create_collector(interval: float = 2.0, include_pools: bool = True):
+        sampler = PgPoolStatsCollector(interval_seconds=interval, include_pools=include_pools)
+        samplers.append(sampler)
+        return sampler
+    
+    yield _create_collector
+    
+    # Garante que nenhuma thread de amostragem fique rodando após o teste
+    for sampler in samplers:
+        sampler.stop()
 
 
 @pytest.fixture
@@ -4,6 +4,7 @@ Fixtures de escrita de dados
 import pytest
 from pathlib import Path
 from src.core.json_manager import JSONLWriter
+from src.core.metrics_exporter import MetricsExporter
 
 
 @pytest.fixture(scope="session")
@@ -12,11 +13,35 @@ def output_base_dir():
     return Path(__file__).parent.parent.parent / "outputs"
 
 
+@pytest.fixture(scope="session")
+def output_compression(request):
+    """Compressão dos arquivos JSONL (--output-compression; None = texto puro)"""
+    compression = request.config.getoption("--output-compression")
+    return None if compression == "none" else compression
+
+
+@pytest.fixture(scope="session", autouse=True)
+def harness_metrics_exporter(request):
+    """Exportador das métricas ao vivo (--metrics-port / --metrics-textfile; None se nenhum)"""
+    port = request.config.getoption("--metrics-port")
+    textfile = request.config.getoption("--metrics-textfile")
+    if port is None and not textfile:
+        yield None
+        return
+    
+    exporter = MetricsExporter(port=port, textfile=textfile)
+    exporter.start()
+    
+    yield exporter
+    
+    exporter.stop()
+
+
 @pytest.fixture
-def rto_writer(run_id, output_base_dir):
+def rto_writer(run_id, output_base_dir, output_compression):
     """Writer JSONL para métricas RTO"""
     output_dir = output_base_dir / "resilience" / "rto"
-    writer = JSONLWriter(output_dir, "rto", run_id)
+    writer = JSONLWriter(output_dir, "rto", run_id, compression=output_compression)
     
     # Escreve metadados iniciais
     writer.write_metadata({
@@ -24,14 +49,50 @@ def rto_writer(run_id, output_base_dir):
         "run_id": run_id
     })
     
-    return writer
+    yield writer
+    
+    writer.close()
+
+
+@pytest.fixture
+def availability_writer(run_id, output_base_dir, output_compression):
+    """Writer JSONL para a linha do tempo de disponibilidade (probes contínuos)"""
+    output_dir = output_base_dir / "resilience" / "availability"
+    writer = JSONLWriter(output_dir, "availability", run_id, compression=output_compression)
+    
+    # Escreve metadados iniciais
+    writer.write_metadata({
+        "test_type": "resilience_availability",
+        "run_id": run_id
+    })
+    
+    yield writer
+    
+    writer.close()
 
 
 @pytest.fixture
-def rpo_writer(run_id, output_base_dir):
+def campaign_writer(run_id, output_base_dir, output_compression):
+    """Writer JSONL para campanhas de resiliência (iterações + resumo)"""
+    output_dir = output_base_dir / "resilience" / "campaign"
+    writer = JSONLWriter(output_dir, "campaign", run_id, compression=output_compression)
+    
+    # Escreve metadados iniciais
+    writer.write_metadata({
+        "test_type": "resilience_campaign",
+        "run_id": run_id
+    })
+    
+    yield writer
+    
+    writer.close()
+
+
+@pytest.fixture
+def rpo_writer(run_id, output_base_dir, output_compression):
     """Writer JSONL para métricas RPO"""
     output_dir = output_base_dir / "resilience" / "rpo"
-    writer = JSONLWriter(output_dir, "rpo", run_id)
+    writer = JSONLWriter(output_dir, "rpo", run_id, compression=output_compression)
     
     # Escreve metadados iniciais
     writer.write_metadata({
@@ -39,11 +100,13 @@ def rpo_writer(run_id, output_base_dir):
         "run_id": run_id
     })
     
-    return writer
+    yield writer
+    
+    writer.close()
 
 
 @pytest.fixture
-def performance_writer_baseline(run_id, output_base_dir, request):
+def performance_writer_baseline(run_id, output_base_dir, output_compression, request):
     """Writer JSONL para métricas de performance - baseline"""
     
     # Extrai informações do teste
@@ -52,7 +115,13 @@ def performance_writer_baseline(run_id, output_base_dir, request):
     client_count = None
     
     # Detecta tipo de workload pelos marcadores
-    if request.node.get_closest_marker("baseline_select_only_reconnect"):
+    if request.node.get_closest_marker("baseline_select_only_adaptive"):
+        workload_type = "select_only_adaptive"
+    elif request.node.get_closest_marker("baseline_select_only_slo"):
+        workload_type = "select_only_slo"
+    elif request.node.get_closest_marker("baseline_select_only_sharded"):
+        workload_type = "select_only_sharded"
+    elif request.node.get_closest_marker("baseline_select_only_reconnect"):
         workload_type = "select_only_reconnect"
     elif request.node.get_closest_marker("baseline_select_only_prepared"):
         workload_type = "select_only_prepared"
@@ -80,7 +149,7 @@ def performance_writer_baseline(run_id, output_base_dir, request):
     if client_count:
         subdirs.append(str(client_count))
     
-    writer = JSONLWriter(output_dir, "performance", run_id, subdirs=subdirs)
+    writer = JSONLWriter(output_dir, "performance", run_id, subdirs=subdirs, compression=output_compression)
     
     # Escreve metadados iniciais
     writer.write_metadata({
@@ -91,11 +160,13 @@ def performance_writer_baseline(run_id, output_base_dir, request):
         "run_id": run_id
     })
     
-    return writer
+    yield writer
+    
+    writer.close()
 
 
 @pytest.fixture
-def performance_writer_cluster(run_id, output_base_dir, request):
+def performance_writer_cluster(run_id, output_base_dir, output_compression, request):
     """Writer JSONL para métricas de performance - cluster"""
     
     # Extrai informações do teste
@@ -104,7 +175,17 @@ def performance_writer_cluster(run_id, output_base_dir, request):
     client_count = None
     
     # Detecta tipo de workload pelos marcadores
-    if request.node.get_closest_marker("cluster_select_only_reconnect"):
+    if request.node.get_closest_marker("cluster_async_crosscheck"):
+        workload_type = "async_crosscheck"
+    elif request.node.get_closest_marker("cluster_custom_mix"):
+        workload_type = "custom_mix"
+    elif request.node.get_closest_marker("cluster_select_only_adaptive"):
+        workload_type = "select_only_adaptive"
+    elif request.node.get_closest_marker("cluster_select_only_slo"):
+        workload_type = "select_only_slo"
+    elif request.node.get_closest_marker("cluster_select_only_sharded"):
+        workload_type = "select_only_sharded"
+    elif request.node.get_closest_marker("cluster_select_only_reconnect"):
         workload_type = "select_only_reconnect"
     elif request.node.get_closest_marker("cluster_select_only_prepared"):
         workload_type = "select_only_prepared"
@@ -132,7 +213,7 @@ def performance_writer_cluster(run_id, output_base_dir, request):
     if client_count:
         subdirs.append(str(client_count))
     
-    writer = JSONLWriter(output_dir, "performance", run_id, subdirs=subdirs)
+    writer = JSONLWriter(output_dir, "performance", run_id, subdirs=subdirs, compression=output_compression)
     
     # Escreve metadados iniciais
     writer.write_metadata({
@@ -143,11 +224,57 @@ def performance_writer_cluster(run_id, output_base_dir, request):
         "run_id": run_id
     })
     
-    return writer
+    yield writer
+    
+    writer.close()
 
 
 @pytest.fixture
-def docker_stats_writer(run_id, output_base_dir, request):
+def load_balance_writer(run_id, output_base_dir, output_compression, request):
+    """Writer JSONL para distribuição de carga entre backends do PgPool"""
+    client_count = request.node.funcargs.get('client_count')
+    
+    output_dir = output_base_dir / "performance" / "cluster" / "load_balance"
+    subdirs = [str(client_count)] if client_count else []
+    writer = JSONLWriter(output_dir, "load_balance", run_id, subdirs=subdirs, compression=output_compression)
+    
+    # Escreve metadados iniciais
+    writer.write_metadata({
+        "test_type": "performance_load_balance",
+        "test_name": request.node.name,
+        "client_count": client_count,
+        "run_id": run_id
+    })
+    
+    yield writer
+    
+    writer.close()
+
+
+@pytest.fixture
+def pgpool_stats_writer(run_id, output_base_dir, output_compression, request):
+    """Writer JSONL para amostragem do estado do PgPool (SHOW POOL_*)"""
+    client_count = request.node.funcargs.get('client_count')
+    
+    output_dir = output_base_dir / "performance" / "cluster" / "pgpool"
+    subdirs = [str(client_count)] if client_count else []
+    writer = JSONLWriter(output_dir, "pgpool_stats", run_id, subdirs=subdirs, compression=output_compression)
+    
+    # Escreve metadados iniciais
+    writer.write_metadata({
+        "test_type": "performance_pgpool_stats",
+        "test_name": request.node.name,
+        "client_count": client_count,
+        "run_id": run_id
+    })
+    
+    yield writer
+    
+    writer.close()
+
+
+@pytest.fixture
+def docker_stats_writer(run_id, output_base_dir, output_compression, request):
     """
     Writer JSONL para métricas de Docker Stats
     
@@ -173,7 +300,13 @@ def docker_stats_writer(run_id, output_base_dir, request):
     if test_type == "performance":
         # Detecta tipo de workload pelos marcadores
         if sub_type == "baseline":
-            if request.node.get_closest_marker("baseline_select_only_reconnect"):
+            if request.node.get_closest_marker("baseline_select_only_adaptive"):
+                workload_type = "select_only_adaptive"
+            elif request.node.get_closest_marker("baseline_select_only_slo"):
+                workload_type = "select_only_slo"
+            elif request.node.get_closest_marker("baseline_select_only_sharded"):
+                workload_type = "select_only_sharded"
+            elif request.node.get_closest_marker("baseline_select_only_reconnect"):
                 workload_type = "select_only_reconnect"
             elif request.node.get_closest_marker("baseline_select_only_prepared"):
                 workload_type = "select_only_prepared"
@@ -186,7 +319,17 @@ def docker_stats_writer(run_id, output_base_dir, request):
             elif request.node.get_closest_marker("baseline_mixed_workload"):
                 workload_type = "mixed"
         elif sub_type == "cluster":
-            if request.node.get_closest_marker("cluster_select_only_reconnect"):
+            if request.node.get_closest_marker("cluster_async_crosscheck"):
+                workload_type = "async_crosscheck"
+            elif request.node.get_closest_marker("cluster_custom_mix"):
+                workload_type = "custom_mix"
+            elif request.node.get_closest_marker("cluster_select_only_adaptive"):
+                workload_type = "select_only_adaptive"
+            elif request.node.get_closest_marker("cluster_select_only_slo"):
+                workload_type = "select_only_slo"
+            elif request.node.get_closest_marker("cluster_select_only_sharded"):
+                workload_type = "select_only_sharded"
+            elif request.node.get_closest_marker("cluster_select_only_reconnect"):
                 workload_type = "select_only_reconnect"
             elif request.node.get_closest_marker("cluster_select_only_prepared"):
                 workload_type = "select_only_prepared"
@@ -214,7 +357,7 @@ def docker_stats_writer(run_id, output_base_dir, request):
     if client_count:
         subdirs.append(str(client_count))
     
-    writer = JSONLWriter(output_dir, "docker_stats", run_id, subdirs=subdirs)
+    writer = JSONLWriter(output_dir, "docker_stats", run_id, subdirs=subdirs, compression=output_compression)
     
     # Escreve metadados iniciais
     writer.write_metadata({
@@ -225,4 +368,40 @@ def docker_stats_writer(run_id, output_base_dir, request):
         "run_id": run_id
     })
     
-    return writer
+    yield writer
+    
+    writer.close()
+
+
+@pytest.fixture
+def regression_writer(run_id, output_base_dir, output_compression):
+    """Writer JSONL para vereditos de regressão de performance"""
+    output_dir = output_base_dir / "performance" / "regression"
+    writer = JSONLWriter(output_dir, "regression", run_id, compression=output_compression)
+    
+    # Escreve metadados iniciais
+    writer.write_metadata({
+        "test_type": "performance_regression",
+        "run_id": run_id
+    })
+    
+    yield writer
+    
+    writer.close()
+
+
+@pytest.fixture
+def scalability_writer(run_id, output_base_dir, output_compression):
+    """Writer JSONL para análises de escalabilidade (USL/Amdahl)"""
+    output_dir = output_base_dir / "performance" / "scalability"
+    writer = JSONLWriter(output_dir, "scalability", run_id, compression=output_compression)
+    
+    # Escreve metadados iniciais
+    writer.write_metadata({
+        "test_type": "performance_scalability",
+        "run_id": run_id
+    })
+    
+    yield writer
+    
+    writer.close()
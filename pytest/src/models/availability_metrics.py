@@ -0,0 +1,69 @@
+"""
+Métricas de disponibilidade do ponto de vista do cliente (probes contínuos)
+"""
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, Any, List
+
+
+@dataclass
+class UnavailabilityWindow:
+    """Intervalo contínuo de probes sem sucesso"""
+    start: float  # Epoch do início do primeiro probe com falha
+    end: float  # Epoch do início do primeiro probe bem-sucedido seguinte (ou do último probe)
+    duration_seconds: float
+    failed_probes: int
+    last_success_before: Optional[float] = None  # Fim do último probe OK antes da janela
+    outcome: str = "error"  # 'error' ou 'read_only' (escrita em réplica)
+    first_error: Optional[str] = None
+    open_at_end: bool = False  # Ainda indisponível quando a coleta terminou
+    start_offset: Optional[float] = None  # Segundos desde o instante de referência (ex: injeção da falha)
+
+
+@dataclass
+class ProbeSeriesStats:
+    """Resultado dos probes de um tipo (leitura/escrita) contra um alvo"""
+    target: str  # 'pgpool' ou nome do nó Patroni
+    kind: str  # 'read' ou 'write'
+    probes: int = 0
+    successes: int = 0
+    failures: int = 0
+    read_only: int = 0  # Escritas recusadas por réplica (backend direto): fora das falhas e das janelas
+    availability_percent: Optional[float] = None  # Sobre os probes aplicáveis (sem read_only)
+    
+    # Latência dos probes bem-sucedidos (ms)
+    latency_p50: Optional[float] = None
+    latency_p99: Optional[float] = None
+    latency_max: Optional[float] = None
+    
+    windows: List[UnavailabilityWindow] = field(default_factory=list)
+    total_unavailable_seconds: float = 0.0
+    longest_window_seconds: float = 0.0
+    dropped_probes: int = 0  # Sobrescritos no ring buffer (coleta maior que a capacidade)
+
+
+@dataclass
+class AvailabilityMetrics:
+    """Linha do tempo de disponibilidade vista pelos clientes durante um teste"""
+    run_id: str
+    test_case: str
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    probe_interval_ms: Optional[float] = None
+    reference_time: Optional[float] = None  # Epoch usado em start_offset (ex: injeção da falha)
+    
+    series: List[ProbeSeriesStats] = field(default_factory=list)
+    
+    # Resumo via PgPool (o que a aplicação enxerga)
+    client_read_downtime: Optional[float] = None
+    client_write_downtime: Optional[float] = None
+    
+    def get_series(self, target: str, kind: str) -> Optional[ProbeSeriesStats]:
+        """Retorna a série de um alvo/tipo"""
+        for series in self.series:
+            if series.target == target and series.kind == kind:
+                return series
+        return None
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
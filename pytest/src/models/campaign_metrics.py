@@ -0,0 +1,105 @@
+"""
+Métricas de campanhas de resiliência (várias iterações de failover/switchover)
+"""
+import statistics
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, Any, List, Sequence
+
+from src.analysis.stats import percentile
+
+
+@dataclass
+class DistributionStats:
+    """Distribuição de uma métrica ao longo das iterações"""
+    count: int = 0
+    min: Optional[float] = None
+    mean: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    max: Optional[float] = None
+    stdev: Optional[float] = None
+    
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[float]]) -> "DistributionStats":
+        """Calcula a distribuição ignorando valores ausentes (None)"""
+        values = [v for v in values if v is not None]
+        if not values:
+            return cls()
+        return cls(
+            count=len(values),
+            min=min(values),
+            mean=statistics.fmean(values),
+            p50=percentile(values, 50),
+            p95=percentile(values, 95),
+            max=max(values),
+            stdev=statistics.stdev(values) if len(values) > 1 else 0.0
+        )
+
+
+@dataclass
+class CampaignIteration:
+    """Resultado de uma iteração da campanha"""
+    iteration: int
+    failure_type: str  # 'kill' ou 'switchover'
+    test_case: str
+    failed_node: Optional[str] = None
+    new_primary_node: Optional[str] = None
+    
+    # RTO (segundos)
+    total_rto: Optional[float] = None
+    detection_time: Optional[float] = None
+    election_time: Optional[float] = None
+    restoration_time: Optional[float] = None
+    downtime_by_layer: Dict[str, float] = field(default_factory=dict)
+    
+    # RPO: escritas confirmadas ao cliente que não existem após o failover
+    transactions_acknowledged: int = 0
+    transactions_lost: Optional[int] = None
+    rpo_seconds: Optional[float] = None  # Idade da escrita perdida mais antiga na injeção
+    
+    # Tempo até o cluster voltar ao estado inicial antes da iteração
+    convergence_seconds: Optional[float] = None
+    
+    error: Optional[str] = None  # Iteração abortada (timeout de eleição, serviço, etc.)
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
+
+
+@dataclass
+class FailureTypeSummary:
+    """Distribuições de RTO/RPO de um tipo de falha"""
+    failure_type: str
+    iterations: int = 0
+    failed_iterations: int = 0
+    rto: DistributionStats = field(default_factory=DistributionStats)
+    phases: Dict[str, DistributionStats] = field(default_factory=dict)
+    layers: Dict[str, DistributionStats] = field(default_factory=dict)
+    transactions_lost: DistributionStats = field(default_factory=DistributionStats)
+    rpo_seconds: DistributionStats = field(default_factory=DistributionStats)
+    iterations_with_data_loss: int = 0
+
+
+@dataclass
+class CampaignMetrics:
+    """Campanha completa: iterações individuais e distribuições por tipo de falha"""
+    run_id: str
+    campaign: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    iterations_per_type: int = 0
+    
+    iterations: List[CampaignIteration] = field(default_factory=list)
+    summaries: List[FailureTypeSummary] = field(default_factory=list)
+    
+    def get_summary(self, failure_type: str) -> Optional[FailureTypeSummary]:
+        """Retorna o resumo de um tipo de falha"""
+        for summary in self.summaries:
+            if summary.failure_type == failure_type:
+                return summary
+        return None
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
@@ -1,8 +1,8 @@
 """
 Modelo de dados para métricas de Docker Stats
 """
-from dataclasses import dataclass, field
-from typing import Dict, List
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any
 from datetime import datetime
 
 
@@ -76,3 +76,30 @@ class DockerStatsMetrics:
                 for name, stats in self.containers.items()
             }
         }
+    
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Converte para dicionário JSON sem perda (bytes, sem arredondamento)
+        
+        to_dict() continua sendo a visão resumida em MB para exibição.
+        """
+        return {
+            'test_name': self.test_name,
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'duration_seconds': self.duration_seconds,
+            'containers': {name: asdict(stats) for name, stats in self.containers.items()}
+        }
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "DockerStatsMetrics":
+        """Reconstrói a partir de to_json()"""
+        return cls(
+            test_name=data['test_name'],
+            start_time=datetime.fromisoformat(data['start_time']),
+            end_time=datetime.fromisoformat(data['end_time']),
+            containers={
+                name: ContainerStatsAverage(**stats)
+                for name, stats in data.get('containers', {}).items()
+            }
+        )
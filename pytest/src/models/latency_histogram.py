@@ -0,0 +1,144 @@
+"""
+Histograma de latência log-linear (estilo HDR)
+"""
+import math
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, Any, Iterable
+
+
+# 2^7 = 128 sub-buckets por potência de 2 -> erro relativo máximo ~0.8%
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+
+def _bucket_index(value_us: int) -> int:
+    """Índice do bucket para um valor em microssegundos"""
+    if value_us < 2 * SUB_BUCKET_COUNT:
+        return value_us  # Região linear: 1 bucket por microssegundo
+    shift = value_us.bit_length() - (SUB_BUCKET_BITS + 1)
+    return shift * SUB_BUCKET_COUNT + (value_us >> shift)
+
+
+def _bucket_bounds(index: int) -> tuple:
+    """Limites [inferior, superior] em microssegundos de um bucket"""
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index, index
+    shift = index // SUB_BUCKET_COUNT - 1
+    mantissa = index - shift * SUB_BUCKET_COUNT
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Histograma de latências com buckets log-lineares
+    
+    Valores são registrados em microssegundos; a precisão relativa é constante
+    (~0.8%) em toda a faixa. Histogramas de clientes/processos diferentes podem
+    ser somados com merge() sem perda, ao contrário de médias de percentis.
+    """
+    counts: Dict[int, int] = field(default_factory=dict)  # índice do bucket -> contagem
+    count: int = 0
+    sum_us: float = 0.0
+    sum_sq_us: float = 0.0
+    min_us: Optional[int] = None
+    max_us: Optional[int] = None
+    
+    def record(self, latency_ms: float, count: int = 1):
+        """
+        Registra uma latência
+        
+        Args:
+            latency_ms: Latência em milissegundos
+            count: Número de ocorrências
+        """
+        value_us = max(int(round(latency_ms * 1000)), 0)
+        index = _bucket_index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.sum_us += value_us * count
+        self.sum_sq_us += value_us * value_us * count
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if self.max_us is None or value_us > self.max_us:
+            self.max_us = value_us
+    
+    def record_many(self, latencies_ms: Iterable[float]):
+        """Registra várias latências (ms)"""
+        for latency in latencies_ms:
+            self.record(latency)
+    
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Soma outro histograma a este (in-place)
+        
+        Returns:
+            O próprio histograma (para encadear)
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.sum_us += other.sum_us
+        self.sum_sq_us += other.sum_sq_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        if other.max_us is not None and (self.max_us is None or other.max_us > self.max_us):
+            self.max_us = other.max_us
+        return self
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Percentil da distribuição em ms (ponto médio do bucket)
+        
+        Args:
+            pct: Percentil entre 0 e 100
+        """
+        if not self.count:
+            return None
+        
+        target = max(math.ceil(self.count * pct / 100.0), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                low, high = _bucket_bounds(index)
+                value = min(max((low + high) / 2.0, self.min_us), self.max_us)
+                return value / 1000.0
+        return self.max_us / 1000.0
+    
+    @property
+    def mean(self) -> Optional[float]:
+        """Média exata em ms"""
+        if not self.count:
+            return None
+        return self.sum_us / self.count / 1000.0
+    
+    @property
+    def stddev(self) -> Optional[float]:
+        """Desvio padrão exato em ms"""
+        if not self.count:
+            return None
+        mean_us = self.sum_us / self.count
+        variance = max(self.sum_sq_us / self.count - mean_us * mean_us, 0.0)
+        return math.sqrt(variance) / 1000.0
+    
+    @property
+    def min(self) -> Optional[float]:
+        """Menor latência em ms"""
+        return self.min_us / 1000.0 if self.min_us is not None else None
+    
+    @property
+    def max(self) -> Optional[float]:
+        """Maior latência em ms"""
+        return self.max_us / 1000.0 if self.max_us is not None else None
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Reconstrói a partir de to_json() (chaves do JSON chegam como string)"""
+        histogram = cls(**{k: v for k, v in data.items() if k != 'counts'})
+        histogram.counts = {int(k): int(v) for k, v in data.get('counts', {}).items()}
+        return histogram
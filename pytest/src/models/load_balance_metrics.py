@@ -0,0 +1,107 @@
+"""
+Métricas de distribuição de carga entre os backends do PgPool
+"""
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, Any, List
+
+
+@dataclass
+class BackendLoad:
+    """Carga recebida por um backend durante um teste (diferença depois - antes)"""
+    node_id: int
+    hostname: str
+    role: Optional[str] = None  # 'primary' ou 'standby'
+    status: Optional[str] = None  # 'up', 'waiting', 'down'
+    lb_weight: Optional[float] = None
+    
+    # SHOW POOL_NODES
+    select_cnt: int = 0  # SELECTs roteados para o nó durante o teste
+    select_share: Optional[float] = None  # % do total de SELECTs
+    expected_share: Optional[float] = None  # % esperado pelo lb_weight
+    load_balance_node: Optional[bool] = None
+    replication_delay_before: Optional[float] = None
+    replication_delay_after: Optional[float] = None
+    
+    # pg_stat_database (somado entre databases)
+    xact_commit: Optional[int] = None
+    xact_rollback: Optional[int] = None
+    xact_share: Optional[float] = None  # % do total de commits
+    tup_returned: Optional[int] = None
+    tup_fetched: Optional[int] = None
+    tup_inserted: Optional[int] = None
+    tup_updated: Optional[int] = None
+    tup_deleted: Optional[int] = None
+
+
+@dataclass
+class LoadBalanceMetrics:
+    """Distribuição de carga do PgPool em um teste de performance"""
+    run_id: str
+    test_case: str
+    scenario: str
+    workload_type: Optional[str] = None
+    clients: Optional[int] = None
+    
+    # Configuração em execução
+    load_balance_mode: Optional[bool] = None
+    disable_load_balance_on_write: Optional[str] = None
+    num_backends: int = 0
+    num_replicas: int = 0
+    
+    # Por backend
+    backends: List[BackendLoad] = field(default_factory=list)
+    
+    # Desequilíbrio entre backends 'up'
+    select_total: int = 0
+    select_imbalance: Optional[float] = None  # maior share / share médio (1.0 = perfeito)
+    select_weight_deviation: Optional[float] = None  # maior |share - esperado| em pontos percentuais
+    replica_select_share: Optional[float] = None  # % dos SELECTs atendidos por réplicas
+    
+    # Contexto
+    tps_total: Optional[float] = None
+    
+    def calculate_distribution(self):
+        """Calcula shares e desequilíbrio a partir dos contadores por backend"""
+        up = [b for b in self.backends if b.status in (None, 'up', 'waiting')]
+        
+        self.select_total = sum(b.select_cnt for b in self.backends)
+        if self.select_total > 0:
+            for backend in self.backends:
+                backend.select_share = backend.select_cnt / self.select_total * 100
+        
+        total_weight = sum(b.lb_weight or 0.0 for b in up)
+        if total_weight > 0:
+            for backend in up:
+                backend.expected_share = (backend.lb_weight or 0.0) / total_weight * 100
+        
+        total_commits = sum(b.xact_commit or 0 for b in self.backends)
+        if total_commits > 0:
+            for backend in self.backends:
+                if backend.xact_commit is not None:
+                    backend.xact_share = backend.xact_commit / total_commits * 100
+        
+        shares = [b.select_share for b in up if b.select_share is not None]
+        if shares:
+            mean_share = sum(shares) / len(shares)
+            self.select_imbalance = max(shares) / mean_share if mean_share else None
+            deviations = [
+                abs(b.select_share - b.expected_share) for b in up
+                if b.select_share is not None and b.expected_share is not None
+            ]
+            if deviations:
+                self.select_weight_deviation = max(deviations)
+            self.replica_select_share = sum(
+                b.select_share for b in self.backends
+                if b.role == 'standby' and b.select_share is not None
+            )
+    
+    def get_backend(self, hostname: str) -> Optional[BackendLoad]:
+        """Retorna o backend pelo hostname"""
+        for backend in self.backends:
+            if backend.hostname == hostname:
+                return backend
+        return None
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
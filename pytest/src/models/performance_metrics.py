@@ -1,7 +1,7 @@
 """
 Métricas de Performance (TPS e Latência)
 """
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields
 from typing import Optional, Dict, Any, List
 
 
@@ -17,6 +17,10 @@ class PerformanceMetrics:
     threads: int = 1
     duration_seconds: int = 60
     workload_type: str = "mixed"  # 'select-only', 'simple-update', 'mixed'
+    load_generator: str = "pgbench"  # 'pgbench' ou 'asyncpg'
+    # 'benchmark' (célula da matriz), 'slo_probe' (sonda da busca de capacidade)
+    # ou 'crosscheck' (validação do gerador de carga): só 'benchmark' entra nas análises
+    run_mode: str = "benchmark"
     
     # Informações do pgbench
     pgbench_version: Optional[str] = None
@@ -38,6 +42,36 @@ class PerformanceMetrics:
     latency_p50: Optional[float] = None  # Mediana
     latency_p95: Optional[float] = None
     latency_p99: Optional[float] = None
+    # p99 contando as transações puladas (-L) como violações do limite: critério
+    # de SLO das sondas de capacidade (None se o p99 cai nas puladas)
+    latency_p99_slo: Optional[float] = None
+    
+    latency_sample_count: Optional[int] = None  # Transações no log (-l) usadas nos percentis
+    latency_histogram: Optional[Dict[str, Any]] = None  # LatencyHistogram.to_json()
+    
+    # Carga limitada por taxa (-R / --latency-limit)
+    target_rate: Optional[float] = None  # TPS alvo
+    latency_limit_ms: Optional[float] = None
+    schedule_lag_avg: Optional[float] = None  # em ms
+    schedule_lag_max: Optional[float] = None  # em ms
+    transactions_skipped: Optional[int] = None
+    transactions_skipped_percent: Optional[float] = None
+    transactions_late: Optional[int] = None  # Acima do limite de latência
+    transactions_late_percent: Optional[float] = None
+    
+    # Detalhamento por script (-f script@peso)
+    # [{'script', 'weight', 'transactions', 'tps', 'latency_avg', 'latency_stddev', ...}]
+    script_stats: List[Dict[str, Any]] = field(default_factory=list)
+    
+    # Execução distribuída em vários processos/containers pgbench
+    shard_count: int = 1
+    # [{'container', 'clients', 'threads', 'tps', 'total_transactions', 'latency_avg', ...}]
+    shards: List[Dict[str, Any]] = field(default_factory=list)
+    
+    # Saturação de CPU do(s) cliente(s) de carga
+    client_cpu_percent_avg: Optional[float] = None  # % do limite de CPU do container
+    client_cpu_percent_max: Optional[float] = None
+    client_cpu_saturated: Optional[bool] = None
     
     # Métricas de Conexão
     initial_connection_time: Optional[float] = None  # em ms
@@ -52,6 +86,17 @@ class PerformanceMetrics:
     pgpool_enabled: bool = False
     load_balancing_enabled: bool = False
     num_replicas: Optional[int] = None
+    select_share_by_node: Dict[str, float] = field(default_factory=dict)  # % dos SELECTs por backend
+    select_imbalance: Optional[float] = None  # maior share / share médio (1.0 = perfeito)
+    
+    # Série temporal do progresso (-P): uma amostra por intervalo
+    # Ex: {'time_s': 5.0, 'tps': 1234.5, 'latency_avg': 0.81, 'latency_stddev': 0.25, 'failed': 0}
+    progress_samples: List[Dict[str, float]] = field(default_factory=list)
+    
+    # Métricas dos exporters durante a célula ('alvo:métrica{labels}')
+    # Contadores: incremento na célula; gauges: {'avg', 'max', 'last'}
+    exporter_deltas: Dict[str, float] = field(default_factory=dict)
+    exporter_gauges: Dict[str, Dict[str, float]] = field(default_factory=dict)
     
     # Raw output do pgbench
     pgbench_output: Optional[str] = None
@@ -71,9 +116,31 @@ class PerformanceMetrics:
                     self.failed_transactions / self.total_transactions * 100
                 )
     
+    @property
+    def is_benchmark(self) -> bool:
+        """
+        Execução comparável da matriz de testes (entra no histórico por célula)
+        
+        Sondas com taxa limitada gravadas antes de run_mode são reconhecidas
+        por target_rate / latency_limit_ms.
+        """
+        return (self.run_mode == "benchmark" and self.target_rate is None
+                and self.latency_limit_ms is None)
+    
     def to_json(self) -> Dict[str, Any]:
         """Converte para dicionário JSON"""
         return asdict(self)
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "PerformanceMetrics":
+        """Reconstrói a partir de to_json() (campos desconhecidos são ignorados)"""
+        try:
+            return cls(**data)  # Caminho rápido: mesmo schema
+        except TypeError:
+            return cls(**{k: v for k, v in data.items() if k in _FIELDS})
+
+
+_FIELDS = frozenset(f.name for f in fields(PerformanceMetrics))
 
 
 @dataclass
@@ -96,6 +163,10 @@ class LoadTestSummary:
     # Escalabilidade
     scalability_factor: Optional[float] = None  # cluster_tps / baseline_tps
     
+    # Célula comparada (relatórios com vários workloads/níveis de clientes)
+    workload_type: Optional[str] = None
+    clients: Optional[int] = None
+    
     def calculate_comparison(self):
         """Calcula métricas de comparação"""
         if self.baseline_tps and self.cluster_tps:
@@ -113,3 +184,31 @@ class LoadTestSummary:
     def to_json(self) -> Dict[str, Any]:
         """Converte para dicionário JSON"""
         return asdict(self)
+
+
+@dataclass
+class RateSearchResult:
+    """Maior taxa sustentável com p99 de latência dentro do SLO (capacidade)"""
+    run_id: str
+    test_case: str
+    scenario: str
+    workload_type: str = "select-only"
+    clients: int = 1
+    
+    # SLO
+    slo_p99_ms: float = 0.0
+    
+    # Referência em malha fechada (throughput máximo)
+    closed_loop_tps: Optional[float] = None
+    closed_loop_latency_p99: Optional[float] = None
+    
+    # Resultado
+    max_sustainable_tps: Optional[float] = None
+    converged: bool = False
+    
+    # Sondas: [{'target_rate', 'tps', 'latency_p99', 'skipped_percent', 'sustainable', ...}]
+    probes: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
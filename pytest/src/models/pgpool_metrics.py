@@ -0,0 +1,249 @@
+"""
+Estado e métricas do PgPool-II (SHOW POOL_NODES / POOL_PROCESSES / POOL_POOLS / POOL_CACHE)
+"""
+import typing
+from dataclasses import dataclass, asdict, field, fields
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+
+def _coerce(value: Optional[str], annotation) -> Any:
+    """Converte o texto do psql para o tipo anotado no dataclass"""
+    if value is None or value == '':
+        return None
+    
+    # Optional[X] -> X
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    target = args[0] if args else annotation
+    
+    try:
+        if target is bool:
+            return value.lower() in ('true', 't', 'on', '1', 'yes')
+        if target is int:
+            return int(value)
+        if target is float:
+            return float(value)
+    except ValueError:
+        return None
+    return value
+
+
+class _PgPoolRow:
+    """Construção a partir de uma linha do SHOW (dict coluna -> texto)"""
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, str]):
+        """Cria a instância convertendo cada coluna conhecida para o tipo do campo"""
+        hints = typing.get_type_hints(cls)
+        return cls(**{
+            f.name: _coerce(row.get(f.name), hints[f.name])
+            for f in fields(cls)
+            if f.name in row
+        })
+
+
+@dataclass
+class PoolNode(_PgPoolRow):
+    """Linha de SHOW POOL_NODES"""
+    node_id: Optional[int] = None
+    hostname: Optional[str] = None
+    port: Optional[int] = None
+    status: Optional[str] = None  # 'up', 'waiting', 'down', 'quarantine'
+    pg_status: Optional[str] = None
+    lb_weight: Optional[float] = None
+    role: Optional[str] = None  # 'primary' ou 'standby'
+    pg_role: Optional[str] = None
+    select_cnt: Optional[int] = None
+    load_balance_node: Optional[bool] = None
+    replication_delay: Optional[float] = None
+    replication_state: Optional[str] = None
+    replication_sync_state: Optional[str] = None
+    last_status_change: Optional[str] = None
+    
+    @property
+    def is_down(self) -> bool:
+        """Nó marcado como DOWN no PgPool"""
+        return (self.status or '').lower() == 'down'
+
+
+@dataclass
+class PoolProcess(_PgPoolRow):
+    """Linha de SHOW POOL_PROCESSES (um processo filho do PgPool)"""
+    pool_pid: Optional[int] = None
+    start_time: Optional[str] = None
+    client_connection_count: Optional[int] = None
+    database: Optional[str] = None
+    username: Optional[str] = None
+    backend_connection_time: Optional[str] = None
+    pool_counter: Optional[int] = None
+    status: Optional[str] = None  # 'Wait for connection', 'Idle', 'Idle in transaction', 'Execute command'
+    
+    @property
+    def has_client(self) -> bool:
+        """Processo atendendo um cliente (não está esperando conexão)"""
+        if self.status:
+            return self.status != 'Wait for connection'
+        return bool(self.database)
+    
+    @property
+    def is_executing(self) -> bool:
+        """Processo executando um comando neste momento"""
+        return self.status == 'Execute command'
+
+
+@dataclass
+class PoolPool(_PgPoolRow):
+    """Linha de SHOW POOL_POOLS (um slot do cache de conexões de um processo filho)"""
+    pool_pid: Optional[int] = None
+    start_time: Optional[str] = None
+    client_connection_count: Optional[int] = None
+    pool_id: Optional[int] = None
+    backend_id: Optional[int] = None
+    database: Optional[str] = None
+    username: Optional[str] = None
+    backend_connection_time: Optional[str] = None
+    client_connection_time: Optional[str] = None
+    client_disconnection_time: Optional[str] = None
+    client_idle_duration: Optional[int] = None
+    majorversion: Optional[int] = None
+    minorversion: Optional[int] = None
+    pool_counter: Optional[int] = None  # Vezes que a conexão em cache foi usada
+    pool_backendpid: Optional[int] = None
+    pool_connected: Optional[bool] = None
+    status: Optional[str] = None
+    load_balance_node: Optional[bool] = None
+    client_host: Optional[str] = None
+    client_port: Optional[str] = None
+    statement: Optional[str] = None
+    
+    @property
+    def is_used(self) -> bool:
+        """Slot com conexão ao backend em cache"""
+        return bool(self.database)
+
+
+@dataclass
+class PoolCache(_PgPoolRow):
+    """SHOW POOL_CACHE (cache de consultas em memória - memory_cache_enabled)"""
+    num_cache_hits: Optional[int] = None
+    num_selects: Optional[int] = None
+    cache_hit_ratio: Optional[float] = None
+    num_hash_entries: Optional[int] = None
+    used_hash_entries: Optional[int] = None
+    num_cache_entries: Optional[int] = None
+    used_cache_entries_size: Optional[int] = None
+    free_cache_entries_size: Optional[int] = None
+    fragment_cache_entries_size: Optional[int] = None
+
+
+@dataclass
+class PgPoolSnapshot:
+    """Estado do PgPool obtido em uma única sessão psql"""
+    timestamp: datetime
+    nodes: List[PoolNode] = field(default_factory=list)
+    processes: List[PoolProcess] = field(default_factory=list)
+    pools: List[PoolPool] = field(default_factory=list)
+    cache: Optional[PoolCache] = None  # None se o cache de consultas estiver desligado
+    
+    @property
+    def children_total(self) -> int:
+        """Processos filhos (num_init_children)"""
+        return len(self.processes)
+    
+    @property
+    def children_with_client(self) -> int:
+        """Processos filhos com cliente conectado"""
+        return sum(1 for p in self.processes if p.has_client)
+    
+    @property
+    def children_executing(self) -> int:
+        """Processos filhos executando comando"""
+        return sum(1 for p in self.processes if p.is_executing)
+    
+    @property
+    def pool_slots_used(self) -> int:
+        """Slots (processo, pool_id) com conexão em cache"""
+        return len({(p.pool_pid, p.pool_id) for p in self.pools if p.is_used})
+    
+    def process_status_counts(self) -> Dict[str, int]:
+        """Contagem de processos filhos por status"""
+        counts: Dict[str, int] = {}
+        for process in self.processes:
+            status = process.status or ('connected' if process.database else 'unknown')
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+    
+    def connection_reuse_ratio(self) -> Optional[float]:
+        """
+        Fração dos usos de conexões em cache que reaproveitaram uma conexão existente
+        
+        pool_counter conta quantas vezes o slot foi usado; o primeiro uso abre
+        a conexão, os demais são acertos do cache de conexões.
+        """
+        counters = [p.pool_counter for p in self.pools if p.is_used and p.backend_id == 0 and p.pool_counter]
+        total = sum(counters)
+        if not total:
+            return None
+        return (total - len(counters)) / total
+    
+    def get_node(self, hostname: str) -> Optional[PoolNode]:
+        """Retorna o nó pelo hostname"""
+        for node in self.nodes:
+            if node.hostname == hostname:
+                return node
+        return None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionário para serialização JSON"""
+        data = asdict(self)
+        data['timestamp'] = self.timestamp.isoformat()
+        return data
+
+
+@dataclass
+class PgPoolStatsMetrics:
+    """Ocupação do PgPool amostrada durante um teste (dimensionamento de num_init_children/max_pool)"""
+    test_name: str
+    start_time: datetime
+    end_time: datetime
+    
+    # Configuração em execução
+    num_init_children: Optional[int] = None
+    max_pool: Optional[int] = None
+    
+    sample_count: int = 0
+    
+    # Processos filhos
+    children_with_client_avg: Optional[float] = None
+    children_with_client_max: Optional[int] = None
+    children_executing_avg: Optional[float] = None
+    children_executing_max: Optional[int] = None
+    children_utilization_max: Optional[float] = None  # % de num_init_children com cliente
+    
+    # Cache de conexões (slots num_init_children * max_pool)
+    pool_slots_used_avg: Optional[float] = None
+    pool_slots_used_max: Optional[int] = None
+    pool_slot_utilization_max: Optional[float] = None  # %
+    connection_reuse_ratio: Optional[float] = None  # Última amostra
+    
+    # Cache de consultas (SHOW POOL_CACHE)
+    query_cache_hit_ratio: Optional[float] = None
+    
+    # Estados dos processos na amostra de maior ocupação
+    process_status_at_peak: Dict[str, int] = field(default_factory=dict)
+    
+    # Série temporal: [{'timestamp', 'children_with_client', 'children_executing', 'pool_slots_used'}]
+    samples: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @property
+    def duration_seconds(self) -> float:
+        """Duração total da amostragem"""
+        return (self.end_time - self.start_time).total_seconds()
+    
+    def to_dict(self) -> dict:
+        """Converte para dicionário para serialização JSON"""
+        data = asdict(self)
+        data['start_time'] = self.start_time.isoformat()
+        data['end_time'] = self.end_time.isoformat()
+        data['duration_seconds'] = round(self.duration_seconds, 2)
+        return data
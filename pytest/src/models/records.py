@@ -0,0 +1,100 @@
+"""
+Formato versionado dos registros JSONL
+
+Cada modelo registrado é gravado em um envelope com discriminador de tipo e
+versão do schema:
+
+    {"type": "rto_metrics", "schema_version": 1, "data": {...to_json()...}}
+
+e decodificado de volta ao modelo por decode_record() via from_json(). Linhas
+sem envelope (metadados, modelos não registrados, arquivos antigos) passam
+como dicionário.
+"""
+from typing import Any, Dict, Optional, Tuple, Type
+
+from .performance_metrics import PerformanceMetrics
+from .rto_metrics import RTOMetrics
+from .rpo_metrics import RPOMetrics
+from .docker_stats_metrics import DockerStatsMetrics
+
+
+# Chaves do envelope
+TYPE_KEY = "type"
+VERSION_KEY = "schema_version"
+DATA_KEY = "data"
+
+# tipo do registro -> (modelo, versão atual do schema)
+RECORD_TYPES: Dict[str, Tuple[Type, int]] = {}
+_TYPE_BY_CLASS: Dict[Type, str] = {}
+
+
+def register_record_type(record_type: str, model: Type, version: int = 1) -> None:
+    """
+    Registra um modelo (com to_json() e from_json()) no formato versionado
+    
+    Args:
+        record_type: Discriminador gravado em 'type'
+        model: Classe do modelo
+        version: Versão atual do schema (incrementar ao mudar campos de forma incompatível)
+    """
+    RECORD_TYPES[record_type] = (model, version)
+    _TYPE_BY_CLASS[model] = record_type
+
+
+register_record_type("performance_metrics", PerformanceMetrics)
+register_record_type("rto_metrics", RTOMetrics)
+register_record_type("rpo_metrics", RPOMetrics)
+register_record_type("docker_stats_metrics", DockerStatsMetrics)
+
+
+def record_type_of(obj: Any) -> Optional[str]:
+    """Tipo registrado do objeto (None se não registrado)"""
+    return _TYPE_BY_CLASS.get(type(obj))
+
+
+def encode_record(obj: Any) -> Dict[str, Any]:
+    """
+    Serializa um objeto para uma linha JSONL
+    
+    Modelos registrados vão no envelope versionado; outros objetos com
+    to_json() e dicionários passam sem envelope.
+    """
+    record_type = _TYPE_BY_CLASS.get(type(obj))
+    if record_type is not None:
+        return {
+            TYPE_KEY: record_type,
+            VERSION_KEY: RECORD_TYPES[record_type][1],
+            DATA_KEY: obj.to_json()
+        }
+    if hasattr(obj, 'to_json'):
+        return obj.to_json()
+    if isinstance(obj, dict):
+        return obj
+    raise ValueError(f"Tipo não suportado: {type(obj)}")
+
+
+def is_envelope(record: Dict[str, Any]) -> bool:
+    """A linha é um registro versionado de um tipo registrado"""
+    return VERSION_KEY in record and record.get(TYPE_KEY) in RECORD_TYPES
+
+
+def decode_record(record: Dict[str, Any]) -> Any:
+    """
+    Decodifica uma linha JSONL
+    
+    Returns:
+        Instância do modelo para envelopes registrados; o próprio dicionário
+        para as demais linhas
+    
+    Raises:
+        ValueError: Envelope gravado com schema mais novo que o suportado
+    """
+    if not is_envelope(record):
+        return record
+    
+    model, version = RECORD_TYPES[record[TYPE_KEY]]
+    if record[VERSION_KEY] > version:
+        raise ValueError(
+            f"{record[TYPE_KEY]}: schema v{record[VERSION_KEY]} mais novo que o suportado (v{version})"
+        )
+    return model.from_json(record[DATA_KEY])
@@ -0,0 +1,75 @@
+"""
+Veredito de regressão de performance (comparação entre runs)
+"""
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, Any, List
+
+
+@dataclass
+class CellRegression:
+    """Comparação de uma célula (scenario, workload, clients) entre dois runs"""
+    scenario: str
+    workload_type: str
+    clients: int
+    
+    # Status: 'ok', 'regression', 'improvement', 'insufficient_data', 'missing'
+    status: str = "ok"
+    
+    # Throughput
+    reference_tps: Optional[float] = None
+    candidate_tps: Optional[float] = None
+    tps_change_percent: Optional[float] = None
+    tps_p_value: Optional[float] = None
+    tps_regressed: bool = False
+    
+    # Latência (ms): p95 do log por transação, ou média quando não há log (ver latency_p95_source)
+    reference_latency_p95: Optional[float] = None
+    candidate_latency_p95: Optional[float] = None
+    latency_p95_change_percent: Optional[float] = None
+    latency_p_value: Optional[float] = None
+    latency_regressed: bool = False
+    # Origem: 'pgbench' (p95 real do log por transação) ou 'latency_avg' (média; não é p95)
+    latency_p95_source: Optional[str] = None
+    
+    # Amostras usadas nos testes estatísticos
+    reference_samples: int = 0
+    candidate_samples: int = 0
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
+
+
+@dataclass
+class RegressionReport:
+    """Veredito de regressão de performance de um run candidato contra uma referência"""
+    reference_run_id: str
+    candidate_run_id: str
+    generated_at: Optional[str] = None
+    
+    # Limiares usados
+    tps_drop_threshold_percent: float = 5.0
+    latency_rise_threshold_percent: float = 10.0
+    alpha: float = 0.05
+    
+    # Resultado
+    cells: List[CellRegression] = field(default_factory=list)
+    regressions: int = 0
+    improvements: int = 0
+    insufficient_data: int = 0
+    passed: bool = True
+    
+    def calculate_verdict(self):
+        """Consolida o veredito a partir das células"""
+        self.regressions = sum(1 for c in self.cells if c.status == "regression")
+        self.improvements = sum(1 for c in self.cells if c.status == "improvement")
+        self.insufficient_data = sum(1 for c in self.cells if c.status == "insufficient_data")
+        self.passed = self.regressions == 0
+    
+    def get_regressions(self) -> List[CellRegression]:
+        """Retorna apenas as células com regressão"""
+        return [c for c in self.cells if c.status == "regression"]
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
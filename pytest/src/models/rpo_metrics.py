@@ -1,7 +1,7 @@
 """
 Métricas de RPO (Recovery Point Objective)
 """
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime
 from typing import Optional, Dict, Any
 
@@ -52,3 +52,14 @@ class RPOMetrics:
     def to_json(self) -> Dict[str, Any]:
         """Converte para dicionário JSON"""
         return asdict(self)
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "RPOMetrics":
+        """Reconstrói a partir de to_json() (campos desconhecidos são ignorados)"""
+        try:
+            return cls(**data)  # Caminho rápido: mesmo schema
+        except TypeError:
+            return cls(**{k: v for k, v in data.items() if k in _FIELDS})
+
+
+_FIELDS = frozenset(f.name for f in fields(RPOMetrics))
@@ -1,9 +1,9 @@
 """
 Métricas de RTO (Recovery Time Objective)
 """
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 @dataclass
@@ -18,12 +18,38 @@ class RTOMetrics:
     new_primary_elected_at: Optional[str] = None
     service_restored_at: Optional[str] = None
     
+    # Visão do PgPool (PCP/SHOW POOL_NODES + log do container)
+    pgpool_backend_down_at: Optional[str] = None  # Primário antigo marcado DOWN
+    pgpool_failover_started_at: Optional[str] = None  # failover.sh
+    pgpool_failover_finished_at: Optional[str] = None
+    pgpool_follow_primary_started_at: Optional[str] = None  # follow_primary.sh
+    pgpool_follow_primary_finished_at: Optional[str] = None
+    pgpool_primary_switched_at: Optional[str] = None  # PgPool roteia escritas ao novo primário
+    
     # Métricas calculadas (em segundos)
     detection_time: Optional[float] = None
     election_time: Optional[float] = None
     restoration_time: Optional[float] = None
     total_rto: Optional[float] = None
     
+    # Camada PgPool (em segundos)
+    pgpool_detection_time: Optional[float] = None  # injeção -> backend DOWN no PgPool
+    failover_hook_time: Optional[float] = None  # duração do failover.sh
+    follow_primary_hook_time: Optional[float] = None  # duração do follow_primary.sh
+    pgpool_switch_lag: Optional[float] = None  # eleição no Patroni -> PgPool no novo primário
+    
+    # Indisponibilidade por camada, em sequência no caminho crítico (soma = total_rto)
+    downtime_by_layer: Dict[str, float] = field(default_factory=dict)
+    dominant_layer: Optional[str] = None
+    
+    # Incerteza do polling: cada evento ocorreu entre o último snapshot com o
+    # estado antigo e o primeiro com o novo ([lower, upper], segundos desde a injeção)
+    event_bounds: Dict[str, List[float]] = field(default_factory=dict)
+    phase_bounds: Dict[str, List[float]] = field(default_factory=dict)  # [mínimo, máximo] de cada fase
+    total_rto_lower: Optional[float] = None
+    total_rto_upper: Optional[float] = None  # = total_rto (primeira observação do serviço)
+    total_rto_uncertainty: Optional[float] = None  # Meia largura do intervalo (RTO ≈ ponto médio ± isso)
+    
     # Dados do cluster
     failed_node: Optional[str] = None
     new_primary_node: Optional[str] = None
@@ -50,7 +76,91 @@ class RTOMetrics:
             t1 = datetime.fromisoformat(self.failure_injected_at)
             t2 = datetime.fromisoformat(self.service_restored_at)
             self.total_rto = (t2 - t1).total_seconds()
+        
+        self._calculate_pgpool_layer()
+        self._calculate_bounds()
+    
+    @staticmethod
+    def _elapsed(start: Optional[str], end: Optional[str]) -> Optional[float]:
+        """Segundos entre dois timestamps ISO (None se faltar algum)"""
+        if not start or not end:
+            return None
+        return (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()
+    
+    def _calculate_pgpool_layer(self):
+        """
+        Atribui a indisponibilidade a cada camada
+        
+        etcd/Patroni: injeção -> detecção -> eleição do novo líder
+        pgpool: eleição -> PgPool roteando para o novo primário (health check + failover.sh)
+        client: PgPool pronto -> primeira conexão bem-sucedida via PgPool
+        """
+        self.pgpool_detection_time = self._elapsed(self.failure_injected_at, self.pgpool_backend_down_at)
+        self.failover_hook_time = self._elapsed(self.pgpool_failover_started_at, self.pgpool_failover_finished_at)
+        self.follow_primary_hook_time = self._elapsed(
+            self.pgpool_follow_primary_started_at, self.pgpool_follow_primary_finished_at
+        )
+        self.pgpool_switch_lag = self._elapsed(self.new_primary_elected_at, self.pgpool_primary_switched_at)
+        
+        if self.total_rto is None:
+            return
+        
+        layers = {
+            'etcd_patroni_detection': self.detection_time,
+            'patroni_election': self.election_time,
+        }
+        if self.pgpool_switch_lag is not None and self.restoration_time is not None:
+            # PgPool pode trocar antes do observer ver a eleição: nesse caso não há atraso do PgPool
+            pgpool_time = min(max(self.pgpool_switch_lag, 0.0), self.restoration_time)
+            layers['pgpool'] = pgpool_time
+            layers['client'] = self.restoration_time - pgpool_time
+        else:
+            # Sem a visão do PgPool, eleição -> serviço fica atribuído ao PgPool
+            layers['pgpool'] = self.restoration_time
+        
+        self.downtime_by_layer = {k: round(v, 3) for k, v in layers.items() if v is not None}
+        if self.downtime_by_layer:
+            self.dominant_layer = max(self.downtime_by_layer, key=self.downtime_by_layer.get)
+    
+    def _calculate_bounds(self):
+        """
+        Intervalo de cada fase a partir dos intervalos dos eventos
+        
+        Fase entre eventos A e B: mínimo = B.lower - A.upper (não negativo),
+        máximo = B.upper - A.lower.
+        """
+        phases = {
+            'detection': (None, 'failure_detected'),
+            'election': ('failure_detected', 'new_primary'),
+            'restoration': ('new_primary', 'service_restored'),
+            'total_rto': (None, 'service_restored'),
+        }
+        self.phase_bounds = {}
+        for phase, (start, end) in phases.items():
+            end_bounds = self.event_bounds.get(end)
+            start_bounds = self.event_bounds.get(start) if start else [0.0, 0.0]
+            if not end_bounds or not start_bounds:
+                continue
+            lower = max(end_bounds[0] - start_bounds[1], 0.0)
+            upper = max(end_bounds[1] - start_bounds[0], lower)
+            self.phase_bounds[phase] = [round(lower, 6), round(upper, 6)]
+        
+        total = self.phase_bounds.get('total_rto')
+        if total:
+            self.total_rto_lower, self.total_rto_upper = total
+            self.total_rto_uncertainty = round((total[1] - total[0]) / 2, 6)
     
     def to_json(self) -> Dict[str, Any]:
         """Converte para dicionário JSON"""
         return asdict(self)
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "RTOMetrics":
+        """Reconstrói a partir de to_json() (campos desconhecidos são ignorados)"""
+        try:
+            return cls(**data)  # Caminho rápido: mesmo schema
+        except TypeError:
+            return cls(**{k: v for k, v in data.items() if k in _FIELDS})
+
+
+_FIELDS = frozenset(f.name for f in fields(RTOMetrics))
@@ -0,0 +1,74 @@
+"""
+Análise de escalabilidade (Universal Scalability Law / Amdahl)
+"""
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, Any, List
+
+
+@dataclass
+class ScalabilityAnalysis:
+    """Parâmetros ajustados da curva TPS x clientes de um cenário"""
+    scenario: str
+    workload_type: str
+    run_ids: List[str] = field(default_factory=list)
+    
+    # Pontos observados: [{'clients': 10, 'tps': 1234.5, 'latency_avg': 8.1}, ...]
+    points: List[Dict[str, float]] = field(default_factory=list)
+    
+    # Modelo: X(N) = λN / (1 + σ(N-1) + κN(N-1))
+    model: Optional[str] = None  # 'usl' ou 'amdahl' (κ = 0)
+    lambda_tps: Optional[float] = None  # Throughput de um cliente isolado
+    sigma: Optional[float] = None  # Coeficiente de contenção
+    kappa: Optional[float] = None  # Coeficiente de coerência (crosstalk)
+    r_squared: Optional[float] = None
+    
+    # Pico previsto pelo modelo (None quando κ = 0: sem pico, apenas assíntota)
+    peak_clients: Optional[float] = None
+    peak_tps: Optional[float] = None
+    asymptotic_tps: Optional[float] = None  # λ/σ (limite de Amdahl)
+    
+    # Joelho: a partir daqui a latência cresce mais rápido que o throughput
+    knee_clients_observed: Optional[int] = None
+    knee_clients_model: Optional[float] = None
+    
+    # Sugestões de dimensionamento
+    recommended_num_init_children: Optional[int] = None
+    recommended_max_connections: Optional[int] = None
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
+
+
+@dataclass
+class AdaptiveSweepResult:
+    """Resultado de uma varredura adaptativa de número de clientes"""
+    scenario: str
+    workload_type: str
+    
+    # Orçamento
+    time_budget_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    cells_run: int = 0
+    
+    # Níveis de clientes na ordem em que foram executados
+    clients_sampled: List[int] = field(default_factory=list)
+    
+    # Pico de throughput observado
+    peak_clients: Optional[int] = None
+    peak_tps: Optional[float] = None
+    peak_at_boundary: bool = False  # Pico no limite da faixa: curva ainda subindo
+    
+    # Joelho observado (latência passa a crescer mais rápido que o throughput)
+    knee_clients: Optional[int] = None
+    knee_bracket: Optional[List[int]] = None
+    
+    # True se pico e joelho foram localizados com a resolução mínima
+    converged: bool = False
+    
+    # Ajuste USL/Amdahl sobre os pontos coletados
+    analysis: Optional[ScalabilityAnalysis] = None
+    
+    def to_json(self) -> Dict[str, Any]:
+        """Converte para dicionário JSON"""
+        return asdict(self)
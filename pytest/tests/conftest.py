@@ -13,6 +13,96 @@ sys.path.insert(0, str(src_path))
 from src.fixtures.cluster import *
 from src.fixtures.collectors import *
 from src.fixtures.writers import *
+from src.fixtures.analysis import *
+
+
+def pytest_addoption(parser):
+    """Opções de linha de comando do projeto"""
+    group = parser.getgroup("regression", "Gate de regressão de performance")
+    group.addoption(
+        "--regression-reference",
+        default=None,
+        help="run_id de referência para o gate de regressão"
+    )
+    group.addoption(
+        "--regression-candidate",
+        default=None,
+        help="run_id candidato (padrão: run mais recente diferente da referência)"
+    )
+    group.addoption(
+        "--regression-tps-threshold",
+        type=float,
+        default=5.0,
+        help="Queda de TPS (%%) considerada regressão (padrão: 5)"
+    )
+    group.addoption(
+        "--regression-latency-threshold",
+        type=float,
+        default=10.0,
+        help="Aumento de latência p95 (%%) considerado regressão (padrão: 10)"
+    )
+    group.addoption(
+        "--regression-alpha",
+        type=float,
+        default=0.05,
+        help="Nível de significância do teste estatístico (padrão: 0.05)"
+    )
+    
+    group = parser.getgroup("analysis", "Análise do histórico de resultados")
+    group.addoption(
+        "--analysis-run",
+        action="append",
+        default=[],
+        help="run_id a incluir na análise (pode repetir; padrão: todos)"
+    )
+    
+    group = parser.getgroup("campaign", "Campanha de resiliência")
+    group.addoption(
+        "--campaign-iterations",
+        type=int,
+        default=5,
+        help="Iterações por tipo de falha (padrão: 5)"
+    )
+    group.addoption(
+        "--campaign-failure-type",
+        action="append",
+        default=[],
+        choices=["kill", "switchover"],
+        help="Tipo de falha da campanha (pode repetir; padrão: kill e switchover)"
+    )
+    
+    group = parser.getgroup("output", "Arquivos de resultado")
+    group.addoption(
+        "--output-compression",
+        default="none",
+        choices=["none", "gzip", "zstd"],
+        help="Compressão dos JSONL em outputs/ (padrão: none, arquivos .jsonl; gzip: .jsonl.gz; zstd: .jsonl.zst, requer zstandard)"
+    )
+    group.addoption(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Expõe as métricas do harness ao vivo em http://<host>:PORT/metrics (formato Prometheus)"
+    )
+    group.addoption(
+        "--metrics-textfile",
+        default=None,
+        help="Reescreve as métricas do harness neste arquivo .prom (textfile collector do node_exporter)"
+    )
+    
+    group = parser.getgroup("exporters", "Raspagem do postgres_exporter / pgpool2_exporter")
+    group.addoption(
+        "--exporter-scrape-interval",
+        type=float,
+        default=5.0,
+        help="Intervalo (s) de raspagem dos exporters durante cada célula do pgbench (0 desativa; padrão: 5)"
+    )
+    group.addoption(
+        "--exporter-metric",
+        action="append",
+        default=[],
+        help="Métrica mantida da exposição (pode repetir; padrão: allowlist de buffers, tuplas, locks e pools)"
+    )
 
 
 @pytest.fixture(scope="session")
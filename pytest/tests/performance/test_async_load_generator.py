@@ -0,0 +1,113 @@
+"""
+Teste de Performance - Gerador de carga nativo (asyncpg) vs pgbench
+
+Executa a mesma carga com o pgbench (container pgbench-client) e com o
+AsyncLoadCollector (host do pytest, via porta publicada do PgPool) e confere
+se os números são coerentes antes de usar o gerador nativo em outros testes.
+"""
+import pytest
+from src.core.config import config
+from src.collectors.async_load_collector import pgbench_templates
+from src.core.performance_targets import ClusterConfig
+
+
+@pytest.mark.cluster_performance
+@pytest.mark.cluster_async_crosscheck
+class TestAsyncLoadGenerator:
+
+    # Gerador nativo roda no host: acessa o PgPool pela porta publicada
+    ASYNC_HOST = "localhost"
+    ASYNC_PORT = config.pgpool_port
+
+    DURATION = 60
+
+    # Diferença relativa máxima de TPS entre os geradores
+    TPS_TOLERANCE = 0.5
+
+    @pytest.mark.parametrize("workload", ["select-only", "simple-update"])
+    @pytest.mark.parametrize("client_count", [10, 50])
+    def test_async_generator_matches_pgbench(
+        self,
+        workload,
+        client_count,
+        performance_collector,
+        async_load_collector,
+        performance_writer_cluster,
+        get_primary_node
+    ):
+        """
+        Cross-check: mesma carga, mesmos clientes, pgbench vs gerador nativo
+        """
+        pytest.importorskip("asyncpg")
+
+        print("\n" + "="*70)
+        print(f"CROSS-CHECK GERADOR NATIVO vs PGBENCH - {workload.upper()} - {client_count} CLIENTES")
+        print("="*70)
+
+        primary_node = get_primary_node()
+        if not primary_node:
+            pytest.fail("❌ Não foi possível identificar o nó primário do cluster!")
+
+        assert performance_collector.initialize_pgbench_database(
+            container_name=ClusterConfig.CONTAINER_NAME,
+            host=primary_node,
+            port=ClusterConfig.PORT,
+            user=ClusterConfig.USER,
+            password=ClusterConfig.PASSWORD,
+            database=ClusterConfig.DATABASE,
+            scale=ClusterConfig.SCALE
+        ), "Falha ao inicializar database pgbench"
+
+        pgbench_metrics = performance_collector.run_pgbench(
+            test_case=f"cluster_crosscheck_{workload}_{client_count}clients_pgbench",
+            scenario=ClusterConfig.SCENARIO,
+            container_name=ClusterConfig.CONTAINER_NAME,
+            host=ClusterConfig.HOST,
+            port=ClusterConfig.PORT,
+            user=ClusterConfig.USER,
+            password=ClusterConfig.PASSWORD,
+            database=ClusterConfig.DATABASE,
+            clients=client_count,
+            threads=ClusterConfig.THREADS,
+            duration=self.DURATION,
+            workload=workload,
+            prepared=True,  # asyncpg usa protocolo estendido com statements preparados
+            latency_log=True
+        )
+        pgbench_metrics.run_mode = "crosscheck"  # Validação do gerador: fora das células da matriz
+        performance_writer_cluster.write(pgbench_metrics)
+
+        async_metrics = async_load_collector.run(
+            test_case=f"cluster_crosscheck_{workload}_{client_count}clients_asyncpg",
+            scenario=ClusterConfig.SCENARIO,
+            templates=pgbench_templates(workload, ClusterConfig.SCALE),
+            host=self.ASYNC_HOST,
+            port=self.ASYNC_PORT,
+            user=ClusterConfig.USER,
+            password=ClusterConfig.PASSWORD,
+            database=ClusterConfig.DATABASE,
+            clients=client_count,
+            duration=self.DURATION,
+            workload=workload
+        )
+        async_metrics.run_mode = "crosscheck"
+        performance_writer_cluster.write(async_metrics)
+
+        assert pgbench_metrics.tps_total, "pgbench sem TPS"
+        assert async_metrics.tps_total, "Gerador nativo sem TPS"
+
+        tps_diff = abs(async_metrics.tps_total - pgbench_metrics.tps_total) / pgbench_metrics.tps_total
+
+        print(f"\n{'':<12} {'pgbench':>12} {'asyncpg':>12}")
+        print(f"{'TPS':<12} {pgbench_metrics.tps_total:>12.2f} {async_metrics.tps_total:>12.2f}")
+        for label, attr in [("lat. média", "latency_avg"), ("p95", "latency_p95"), ("p99", "latency_p99")]:
+            pg_value = getattr(pgbench_metrics, attr)
+            async_value = getattr(async_metrics, attr)
+            print(f"{label:<12} {pg_value if pg_value is not None else float('nan'):>12.3f} "
+                  f"{async_value if async_value is not None else float('nan'):>12.3f}")
+        print(f"Diferença de TPS: {tps_diff * 100:.1f}%")
+
+        assert tps_diff <= self.TPS_TOLERANCE, (
+            f"Gerador nativo diverge do pgbench em {tps_diff * 100:.1f}% "
+            f"(limite {self.TPS_TOLERANCE * 100:.0f}%)"
+        )
@@ -2,6 +2,7 @@
 Teste de Performance - Baseline (Single Node)
 """
 import pytest
+from src.collectors.adaptive_sweep import AdaptiveSweep
 
 # Configurações centralizadas
 class BaselineConfig:
@@ -20,6 +21,20 @@ class BaselineConfig:
     THREADS = 4
     DURATION = 180
     SCALE = 2000  # (DEVE SER MAIOR QUE A QT DE RAM DO SISTEMA! SCALE 1 =~ 16MB)
+    LATENCY_LOG_SAMPLING = 0.01  # Fração das transações no log (-l --sampling-rate) das células da matriz
+    
+    # Varredura adaptativa
+    ADAPTIVE_TIME_BUDGET = 1800  # segundos (~10 células de 180s)
+    ADAPTIVE_COARSE_GRID = [10, 50, 100, 200]
+    ADAPTIVE_MAX_CLIENTS = 200
+    
+    # Busca de capacidade sob SLO (malha aberta, pgbench -R)
+    SLO_P99_MS = 50.0
+    SLO_CLIENTS = 100
+    SLO_PROBE_DURATION = 60
+    
+    # Geração de carga distribuída (pgbench-client-2: docker compose --profile sharded)
+    SHARD_CONTAINERS = ["pgbench-client", "pgbench-client-2"]
 
 @pytest.mark.baseline
 class TestPerformanceBaseline:
@@ -35,6 +50,14 @@ class TestPerformanceBaseline:
     THREADS = BaselineConfig.THREADS
     DURATION = BaselineConfig.DURATION
     SCALE = BaselineConfig.SCALE
+    LATENCY_LOG_SAMPLING = BaselineConfig.LATENCY_LOG_SAMPLING
+    ADAPTIVE_TIME_BUDGET = BaselineConfig.ADAPTIVE_TIME_BUDGET
+    ADAPTIVE_COARSE_GRID = BaselineConfig.ADAPTIVE_COARSE_GRID
+    ADAPTIVE_MAX_CLIENTS = BaselineConfig.ADAPTIVE_MAX_CLIENTS
+    SLO_P99_MS = BaselineConfig.SLO_P99_MS
+    SLO_CLIENTS = BaselineConfig.SLO_CLIENTS
+    SLO_PROBE_DURATION = BaselineConfig.SLO_PROBE_DURATION
+    SHARD_CONTAINERS = BaselineConfig.SHARD_CONTAINERS
     
     @pytest.mark.baseline_select_only
     @pytest.mark.parametrize("client_count", [10, 25, 50, 75, 100, 125, 150, 175, 200])
@@ -88,16 +111,19 @@ class TestPerformanceBaseline:
             clients=client_count,
             threads=self.THREADS,
             duration=self.DURATION,
+            latency_log=True,  # Amostra do log por transação: p95/p99 reais na matriz
+            latency_log_sampling=self.LATENCY_LOG_SAMPLING,
             workload="select-only"
         )
         
         # Para coleta de Docker Stats
         stats_collector.stop()
         docker_metrics = stats_collector.get_metrics(f"baseline_select_only_{client_count}clients")
+        performance_collector.flag_client_saturation(metrics, docker_metrics, [self.CONTAINER_NAME])
         
         # Salva métricas
         performance_writer_baseline.write(metrics)
-        docker_stats_writer.write(docker_metrics.to_dict())
+        docker_stats_writer.write(docker_metrics)
         
         # Exibe resultados
         self._print_performance_metrics(metrics)
@@ -155,15 +181,18 @@ class TestPerformanceBaseline:
             clients=client_count,
             threads=self.THREADS,
             duration=self.DURATION,
+            latency_log=True,  # Amostra do log por transação: p95/p99 reais na matriz
+            latency_log_sampling=self.LATENCY_LOG_SAMPLING,
             workload="mixed"
         )
         
         # Para coleta de Docker Stats
         stats_collector.stop()
         docker_metrics = stats_collector.get_metrics(f"baseline_select_only_{client_count}clients")
+        performance_collector.flag_client_saturation(metrics, docker_metrics, [self.CONTAINER_NAME])
 
         performance_writer_baseline.write(metrics)
-        docker_stats_writer.write(docker_metrics.to_dict())
+        docker_stats_writer.write(docker_metrics)
         
         self._print_performance_metrics(metrics)
         self._print_docker_stats(docker_metrics)
@@ -172,6 +201,204 @@ class TestPerformanceBaseline:
         assert metrics.total_transactions > 0
         print(f"\n✅ Baseline (mixed) concluído ({client_count} clientes)")
         
+    @pytest.mark.baseline_select_only_sharded
+    @pytest.mark.parametrize("client_count", [100, 150, 200])
+    def test_baseline_select_only_sharded(
+        self,
+        client_count,
+        performance_collector,
+        performance_writer_baseline,
+        docker_stats_collector,
+        docker_stats_writer
+    ):
+        """
+        Teste de Performance (Baseline) - Carga distribuída em vários clientes pgbench
+        
+        Cenário 1: PostgreSQL standalone
+        Carga: SELECT-only (leitura)
+        
+        Divide os clientes entre os containers de SHARD_CONTAINERS (perfil
+        'sharded' do docker compose) para que a CPU do gerador de carga não
+        limite o TPS em contagens altas de clientes.
+        """
+        print("\n" + "="*70)
+        print(f"TESTE DE PERFORMANCE - BASELINE (SELECT-ONLY) - {client_count} CLIENTES EM {len(self.SHARD_CONTAINERS)} SHARDS")
+        print("="*70)
+        
+        self._initialize_database_once(performance_collector)
+        
+        # Inicia coleta de Docker Stats
+        stats_collector = docker_stats_collector(["postgres-baseline", "pgbench-client"] + self.SHARD_CONTAINERS[1:], interval=2.0)
+        stats_collector.start()
+        
+        metrics = performance_collector.run_pgbench_sharded(
+            test_case=f"baseline_select_only_sharded_{client_count}clients",
+            scenario=self.SCENARIO,
+            containers=self.SHARD_CONTAINERS,
+            host=self.HOST,
+            port=self.PORT,
+            user=self.USER,
+            password=self.PASSWORD,
+            database=self.DATABASE,
+            clients=client_count,
+            threads=self.THREADS,
+            duration=self.DURATION,
+            workload="select-only"
+        )
+        
+        # Para coleta de Docker Stats
+        stats_collector.stop()
+        docker_metrics = stats_collector.get_metrics(f"baseline_select_only_sharded_{client_count}clients")
+        performance_collector.flag_client_saturation(metrics, docker_metrics, self.SHARD_CONTAINERS)
+        
+        performance_writer_baseline.write(metrics)
+        docker_stats_writer.write(docker_metrics)
+        
+        self._print_performance_metrics(metrics)
+        self._print_docker_stats(docker_metrics)
+        
+        for shard in metrics.shards:
+            print(f"  Shard {shard['shard']}: {shard['clients']} clientes, {shard['tps'] or 0:.2f} TPS")
+        
+        assert metrics.total_transactions > 0, "Nenhuma transação executada"
+        assert len(metrics.shards) == len(self.SHARD_CONTAINERS), "Shard sem resultado"
+        print(f"\n✅ Baseline (sharded) concluído ({client_count} clientes)")
+        
+    @pytest.mark.baseline_select_only_adaptive
+    def test_baseline_select_only_adaptive(
+        self,
+        performance_collector,
+        performance_writer_baseline,
+        docker_stats_collector,
+        docker_stats_writer
+    ):
+        """
+        Teste de Performance (Baseline) - Varredura adaptativa de clientes
+        
+        Cenário 1: PostgreSQL standalone
+        Carga: SELECT-only (leitura)
+        
+        Em vez da grade fixa, parte de uma grade grossa e adiciona níveis de
+        clientes perto do pico de TPS (seção áurea) e do joelho de latência
+        (bisseção) dentro do orçamento ADAPTIVE_TIME_BUDGET.
+        """
+        print("\n" + "="*70)
+        print(f"TESTE DE PERFORMANCE - BASELINE (SELECT-ONLY) - VARREDURA ADAPTATIVA")
+        print("="*70)
+        
+        self._initialize_database_once(performance_collector)
+        
+        def _run_cell(client_count):
+            stats_collector = docker_stats_collector(["postgres-baseline", "pgbench-client"], interval=2.0)
+            stats_collector.start()
+            
+            metrics = performance_collector.run_pgbench(
+                test_case=f"baseline_select_only_{client_count}clients",
+                scenario=self.SCENARIO,
+                container_name=self.CONTAINER_NAME,
+                host=self.HOST,
+                port=self.PORT,
+                user=self.USER,
+                password=self.PASSWORD,
+                database=self.DATABASE,
+                clients=client_count,
+                threads=self.THREADS,
+                duration=self.DURATION,
+                latency_log=True,  # Amostra do log por transação: p95/p99 reais na matriz
+                latency_log_sampling=self.LATENCY_LOG_SAMPLING,
+                workload="select-only"
+            )
+            
+            stats_collector.stop()
+            docker_metrics = stats_collector.get_metrics(f"baseline_select_only_{client_count}clients")
+            performance_collector.flag_client_saturation(metrics, docker_metrics, [self.CONTAINER_NAME])
+            
+            performance_writer_baseline.write(metrics)
+            docker_stats_writer.write(docker_metrics)
+            self._print_performance_metrics(metrics)
+            return metrics
+        
+        sweep = AdaptiveSweep(
+            run_cell=_run_cell,
+            time_budget=self.ADAPTIVE_TIME_BUDGET,
+            coarse_grid=self.ADAPTIVE_COARSE_GRID,
+            max_clients=self.ADAPTIVE_MAX_CLIENTS,
+            estimated_cell_seconds=self.DURATION
+        )
+        result = sweep.run(self.SCENARIO, "select-only")
+        performance_writer_baseline.write(result)
+        
+        assert result.cells_run > 0, "Nenhuma célula executada"
+        assert result.peak_tps and result.peak_tps > 0, "TPS zerado"
+        
+        print(f"\n✅ Varredura adaptativa concluída ({result.cells_run} células, {result.elapsed_seconds:.0f}s)")
+        print(f"   Clientes amostrados: {result.clients_sampled}")
+        print(f"   Pico: {result.peak_clients} clientes ({result.peak_tps:.2f} TPS)"
+              f"{' - no limite da faixa' if result.peak_at_boundary else ''}")
+        if result.knee_bracket:
+            print(f"   Joelho: entre {result.knee_bracket[0]} e {result.knee_bracket[1]} clientes")
+        
+    @pytest.mark.baseline_select_only_slo
+    def test_baseline_select_only_slo(
+        self,
+        performance_collector,
+        performance_writer_baseline,
+        docker_stats_collector,
+        docker_stats_writer
+    ):
+        """
+        Teste de Performance (Baseline) - Capacidade sustentável sob SLO de latência
+        
+        Cenário 1: PostgreSQL standalone
+        Carga: SELECT-only (leitura), malha aberta (pgbench -R)
+        
+        Mede o TPS máximo em malha fechada e faz bisseção na taxa alvo até
+        encontrar a maior taxa em que o p99 fica abaixo de SLO_P99_MS.
+        """
+        print("\n" + "="*70)
+        print(f"TESTE DE PERFORMANCE - BASELINE (SELECT-ONLY) - BUSCA DE CAPACIDADE (SLO p99 <= {self.SLO_P99_MS}ms)")
+        print("="*70)
+        
+        self._initialize_database_once(performance_collector)
+        
+        stats_collector = docker_stats_collector(["postgres-baseline", "pgbench-client"], interval=2.0)
+        stats_collector.start()
+        
+        def _on_probe(metrics):
+            performance_writer_baseline.write(metrics)
+            self._print_performance_metrics(metrics)
+        
+        result = performance_collector.find_max_sustainable_rate(
+            test_case=f"baseline_select_only_slo_{self.SLO_CLIENTS}clients",
+            scenario=self.SCENARIO,
+            slo_p99_ms=self.SLO_P99_MS,
+            probe_duration=self.SLO_PROBE_DURATION,
+            on_probe=_on_probe,
+            container_name=self.CONTAINER_NAME,
+            host=self.HOST,
+            port=self.PORT,
+            user=self.USER,
+            password=self.PASSWORD,
+            database=self.DATABASE,
+            clients=self.SLO_CLIENTS,
+            threads=self.THREADS,
+            workload="select-only"
+        )
+        
+        stats_collector.stop()
+        docker_metrics = stats_collector.get_metrics(f"baseline_select_only_slo_{self.SLO_CLIENTS}clients")
+        
+        performance_writer_baseline.write(result)
+        docker_stats_writer.write(docker_metrics)
+        
+        assert result.probes, "Nenhuma sonda executada"
+        assert result.max_sustainable_tps, f"Nenhuma taxa atende o SLO p99 <= {self.SLO_P99_MS}ms"
+        
+        print(f"\n✅ Busca de capacidade concluída ({len(result.probes)} sondas)")
+        if result.closed_loop_tps:
+            print(f"   TPS máximo (malha fechada): {result.closed_loop_tps:.2f}")
+        print(f"   TPS sustentável (p99 <= {self.SLO_P99_MS}ms): {result.max_sustainable_tps:.2f}")
+        
     # @pytest.mark.baseline_select_only_reconnect
     # @pytest.mark.parametrize("client_count", [10, 25, 50, 75, 100])
     # def test_baseline_select_only_with_reconnect(
@@ -236,7 +463,7 @@ class TestPerformanceBaseline:
         
     #     # Salva métricas
     #     performance_writer_baseline.write(metrics)
-    #     docker_stats_writer.write(docker_metrics.to_dict())
+    #     docker_stats_writer.write(docker_metrics)
         
     #     # Exibe resultados
     #     self._print_performance_metrics(metrics)
@@ -304,7 +531,7 @@ class TestPerformanceBaseline:
     #     docker_metrics = stats_collector.get_metrics(f"baseline_mixed_reconnect_{client_count}clients")
 
     #     performance_writer_baseline.write(metrics)
-    #     docker_stats_writer.write(docker_metrics.to_dict())
+    #     docker_stats_writer.write(docker_metrics)
         
     #     self._print_performance_metrics(metrics)
     #     self._print_docker_stats(docker_metrics)
@@ -381,7 +608,7 @@ class TestPerformanceBaseline:
         
     #     # Salva métricas
     #     performance_writer_baseline.write(metrics)
-    #     docker_stats_writer.write(docker_metrics.to_dict())
+    #     docker_stats_writer.write(docker_metrics)
         
     #     # Exibe resultados
     #     self._print_performance_metrics(metrics)
@@ -465,7 +692,7 @@ class TestPerformanceBaseline:
         
     #     # Salva métricas
     #     performance_writer_baseline.write(metrics)
-    #     docker_stats_writer.write(docker_metrics.to_dict())
+    #     docker_stats_writer.write(docker_metrics)
         
     #     # Exibe resultados
     #     self._print_performance_metrics(metrics)
@@ -2,24 +2,11 @@
 Teste de Performance - Cluster com PgPool
 """
 import pytest
+from pathlib import Path
+from src.collectors.adaptive_sweep import AdaptiveSweep
+from src.collectors.exporter_scrape_collector import ExporterScrapeCollector
+from src.core.performance_targets import ClusterConfig
 
-# Configurações centralizadas
-class ClusterConfig:
-    """Configurações compartilhadas entre fixture e testes"""
-    
-    # Conexão
-    CONTAINER_NAME = "pgbench-client"
-    HOST = "pgpool"
-    PORT = 5432
-    USER = "teste"
-    PASSWORD = "zxwJA9P6C0hie03dwfNNP"
-    DATABASE = "postgres"
-    SCENARIO = "cluster_with_pgpool"
-    
-    # Carga
-    THREADS = 4
-    DURATION = 180
-    SCALE = 2000  # (DEVE SER MAIOR QUE A QT DE RAM DO SISTEMA! SCALE 1 =~ 16MB)
 
 @pytest.mark.cluster_performance
 class TestPerformanceCluster:
@@ -35,6 +22,15 @@ class TestPerformanceCluster:
     THREADS = ClusterConfig.THREADS
     DURATION = ClusterConfig.DURATION
     SCALE = ClusterConfig.SCALE
+    LATENCY_LOG_SAMPLING = ClusterConfig.LATENCY_LOG_SAMPLING
+    ADAPTIVE_TIME_BUDGET = ClusterConfig.ADAPTIVE_TIME_BUDGET
+    ADAPTIVE_COARSE_GRID = ClusterConfig.ADAPTIVE_COARSE_GRID
+    ADAPTIVE_MAX_CLIENTS = ClusterConfig.ADAPTIVE_MAX_CLIENTS
+    SLO_P99_MS = ClusterConfig.SLO_P99_MS
+    SLO_CLIENTS = ClusterConfig.SLO_CLIENTS
+    SLO_PROBE_DURATION = ClusterConfig.SLO_PROBE_DURATION
+    SHARD_CONTAINERS = ClusterConfig.SHARD_CONTAINERS
+    CUSTOM_MIX = ClusterConfig.CUSTOM_MIX
     
     # Containers para monitoramento Docker Stats
     CONTAINERS_TO_MONITOR = [
@@ -106,6 +102,10 @@ class TestPerformanceCluster:
         performance_writer_cluster,
         docker_stats_collector,
         docker_stats_writer,
+        load_balance_collector,
+        load_balance_writer,
+        pgpool_stats_collector,
+        pgpool_stats_writer,
         get_primary_node
     ):
         """
@@ -130,6 +130,13 @@ class TestPerformanceCluster:
         # Inicia coleta de Docker Stats
         stats_collector = docker_stats_collector(self.CONTAINERS_TO_MONITOR, interval=2.0)
         stats_collector.start()
+        
+        # Snapshot inicial da distribuição de carga (SHOW POOL_NODES + pg_stat_database)
+        load_balance_collector.start()
+        
+        # Amostragem de processos filhos / slots de conexão do PgPool (SHOW POOL_*)
+        pool_sampler = pgpool_stats_collector(interval=2.0)
+        pool_sampler.start()
 
         # Executa teste de carga
         print("\nExecutando teste de carga...")
@@ -150,20 +157,30 @@ class TestPerformanceCluster:
             clients=client_count,
             threads=self.THREADS,
             duration=self.DURATION,
+            latency_log=True,  # Amostra do log por transação: p95/p99 reais na matriz
+            latency_log_sampling=self.LATENCY_LOG_SAMPLING,
             workload="select-only"
         )
         
         # Para coleta de Docker Stats
         stats_collector.stop()
         docker_metrics = stats_collector.get_metrics(f"cluster_select_only_{client_count}clients")
+        performance_collector.flag_client_saturation(metrics, docker_metrics, [self.CONTAINER_NAME])
+        lb_metrics = load_balance_collector.stop(f"cluster_select_only_{client_count}clients", metrics)
+        pool_sampler.stop()
+        pool_metrics = pool_sampler.get_metrics(f"cluster_select_only_{client_count}clients")
         
         # Salva métricas
         performance_writer_cluster.write(metrics)
-        docker_stats_writer.write(docker_metrics.to_dict())
+        docker_stats_writer.write(docker_metrics)
+        load_balance_writer.write(lb_metrics)
+        pgpool_stats_writer.write(pool_metrics.to_dict())
         
         # Exibe resultados
         self._print_performance_metrics(metrics)
         self._print_docker_stats(docker_metrics)
+        print(load_balance_collector.summarize(lb_metrics))
+        print(pool_sampler.summarize(pool_metrics))
         
         # Valida que teste executou
         assert metrics.total_transactions > 0, "Nenhuma transação executada"
@@ -182,6 +199,10 @@ class TestPerformanceCluster:
         performance_writer_cluster,
         docker_stats_collector,
         docker_stats_writer,
+        load_balance_collector,
+        load_balance_writer,
+        pgpool_stats_collector,
+        pgpool_stats_writer,
         get_primary_node
     ):
         """
@@ -204,6 +225,13 @@ class TestPerformanceCluster:
         stats_collector = docker_stats_collector(self.CONTAINERS_TO_MONITOR, interval=2.0)
         stats_collector.start()
         
+        # Snapshot inicial da distribuição de carga (SHOW POOL_NODES + pg_stat_database)
+        load_balance_collector.start()
+        
+        # Amostragem de processos filhos / slots de conexão do PgPool (SHOW POOL_*)
+        pool_sampler = pgpool_stats_collector(interval=2.0)
+        pool_sampler.start()
+        
         print("\nExecutando teste de carga mista...")
         print(f"  Clientes: {client_count}, Threads: {self.THREADS}, Duração: {self.DURATION}s")
         print(f"  Conexão: {self.HOST}:{self.PORT} (PgPool)")
@@ -220,22 +248,325 @@ class TestPerformanceCluster:
             clients=client_count,
             threads=self.THREADS,
             duration=self.DURATION,
+            latency_log=True,  # Amostra do log por transação: p95/p99 reais na matriz
+            latency_log_sampling=self.LATENCY_LOG_SAMPLING,
             workload="mixed"
         )
 
         # Para coleta de Docker Stats
         stats_collector.stop()
         docker_metrics = stats_collector.get_metrics(f"cluster_mixed_{client_count}clients")
+        performance_collector.flag_client_saturation(metrics, docker_metrics, [self.CONTAINER_NAME])
+        lb_metrics = load_balance_collector.stop(f"cluster_mixed_{client_count}clients", metrics)
+        pool_sampler.stop()
+        pool_metrics = pool_sampler.get_metrics(f"cluster_mixed_{client_count}clients")
 
         performance_writer_cluster.write(metrics)
-        docker_stats_writer.write(docker_metrics.to_dict())
+        docker_stats_writer.write(docker_metrics)
+        load_balance_writer.write(lb_metrics)
+        pgpool_stats_writer.write(pool_metrics.to_dict())
         
         self._print_performance_metrics(metrics)
         self._print_docker_stats(docker_metrics)
+        print(load_balance_collector.summarize(lb_metrics))
+        print(pool_sampler.summarize(pool_metrics))
         
         assert metrics.total_transactions > 0
         print(f"\n✅ Cluster (mixed) concluído ({client_count} clientes)")
 
+    
+    @pytest.mark.cluster_custom_mix
+    @pytest.mark.parametrize("client_count", [10, 25, 50, 75, 100])
+    def test_cluster_custom_mix(
+        self,
+        client_count,
+        performance_collector,
+        performance_writer_cluster,
+        docker_stats_collector,
+        docker_stats_writer,
+        load_balance_collector,
+        load_balance_writer,
+        get_primary_node
+    ):
+        """
+        Teste cluster com mix ponderado de scripts customizados
+        
+        Reproduz uma versão sintética do mix leitura/escrita da produção
+        (CUSTOM_MIX) para avaliar o balanceamento de carga do PgPool.
+        O pgbench reporta latência e TPS por script.
+        """
+        print("\n" + "="*70)
+        print(f"TESTE DE PERFORMANCE - CLUSTER (CUSTOM MIX) - {client_count} CLIENTES")
+        print("="*70)
+        
+        # Garante que o database foi inicializado (só executa na primeira vez)
+        self._ensure_database_initialized(performance_collector, get_primary_node)
+        
+        # Inicia coleta de Docker Stats
+        stats_collector = docker_stats_collector(self.CONTAINERS_TO_MONITOR, interval=2.0)
+        stats_collector.start()
+        
+        # Snapshot inicial da distribuição de carga (SHOW POOL_NODES + pg_stat_database)
+        load_balance_collector.start()
+        
+        print("\nExecutando teste com mix customizado...")
+        for script, weight in self.CUSTOM_MIX.items():
+            print(f"  {Path(script).name}: peso {weight}")
+        
+        metrics = performance_collector.run_pgbench(
+            test_case=f"cluster_custom_mix_{client_count}clients",
+            scenario=self.SCENARIO,
+            container_name=self.CONTAINER_NAME,
+            host=self.HOST,
+            port=self.PORT,
+            user=self.USER,
+            password=self.PASSWORD,
+            database=self.DATABASE,
+            clients=client_count,
+            threads=self.THREADS,
+            duration=self.DURATION,
+            latency_log=True,  # Amostra do log por transação: p95/p99 reais na matriz
+            latency_log_sampling=self.LATENCY_LOG_SAMPLING,
+            workload="custom-mix",
+            scripts=self.CUSTOM_MIX
+        )
+        
+        # Para coleta de Docker Stats
+        stats_collector.stop()
+        docker_metrics = stats_collector.get_metrics(f"cluster_custom_mix_{client_count}clients")
+        performance_collector.flag_client_saturation(metrics, docker_metrics, [self.CONTAINER_NAME])
+        lb_metrics = load_balance_collector.stop(f"cluster_custom_mix_{client_count}clients", metrics)
+        
+        performance_writer_cluster.write(metrics)
+        docker_stats_writer.write(docker_metrics)
+        load_balance_writer.write(lb_metrics)
+        
+        self._print_performance_metrics(metrics)
+        self._print_docker_stats(docker_metrics)
+        print(load_balance_collector.summarize(lb_metrics))
+        
+        print("\nDetalhamento por script:")
+        for stats in metrics.script_stats:
+            print(f"  {Path(stats['script']).name}: {stats.get('tps', 0):.2f} TPS, "
+                  f"latência média {stats.get('latency_avg', 0):.3f} ms "
+                  f"({stats.get('transactions_percent', 0):.1f}% das transações)")
+        
+        assert metrics.total_transactions > 0
+        assert len(metrics.script_stats) == len(self.CUSTOM_MIX), "Detalhamento por script incompleto"
+        print(f"\n✅ Cluster (custom mix) concluído ({client_count} clientes)")
+        
+    @pytest.mark.cluster_select_only_sharded
+    @pytest.mark.parametrize("client_count", [100, 150, 200])
+    def test_cluster_select_only_sharded(
+        self,
+        client_count,
+        performance_collector,
+        performance_writer_cluster,
+        docker_stats_collector,
+        docker_stats_writer,
+        load_balance_collector,
+        load_balance_writer,
+        get_primary_node
+    ):
+        """
+        Teste de Performance (Cluster) - Carga distribuída em vários clientes pgbench
+        
+        Cenário 2: Cluster PostgreSQL + PgPool
+        Carga: SELECT-only (leitura)
+        
+        Divide os clientes entre os containers de SHARD_CONTAINERS (perfil
+        'sharded' do docker compose) para que a CPU do gerador de carga não
+        limite o TPS em contagens altas de clientes.
+        """
+        print("\n" + "="*70)
+        print(f"TESTE DE PERFORMANCE - CLUSTER (SELECT-ONLY) - {client_count} CLIENTES EM {len(self.SHARD_CONTAINERS)} SHARDS")
+        print("="*70)
+        
+        # Garante que o database foi inicializado (só executa na primeira vez)
+        self._ensure_database_initialized(performance_collector, get_primary_node)
+        
+        # Inicia coleta de Docker Stats
+        stats_collector = docker_stats_collector(self.CONTAINERS_TO_MONITOR + self.SHARD_CONTAINERS[1:], interval=2.0)
+        stats_collector.start()
+        
+        # Snapshot inicial da distribuição de carga (SHOW POOL_NODES + pg_stat_database)
+        load_balance_collector.start()
+        
+        metrics = performance_collector.run_pgbench_sharded(
+            test_case=f"cluster_select_only_sharded_{client_count}clients",
+            scenario=self.SCENARIO,
+            containers=self.SHARD_CONTAINERS,
+            host=self.HOST,
+            port=self.PORT,
+            user=self.USER,
+            password=self.PASSWORD,
+            database=self.DATABASE,
+            clients=client_count,
+            threads=self.THREADS,
+            duration=self.DURATION,
+            workload="select-only"
+        )
+        
+        # Para coleta de Docker Stats
+        stats_collector.stop()
+        docker_metrics = stats_collector.get_metrics(f"cluster_select_only_sharded_{client_count}clients")
+        performance_collector.flag_client_saturation(metrics, docker_metrics, self.SHARD_CONTAINERS)
+        lb_metrics = load_balance_collector.stop(f"cluster_select_only_sharded_{client_count}clients", metrics)
+        
+        performance_writer_cluster.write(metrics)
+        docker_stats_writer.write(docker_metrics)
+        load_balance_writer.write(lb_metrics)
+        
+        self._print_performance_metrics(metrics)
+        self._print_docker_stats(docker_metrics)
+        print(load_balance_collector.summarize(lb_metrics))
+        
+        for shard in metrics.shards:
+            print(f"  Shard {shard['shard']}: {shard['clients']} clientes, {shard['tps'] or 0:.2f} TPS")
+        
+        assert metrics.total_transactions > 0, "Nenhuma transação executada"
+        assert len(metrics.shards) == len(self.SHARD_CONTAINERS), "Shard sem resultado"
+        print(f"\n✅ Cluster (sharded) concluído ({client_count} clientes)")
+        
+    @pytest.mark.cluster_select_only_adaptive
+    def test_cluster_select_only_adaptive(
+        self,
+        performance_collector,
+        performance_writer_cluster,
+        docker_stats_collector,
+        docker_stats_writer,
+        get_primary_node
+    ):
+        """
+        Teste de Performance (Cluster) - Varredura adaptativa de clientes
+        
+        Cenário 2: Cluster PostgreSQL + PgPool
+        Carga: SELECT-only (leitura)
+        
+        Em vez da grade fixa, parte de uma grade grossa e adiciona níveis de
+        clientes perto do pico de TPS (seção áurea) e do joelho de latência
+        (bisseção) dentro do orçamento ADAPTIVE_TIME_BUDGET.
+        """
+        print("\n" + "="*70)
+        print(f"TESTE DE PERFORMANCE - CLUSTER (SELECT-ONLY) - VARREDURA ADAPTATIVA")
+        print("="*70)
+        
+        # Garante que o database foi inicializado (só executa na primeira vez)
+        self._ensure_database_initialized(performance_collector, get_primary_node)
+        
+        def _run_cell(client_count):
+            stats_collector = docker_stats_collector(self.CONTAINERS_TO_MONITOR, interval=2.0)
+            stats_collector.start()
+            
+            metrics = performance_collector.run_pgbench(
+                test_case=f"cluster_select_only_{client_count}clients",
+                scenario=self.SCENARIO,
+                container_name=self.CONTAINER_NAME,
+                host=self.HOST,
+                port=self.PORT,
+                user=self.USER,
+                password=self.PASSWORD,
+                database=self.DATABASE,
+                clients=client_count,
+                threads=self.THREADS,
+                duration=self.DURATION,
+                latency_log=True,  # Amostra do log por transação: p95/p99 reais na matriz
+                latency_log_sampling=self.LATENCY_LOG_SAMPLING,
+                workload="select-only"
+            )
+            
+            stats_collector.stop()
+            docker_metrics = stats_collector.get_metrics(f"cluster_select_only_{client_count}clients")
+            performance_collector.flag_client_saturation(metrics, docker_metrics, [self.CONTAINER_NAME])
+            
+            performance_writer_cluster.write(metrics)
+            docker_stats_writer.write(docker_metrics)
+            self._print_performance_metrics(metrics)
+            return metrics
+        
+        sweep = AdaptiveSweep(
+            run_cell=_run_cell,
+            time_budget=self.ADAPTIVE_TIME_BUDGET,
+            coarse_grid=self.ADAPTIVE_COARSE_GRID,
+            max_clients=self.ADAPTIVE_MAX_CLIENTS,
+            estimated_cell_seconds=self.DURATION
+        )
+        result = sweep.run(self.SCENARIO, "select-only")
+        performance_writer_cluster.write(result)
+        
+        assert result.cells_run > 0, "Nenhuma célula executada"
+        assert result.peak_tps and result.peak_tps > 0, "TPS zerado"
+        
+        print(f"\n✅ Varredura adaptativa concluída ({result.cells_run} células, {result.elapsed_seconds:.0f}s)")
+        print(f"   Clientes amostrados: {result.clients_sampled}")
+        print(f"   Pico: {result.peak_clients} clientes ({result.peak_tps:.2f} TPS)"
+              f"{' - no limite da faixa' if result.peak_at_boundary else ''}")
+        if result.knee_bracket:
+            print(f"   Joelho: entre {result.knee_bracket[0]} e {result.knee_bracket[1]} clientes")
+
+    @pytest.mark.cluster_select_only_slo
+    def test_cluster_select_only_slo(
+        self,
+        performance_collector,
+        performance_writer_cluster,
+        docker_stats_collector,
+        docker_stats_writer,
+        get_primary_node
+    ):
+        """
+        Teste de Performance (Cluster) - Capacidade sustentável sob SLO de latência
+        
+        Cenário 2: Cluster PostgreSQL + PgPool
+        Carga: SELECT-only (leitura), malha aberta (pgbench -R)
+        
+        Mede o TPS máximo em malha fechada e faz bisseção na taxa alvo até
+        encontrar a maior taxa em que o p99 fica abaixo de SLO_P99_MS.
+        """
+        print("\n" + "="*70)
+        print(f"TESTE DE PERFORMANCE - CLUSTER (SELECT-ONLY) - BUSCA DE CAPACIDADE (SLO p99 <= {self.SLO_P99_MS}ms)")
+        print("="*70)
+        
+        # Garante que o database foi inicializado (só executa na primeira vez)
+        self._ensure_database_initialized(performance_collector, get_primary_node)
+        
+        stats_collector = docker_stats_collector(self.CONTAINERS_TO_MONITOR, interval=2.0)
+        stats_collector.start()
+        
+        def _on_probe(metrics):
+            performance_writer_cluster.write(metrics)
+            self._print_performance_metrics(metrics)
+        
+        result = performance_collector.find_max_sustainable_rate(
+            test_case=f"cluster_select_only_slo_{self.SLO_CLIENTS}clients",
+            scenario=self.SCENARIO,
+            slo_p99_ms=self.SLO_P99_MS,
+            probe_duration=self.SLO_PROBE_DURATION,
+            on_probe=_on_probe,
+            container_name=self.CONTAINER_NAME,
+            host=self.HOST,
+            port=self.PORT,
+            user=self.USER,
+            password=self.PASSWORD,
+            database=self.DATABASE,
+            clients=self.SLO_CLIENTS,
+            threads=self.THREADS,
+            workload="select-only"
+        )
+        
+        stats_collector.stop()
+        docker_metrics = stats_collector.get_metrics(f"cluster_select_only_slo_{self.SLO_CLIENTS}clients")
+        
+        performance_writer_cluster.write(result)
+        docker_stats_writer.write(docker_metrics)
+        
+        assert result.probes, "Nenhuma sonda executada"
+        assert result.max_sustainable_tps, f"Nenhuma taxa atende o SLO p99 <= {self.SLO_P99_MS}ms"
+        
+        print(f"\n✅ Busca de capacidade concluída ({len(result.probes)} sondas)")
+        if result.closed_loop_tps:
+            print(f"   TPS máximo (malha fechada): {result.closed_loop_tps:.2f}")
+        print(f"   TPS sustentável (p99 <= {self.SLO_P99_MS}ms): {result.max_sustainable_tps:.2f}")
+
 
     def _print_performance_metrics(self, metrics):
         """Exibe métricas formatadas"""
@@ -298,6 +629,10 @@ class TestPerformanceCluster:
             else:
                 print(f"Tempo conexão inicial: {metrics.initial_connection_time:.2f} ms")
         
+        if metrics.exporter_deltas:
+            print("-"*70)
+            print(ExporterScrapeCollector.summarize(metrics))
+        
         print("="*70)
     
     def _print_docker_stats(self, metrics):
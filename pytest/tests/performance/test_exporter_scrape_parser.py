@@ -0,0 +1,90 @@
+"""
+Parser da exposição dos exporters e acúmulo por célula (sem Docker)
+
+Exposições no formato texto do Prometheus, como as do postgres_exporter e do
+pgpool2_exporter, alimentadas direto no parser e no ExporterScrapeCollector.
+
+Uso:
+    pytest -m unit tests/performance/test_exporter_scrape_parser.py
+"""
+import pytest
+
+from src.collectors.exporter_scrape_collector import ExporterScrapeCollector, parse_exposition
+from src.models.performance_metrics import PerformanceMetrics
+
+
+EXPOSITION = """\
+# HELP pg_stat_database_blks_hit Number of times disk blocks were found already in the buffer cache
+# TYPE pg_stat_database_blks_hit counter
+pg_stat_database_blks_hit{datid="16384",datname="postgres"} 1500 1700000000000
+pg_stat_database_blks_hit{datid="1",datname="template1"} 99
+# HELP pg_locks_count Number of locks
+# TYPE pg_locks_count gauge
+pg_locks_count{datname="postgres",mode="accesssharelock"} 4
+pg_locks_count_x{datname="postgres"} 123
+# TYPE pgpool2_frontend_used gauge
+pgpool2_frontend_used 12
+"""
+
+ALLOWLIST = {
+    "pg_stat_database_blks_hit": "counter",
+    "pg_locks_count": "gauge",
+    "pgpool2_frontend_used": "gauge",
+}
+
+
+def _collector() -> ExporterScrapeCollector:
+    return ExporterScrapeCollector(targets={}, allowlist=ALLOWLIST, label_filter={"datname": "postgres"})
+
+
+@pytest.mark.unit
+class TestParseExposition:
+    
+    def test_allowlist_prefix_collision(self):
+        """pg_locks_count_x tem o prefixo de pg_locks_count, mas não está na allowlist"""
+        values, types = parse_exposition(EXPOSITION, ALLOWLIST)
+        assert not any(name == "pg_locks_count_x" for name, _ in values)
+        assert values[("pg_locks_count", '{datname="postgres",mode="accesssharelock"}')] == 4
+        assert types == {"pg_stat_database_blks_hit": "counter", "pg_locks_count": "gauge",
+                         "pgpool2_frontend_used": "gauge"}
+    
+    def test_trailing_timestamp_is_ignored(self):
+        """Timestamp opcional após o valor não entra no valor"""
+        values, _ = parse_exposition(EXPOSITION, ALLOWLIST)
+        assert values[("pg_stat_database_blks_hit", '{datid="16384",datname="postgres"}')] == 1500
+        assert values[("pgpool2_frontend_used", "")] == 12
+    
+    def test_label_filter(self):
+        """Séries de outro banco são descartadas; séries sem o label são mantidas"""
+        values, _ = parse_exposition(EXPOSITION, ALLOWLIST, label_filter={"datname": "postgres"})
+        assert sorted(values) == [
+            ("pg_locks_count", '{datname="postgres",mode="accesssharelock"}'),
+            ("pg_stat_database_blks_hit", '{datid="16384",datname="postgres"}'),
+            ("pgpool2_frontend_used", ""),
+        ]
+
+
+@pytest.mark.unit
+class TestAccumulate:
+    
+    def test_counter_increase_and_gauge_stats(self):
+        """Contador vira incremento na célula; gauge vira média, máximo e último valor"""
+        collector = _collector()
+        for hit, locks in ((100, 2), (160, 6), (200, 4)):
+            collector._accumulate(("patroni1", "pg_stat_database_blks_hit", ""), hit)
+            collector._accumulate(("patroni1", "pg_locks_count", ""), locks)
+        
+        assert collector.get_deltas() == {"patroni1:pg_stat_database_blks_hit": 100}
+        assert collector.get_gauges() == {"patroni1:pg_locks_count": {'avg': 4, 'max': 6, 'last': 4}}
+    
+    def test_counter_reset(self):
+        """Contador reiniciado (restart/failover): o valor novo é todo incremento"""
+        collector = _collector()
+        for value in (1000, 1200, 50, 80):
+            collector._accumulate(("patroni1", "pg_stat_database_blks_hit", ""), value)
+        
+        # 1000 → 1200 (+200), reinício → 50 (+50), 50 → 80 (+30)
+        assert collector.get_deltas() == {"patroni1:pg_stat_database_blks_hit": 280}
+        
+        metrics = collector.attach(PerformanceMetrics(run_id="unit", test_case="unit", scenario="cluster"))
+        assert metrics.exporter_deltas == {"patroni1:pg_stat_database_blks_hit": 280}
@@ -0,0 +1,60 @@
+"""
+Arquivos JSONL de resultado: ida e volta e escrita interrompida (sem Docker)
+
+Cada compressão suportada (texto puro, gzip, zstd) é gravada pelo JSONLWriter
+e relida pelo JSONLReader; depois o arquivo é cortado no meio do último
+registro, como após um kill durante o flush.
+
+Uso:
+    pytest -m unit tests/performance/test_jsonl_files.py
+"""
+import pytest
+
+from src.core import json_manager
+from src.core.json_manager import JSONLReader, JSONLWriter
+from src.models.performance_metrics import PerformanceMetrics
+
+
+COMPRESSIONS = [
+    None,
+    "gzip",
+    pytest.param("zstd", marks=pytest.mark.skipif(json_manager.zstandard is None,
+                                                  reason="zstandard não instalado")),
+]
+
+
+def _write(tmp_path, compression, count=3):
+    """Grava count registros; retorna o arquivo e o tamanho após cada flush"""
+    sizes = []
+    with JSONLWriter(tmp_path, "performance", "unit", compression=compression, flush_interval=None) as writer:
+        writer.write_metadata({"run_id": "unit"})
+        for i in range(count):
+            writer.write(PerformanceMetrics(run_id="unit", test_case=f"case_{i}", scenario="baseline",
+                                            tps_total=100.0 + i))
+            writer.flush()  # Um bloco comprimido por registro
+            sizes.append(writer.get_filepath().stat().st_size)
+    return writer.get_filepath(), sizes
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+class TestJSONLFiles:
+    
+    def test_round_trip(self, tmp_path, compression):
+        """Registros versionados voltam como os modelos gravados"""
+        path, _ = _write(tmp_path, compression)
+        assert path.name.endswith(json_manager.COMPRESSION_SUFFIXES[compression])
+        
+        records = list(JSONLReader.iter_typed(path, "performance_metrics"))
+        assert [m.test_case for m in records] == ["case_0", "case_1", "case_2"]
+        assert [m.tps_total for m in records] == [100.0, 101.0, 102.0]
+        assert JSONLReader.read_by_type(path, "metadata")[0]["data"] == {"run_id": "unit"}
+    
+    def test_truncated_last_record(self, tmp_path, compression):
+        """Arquivo cortado no meio do último registro: lê até o último registro completo"""
+        path, sizes = _write(tmp_path, compression)
+        data = path.read_bytes()
+        path.write_bytes(data[:(sizes[-2] + sizes[-1]) // 2])  # Metade do último bloco/linha
+        
+        records = list(JSONLReader.iter_typed(path, "performance_metrics"))
+        assert [m.test_case for m in records] == ["case_0", "case_1"]
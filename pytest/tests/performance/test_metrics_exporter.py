@@ -0,0 +1,125 @@
+"""
+Exportador das métricas do harness no formato do Prometheus (sem Docker)
+
+Registro, exposição de gauges/contadores/histogramas e o endpoint HTTP
+/metrics servido em uma porta livre.
+
+Uso:
+    pytest -m unit tests/performance/test_metrics_exporter.py
+"""
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.collectors.exporter_scrape_collector import parse_exposition
+from src.core.metrics_exporter import CONTENT_TYPE, MetricsExporter, MetricsRegistry, _Metric
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(prefix="test_")
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    
+    def test_get_or_create_and_kind_conflict(self, registry):
+        """Mesmo nome devolve a mesma família; outro tipo com o mesmo nome é recusado"""
+        gauge = registry.gauge("probe_up", "Último probe OK")
+        assert registry.gauge("probe_up") is gauge
+        assert gauge.name == "test_probe_up"
+        with pytest.raises(ValueError):
+            registry.counter("probe_up")
+    
+    def test_gauge_and_counter_exposition(self, registry):
+        """HELP/TYPE por família, labels ordenados e escapados, contador com sufixo _total"""
+        registry.gauge("pgbench_tps", "TPS do último intervalo").set(1234.5, scenario="cluster", cell="a")
+        counter = registry.counter("probes", "Probes por resultado")
+        counter.inc(target="pgpool", outcome="ok")
+        counter.inc(2, target="pgpool", outcome="ok")
+        registry.gauge("note").set(1, text='a "b"\nc')
+        
+        text = registry.expose()
+        assert "# HELP test_pgbench_tps TPS do último intervalo\n# TYPE test_pgbench_tps gauge\n" in text
+        assert 'test_pgbench_tps{cell="a",scenario="cluster"} 1234.5\n' in text
+        assert "# TYPE test_probes counter\n" in text
+        assert 'test_probes_total{outcome="ok",target="pgpool"} 3\n' in text
+        assert 'test_note{text="a \\"b\\"\\nc"} 1\n' in text
+    
+    def test_clear_keeps_families(self, registry):
+        """clear() zera as séries, mas as famílias continuam registradas"""
+        registry.gauge("pgbench_tps", "TPS").set(1.0)
+        registry.clear()
+        assert registry.expose() == "# HELP test_pgbench_tps TPS\n# TYPE test_pgbench_tps gauge\n"
+    
+    def test_metric_base_is_abstract(self):
+        """Família sem _samples() não pode ser instanciada"""
+        with pytest.raises(TypeError):
+            _Metric("test_untyped", "")
+
+
+@pytest.mark.unit
+class TestHistogram:
+    
+    def test_cumulative_buckets(self, registry):
+        """Buckets cumulativos com +Inf, _sum e _count coerentes"""
+        histogram = registry.histogram("probe_latency_ms", "Latência", buckets=(1, 10, 100))
+        for value in (0.5, 1, 5, 50, 5000):
+            histogram.observe(value, kind="read")
+        
+        values, _ = parse_exposition(histogram.expose(), ["test_probe_latency_ms_bucket",
+                                                          "test_probe_latency_ms_sum",
+                                                          "test_probe_latency_ms_count"])
+        assert values[("test_probe_latency_ms_bucket", '{kind="read",le="1"}')] == 2  # Limite inclusivo
+        assert values[("test_probe_latency_ms_bucket", '{kind="read",le="10"}')] == 3
+        assert values[("test_probe_latency_ms_bucket", '{kind="read",le="100"}')] == 4
+        assert values[("test_probe_latency_ms_bucket", '{kind="read",le="+Inf"}')] == 5
+        assert values[("test_probe_latency_ms_sum", '{kind="read"}')] == pytest.approx(5056.5)
+        assert values[("test_probe_latency_ms_count", '{kind="read"}')] == 5
+        assert "# TYPE test_probe_latency_ms histogram\n" in histogram.expose()
+
+
+@pytest.mark.unit
+class TestMetricsExporter:
+    
+    def test_http_endpoint(self, registry):
+        """Servidor em porta livre: GET /metrics devolve a exposição atual; outros caminhos, 404"""
+        registry.gauge("observer_state", "Estado").set(2)
+        registry.histogram("probe_latency_ms", "Latência", buckets=(1, 10)).observe(3)
+        
+        exporter = MetricsExporter(registry, port=0, host="127.0.0.1")
+        assert exporter.start()
+        try:
+            with urllib.request.urlopen(exporter.url, timeout=5) as response:
+                assert response.status == 200
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                body = response.read().decode("utf-8")
+            
+            assert body == registry.expose()
+            assert "test_observer_state 2\n" in body
+            assert 'test_probe_latency_ms_bucket{le="1"} 0\n' in body
+            assert 'test_probe_latency_ms_bucket{le="10"} 1\n' in body
+            assert 'test_probe_latency_ms_bucket{le="+Inf"} 1\n' in body
+            
+            # Atualizações aparecem na próxima raspagem
+            registry.gauge("observer_state").set(5)
+            with urllib.request.urlopen(exporter.url, timeout=5) as response:
+                assert "test_observer_state 5\n" in response.read().decode("utf-8")
+            
+            with pytest.raises(urllib.error.HTTPError) as excinfo:
+                urllib.request.urlopen(exporter.url.replace("/metrics", "/other"), timeout=5)
+            assert excinfo.value.code == 404
+        finally:
+            exporter.stop()
+        assert exporter.url is None
+    
+    def test_textfile(self, registry, tmp_path):
+        """Arquivo texto recebe a exposição final ao parar"""
+        path = tmp_path / "harness.prom"
+        exporter = MetricsExporter(registry, textfile=path, textfile_interval=60)
+        exporter.start()
+        registry.counter("probes", "Probes").inc(target="pgpool")
+        exporter.stop()
+        assert path.read_text(encoding="utf-8") == registry.expose()
+        assert 'test_probes_total{target="pgpool"} 1\n' in path.read_text(encoding="utf-8")
@@ -0,0 +1,50 @@
+"""
+Gate de Regressão de Performance
+
+Compara o histórico salvo em outputs/performance de um run candidato contra
+um run de referência e falha a sessão se alguma célula
+(scenario, workload, clients) regrediu de forma estatisticamente significativa.
+
+Uso:
+    pytest -m regression --regression-reference=<run_id> [--regression-candidate=<run_id>]
+"""
+import pytest
+from src.analysis.regression import summarize_report
+
+
+@pytest.mark.regression
+class TestPerformanceRegression:
+    
+    def test_no_performance_regression(
+        self,
+        performance_history,
+        regression_runs,
+        regression_detector,
+        regression_writer
+    ):
+        """
+        Gate de regressão
+        
+        Critérios por célula:
+        - Queda de TPS acima do limiar (Mann-Whitney sobre TPS por intervalo)
+        - Aumento de latência p95 acima do limiar (média sem log por transação; Mann-Whitney sobre latência por intervalo)
+        """
+        reference, candidate = regression_runs
+        
+        print("\n" + "="*70)
+        print(f"GATE DE REGRESSÃO - {candidate} vs {reference}")
+        print("="*70)
+        
+        report = regression_detector.compare_runs(performance_history, reference, candidate)
+        
+        # Salva veredito (machine-readable)
+        regression_writer.write(report)
+        print(f"💾 Veredito salvo em {regression_writer.get_filepath()}")
+        
+        print(summarize_report(report))
+        
+        regressions = report.get_regressions()
+        assert report.passed, (
+            f"{len(regressions)} célula(s) com regressão: "
+            + ", ".join(f"{c.scenario}/{c.workload_type}/{c.clients}" for c in regressions)
+        )
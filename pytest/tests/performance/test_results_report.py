@@ -0,0 +1,127 @@
+"""
+Relatório Comparativo - baseline x cluster, recursos e RTO/RPO
+
+Gera um HTML estático (gráficos SVG) a partir dos JSONL em outputs/. Os
+arquivos já lidos ficam em cache (outputs/reports/.cache.pkl): depois de um
+novo run só os arquivos novos são processados.
+
+Uso:
+    pytest -m report [--analysis-run=<run_id> ...]
+    python -m src.analysis.report --run <run_id>
+"""
+import json
+import statistics
+
+import pytest
+
+from src.analysis.report import ReportGenerator
+from src.core.performance_targets import ClusterConfig
+from src.models.performance_metrics import PerformanceMetrics
+from src.models.records import encode_record
+
+
+def _cell_means(performance, workload, clients, side):
+    """Média de TPS e latência das execuções de benchmark de um lado ('baseline' ou 'cluster') da célula"""
+    runs = [m for m in performance
+            if m.is_benchmark and m.tps_total is not None
+            and (m.workload_type, m.clients) == (workload, clients)
+            and (m.scenario == "baseline") == (side == "baseline")]
+    if not runs:
+        return None, None
+    latencies = [m.latency_avg for m in runs if m.latency_avg is not None]
+    return statistics.fmean(m.tps_total for m in runs), statistics.fmean(latencies) if latencies else None
+
+
+@pytest.mark.report
+class TestResultsReport:
+    
+    def test_render_comparison_report(self, report_generator, analysis_run_ids):
+        """
+        Pareia células baseline/cluster por (workload, clientes) e gera o relatório
+        """
+        data = report_generator.load(analysis_run_ids)
+        
+        if not data.comparisons and not data.rto_seconds and not data.resources:
+            pytest.skip("Nenhum resultado em outputs/ para o relatório")
+        
+        self._print_comparisons(data)
+        
+        path = report_generator.generate(analysis_run_ids)
+        print(f"\n📊 Relatório salvo em {path}")
+        
+        content = path.read_text(encoding='utf-8')
+        assert "<svg" in content
+        
+        # Cada célula pareada traz a média das execuções de benchmark de cada cenário
+        for summary in data.comparisons:
+            for side in ("baseline", "cluster"):
+                tps, latency = _cell_means(data.performance, summary.workload_type, summary.clients, side)
+                assert getattr(summary, f"{side}_tps") == pytest.approx(tps)
+                assert getattr(summary, f"{side}_latency_avg") == pytest.approx(latency)
+        
+        # Sem arquivos novos, uma segunda carga não relê nada do disco
+        reloaded = ReportGenerator(report_generator.output_base_dir).load(analysis_run_ids)
+        assert reloaded.files_parsed == 0
+        assert reloaded.files_reused == data.files_parsed + data.files_reused
+    
+    
+    def _print_comparisons(self, data):
+        """Exibe a tabela baseline x cluster"""
+        print("\n" + "="*70)
+        print(f"RELATÓRIO COMPARATIVO ({len(data.run_ids)} runs, "
+              f"{data.files_parsed} arquivos lidos, {data.files_reused} do cache)")
+        print("="*70)
+        print(f"{'Workload':<22} {'Clientes':>8} {'TPS base':>10} {'TPS cluster':>12} {'Fator':>7}")
+        print("-"*70)
+        for s in data.comparisons:
+            base = f"{s.baseline_tps:.1f}" if s.baseline_tps is not None else "-"
+            cluster = f"{s.cluster_tps:.1f}" if s.cluster_tps is not None else "-"
+            factor = f"{s.scalability_factor:.2f}" if s.scalability_factor is not None else "-"
+            print(f"{str(s.workload_type):<22} {s.clients:>8} {base:>10} {cluster:>12} {factor:>7}")
+        print("="*70)
+
+
+@pytest.mark.unit
+class TestReportCells:
+    
+    @staticmethod
+    def _write_run(outputs, run_id, rows):
+        path = outputs / "performance" / f"performance_{run_id}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "metadata", "data": {"run_id": run_id}}) + "\n")
+            for metrics in rows:
+                f.write(json.dumps(encode_record(metrics)) + "\n")
+    
+    @staticmethod
+    def _metrics(run_id, scenario, tps, latency, **kwargs):
+        return PerformanceMetrics(run_id=run_id, test_case=f"{scenario}_select", scenario=scenario,
+                                  clients=10, workload_type="select-only",
+                                  tps_total=tps, latency_avg=latency, **kwargs)
+    
+    def test_pair_cells_and_cache_reuse(self, tmp_path):
+        """Pareia as médias por célula (sem sondas de SLO) e reaproveita o cache na segunda carga"""
+        self._write_run(tmp_path, "run_a", [
+            self._metrics("run_a", "baseline", 1000.0, 10.0),
+            self._metrics("run_a", ClusterConfig.SCENARIO, 800.0, 12.5),
+            self._metrics("run_a", ClusterConfig.SCENARIO, 50.0, 1.0, target_rate=100, run_mode="slo_probe"),
+        ])
+        self._write_run(tmp_path, "run_b", [
+            self._metrics("run_b", "baseline", 1200.0, 8.0),
+            self._metrics("run_b", ClusterConfig.SCENARIO, 1000.0, 9.5),
+        ])
+        
+        data = ReportGenerator(tmp_path).load()
+        assert (data.files_parsed, data.files_reused) == (2, 0)
+        assert len(data.comparisons) == 1
+        summary = data.comparisons[0]
+        assert (summary.workload_type, summary.clients) == ("select-only", 10)
+        assert summary.baseline_tps == pytest.approx(1100.0)
+        assert summary.cluster_tps == pytest.approx(900.0)
+        assert summary.baseline_latency_avg == pytest.approx(9.0)
+        assert summary.cluster_latency_avg == pytest.approx(11.0)
+        assert summary.scalability_factor == pytest.approx(900.0 / 1100.0)
+        
+        reloaded = ReportGenerator(tmp_path).load()
+        assert (reloaded.files_parsed, reloaded.files_reused) == (0, 2)
+        assert [s.cluster_tps for s in reloaded.comparisons] == [pytest.approx(900.0)]
@@ -0,0 +1,64 @@
+"""
+Análise de Escalabilidade - Universal Scalability Law
+
+Ajusta USL (ou Amdahl) sobre a curva TPS x clientes de cada cenário salvo em
+outputs/performance e reporta contenção (σ), coerência (κ), pico previsto e
+joelho da curva. Base para dimensionar num_init_children (PgPool) e
+max_connections (PostgreSQL).
+
+Uso:
+    pytest -m scalability [--analysis-run=<run_id> ...]
+"""
+import pytest
+
+
+@pytest.mark.scalability
+class TestScalabilityAnalysis:
+    
+    def test_fit_scalability_curves(
+        self,
+        performance_history,
+        analysis_run_ids,
+        scalability_analyzer,
+        scalability_writer
+    ):
+        """
+        Ajusta o modelo por (scenario, workload) e salva os parâmetros
+        """
+        analyses = scalability_analyzer.analyze_history(performance_history, analysis_run_ids)
+        
+        if not analyses:
+            pytest.skip("Histórico sem séries com níveis de clientes suficientes")
+        
+        for analysis in analyses:
+            scalability_writer.write(analysis)
+            self._print_analysis(analysis)
+            
+            assert analysis.sigma is not None and analysis.sigma >= 0
+            assert analysis.kappa is not None and analysis.kappa >= 0
+        
+        print(f"\n💾 Análises salvas em {scalability_writer.get_filepath()}")
+    
+    def _print_analysis(self, analysis):
+        """Exibe parâmetros ajustados"""
+        print("\n" + "="*70)
+        print(f"ESCALABILIDADE - {analysis.scenario} / {analysis.workload_type}")
+        print("="*70)
+        print(f"Modelo:                {analysis.model.upper()} (R² = {analysis.r_squared:.4f})")
+        print(f"λ (TPS 1 cliente):     {analysis.lambda_tps:.2f}")
+        print(f"σ (contenção):         {analysis.sigma:.6f}")
+        print(f"κ (coerência):         {analysis.kappa:.8f}")
+        print("-"*70)
+        if analysis.peak_clients:
+            print(f"Pico previsto:         {analysis.peak_clients:.1f} clientes ({analysis.peak_tps:.2f} TPS)")
+        elif analysis.asymptotic_tps:
+            print(f"Teto assintótico:      {analysis.asymptotic_tps:.2f} TPS (sem pico, κ = 0)")
+        if analysis.knee_clients_model:
+            print(f"Joelho (modelo):       {analysis.knee_clients_model:.1f} clientes")
+        if analysis.knee_clients_observed:
+            print(f"Joelho (observado):    {analysis.knee_clients_observed} clientes")
+        if analysis.recommended_num_init_children:
+            print("-"*70)
+            print(f"num_init_children:     {analysis.recommended_num_init_children}")
+            print(f"max_connections:       >= {analysis.recommended_max_connections}")
+        print("="*70)
@@ -0,0 +1,142 @@
+"""
+Cliente PCP nativo contra um servidor PCP simulado (sem Docker)
+
+O servidor simulado valida o token md5 como o pcp_worker do pgpool, a partir
+do hash guardado no pcp.conf (usuário:pg_md5(senha)), e responde às
+operações com o mesmo enquadramento (tag | tamanho | campos NUL).
+
+Uso:
+    pytest -m unit tests/resilience/test_pcp_client.py
+"""
+import hashlib
+import os
+import socket
+import struct
+import threading
+
+import pytest
+
+from src.core.pcp_client import PCPClient, PCPError, PCPConnectionError
+from src.core.pgpool_manager import PgPoolManager
+
+
+PCP_USER = "admin"
+PCP_PASSWORD = "s3cret"
+
+
+class FakePCPServer:
+    """Servidor PCP mínimo: salt, autenticação md5, node count, attach e erro"""
+    
+    def __init__(self, user: str, password: str, node_count: int = 3):
+        self.pcp_conf_md5 = hashlib.md5(password.encode()).hexdigest()  # pg_md5 <senha>
+        self.user = user
+        self.node_count = node_count
+        self.requests = []
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+    
+    def close(self):
+        self.listener.close()
+    
+    @staticmethod
+    def _send(conn, tag: bytes, *fields: bytes):
+        payload = b"".join(f + b"\0" for f in fields)
+        conn.sendall(tag + struct.pack("!i", len(payload) + 4) + payload)
+    
+    @staticmethod
+    def _recv(conn):
+        header = conn.recv(5, socket.MSG_WAITALL)
+        if len(header) < 5:
+            return None, []
+        (length,) = struct.unpack("!i", header[1:])
+        payload = conn.recv(length - 4, socket.MSG_WAITALL) if length > 4 else b""
+        return header[:1], payload.split(b"\0")[:-1]
+    
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            with conn:
+                self._session(conn)
+    
+    def _session(self, conn):
+        salt = os.urandom(4)
+        while True:
+            tag, fields = self._recv(conn)
+            if tag is None or tag == b"X":
+                return
+            self.requests.append(tag)
+            
+            if tag == b"M":
+                payload = salt
+                conn.sendall(b"m" + struct.pack("!i", len(payload) + 4) + payload)
+            elif tag == b"R":
+                # pcp_worker: md5(md5(<md5 do pcp.conf> + usuário) + salt)
+                user_md5 = hashlib.md5((self.pcp_conf_md5 + self.user).encode()).hexdigest()
+                expected = hashlib.md5(user_md5.encode() + salt).hexdigest().encode()
+                if fields[0].decode() != self.user or fields[1] != expected:
+                    self._send(conn, b"E", b"SERROR", b"Mauthentication failed")
+                    return
+                self._send(conn, b"r", b"AuthenticationOK")
+            elif tag == b"L":
+                self._send(conn, b"l", b"CommandComplete", str(self.node_count).encode())
+            elif tag == b"C":
+                node_id = int(fields[0])
+                if node_id >= self.node_count:
+                    self._send(conn, b"E", b"SERROR", b"Minvalid node id", b"Dnode id %d" % node_id)
+                else:
+                    self._send(conn, b"c", b"CommandComplete")
+
+
+@pytest.fixture
+def fake_pcp_server():
+    server = FakePCPServer(PCP_USER, PCP_PASSWORD)
+    yield server
+    server.close()
+
+
+@pytest.mark.unit
+class TestPCPClient:
+    
+    def test_md5_auth_matches_pcp_conf(self, fake_pcp_server):
+        """Token md5 inclui o usuário: autentica contra o hash de pg_md5 do pcp.conf"""
+        with PCPClient("127.0.0.1", fake_pcp_server.port, PCP_USER, PCP_PASSWORD, timeout=5) as pcp:
+            assert pcp.node_count() == 3
+            assert pcp.attach_node(1) is True
+        assert fake_pcp_server.requests == [b"M", b"R", b"L", b"C"]
+    
+    def test_wrong_password_is_connection_error(self, fake_pcp_server):
+        """Autenticação recusada: sessão indisponível (PCPConnectionError)"""
+        pcp = PCPClient("127.0.0.1", fake_pcp_server.port, PCP_USER, "wrong", timeout=5)
+        with pytest.raises(PCPConnectionError):
+            pcp.node_count()
+    
+    def test_server_error_is_definitive(self, fake_pcp_server):
+        """Erro 'E' respondido pelo pgpool: PCPError (não de conexão) com a mensagem"""
+        with PCPClient("127.0.0.1", fake_pcp_server.port, PCP_USER, PCP_PASSWORD, timeout=5) as pcp:
+            with pytest.raises(PCPError) as excinfo:
+                pcp.attach_node(7)
+        assert not isinstance(excinfo.value, PCPConnectionError)
+        assert "invalid node id" in str(excinfo.value)
+    
+    def test_manager_falls_back_only_without_session(self, fake_pcp_server, monkeypatch):
+        """PgPoolManager usa o binário pcp_* só quando o PCP nativo está inacessível"""
+        manager = PgPoolManager()
+        fallbacks = []
+        monkeypatch.setattr(manager, "_pcp_exec", lambda command, timeout=10: fallbacks.append(command) or True)
+        
+        manager.pcp = PCPClient("127.0.0.1", fake_pcp_server.port, PCP_USER, PCP_PASSWORD, timeout=5)
+        assert manager.attach_node(1) is True
+        assert manager.attach_node(7) is False  # Recusado pelo pgpool: sem re-execução pelo CLI
+        assert fallbacks == []
+        manager.close()
+        
+        with socket.create_server(("127.0.0.1", 0)) as unused:
+            closed_port = unused.getsockname()[1]  # Porta sem servidor: conexão recusada
+        manager.pcp = PCPClient("127.0.0.1", closed_port, PCP_USER, PCP_PASSWORD, timeout=1)
+        assert manager.attach_node(1) is True
+        assert fallbacks == [["pcp_attach_node", "-n", "1"]]
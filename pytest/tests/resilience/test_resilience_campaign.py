@@ -0,0 +1,79 @@
+"""
+Campanha de Resiliência - RTO/RPO em várias iterações
+
+Repete falha do primário (SIGKILL) e switchover controlado N vezes,
+alternando os tipos, e reporta as distribuições (p50/p95/max) em vez de uma
+única amostra.
+
+Uso:
+    pytest -m campaign --campaign-iterations 20
+    pytest -m campaign --campaign-failure-type kill
+
+Entre as iterações não há sleeps fixos: a campanha religa o nó derrubado e
+segue assim que o cluster reconverge (réplicas em streaming, backends UP no
+PgPool).
+"""
+import pytest
+
+
+@pytest.mark.campaign
+@pytest.mark.resilience
+@pytest.mark.slow
+class TestResilienceCampaign:
+
+    @pytest.mark.asyncio
+    async def test_failover_switchover_campaign(
+        self,
+        resilience_campaign,
+        campaign_writer,
+        cluster_healthy
+    ):
+        """
+        Teste de Resiliência (campanha)
+        
+        Procedimento, para cada iteração e tipo de falha:
+        1. Aguarda a reconvergência do cluster
+        2. Inicia observação e escritas contínuas via PgPool
+        3. Injeta a falha (SIGKILL no primário ou switchover)
+        4. Mede detecção, eleição e restauração do serviço
+        5. Verifica as escritas confirmadas que foram perdidas (RPO)
+        
+        SLA: RTO p95 < 60 segundos
+        """
+        print("\n" + "="*70)
+        print("CAMPANHA DE RESILIÊNCIA - FAILOVER E SWITCHOVER")
+        print("="*70)
+        print(f"Iterações por tipo: {resilience_campaign.iterations}")
+        print(f"Tipos de falha:     {', '.join(resilience_campaign.failure_types)}")
+        
+        # Cada iteração é salva assim que termina (campanhas longas podem ser interrompidas)
+        resilience_campaign.on_iteration = campaign_writer.write
+        
+        metrics = await resilience_campaign.run("failover_switchover")
+        campaign_writer.write(metrics)
+        
+        print(resilience_campaign.summarize(metrics))
+        
+        completed = [i for i in metrics.iterations if i.error is None]
+        assert completed, "Nenhuma iteração da campanha foi concluída"
+        
+        self._validate_sla_rto(metrics)
+    
+    def _validate_sla_rto(self, metrics):
+        """Valida SLA pelo p95 e exibe resultados sem interromper o teste"""
+        sla_target = 60.0  # segundos
+        
+        print(f"\n{'='*70}")
+        print("VALIDAÇÃO DE SLA (p95)")
+        print("="*70)
+        
+        for summary in metrics.summaries:
+            p95 = summary.rto.p95
+            if p95 is None:
+                print(f"{summary.failure_type:<12} sem iterações concluídas")
+                continue
+            status = '✅ PASSOU' if p95 < sla_target else '⚠️  EXCEDEU'
+            print(f"{summary.failure_type:<12} RTO p95 {p95:.3f}s (max {summary.rto.max:.3f}s) "
+                  f"target < {sla_target}s: {status}")
+        
+        print("="*70)
@@ -26,7 +26,8 @@ class TestRPOPrimaryFailure:
         rpo_writer,
         cluster_healthy,
         get_primary_node,
-        pgpool_manager
+        pgpool_manager,
+        convergence_waiter
     ):
         """
         Teste de Resiliência (RPO)
@@ -90,7 +91,9 @@ class TestRPOPrimaryFailure:
         # 0. Inicia observação assíncrona
         print("\n[0/7] 🔍 Iniciando observação do cluster...")
         await rpo_collector.start_observation()
-        print("✓ Cluster sob observação (polling: 100ms)")
+        observer = rpo_collector.observer
+        print(f"✓ Cluster sob observação (polling: {observer.poll_interval*1000:.0f}ms, "
+              f"rajada: {observer.burst_interval*1000:.0f}ms por até {observer.burst_window:.0f}s)")
         
         # Aguarda estabilização
         await asyncio.sleep(0.3)
@@ -217,17 +220,12 @@ class TestRPOPrimaryFailure:
         print(f"\n[Cleanup] 🔄 Reiniciando {initial_primary}...")
         docker.start_container(initial_primary)
 
-        # Aguarda container subir
-        await asyncio.sleep(2)
-
-        # Re-anexa nós ao PgPool
-        pgpool_manager.attach_down_nodes()
-
         # Remove tabela de teste
         rpo_collector.drop_test_table()
         
-        # Aguarda estabilização (pode usar um pouco de tempo aqui, não é medido)
-        await asyncio.sleep(5)
+        # Aguarda a reintegração do primário antigo (réplica na timeline atual + UP no PgPool)
+        convergence = await convergence_waiter.wait(old_primary=initial_primary)
+        assert convergence.converged, f"Cluster não convergiu: {convergence.pending}"
         print("✓ Cleanup concluído")
     
     def _print_rpo_metrics(self, metrics, expected_count):
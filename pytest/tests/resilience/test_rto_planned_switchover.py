@@ -27,9 +27,12 @@ class TestRTOPlannedSwitchover:
         self,
         rto_collector,
         rto_writer,
+        availability_collector,
+        availability_writer,
         cluster_healthy,
         get_primary_node,
-        pgpool_manager
+        pgpool_manager,
+        convergence_waiter
     ):
         """
         Teste de Resiliência (RTO) - Manutenção Programada
@@ -67,7 +70,10 @@ class TestRTOPlannedSwitchover:
         # 0. Inicia observação assíncrona
         print("\n[0/5] 🔍 Iniciando observação do cluster...")
         await rto_collector.start_observation_switchover()
-        print("✓ Cluster sob observação (polling: 100ms)")
+        observer = rto_collector.observer
+        print(f"✓ Cluster sob observação (polling: {observer.poll_interval*1000:.0f}ms, "
+              f"rajada: {observer.burst_interval*1000:.0f}ms por até {observer.burst_window:.0f}s)")
+        availability_collector.start()
         
         # 1. Identifica primário
         print("\n[1/5] 🎯 Identificando nó primário...")
@@ -108,27 +114,38 @@ class TestRTOPlannedSwitchover:
         print(f"\n[5/5] 📊 Finalizando medição...")
         rto_collector.finalize_metrics()
         
-        # Para observação
+        # Para observação e probes de disponibilidade
         await rto_collector.stop_observation()
+        availability_collector.stop()
         
         # Obtém métricas
         metrics = rto_collector.get_metrics()
         assert metrics, "Métricas não foram coletadas"
+        availability = availability_collector.get_metrics(
+            "planned_maintenance_switchover",
+            reference_time=rto_collector.failure_injection_time
+        )
         
         # Salva resultados
         rto_writer.write(metrics)
+        availability_writer.write(availability)
         
         # Exibe resultados
         self._print_rto_metrics(metrics)
         
         # Exibe eventos detectados
         print(rto_collector.get_events_summary())
+        print(availability_collector.summarize(availability))
 
         # Valida SLA (switchover deve ser mais rápido)
         self._validate_sla_rto(metrics)
         
-        # Aguarda estabilização
-        await asyncio.sleep(3)
+        # Aguarda o primário antigo voltar como réplica
+        convergence = await convergence_waiter.wait(
+            old_primary=initial_primary,
+            since=rto_collector.failure_injection_time
+        )
+        assert convergence.converged, f"Cluster não convergiu: {convergence.pending}"
         print("\n✓ Teste concluído")
     
     def _print_rto_metrics(self, metrics):
@@ -147,6 +164,21 @@ class TestRTOPlannedSwitchover:
         print(f"  3. Serviço disponível:   {metrics.service_restored_at}")
         print("-"*70)
         print(f"DOWNTIME TOTAL:    {metrics.total_rto:8.3f}s")
+        if metrics.total_rto_uncertainty is not None:
+            print(f"  intervalo real:  [{metrics.total_rto_lower:.3f}s, {metrics.total_rto_upper:.3f}s] "
+                  f"(±{metrics.total_rto_uncertainty * 1000:.0f}ms de polling)")
+        if metrics.downtime_by_layer:
+            print("-"*70)
+            print("INDISPONIBILIDADE POR CAMADA:")
+            for layer, seconds in metrics.downtime_by_layer.items():
+                marker = "  ◀ dominante" if layer == metrics.dominant_layer else ""
+                print(f"  {layer:<24} {seconds:8.3f}s{marker}")
+            if metrics.pgpool_detection_time is not None:
+                print(f"  PgPool marcou DOWN em {metrics.pgpool_detection_time:.3f}s")
+            if metrics.failover_hook_time is not None:
+                print(f"  failover.sh:         {metrics.failover_hook_time:.3f}s")
+            if metrics.follow_primary_hook_time is not None:
+                print(f"  follow_primary.sh:   {metrics.follow_primary_hook_time:.3f}s")
         print("="*70)
 
     def _validate_sla_rto(self, metrics):
@@ -29,9 +29,12 @@ class TestRTOPrimaryFailure:
         save_metrics,
         rto_collector,
         rto_writer,
+        availability_collector,
+        availability_writer,
         cluster_healthy,
         get_primary_node,
-        pgpool_manager
+        pgpool_manager,
+        convergence_waiter
     ):
         """
         Teste de Resiliência (RTO)
@@ -48,7 +51,7 @@ class TestRTOPrimaryFailure:
         
         Observações:
         - Sem sleeps arbitrários
-        - Polling de 100ms em todos os nós
+        - Polling adaptativo (rajada de 10ms nos segundos críticos do failover)
         - Detecção real de eventos via API Patroni
         """
         docker = DockerManager()
@@ -63,7 +66,10 @@ class TestRTOPrimaryFailure:
         # 0. Inicia observação assíncrona
         print("\n[0/6] 🔍 Iniciando observação do cluster...")
         await rto_collector.start_observation()
-        print("✓ Cluster sob observação (polling: 100ms)")
+        observer = rto_collector.observer
+        print(f"✓ Cluster sob observação (polling: {observer.poll_interval*1000:.0f}ms, "
+              f"rajada: {observer.burst_interval*1000:.0f}ms por até {observer.burst_window:.0f}s)")
+        availability_collector.start()
         
         # 1. Identifica primário
         print("\n[1/6] 🎯 Identificando nó primário...")
@@ -109,16 +115,22 @@ class TestRTOPrimaryFailure:
         print(f"\n[6/6] 📊 Finalizando medição...")
         rto_collector.finalize_metrics()
         
-        # Para observação
+        # Para observação e probes de disponibilidade
         await rto_collector.stop_observation()
+        availability_collector.stop()
         
         # Obtém métricas
         metrics = rto_collector.get_metrics()
         assert metrics, "Métricas não foram coletadas"
+        availability = availability_collector.get_metrics(
+            "primary_node_complete_failure",
+            reference_time=rto_collector.failure_injection_time
+        )
         
         # Salva resultados (se habilitado)
         if save_metrics:
             rto_writer.write(metrics)
+            availability_writer.write(availability)
             print("💾 Métricas salvas em arquivo")
         else:
             print("⏭️  Métricas NÃO foram salvas (save_metrics=False)")
@@ -128,22 +140,20 @@ class TestRTOPrimaryFailure:
         
         # Exibe eventos detectados
         print(rto_collector.get_events_summary())
+        print(availability_collector.summarize(availability))
 
         # Valida SLA
         self._validate_sla_rto(metrics)
         
-        # Cleanup: reinicia o container e re-anexa o nó ao PgPool via PCP
+        # Cleanup: reinicia o container e aguarda a reintegração (réplica + PgPool)
         print(f"\n[Cleanup] 🔄 Reiniciando {initial_primary}...")
-        
-        await asyncio.sleep(5)
-        
         docker.start_container(initial_primary)
-
-        # Aguarda container subir
-        await asyncio.sleep(2)
-
-        # Re-anexa nós ao PgPool
-        pgpool_manager.attach_down_nodes()
+        
+        convergence = await convergence_waiter.wait(
+            old_primary=initial_primary,
+            since=rto_collector.failure_injection_time
+        )
+        assert convergence.converged, f"Cluster não convergiu: {convergence.pending}"
         
         print("✓ Cleanup concluído")
 
@@ -165,6 +175,21 @@ class TestRTOPrimaryFailure:
         print(f"  3. Restauração:  {metrics.restoration_time:8.3f}s  (serviço disponível)")
         print("-"*70)
         print(f"RTO TOTAL:         {metrics.total_rto:8.3f}s")
+        if metrics.total_rto_uncertainty is not None:
+            print(f"  intervalo real:  [{metrics.total_rto_lower:.3f}s, {metrics.total_rto_upper:.3f}s] "
+                  f"(±{metrics.total_rto_uncertainty * 1000:.0f}ms de polling)")
+        if metrics.downtime_by_layer:
+            print("-"*70)
+            print("INDISPONIBILIDADE POR CAMADA:")
+            for layer, seconds in metrics.downtime_by_layer.items():
+                marker = "  ◀ dominante" if layer == metrics.dominant_layer else ""
+                print(f"  {layer:<24} {seconds:8.3f}s{marker}")
+            if metrics.pgpool_detection_time is not None:
+                print(f"  PgPool marcou DOWN em {metrics.pgpool_detection_time:.3f}s")
+            if metrics.failover_hook_time is not None:
+                print(f"  failover.sh:         {metrics.failover_hook_time:.3f}s")
+            if metrics.follow_primary_hook_time is not None:
+                print(f"  follow_primary.sh:   {metrics.follow_primary_hook_time:.3f}s")
         print("="*70)
 
     def _validate_sla_rto(self, metrics):
@@ -0,0 +1,7 @@
+-- Leitura logo após escrita na mesma transação (o PgPool envia tudo ao primário)
+\set aid random(1, 100000 * :scale)
+\set delta random(-5000, 5000)
+BEGIN;
+UPDATE pgbench_accounts SET abalance = abalance + :delta WHERE aid = :aid;
+SELECT abalance FROM pgbench_accounts WHERE aid = :aid;
+END;
@@ -0,0 +1,3 @@
+-- Leitura pontual por chave primária (balanceada entre réplicas pelo PgPool)
+\set aid random(1, 100000 * :scale)
+SELECT abalance FROM pgbench_accounts WHERE aid = :aid;
@@ -0,0 +1,3 @@
+-- Leitura de intervalo curto (varredura de índice)
+\set aid random(1, 100000 * :scale - 100)
+SELECT aid, abalance FROM pgbench_accounts WHERE aid BETWEEN :aid AND :aid + 100;